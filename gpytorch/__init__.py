@@ -14,7 +14,7 @@ from . import (
     utils,
     variational,
 )
-from .beta_features import fast_pred_var
+from .settings import fast_pred_var
 from .functions import (
     add_diag,
     add_jitter,
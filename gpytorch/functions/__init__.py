@@ -113,6 +113,49 @@ def exact_predictive_covar(full_covar, num_train, likelihood, precomputed_cache=
     return full_covar.exact_predictive_covar(num_train, likelihood, precomputed_cache)
 
 
+def exact_predictive_var(full_covar, num_train, likelihood, precomputed_cache=None):
+    """
+    Computes the posterior predictive variances of a GP - i.e. only the diagonal of the predictive covariance
+
+    Args:
+    - full_covar ( (n+t) x (n+t) ) - the block prior covariance matrix of training and testing points
+        - [ K_XX, K_XX*; K_X*X, K_X*X* ]
+    - num_train (int) - how many training points are there in the full covariance matrix
+    - noise (1) - the observed noise (from the likelihood)
+    - precomputed_cache - speeds up subsequent computations (default: None)
+
+    Returns:
+    - (t) - the predictive posterior variances of the test points
+    """
+    if not hasattr(full_covar, "exact_predictive_var"):
+        from ..lazy.non_lazy_tensor import NonLazyTensor
+
+        full_covar = NonLazyTensor(full_covar)
+    if not num_train:
+        return full_covar.diag(), None
+    return full_covar.exact_predictive_var(num_train, likelihood, precomputed_cache)
+
+
+def exact_loo_predictive(covar, mean, target):
+    """
+    Computes the leave-one-out predictive means and variances of the observations of a GP - the predictive
+    distribution of each observation, conditioned on all of the other observations
+
+    Args:
+    - covar (n x n) - the covariance matrix of the observations (including the observation noise)
+    - mean (n) - the prior means of the observations
+    - target (n) - the observations
+
+    Returns:
+    - (n), (n) - the leave-one-out predictive means and variances
+    """
+    if not hasattr(covar, "exact_loo_predictive"):
+        from ..lazy.non_lazy_tensor import NonLazyTensor
+
+        covar = NonLazyTensor(covar)
+    return covar.exact_loo_predictive(mean, target)
+
+
 def log_normal_cdf(x):
     """
     Computes the element-wise log standard normal CDF of an input tensor x.
@@ -243,8 +286,10 @@ def root_inv_decomposition(mat, initial_vectors=None, test_vectors=None):
 __all__ = [
     "add_diag",
     "dsmm",
+    "exact_loo_predictive",
     "exact_predictive_mean",
     "exact_predictive_covar",
+    "exact_predictive_var",
     "inv_matmul",
     "inv_quad",
     "inv_quad_log_det",
@@ -0,0 +1,168 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import torch
+from torch.autograd import Function
+
+
+def _scaled_sq_dist(x1, x2, scales):
+    # Squared distances between the scaled inputs - computed with a matrix multiplication
+    # The inputs are centered first (as in Kernel._covar_dist), to reduce cancellation errors
+    adjustment = x1.mean(-2, keepdim=True)
+    x1_ = (x1 - adjustment) * scales
+    x2_ = (x2 - adjustment) * scales
+    res = x1_.pow(2).sum(-1, keepdim=True) + x2_.pow(2).sum(-1).unsqueeze(-2)
+    res.baddbmm_(x1_, x2_.transpose(-1, -2), alpha=-2)
+    return res.clamp_(min=0)
+
+
+def _cos_term(x1, x2, means, dim):
+    # cos(2 pi mu_d (x1_d - x2_d)) - an n x m matrix
+    diff = x1[..., dim].unsqueeze(-1) - x2[..., dim].unsqueeze(-2)
+    return diff.mul_(means[..., dim].view(-1, 1, 1).mul(2 * math.pi))
+
+
+class SpectralMixtureCovar(Function):
+    """
+    Computes the spectral mixture kernel matrix (see :class:`gpytorch.kernels.SpectralMixtureKernel`)
+
+    .. math::
+
+        K_{ij} = \\sum_q w_q \\exp \\left( -2 \\pi^2 \\Vert (x_i - x'_j) \\circ s_q \\Vert^2 \\right)
+            \\prod_d \\cos \\left( 2 \\pi \\mu_{qd} (x_{id} - x'_{jd}) \\right)
+
+    without materializing `b x k x n x m x d` tensors. The mixtures are accumulated one at a time
+    (the exponential term is a single matrix multiplication, and the cosine terms are multiplied in one dimension
+    at a time). The backward pass recomputes the kernel in blocks of rows, so that it only stores
+    `O(d)` blocks at a time.
+
+    Args:
+        - x1 (b x n x d), x2 (b x m x d) - the inputs
+        - weights (b x k), means (b x k x d), scales (b x k x d) - the mixture parameters
+
+    Returns: (b x n x m)
+    """
+
+    def __init__(self, max_block_size=2 ** 22):
+        self.max_block_size = max_block_size
+
+    def forward(self, x1, x2, weights, means, scales):
+        batch_size, num_rows, num_dims = x1.size()
+        num_cols = x2.size(-2)
+
+        res = torch.zeros(batch_size, num_rows, num_cols, dtype=x1.dtype, device=x1.device)
+        for q in range(weights.size(-1)):
+            term = _scaled_sq_dist(x1, x2, scales[:, q].unsqueeze(-2))
+            term.mul_(-2 * math.pi ** 2).exp_()
+            for dim in range(num_dims):
+                term.mul_(_cos_term(x1, x2, means[:, q], dim).cos_())
+            res.add_(term.mul_(weights[:, q].view(-1, 1, 1)))
+
+        self.save_for_backward(x1, x2, weights, means, scales)
+        return res
+
+    def backward(self, grad_output):
+        x1, x2, weights, means, scales = self.saved_tensors
+        num_rows, num_dims = x1.shape[-2:]
+        num_cols = x2.size(-2)
+        x1_needs_grad, x2_needs_grad, weights_needs_grad, means_needs_grad, scales_needs_grad = self.needs_input_grad
+        needs_cos_grad = x1_needs_grad or x2_needs_grad or means_needs_grad
+
+        x1_grad = torch.zeros_like(x1)
+        x2_grad = torch.zeros_like(x2)
+        weights_grad = torch.zeros_like(weights)
+        means_grad = torch.zeros_like(means)
+        scales_grad = torch.zeros_like(scales)
+
+        block_size = max(1, self.max_block_size // max(1, num_cols * (num_dims + 4)))
+        for start in range(0, num_rows, block_size):
+            length = min(block_size, num_rows - start)
+            x1_block = x1.narrow(-2, start, length)
+            grad_block = grad_output.narrow(-2, start, length)
+            x1_grad_block = x1_grad.narrow(-2, start, length)
+
+            for q in range(weights.size(-1)):
+                q_scales = scales[:, q].unsqueeze(-2)
+                q_means = means[:, q]
+
+                # grad_output * w_q * exp_term
+                weighted_grad = _scaled_sq_dist(x1_block, x2, q_scales)
+                weighted_grad.mul_(-2 * math.pi ** 2).exp_().mul_(grad_block)
+
+                # Suffix products of the cosine terms (the suffix product of 0 is the full cosine term)
+                suffix_prods = [None] * (num_dims + 1)
+                for dim in range(num_dims - 1, -1, -1):
+                    cos_term = _cos_term(x1_block, x2, q_means, dim).cos_()
+                    if suffix_prods[dim + 1] is not None:
+                        cos_term.mul_(suffix_prods[dim + 1])
+                    suffix_prods[dim] = cos_term
+                    if not needs_cos_grad and dim + 1 < num_dims:
+                        suffix_prods[dim + 1] = None
+
+                # Gradients through the mixture weights and the exponential term
+                exp_grad = weighted_grad * suffix_prods[0]
+                if weights_needs_grad:
+                    weights_grad[:, q].add_(exp_grad.sum(-1).sum(-1))
+                exp_grad.mul_(weights[:, q].view(-1, 1, 1))
+                weighted_grad.mul_(weights[:, q].view(-1, 1, 1))
+
+                row_sums = exp_grad.sum(-1).unsqueeze(-1)
+                col_sums = exp_grad.sum(-2).unsqueeze(-1)
+                exp_grad_x2 = torch.bmm(exp_grad, x2)
+                exp_grad_x1 = torch.bmm(exp_grad.transpose(-1, -2), x1_block)
+                del exp_grad
+
+                if scales_needs_grad:
+                    # sum_ij exp_grad_ij (x1_id - x2_jd)^2
+                    sq_diff_sums = (
+                        x1_block.pow(2).mul(row_sums).sum(-2)
+                        + x2.pow(2).mul(col_sums).sum(-2)
+                        - exp_grad_x2.mul(x1_block).sum(-2).mul(2)
+                    )
+                    scales_grad[:, q].add_(sq_diff_sums.mul(scales[:, q]).mul(-4 * math.pi ** 2))
+                if x1_needs_grad:
+                    x1_grad_block.add_(
+                        (x1_block * row_sums - exp_grad_x2).mul(q_scales.pow(2)).mul(-4 * math.pi ** 2)
+                    )
+                if x2_needs_grad:
+                    x2_grad.add_((x2 * col_sums - exp_grad_x1).mul(q_scales.pow(2)).mul(-4 * math.pi ** 2))
+
+                # Gradients through the cosine terms
+                if needs_cos_grad:
+                    prefix_prod = None
+                    for dim in range(num_dims):
+                        angle = _cos_term(x1_block, x2, q_means, dim)
+                        sin_grad = angle.sin().mul_(weighted_grad)
+                        if prefix_prod is not None:
+                            sin_grad.mul_(prefix_prod)
+                        if suffix_prods[dim + 1] is not None:
+                            sin_grad.mul_(suffix_prods[dim + 1])
+                        suffix_prods[dim + 1] = None
+
+                        sin_row_sums = sin_grad.sum(-1)
+                        sin_col_sums = sin_grad.sum(-2)
+                        if means_needs_grad:
+                            # sum_ij sin_grad_ij (x1_id - x2_jd)
+                            diff_sums = (sin_row_sums * x1_block[..., dim]).sum(-1) - (
+                                sin_col_sums * x2[..., dim]
+                            ).sum(-1)
+                            means_grad[:, q, dim].add_(diff_sums.mul(-2 * math.pi))
+                        dim_means = q_means[..., dim].unsqueeze(-1)
+                        if x1_needs_grad:
+                            x1_grad_block[..., dim].add_(sin_row_sums.mul(dim_means).mul(-2 * math.pi))
+                        if x2_needs_grad:
+                            x2_grad[..., dim].add_(sin_col_sums.mul(dim_means).mul(2 * math.pi))
+
+                        cos_term = angle.cos_()
+                        prefix_prod = cos_term if prefix_prod is None else prefix_prod.mul_(cos_term)
+
+        return (
+            x1_grad if x1_needs_grad else None,
+            x2_grad if x2_needs_grad else None,
+            weights_grad if weights_needs_grad else None,
+            means_grad if means_needs_grad else None,
+            scales_grad if scales_needs_grad else None,
+        )
@@ -0,0 +1,42 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from torch.autograd import Function
+from ..utils.toeplitz import sym_toeplitz_derivative_quadratic_form, sym_toeplitz_inv_matmul, sym_toeplitz_levinson
+
+
+class ToeplitzInvMatmul(Function):
+    """
+    Computes exact solves T^{-1} M against a symmetric PD Toeplitz matrix T (or a batch of them),
+    represented by its first column. The first column of T^{-1} is computed once with the Levinson-Durbin
+    recursion, after which every solve (forward and backward) uses the Gohberg-Semencul formula.
+    """
+
+    def forward(self, rhs, column):
+        inv_column, _ = sym_toeplitz_levinson(column)
+        res = sym_toeplitz_inv_matmul(inv_column, rhs)
+        self.save_for_backward(res, inv_column)
+        return res
+
+    def backward(self, grad_output):
+        rhs_solves, inv_column = self.saved_tensors
+        rhs_grad = None
+        column_grad = None
+
+        if any(self.needs_input_grad):
+            grad_output_solves = sym_toeplitz_inv_matmul(inv_column, grad_output)
+
+            if self.needs_input_grad[1]:
+                if rhs_solves.ndimension() == 1:
+                    column_grad = sym_toeplitz_derivative_quadratic_form(
+                        grad_output_solves.unsqueeze(-1), rhs_solves.mul(-1).unsqueeze(-1)
+                    )
+                else:
+                    column_grad = sym_toeplitz_derivative_quadratic_form(grad_output_solves, rhs_solves.mul(-1))
+
+            if self.needs_input_grad[0]:
+                rhs_grad = grad_output_solves
+
+        return rhs_grad, column_grad
@@ -0,0 +1,132 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+from torch.autograd import Function
+from ..utils import linear_cg
+from ..utils.toeplitz import (
+    circulant_eigenvalues,
+    circulant_inv_matmul,
+    sym_toeplitz_circulant_column,
+    sym_toeplitz_derivative_quadratic_form,
+    sym_toeplitz_inv_matmul,
+    sym_toeplitz_levinson,
+    sym_toeplitz_log_det_derivative,
+    sym_toeplitz_matmul,
+)
+from .. import settings
+
+
+class ToeplitzInvQuadLogDet(Function):
+    """
+    Given a symmetric PD Toeplitz matrix T (or a batch of them), represented by its first column,
+    this function computes one or both of the following
+    - The inverse quadratic form b^T T^{-1} b
+    - logdet(T)
+
+    Rather than CG and stochastic Lanczos quadrature, this uses the Toeplitz structure directly:
+    - method="exact": the Levinson-Durbin recursion gives the exact log determinant and the first column
+      of T^{-1}. Solves and log determinant derivatives then follow from the Gohberg-Semencul formula.
+    - method="circulant": the log determinant is approximated by that of T. Chan's optimal circulant
+      approximation C (computed with a single FFT), and solves use CG preconditioned with C.
+    In both cases, the log determinant derivatives are deterministic.
+    """
+
+    def __init__(self, method="exact", inv_quad=False, log_det=False):
+        if not (inv_quad or log_det):
+            raise RuntimeError("Either inv_quad or log_det must be true (or both)")
+        if method not in ("exact", "circulant"):
+            raise RuntimeError("Unknown Toeplitz inference method {}.".format(method))
+
+        self.method = method
+        self.inv_quad = inv_quad
+        self.log_det = log_det
+
+    def forward(self, *args):
+        """
+        *args - The first column of T (or batch of columns).
+        If self.inv_quad is true, the first entry in *args is inv_quad_rhs (Tensor)
+        - the RHS of the matrix solves.
+
+        Returns:
+        - (Scalar) The inverse quadratic form (or None, if self.inv_quad is False)
+        - (Scalar) The log determinant (or None, self.if log_det is False)
+        """
+        inv_quad_rhs = None
+        if self.inv_quad:
+            inv_quad_rhs, column = args
+        else:
+            column, = args
+
+        self.is_vector = False
+        if self.inv_quad and inv_quad_rhs.ndimension() == 1:
+            inv_quad_rhs = inv_quad_rhs.unsqueeze(-1)
+            self.is_vector = True
+
+        solves = None
+        log_det_derivative = None
+        log_det_term = torch.empty(0, dtype=column.dtype, device=column.device)
+        inv_quad_term = torch.empty(0, dtype=column.dtype, device=column.device)
+
+        if self.method == "exact":
+            inv_column, exact_log_det = sym_toeplitz_levinson(column)
+            if self.inv_quad:
+                solves = sym_toeplitz_inv_matmul(inv_column, inv_quad_rhs)
+            if self.log_det:
+                log_det_term = exact_log_det
+                log_det_derivative = sym_toeplitz_log_det_derivative(inv_column)
+
+        else:
+            eigenvalues = circulant_eigenvalues(sym_toeplitz_circulant_column(column))
+            if self.inv_quad:
+                solves = linear_cg(
+                    lambda tensor: sym_toeplitz_matmul(column, tensor),
+                    inv_quad_rhs,
+                    max_iter=settings.max_cg_iterations.value(),
+                    preconditioner=lambda tensor: circulant_inv_matmul(eigenvalues, tensor),
+                )
+            if self.log_det:
+                log_det_term = eigenvalues.log().sum(-1)
+                # d/dc_k sum_j log(lambda_j) is the DFT of 1 / lambda
+                # Each t_k (k > 0) contributes to c_k and c_{n-k} with weight (n - k) / n
+                n = column.size(-1)
+                weights = torch.arange(n, dtype=column.dtype, device=column.device).mul_(-2).add_(2 * n).div_(n)
+                weights[0] = 1
+                log_det_derivative = circulant_eigenvalues(eigenvalues.reciprocal()).mul(weights)
+
+        if self.inv_quad:
+            inv_quad_term = (solves * inv_quad_rhs).sum(-2)
+
+        self.save_for_backward(column, solves, log_det_derivative)
+        return inv_quad_term, log_det_term
+
+    def backward(self, inv_quad_grad_output, log_det_grad_output):
+        column_grad = None
+        inv_quad_rhs_grad = None
+
+        # Which backward passes should we compute?
+        compute_inv_quad_grad = inv_quad_grad_output.sum() and self.inv_quad
+        compute_log_det_grad = log_det_grad_output.sum() and self.log_det
+
+        column, solves, log_det_derivative = self.saved_tensors
+
+        if self.needs_input_grad[-1]:
+            column_grad = torch.zeros_like(column)
+            if compute_log_det_grad:
+                column_grad = column_grad + log_det_derivative.mul(log_det_grad_output.unsqueeze(-1))
+            if compute_inv_quad_grad:
+                neg_solves_times_grad_out = solves.mul(inv_quad_grad_output.unsqueeze(-2)).mul_(-1)
+                column_grad = column_grad + sym_toeplitz_derivative_quadratic_form(neg_solves_times_grad_out, solves)
+
+        if self.inv_quad:
+            if compute_inv_quad_grad and self.needs_input_grad[0]:
+                inv_quad_rhs_grad = solves.mul(inv_quad_grad_output.unsqueeze(-2)).mul_(2)
+            else:
+                inv_quad_rhs_grad = torch.zeros_like(solves)
+            if self.is_vector:
+                inv_quad_rhs_grad.squeeze_(-1)
+            return inv_quad_rhs_grad, column_grad
+
+        return column_grad
@@ -10,6 +10,7 @@ from .grid_kernel import GridKernel
 from .grid_interpolation_kernel import GridInterpolationKernel
 from .index_kernel import IndexKernel
 from .inducing_point_kernel import InducingPointKernel
+from .lattice_interpolation_kernel import LatticeInterpolationKernel
 from .lcm_kernel import LCMKernel
 from .linear_kernel import LinearKernel
 from .matern_kernel import MaternKernel
@@ -17,8 +18,10 @@ from .multitask_kernel import MultitaskKernel
 from .periodic_kernel import PeriodicKernel
 from .product_structure_kernel import ProductStructureKernel
 from .rbf_kernel import RBFKernel
+from .rff_kernel import RFFKernel
 from .scale_kernel import ScaleKernel
 from .spectral_mixture_kernel import SpectralMixtureKernel
+from .wendland_kernel import WendlandKernel
 from .white_noise_kernel import WhiteNoiseKernel
 
 __all__ = [
@@ -30,6 +33,7 @@ __all__ = [
     "GridInterpolationKernel",
     "IndexKernel",
     "InducingPointKernel",
+    "LatticeInterpolationKernel",
     "LCMKernel",
     "LinearKernel",
     "MaternKernel",
@@ -38,7 +42,9 @@ __all__ = [
     "ProductKernel",
     "ProductStructureKernel",
     "RBFKernel",
+    "RFFKernel",
     "ScaleKernel",
     "SpectralMixtureKernel",
+    "WendlandKernel",
     "WhiteNoiseKernel",
 ]
@@ -41,10 +41,17 @@ class AdditiveStructureKernel(Kernel):
         self.base_kernel = base_kernel
         self.num_dims = num_dims
 
-    def forward(self, x1, x2, batch_dims=None, **params):
+    def forward(self, x1, x2, diag=False, batch_dims=None, **params):
         if batch_dims == (0, 2):
             raise RuntimeError("AdditiveStructureKernel does not accept the batch_dims argument.")
 
+        if diag:
+            # The diagonals of the component kernels are `(b * d) x n` - with one row per batch and dimension
+            x1_, x2_ = (x1, x2) if x1.dim() == 3 else (x1.unsqueeze(0), x2.unsqueeze(0))
+            res = self.base_kernel(x1_, x2_, diag=True, batch_dims=(0, 2), **params)
+            res = res.view(-1, x1.size(-1), res.size(-1)).sum(-2)
+            return res if x1.dim() == 3 else res.squeeze(0)
+
         res = self.base_kernel(x1, x2, batch_dims=(0, 2), **params).evaluate_kernel()
 
         evaluate = False
@@ -5,7 +5,7 @@ from __future__ import unicode_literals
 
 import math
 import torch
-from .kernel import Kernel
+from .kernel import Kernel, _is_same_tensor
 
 
 class CosineKernel(Kernel):
@@ -61,15 +61,24 @@ class CosineKernel(Kernel):
             prior=log_period_length_prior,
         )
 
+    @property
+    def is_stationary(self):
+        return True
+
     @property
     def period_length(self):
         return self.log_period_length.exp().clamp(self.eps, 1e5)
 
+    def _can_forward_shared_dist(self):
+        return True
+
+    def _forward_shared_dist(self, dists):
+        diff = dists.dist.div(self.period_length)
+        return torch.cos(diff.mul(math.pi))
+
     def forward(self, x1, x2, **params):
         x1_ = x1.div(self.period_length)
-        x2_ = x2.div(self.period_length)
-        x1_, x2_ = self._create_input_grid(x1_, x2_, **params)
-
-        diff = torch.norm((x1_ - x2_).abs(), 2, -1)
+        x2_ = x1_ if _is_same_tensor(x1, x2) else x2.div(self.period_length)
+        diff = self._covar_dist(x1_, x2_, **params)
         res = torch.cos(diff.mul(math.pi))
         return res
@@ -5,7 +5,9 @@ from __future__ import unicode_literals
 
 import torch
 from .grid_kernel import GridKernel
+from .kernel import _is_same_tensor
 from ..lazy import InterpolatedLazyTensor
+from ..utils.grid import create_grid
 from ..utils.interpolation import Interpolation
 
 
@@ -41,6 +43,17 @@ class GridInterpolationKernel(GridKernel):
     (Alternatively, you can hard-code bounds using the :attr:`grid_bounds`, which
     will speed up this kernel's computations.)
 
+    The grid can have a different size in each dimension (by supplying a list for :attr:`grid_size`).
+    It is also possible to supply the :attr:`grid` points of each dimension directly - these do not need to be
+    regularly spaced, so resolution can be concentrated where the data is
+    (see :func:`gpytorch.utils.grid.create_adaptive_grid`). Irregularly spaced dimensions use local
+    cubic Hermite (Catmull-Rom) interpolation, and lose the Toeplitz structure - but keep the Kronecker structure.
+
+    Once the grid is static (either because :attr:`grid_bounds` were supplied, or because
+    :meth:`freeze_grid` was called), the kernel no longer inspects the data bounds on every call,
+    and the interpolation weights of the training inputs are cached between training iterations.
+    The dense set of `grid_size^d` inducing points is never constructed for KISS-GP.
+
     .. note::
 
         `GridInterpolationKernel` can only wrap **stationary kernels** (such as RBF, Matern,
@@ -49,14 +62,16 @@ class GridInterpolationKernel(GridKernel):
     Args:
         :attr:`base_kernel` (Kernel):
             The kernel to approximate with KISS-GP
-        :attr:`grid_size` (int):
-            The size of the grid (in each dimension)
+        :attr:`grid_size` (int or list(int)):
+            The size of the grid (in each dimension). Required if `grid=None`
         :attr:`num_dims` (int):
-            The dimension of the input data. Required if `grid_bounds=None`
+            The dimension of the input data. Required if `grid_bounds=None` and `grid=None`
         :attr:`grid_bounds` (tuple(float, float), optional):
             The bounds of the grid, if known (high performance mode).
             The length of the tuple must match the number of dimensions.
             The entries represent the min/max values for each dimension.
+        :attr:`grid` (list of Tensors, optional):
+            The (sorted) grid points of each dimension, if known. The grid is then static.
         :attr:`active_dims` (tuple of ints, optional):
             Passed down to the `base_kernel`.
 
@@ -64,12 +79,28 @@ class GridInterpolationKernel(GridKernel):
         http://proceedings.mlr.press/v37/wilson15.pdf
     """
 
-    def __init__(self, base_kernel, grid_size, num_dims=None, grid_bounds=None, active_dims=None):
+    def __init__(self, base_kernel, grid_size=None, num_dims=None, grid_bounds=None, grid=None, active_dims=None):
         has_initialized_grid = 0
         grid_is_dynamic = True
 
+        if grid is not None:
+            # The grid is supplied directly
+            grid = [dim_grid.detach() for dim_grid in grid]
+            has_initialized_grid = 1
+            grid_is_dynamic = False
+            grid_size = [len(dim_grid) for dim_grid in grid]
+            grid_bounds = tuple((dim_grid[1].item(), dim_grid[-2].item()) for dim_grid in grid)
+            if num_dims is not None and num_dims != len(grid):
+                raise RuntimeError(
+                    "num_dims ({}) disagrees with the number of dimensions of the "
+                    "supplied grid ({})".format(num_dims, len(grid))
+                )
+            num_dims = len(grid)
+        elif grid_size is None:
+            raise RuntimeError("grid_size must be supplied if grid is None")
+
         # Make some temporary grid bounds, if none exist
-        if grid_bounds is None:
+        elif grid_bounds is None:
             if num_dims is None:
                 raise RuntimeError("num_dims must be supplied if grid_bounds is None")
             else:
@@ -91,35 +122,22 @@ class GridInterpolationKernel(GridKernel):
         self.num_dims = num_dims
         self.grid_size = grid_size
         self.grid_bounds = grid_bounds
-        inducing_points, grid = self._create_grid()
+        if grid is None:
+            grid = self._create_grid()
 
         super(GridInterpolationKernel, self).__init__(
-            base_kernel=base_kernel, inducing_points=inducing_points, grid=grid, active_dims=active_dims
+            base_kernel=base_kernel, inducing_points=None, grid=grid, active_dims=active_dims
         )
         self.register_buffer("has_initialized_grid", torch.tensor(has_initialized_grid, dtype=torch.uint8))
 
     def _create_grid(self):
-        grid = torch.zeros(self.grid_size, len(self.grid_bounds))
-        for i in range(len(self.grid_bounds)):
-            grid_diff = float(self.grid_bounds[i][1] - self.grid_bounds[i][0]) / (self.grid_size - 2)
-            grid[:, i] = torch.linspace(
-                self.grid_bounds[i][0] - grid_diff, self.grid_bounds[i][1] + grid_diff, self.grid_size
-            )
-
-        inducing_points = torch.zeros(int(pow(self.grid_size, len(self.grid_bounds))), len(self.grid_bounds))
-        prev_points = None
-        for i in range(len(self.grid_bounds)):
-            for j in range(self.grid_size):
-                inducing_points[j * self.grid_size ** i : (j + 1) * self.grid_size ** i, i].fill_(grid[j, i])
-                if prev_points is not None:
-                    inducing_points[j * self.grid_size ** i : (j + 1) * self.grid_size ** i, :i].copy_(prev_points)
-            prev_points = inducing_points[: self.grid_size ** (i + 1), : (i + 1)]
-
-        return inducing_points, grid
+        return create_grid(self.grid_size, self.grid_bounds)
 
     @property
     def _tight_grid_bounds(self):
-        grid_spacings = tuple((bound[1] - bound[0]) / self.grid_size for bound in self.grid_bounds)
+        grid_spacings = tuple(
+            (bound[1] - bound[0]) / grid_size for bound, grid_size in zip(self.grid_bounds, self.grid_sizes)
+        )
         return tuple(
             (bound[0] + 2.01 * spacing, bound[1] - 2.01 * spacing)
             for bound, spacing in zip(self.grid_bounds, grid_spacings)
@@ -129,6 +147,30 @@ class GridInterpolationKernel(GridKernel):
     def has_custom_exact_predictions(self):
         return True
 
+    def freeze_grid(self):
+        """
+        Stops the grid from adapting to the data.
+
+        The grid bounds are no longer recomputed on every call (avoiding a device sync),
+        and the interpolation weights of the training inputs are reused between iterations.
+        Call this after the grid has been fit to the training data.
+        """
+        self.grid_is_dynamic = False
+        self._clear_interp_cache()
+        return self
+
+    def train(self, mode=True):
+        self._clear_interp_cache()
+        return super(GridInterpolationKernel, self).train(mode)
+
+    def update_grid(self, grid):
+        self._clear_interp_cache()
+        return super(GridInterpolationKernel, self).update_grid(grid)
+
+    def _clear_interp_cache(self):
+        if hasattr(self, "_cached_interp"):
+            del self._cached_interp
+
     def _compute_grid(self, inputs, batch_dims):
         batch_size, n_data, n_dimensions = inputs.size()
         if batch_dims == (0, 2):
@@ -138,20 +180,39 @@ class GridInterpolationKernel(GridKernel):
             n_dimensions = n_dimensions // inputs.size(1)
 
         inputs = inputs.view(batch_size * n_data, n_dimensions)
-        interp_indices, interp_values = Interpolation().interpolate(self.grid, inputs)
+        interp_indices, interp_values = Interpolation().interpolate(
+            self.grid, inputs, uniform_grid_dims=self._uniform_grid_dims
+        )
         interp_indices = interp_indices.view(batch_size, n_data, -1)
         interp_values = interp_values.view(batch_size, n_data, -1)
         return interp_indices, interp_values
 
-    def _inducing_forward(self, batch_dims, **params):
-        return super(GridInterpolationKernel, self).forward(
-            self.inducing_points, self.inducing_points, batch_dims=batch_dims, **params
-        )
+    def _interp(self, inputs, batch_dims):
+        # Interpolation weights only depend on the inputs (and the grid) - so if the grid is static and
+        # we see the same (unmodified) training inputs again, we can reuse the weights
+        use_cache = self.training and not self.grid_is_dynamic and not inputs.requires_grad
+        if use_cache and hasattr(self, "_cached_interp"):
+            cached_inputs, cached_version, cached_batch_dims, interp_indices, interp_values = self._cached_interp
+            if (
+                cached_version == inputs._version
+                and cached_batch_dims == batch_dims
+                and _is_same_tensor(cached_inputs, inputs)
+            ):
+                return interp_indices, interp_values
+
+        interp_indices, interp_values = self._compute_grid(inputs, batch_dims)
+        if use_cache:
+            # Holding on to the inputs ensures that their memory can't be reused by another tensor
+            self._cached_interp = (inputs, inputs._version, batch_dims, interp_indices, interp_values)
+        return interp_indices, interp_values
+
+    def _inducing_forward(self, batch_dims, diag=False, **params):
+        return self._grid_covar(batch_dims=batch_dims, **params)
 
     def forward(self, x1, x2, batch_dims=None, **params):
         # See if we need to update the grid or not
         if self.grid_is_dynamic:  # This is true if a grid_bounds wasn't passed in
-            if torch.equal(x1, x2):
+            if _is_same_tensor(x1, x2):
                 x = x1.view(-1, self.num_dims)
             else:
                 x = torch.cat([x1.view(-1, self.num_dims), x2.view(-1, self.num_dims)])
@@ -168,20 +229,23 @@ class GridInterpolationKernel(GridKernel):
 
             # Update the grid if needed
             if update_grid:
-                grid_spacings = tuple((x_max - x_min) / (self.grid_size - 4.02) for x_min, x_max in zip(x_mins, x_maxs))
+                grid_spacings = tuple(
+                    (x_max - x_min) / (grid_size - 4.02)
+                    for x_min, x_max, grid_size in zip(x_mins, x_maxs, self.grid_sizes)
+                )
                 self.grid_bounds = tuple(
                     (x_min - 2.01 * spacing, x_max + 2.01 * spacing)
                     for x_min, x_max, spacing in zip(x_mins, x_maxs, grid_spacings)
                 )
-                inducing_points, grid = self._create_grid()
-                self.update_inducing_points_and_grid(inducing_points, grid)
+                self.update_grid(self._create_grid())
+                self.has_initialized_grid.fill_(1)
 
         base_lazy_tsr = self._inducing_forward(batch_dims=batch_dims, **params)
         if x1.size(0) > 1:
             base_lazy_tsr = base_lazy_tsr.repeat(x1.size(0), 1, 1)
 
-        left_interp_indices, left_interp_values = self._compute_grid(x1, batch_dims)
-        if torch.equal(x1, x2):
+        left_interp_indices, left_interp_values = self._interp(x1, batch_dims)
+        if _is_same_tensor(x1, x2):
             right_interp_indices = left_interp_indices
             right_interp_values = left_interp_values
         else:
@@ -5,7 +5,8 @@ from __future__ import unicode_literals
 
 import torch
 from .kernel import Kernel
-from ..lazy import ToeplitzLazyTensor, KroneckerProductLazyTensor
+from ..lazy import KroneckerProductLazyTensor, NonLazyTensor, ToeplitzLazyTensor
+from ..utils.grid import create_data_from_grid, is_uniform_grid
 from .. import settings
 
 
@@ -22,13 +23,18 @@ class GridKernel(Kernel):
         `GridKernel` can only wrap **stationary kernels** (such as RBF, Matern,
         Periodic, Spectral Mixture, etc.)
 
+    The grid may have a different number of points in each dimension, and the points of a dimension
+    do not need to be regularly spaced. Regularly spaced dimensions have Toeplitz structure;
+    the kernel matrix of the other dimensions is stored densely (the Kronecker structure is kept throughout).
+
     Args:
         :attr:`base_kernel` (Kernel):
             The kernel to speed up with grid methods.
-        :attr:`inducing_points` (Tensor, n x d):
+        :attr:`inducing_points` (Tensor, n x d, optional):
             This will be the set of points that lie on the grid.
-        :attr:`grid` (Tensor, k x d):
-            The exact grid points.
+            If `None`, the points are only constructed from :attr:`grid` when they are accessed.
+        :attr:`grid` (list of Tensors, or Tensor k x d):
+            The exact grid points of each dimension.
         :attr:`active_dims` (tuple of ints, optional):
             Passed down to the `base_kernel`.
 
@@ -39,58 +45,151 @@ class GridKernel(Kernel):
     def __init__(self, base_kernel, inducing_points, grid, active_dims=None):
         super(GridKernel, self).__init__(active_dims=active_dims)
         self.base_kernel = base_kernel
-        if inducing_points.ndimension() != 2:
-            raise RuntimeError("Inducing points should be 2 dimensional")
-        self.register_buffer("inducing_points", inducing_points.unsqueeze(0))
-        self.register_buffer("grid", grid)
+        if inducing_points is not None:
+            if inducing_points.ndimension() != 2:
+                raise RuntimeError("Inducing points should be 2 dimensional")
+            self.register_buffer("inducing_points", inducing_points.unsqueeze(0))
+
+        grid = _grid_to_list(grid)
+        self.num_grid_dims = len(grid)
+        for i, dim_grid in enumerate(grid):
+            self.register_buffer("grid_{}".format(i), dim_grid)
+        self._update_grid_structure()
+
+    def __getattr__(self, name):
+        if name == "inducing_points" and "inducing_points" not in self._buffers:
+            return create_data_from_grid(self.grid).unsqueeze(0)
+        return super(GridKernel, self).__getattr__(name)
+
+    @property
+    def grid(self):
+        """
+        The grid points of each dimension (list of Tensors)
+        """
+        return [getattr(self, "grid_{}".format(i)) for i in range(self.num_grid_dims)]
+
+    @property
+    def grid_sizes(self):
+        return [len(dim_grid) for dim_grid in self.grid]
+
+    def _update_grid_structure(self):
+        # Only regularly spaced dimensions give rise to Toeplitz matrices
+        self._uniform_grid_dims = [is_uniform_grid(dim_grid) for dim_grid in self.grid]
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # Older models stored the full set of inducing points, which are now derived from the grid
+        if "inducing_points" not in self._buffers:
+            state_dict.pop(prefix + "inducing_points", None)
+        # Older models stored the grid as a single (k x d) tensor
+        if prefix + "grid" in state_dict:
+            for i, dim_grid in enumerate(_grid_to_list(state_dict.pop(prefix + "grid"))):
+                state_dict[prefix + "grid_{}".format(i)] = dim_grid
+        res = super(GridKernel, self)._load_from_state_dict(state_dict, prefix, *args, **kwargs)
+        self._update_grid_structure()
+        return res
 
     def train(self, mode=True):
         if hasattr(self, "_cached_kernel_mat"):
             del self._cached_kernel_mat
         return super(GridKernel, self).train(mode)
 
-    def update_inducing_points_and_grid(self, inducing_points, grid):
+    def update_grid(self, grid):
         """
-        Supply a new set of `inducing_points` and a new `grid` if they ever change.
+        Supply a new `grid` if it ever changes.
         """
-        self.inducing_points.detach().resize_(inducing_points.size()).copy_(inducing_points)
-        self.grid.detach().resize_(grid.size()).copy_(grid)
+        grid = _grid_to_list(grid)
+        if len(grid) != self.num_grid_dims:
+            raise RuntimeError("Expected a grid with {} dimensions. Got {}.".format(self.num_grid_dims, len(grid)))
+        for old_dim_grid, dim_grid in zip(self.grid, grid):
+            old_dim_grid.detach().resize_(dim_grid.size()).copy_(dim_grid)
+        self._update_grid_structure()
+        if "inducing_points" in self._buffers:
+            inducing_points = create_data_from_grid(grid)
+            self.inducing_points.detach().resize_(1, *inducing_points.size()).copy_(inducing_points)
         if hasattr(self, "_cached_kernel_mat"):
             del self._cached_kernel_mat
         return self
 
-    def forward(self, x1, x2, diag=False, batch_dims=None, **params):
-        if not torch.equal(x1, self.inducing_points) or not torch.equal(x2, self.inducing_points):
-            raise RuntimeError("The kernel should only receive the inducing points as input")
+    def update_inducing_points_and_grid(self, inducing_points, grid):
+        """
+        Supply a new set of `inducing_points` and a new `grid` if they ever change.
+        """
+        self.update_grid(grid)
+        if "inducing_points" in self._buffers:
+            self.inducing_points.detach().resize_(inducing_points.size()).copy_(inducing_points)
+        return self
 
+    def forward(self, x1, x2, diag=False, batch_dims=None, **params):
+        if "inducing_points" in self._buffers:
+            if not torch.equal(x1, self.inducing_points) or not torch.equal(x2, self.inducing_points):
+                raise RuntimeError("The kernel should only receive the inducing points as input")
+        else:
+            num_grid_points = 1
+            for grid_size in self.grid_sizes:
+                num_grid_points *= grid_size
+            if x1.size(-2) != num_grid_points or x2.size(-2) != num_grid_points:
+                raise RuntimeError("The kernel should only receive the inducing points as input")
+        return self._grid_covar(batch_dims=batch_dims, **params)
+
+    def _grid_covar(self, batch_dims=None, **params):
+        """
+        Computes the (Kronecker/Toeplitz structured) covariance between all of the grid points.
+        The inducing points themselves are never needed.
+        """
         if not self.training and hasattr(self, "_cached_kernel_mat"):
-            covar = self._cached_kernel_mat
-
+            return self._cached_kernel_mat
+
+        grid_sizes = self.grid_sizes
+        max_grid_size = max(grid_sizes)
+        if batch_dims == (0, 2) and min(grid_sizes) != max_grid_size:
+            raise RuntimeError("batch_dims=(0, 2) requires the same number of grid points in every dimension.")
+        use_toeplitz = [settings.use_toeplitz.on() and is_uniform for is_uniform in self._uniform_grid_dims]
+
+        # Every dimension is evaluated in a single batch (using batch_dims=(0, 2))
+        # Dimensions with fewer grid points are padded, and then truncated afterwards
+        grid = torch.stack(
+            [
+                dim_grid
+                if len(dim_grid) == max_grid_size
+                else torch.cat([dim_grid, dim_grid[-1:].expand(max_grid_size - len(dim_grid))])
+                for dim_grid in self.grid
+            ],
+            -1,
+        ).unsqueeze(0)
+
+        if any(use_toeplitz):
+            first_item = grid[:, 0:1]
+            covar_columns = self.base_kernel(first_item, grid, diag=False, batch_dims=(0, 2), **params)
+            covar_columns = covar_columns.evaluate().squeeze(-2)
+        if not all(use_toeplitz):
+            full_covar = self.base_kernel(grid, grid, batch_dims=(0, 2), **params).evaluate_kernel()
+
+        if batch_dims == (0, 2):
+            covars = [ToeplitzLazyTensor(covar_columns) if all(use_toeplitz) else full_covar]
         else:
-            n_dim = x1.size(-1)
-            grid = self.grid.unsqueeze(0)
-
-            if settings.use_toeplitz.on():
-                first_item = grid[:, 0:1]
-                covar_columns = self.base_kernel(first_item, grid, diag=False, batch_dims=(0, 2), **params)
-                covar_columns = covar_columns.evaluate().squeeze(-2)
-                if batch_dims == (0, 2):
-                    covars = [ToeplitzLazyTensor(covar_columns)]
+            covars = []
+            for i, grid_size in enumerate(grid_sizes):
+                if use_toeplitz[i]:
+                    covars.append(ToeplitzLazyTensor(covar_columns[i : i + 1, :grid_size]))
+                elif grid_size == max_grid_size:
+                    covars.append(full_covar[i : i + 1])
                 else:
-                    covars = [ToeplitzLazyTensor(covar_columns[i : i + 1]) for i in range(n_dim)]
-            else:
-                full_covar = self.base_kernel(grid, grid, batch_dims=(0, 2), **params).evaluate_kernel()
-                if batch_dims == (0, 2):
-                    covars = [full_covar]
-                else:
-                    covars = [full_covar[i : i + 1] for i in range(n_dim)]
-
-            if len(covars) > 1:
-                covar = KroneckerProductLazyTensor(*covars)
-            else:
-                covar = covars[0]
+                    covars.append(NonLazyTensor(full_covar[i : i + 1].evaluate()[:, :grid_size, :grid_size]))
 
-            if not self.training:
-                self._cached_kernel_mat = covar
+        # The first dimension is the slowest varying one (which matches the interpolation indices)
+        if len(covars) > 1:
+            covar = KroneckerProductLazyTensor(*covars[::-1])
+        else:
+            covar = covars[0]
 
+        if not self.training:
+            self._cached_kernel_mat = covar
         return covar
+
+
+def _grid_to_list(grid):
+    if torch.is_tensor(grid):
+        if grid.ndimension() != 2:
+            raise RuntimeError("The grid should either be a list of Tensors, or a 2 dimensional (k x d) Tensor")
+        grid = [grid[:, i].contiguous() for i in range(grid.size(-1))]
+    return list(grid)
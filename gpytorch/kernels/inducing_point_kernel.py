@@ -4,10 +4,11 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import torch
-from .kernel import Kernel
+from .kernel import Kernel, _is_same_tensor
 from ..functions import add_jitter
 from ..lazy import DiagLazyTensor, LazyTensor, MatmulLazyTensor, RootLazyTensor
 from ..distributions import MultivariateNormal
+from ..utils.cholesky import batch_potrf, batch_trtri
 from ..variational import MVNVariationalStrategy
 
 
@@ -23,52 +24,68 @@ class InducingPointKernel(Kernel):
         self.register_parameter(name="inducing_points", parameter=torch.nn.Parameter(inducing_points.unsqueeze(0)))
         self.register_variational_strategy("inducing_point_strategy")
 
-    def train(self, mode=True):
-        if hasattr(self, "_cached_kernel_mat"):
-            del self._cached_kernel_mat
-        return super(InducingPointKernel, self).train(mode)
+    @property
+    def has_custom_exact_predictions(self):
+        return True
 
     @property
     def _inducing_mat(self):
-        if not self.training and hasattr(self, "_cached_kernel_mat"):
-            return self._cached_kernel_mat
-        else:
-            res = self.base_kernel(self.inducing_points, self.inducing_points).evaluate()
-            if not self.training:
-                self._cached_kernel_mat = res
-            return res
+        return self.base_kernel(self.inducing_points, self.inducing_points).evaluate()
 
     @property
     def _inducing_inv_root(self):
-        if not self.training and hasattr(self, "_cached_kernel_inv_root"):
-            return self._cached_kernel_inv_root
-        else:
-            inv_roots_list = []
-            for i in range(self._inducing_mat.size(0)):
-                jitter_mat = add_jitter(self._inducing_mat[i])
-                chol = torch.potrf(jitter_mat)
-                eye = torch.eye(chol.size(-1), device=chol.device)
-                inv_roots_list.append(torch.trtrs(eye, chol)[0])
-
-            res = torch.cat(inv_roots_list, 0)
-            if not self.training:
-                self._cached_kernel_inv_root = res
-            return res
+        r"""
+        Returns :math:`R = U^{-1}`, where :math:`U` is the (upper triangular) Cholesky factor of :math:`K_{UU}`
+        - so that :math:`K_{UU}^{-1} = R R^\top`. All batches are factorized at once.
+
+        The result is cached (in both train and eval mode) until the inducing points or the hyperparameters
+        of the base kernel change. In train mode, results that are part of an autograd graph are not reused (as
+        for the kernel cache), and the (detached) cached result is only used if no gradients are needed. In eval
+        mode, a detached copy is cached - whether or not autograd is enabled.
+        """
+        current_state = [self.inducing_points] + list(self.base_kernel.parameters())
+        needs_grad = self.training and torch.is_grad_enabled() and any(tensor.requires_grad for tensor in current_state)
+        cache = getattr(self, "_inducing_inv_root_cache", None)
+        if cache is not None and not needs_grad:
+            state_values, res = cache
+            if len(state_values) == len(current_state) and all(
+                value.shape == tensor.shape and torch.equal(value, tensor.detach())
+                for value, tensor in zip(state_values, current_state)
+            ):
+                return res
+
+        chol = batch_potrf(add_jitter(self._inducing_mat))
+        res = batch_trtri(chol)
+        if not self.training:
+            res = res.detach()
+        if not res.requires_grad:
+            self._inducing_inv_root_cache = ([tensor.detach().clone() for tensor in current_state], res)
+        return res
 
     def _get_covariance(self, x1, x2):
+        inducing_inv_root = self._inducing_inv_root
         k_ux1 = self.base_kernel(x1, self.inducing_points).evaluate()
-        if torch.equal(x1, x2):
-            covar = RootLazyTensor(k_ux1.matmul(self._inducing_inv_root))
+        if _is_same_tensor(x1, x2):
+            if self.training:
+                covar = RootLazyTensor(k_ux1.matmul(inducing_inv_root))
+            else:
+                # The root is not multiplied out - so that predictions only need the rows of the test points
+                covar = RootLazyTensor(MatmulLazyTensor(k_ux1, inducing_inv_root))
         else:
             k_ux2 = self.base_kernel(x2, self.inducing_points).evaluate()
             covar = MatmulLazyTensor(
-                k_ux1.matmul(self._inducing_inv_root), k_ux2.matmul(self._inducing_inv_root).transpose(-1, -2)
+                k_ux1.matmul(inducing_inv_root), k_ux2.matmul(inducing_inv_root).transpose(-1, -2)
             )
         return covar
 
     def _covar_diag(self, inputs):
         if inputs.ndimension() == 1:
             inputs = inputs.unsqueeze(1)
+
+        # Stationary kernels have a constant diagonal
+        if self.base_kernel.is_stationary:
+            return DiagLazyTensor(self.base_kernel(inputs, diag=True))
+
         orig_size = list(inputs.size())
 
         # Resize inputs so that everything is batch
@@ -85,7 +102,7 @@ class InducingPointKernel(Kernel):
         covar = self._get_covariance(x1, x2)
 
         if self.training:
-            if not torch.equal(x1, x2):
+            if not _is_same_tensor(x1, x2):
                 raise RuntimeError("x1 should equal x2 in training mode")
             zero_mean = torch.zeros_like(x1.select(-1, 0))
             new_variational_strategy = MVNVariationalStrategy(
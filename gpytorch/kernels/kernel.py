@@ -4,9 +4,10 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 from abc import abstractmethod
+from collections import OrderedDict
 import torch
 from torch.nn import ModuleList
-from ..lazy import LazyEvaluatedKernelTensor, ZeroLazyTensor
+from ..lazy import LazyEvaluatedKernelTensor, NonLazyTensor, ZeroLazyTensor
 from ..module import Module
 from .. import settings
 
@@ -54,6 +55,11 @@ class Kernel(Module):
         You can set a prior on this parameter using the :attr:`log_lengthscale_prior` argument, but
         be sure that the prior has :attr:`log_transform=True` set.
 
+    .. note::
+
+        Kernel matrices can be cached between calls (see :meth:`enable_kernel_cache`). This is useful when the
+        kernel is repeatedly evaluated on the same inputs with fixed hyperparameters (e.g. when serving predictions).
+
     Base Args:
         :attr:`has_lengthscale` (bool):
             Set this if the kernel has a lengthscale. Default: `False`.
@@ -108,6 +114,9 @@ class Kernel(Module):
                 prior=log_lengthscale_prior,
             )
 
+        self._kernel_cache = None
+        self._kernel_cache_max_size = 0
+
     @property
     def has_lengthscale(self):
         return self.__has_lengthscale
@@ -140,6 +149,8 @@ class Kernel(Module):
 
             All non-compositional kernels should use the :meth:`gpytorch.kernels.Kernel._create_input_grid`
             method to create a meshgrid between x1 and x2 (if necessary).
+            Kernels that only depend on the (squared) Euclidean distance between x1 and x2 should use
+            :meth:`gpytorch.kernels.Kernel._covar_dist` instead, which never creates the meshgrid.
 
             Do not manually create the grid - this is inefficient and will cause erroneous behavior in certain
             evaluation modes.
@@ -167,6 +178,169 @@ class Kernel(Module):
         """
         raise NotImplementedError()
 
+    @property
+    def is_stationary(self):
+        r"""
+        Whether or not the kernel only depends on the difference between its inputs (i.e.
+        :math:`k(\mathbf{x_1}, \mathbf{x_2}) = k(\mathbf{x_1} - \mathbf{x_2})`).
+
+        The diagonal of a stationary kernel matrix :math:`K_{XX}` is constant.
+        Kernels that set this to `True` must implement :meth:`_stationary_diag_value`,
+        and their diagonals are computed without looking at the data.
+        """
+        return False
+
+    def _stationary_diag_value(self, x1):
+        r"""
+        The value of :math:`k(\mathbf{x}, \mathbf{x})` for a stationary kernel.
+
+        Args:
+            :attr:`x1` (Tensor `n x d` or `b x n x d`): the inputs (only used for their dtype/device)
+
+        Returns:
+            :class:`Tensor` with 1 element (or `b` elements for kernels with batch-specific hyperparameters)
+        """
+        return torch.ones(1, dtype=x1.dtype, device=x1.device)
+
+    def _can_forward_shared_dist(self):
+        """
+        Whether or not the kernel can be computed from the (squared) Euclidean distances between its unscaled
+        inputs, using :meth:`_forward_shared_dist`. This is usually the case for isotropic stationary kernels
+        (i.e. kernels without an ARD lengthscale).
+        """
+        return False
+
+    def _forward_shared_dist(self, dists):
+        """
+        Computes the kernel from the (squared) Euclidean distances between the unscaled inputs.
+
+        :class:`AdditiveKernel` and :class:`ProductKernel` use this method to evaluate all of their components
+        that operate on the same inputs together - so that the distances are only computed once.
+
+        Args:
+            :attr:`dists` (:obj:`_SharedDistances`): has the squared distances (:attr:`sq_dist`, `b x n x m`)
+                and the distances (:attr:`dist`, computed on first access). See :meth:`_covar_dist`.
+
+        Returns:
+            :class:`Tensor` (`b x n x m`)
+        """
+        raise NotImplementedError()
+
+    def _constant_diag(self, x1, x2, batch_dims=None):
+        """
+        Returns the diagonal of the kernel matrix as an expanded constant, if the kernel is stationary and x1 and x2
+        are the same inputs. Returns `None` otherwise.
+        """
+        if not self.is_stationary or not _is_same_tensor(x1, x2):
+            return None
+
+        value = self._stationary_diag_value(x1).view(-1)
+        is_batch = x1.ndimension() == 3
+        batch_size = x1.size(0) if is_batch else 1
+        if value.numel() != batch_size:
+            if value.numel() != 1:
+                # Let the forward method handle (or complain about) the batch size mismatch
+                return None
+            value = value.expand(batch_size)
+
+        if batch_dims == (0, 2):
+            value = value.unsqueeze(-1).expand(batch_size, x1.size(-1)).contiguous().view(-1)
+        res = value.unsqueeze(-1).expand(value.numel(), x1.size(-2))
+        if not is_batch and batch_dims != (0, 2):
+            res = res[0]
+        return res
+
+    def enable_kernel_cache(self, max_size=16):
+        """
+        Caches the outputs of this kernel (i.e. the evaluated kernel matrices and diagonals), so that they are not
+        recomputed when the kernel is called again on the same inputs with the same hyperparameters.
+
+        Entries are keyed by the identity (storage, size, stride) and the version counter of the input tensors,
+        and by the version counters of the kernel's parameters and buffers. (The parameter values are also checked,
+        since updates through `.data` do not change version counters.) The least recently used entries are
+        evicted once there are more than :attr:`max_size` of them.
+
+        Outputs are only cached if they do not require gradients - e.g. when the kernel is called inside
+        a :obj:`torch.no_grad` block, or when the hyperparameters are fixed.
+
+        Args:
+            :attr:`max_size` (int): the maximum number of cached kernel outputs. Default: `16`.
+
+        Returns:
+            :obj:`gpytorch.kernels.Kernel` (self)
+        """
+        if max_size < 1:
+            raise RuntimeError("max_size must be a positive integer. Got {}.".format(max_size))
+        self._kernel_cache = OrderedDict()
+        self._kernel_cache_max_size = max_size
+        return self
+
+    def disable_kernel_cache(self):
+        """
+        Disables (and clears) the cache created by :meth:`enable_kernel_cache`.
+
+        Returns:
+            :obj:`gpytorch.kernels.Kernel` (self)
+        """
+        self._kernel_cache = None
+        self._kernel_cache_max_size = 0
+        return self
+
+    def clear_kernel_cache(self):
+        """
+        Removes all entries from the cache created by :meth:`enable_kernel_cache`.
+        """
+        if getattr(self, "_kernel_cache", None) is not None:
+            self._kernel_cache.clear()
+
+    def _kernel_cache_key(self, x1, x2, diag, batch_dims, params):
+        try:
+            param_key = tuple(sorted(params.items()))
+            hash(param_key)
+        except TypeError:
+            return None
+
+        state = [tensor for tensor in list(self.parameters()) + list(self.buffers())]
+        return (
+            self.training,
+            diag,
+            batch_dims,
+            param_key,
+            _tensor_key(x1),
+            _tensor_key(x2),
+            tuple((id(tensor), tensor._version) for tensor in state),
+        )
+
+    def _cached_call(self, x1, x2, diag=False, batch_dims=None, **params):
+        """
+        Calls :meth:`forward` (through :func:`torch.nn.Module.__call__`).
+        The result is cached if :meth:`enable_kernel_cache` was called.
+        """
+        kernel_cache = getattr(self, "_kernel_cache", None)
+        key = None if kernel_cache is None else self._kernel_cache_key(x1, x2, diag, batch_dims, params)
+        if key is None:
+            return super(Kernel, self).__call__(x1, x2, diag=diag, batch_dims=batch_dims, **params)
+
+        entry = kernel_cache.pop(key, None)
+        if entry is not None:
+            _, _, state_values, res = entry
+            current_state = list(self.parameters()) + list(self.buffers())
+            if all(torch.equal(value, tensor.detach()) for value, tensor in zip(state_values, current_state)):
+                kernel_cache[key] = entry
+                return res
+
+        res = super(Kernel, self).__call__(x1, x2, diag=diag, batch_dims=batch_dims, **params)
+
+        # Results that are part of an autograd graph cannot be reused
+        representation = res.representation() if hasattr(res, "representation") else (res,)
+        if not any(tensor.requires_grad for tensor in representation):
+            state_values = [tensor.detach().clone() for tensor in list(self.parameters()) + list(self.buffers())]
+            # The inputs are stored as well - so that their memory cannot be reused by other tensors
+            kernel_cache[key] = (x1, x2, state_values, res)
+            while len(kernel_cache) > self._kernel_cache_max_size:
+                kernel_cache.popitem(last=False)
+        return res
+
     def _create_input_grid(self, x1, x2, diag=False, batch_dims=None, **params):
         """
         This is a helper method for creating a grid of the kernel's inputs.
@@ -204,6 +378,46 @@ class Kernel(Module):
         else:
             return x1_.unsqueeze(-2), x2_.unsqueeze(-3)
 
+    def _covar_dist(self, x1, x2, diag=False, batch_dims=None, square_dist=False, **params):
+        r"""
+        This is a helper method for computing the Euclidean distance between all pairs of points in x1 and x2.
+        It supports the same evaluation modes as :meth:`gpytorch.kernels.Kernel._create_input_grid`.
+
+        Rather than creating a meshgrid (a `n x m x d` tensor), squared distances are computed as
+        :math:`\|x_1\|^2 + \|x_2\|^2 - 2 x_1 x_2^\top` - a single matrix multiplication, whose backward pass is
+        also a matrix multiplication. The result is clamped to be non-negative. If x1 and x2 are the same, the
+        diagonal is set to exactly zero.
+
+        Args:
+            :attr:`x1` (Tensor `n x d` or `b x n x d`)
+            :attr:`x2` (Tensor `m x d` or `b x m x d`) - for diag mode, these must be the same inputs
+            :attr:`square_dist` (bool):
+                Should we return the squared distance (rather than the distance)? Default: `False`.
+
+        Returns:
+            :class:`Tensor` corresponding to the distance matrix between `x1` and `x2`.
+            The shape depends on the kernel's mode
+
+            * `full_covar`: `n x m` or `b x n x m`
+            * `full_covar` with `batch_dims=(0, 2)`: `k x n x m` or `b x k x n x m`
+            * `diag`: `n` or `b x n`
+            * `diag` with `batch_dims=(0, 2)`: `k x n` or `b x k x n`
+        """
+        x1_eq_x2 = _is_same_tensor(x1, x2)
+        x1_, x2_ = self._create_input_grid(x1, x2, diag=True, batch_dims=batch_dims)
+
+        if diag:
+            if x1_eq_x2:
+                return torch.zeros(x1_.shape[:-1], dtype=x1_.dtype, device=x1_.device)
+            res = (x1_ - x2_).pow(2).sum(-1)
+        else:
+            res = _sq_dist(x1_, x2_, x1_eq_x2)
+
+        if not square_dist:
+            # Clamping before the square root keeps its gradient finite
+            res = res.clamp(min=1e-30).sqrt()
+        return res
+
     def __call__(self, x1, x2=None, diag=False, batch_dims=None, **params):
         x1_, x2_ = x1, x2
 
@@ -211,7 +425,7 @@ class Kernel(Module):
         if self.active_dims is not None:
             x1_ = x1_.index_select(-1, self.active_dims)
             if x2_ is not None:
-                x2_ = x2_.index_select(-1, self.active_dims)
+                x2_ = x1_ if _is_same_tensor(x1, x2) else x2_.index_select(-1, self.active_dims)
 
         # Give x1_ and x2_ a last dimension, if necessary
         if x1_.ndimension() == 1:
@@ -234,7 +448,11 @@ class Kernel(Module):
                     )
 
         if diag:
-            res = super(Kernel, self).__call__(x1_, x2_, diag=True, batch_dims=batch_dims, **params)
+            res = self._constant_diag(x1_, x2_, batch_dims=batch_dims)
+            if res is not None:
+                return res
+
+            res = self._cached_call(x1_, x2_, diag=True, batch_dims=batch_dims, **params)
 
             # Did this Kernel eat the diag option?
             # If it does not return a LazyEvaluatedKernelTensor, we can call diag on the output
@@ -319,9 +537,22 @@ class AdditiveKernel(Kernel):
         super(AdditiveKernel, self).__init__()
         self.kernels = ModuleList(kernels)
 
+    @property
+    def is_stationary(self):
+        return all(kern.is_stationary for kern in self.kernels)
+
+    def _stationary_diag_value(self, x1):
+        res = self.kernels[0]._stationary_diag_value(x1).view(-1)
+        for kern in self.kernels[1:]:
+            res = res + kern._stationary_diag_value(x1).view(-1)
+        return res
+
     def forward(self, x1, x2, **params):
         res = ZeroLazyTensor()
-        for kern in self.kernels:
+        fused_res, kernels = _forward_fused_kernels(self, x1, x2, _add_kernel_matrices, **params)
+        if fused_res is not None:
+            res = NonLazyTensor(fused_res)
+        for kern in kernels:
             next_term = kern(x1, x2, **params)
             if isinstance(next_term, LazyEvaluatedKernelTensor):
                 next_term = next_term.evaluate_kernel()
@@ -343,11 +574,151 @@ class ProductKernel(Kernel):
         super(ProductKernel, self).__init__()
         self.kernels = ModuleList(kernels)
 
-    def forward(self, x1, x2, **params):
-        res = self.kernels[0](x1, x2, **params)
+    @property
+    def is_stationary(self):
+        return all(kern.is_stationary for kern in self.kernels)
+
+    def _stationary_diag_value(self, x1):
+        res = self.kernels[0]._stationary_diag_value(x1).view(-1)
         for kern in self.kernels[1:]:
+            res = res * kern._stationary_diag_value(x1).view(-1)
+        return res
+
+    def forward(self, x1, x2, **params):
+        fused_res, kernels = _forward_fused_kernels(self, x1, x2, _mul_kernel_matrices, **params)
+        res = NonLazyTensor(fused_res) if fused_res is not None else kernels.pop(0)(x1, x2, **params)
+        for kern in kernels:
             next_term = kern(x1, x2, **params)
             if isinstance(next_term, LazyEvaluatedKernelTensor):
                 next_term = next_term.evaluate_kernel()
             res = res * next_term
         return res
+
+
+class _SharedDistances(object):
+    def __init__(self, sq_dist):
+        self.sq_dist = sq_dist
+
+    @property
+    def dist(self):
+        if not hasattr(self, "_dist"):
+            # The same clamping as Kernel._covar_dist
+            self._dist = self.sq_dist.clamp(min=1e-30).sqrt()
+        return self._dist
+
+
+def _add_kernel_matrices(res, term):
+    # In-place accumulation is only possible outside of autograd
+    if res.requires_grad or term.requires_grad or res.shape != torch.broadcast_tensors(res, term)[0].shape:
+        return res + term
+    return res.add_(term)
+
+
+def _mul_kernel_matrices(res, term):
+    # In-place accumulation is only possible outside of autograd
+    if res.requires_grad or term.requires_grad or res.shape != torch.broadcast_tensors(res, term)[0].shape:
+        return res * term
+    return res.mul_(term)
+
+
+def _forward_fused_kernels(composite_kernel, x1, x2, combine, **params):
+    """
+    Evaluates the components of an additive or product kernel that can be computed from the same
+    distances (see :meth:`Kernel._forward_shared_dist`) together. Kernels are grouped by their active dimensions.
+    The distances of each group are computed once, and its kernel matrices are combined (in place, if possible).
+
+    Returns:
+        (:class:`Tensor`, list of :class:`Kernel`) - the combined kernel matrix of the fused kernels (or `None`),
+        and the kernels that have to be evaluated separately.
+    """
+    # Fusion is only done for full kernel matrices in the standard evaluation mode
+    if params.get("diag", False) or params.get("batch_dims", None) is not None or set(params) - {"diag", "batch_dims"}:
+        return None, list(composite_kernel.kernels)
+    # Fused kernel matrices are dense - large matrices are tiled instead (see settings.max_kernel_tile_size)
+    max_tile_size = settings.max_kernel_tile_size.value()
+    if max_tile_size is not None and x1.size(-2) * x2.size(-2) > max_tile_size:
+        return None, list(composite_kernel.kernels)
+
+    # Nested sums (or products) - e.g. from k1 + k2 + k3 - are fused as well
+    leaf_kernels = []
+    kernels = list(composite_kernel.kernels)
+    while len(kernels):
+        kern = kernels.pop(0)
+        if type(kern) is type(composite_kernel) and kern.active_dims is None:
+            kernels = list(kern.kernels) + kernels
+        else:
+            leaf_kernels.append(kern)
+
+    groups = OrderedDict()
+    remaining_kernels = []
+    for kern in leaf_kernels:
+        if kern._can_forward_shared_dist() and not _uses_fast_gauss_transform(kern, x1):
+            active_dims = None if kern.active_dims is None else tuple(kern.active_dims.tolist())
+            groups.setdefault(active_dims, []).append(kern)
+        else:
+            remaining_kernels.append(kern)
+
+    fused_res = None
+    for group in groups.values():
+        if len(group) == 1:
+            remaining_kernels.append(group[0])
+            continue
+
+        x1_, x2_ = x1, x2
+        if group[0].active_dims is not None:
+            x1_ = x1.index_select(-1, group[0].active_dims)
+            x2_ = x1_ if _is_same_tensor(x1, x2) else x2.index_select(-1, group[0].active_dims)
+        dists = _SharedDistances(group[0]._covar_dist(x1_, x2_, square_dist=True))
+
+        for kern in group:
+            term = kern._forward_shared_dist(dists)
+            fused_res = term if fused_res is None else combine(fused_res, term)
+
+    return fused_res, remaining_kernels
+
+
+def _uses_fast_gauss_transform(kernel, x1):
+    # Kernels whose matrices are computed with the fast Gauss transform (see LazyEvaluatedKernelTensor) are not fused
+    from ..lazy.fast_gauss_transform_lazy_tensor import FastGaussTransformLazyTensor
+
+    if settings.fast_gauss_transform_tolerance.value() is None:
+        return False
+    if kernel.active_dims is not None:
+        x1 = x1.narrow(-2, 0, 1).index_select(-1, kernel.active_dims)
+    return FastGaussTransformLazyTensor.supports_kernel(kernel, x1)
+
+
+def _is_same_tensor(tensor1, tensor2):
+    # A cheap (storage-based) check - unlike torch.equal, this does not scan the tensors
+    return tensor1 is tensor2 or (
+        tensor1.device == tensor2.device
+        and tensor1.data_ptr() == tensor2.data_ptr()
+        and tensor1.size() == tensor2.size()
+        and tensor1.stride() == tensor2.stride()
+    )
+
+
+def _tensor_key(tensor):
+    return (tensor.data_ptr(), str(tensor.device), tensor.dtype, tensor.size(), tensor.stride(), tensor._version)
+
+
+def _sq_dist(x1, x2, x1_eq_x2=False):
+    # Center the inputs - this reduces cancellation errors in ||x1||^2 + ||x2||^2 - 2 x1 x2^T
+    adjustment = x1.mean(-2, keepdim=True)
+    x1 = x1 - adjustment
+    x2 = x1 if x1_eq_x2 else x2 - adjustment
+
+    # Compute ||x1||^2 + ||x2||^2 - 2 x1 x2^T with one matmul, by augmenting the inputs
+    x1_norm = x1.pow(2).sum(dim=-1, keepdim=True)
+    x2_norm = x1_norm if x1_eq_x2 else x2.pow(2).sum(dim=-1, keepdim=True)
+    x1_pad = torch.ones_like(x1_norm)
+    x2_pad = x1_pad if x1_eq_x2 else torch.ones_like(x2_norm)
+    x1_ = torch.cat([x1.mul(-2), x1_norm, x1_pad], dim=-1)
+    x2_ = torch.cat([x2, x2_pad, x2_norm], dim=-1)
+    res = x1_.matmul(x2_.transpose(-2, -1))
+
+    # Rounding errors can make some (near-zero) entries negative
+    res = res.clamp(min=0)
+    if x1_eq_x2:
+        res.diagonal(dim1=-2, dim2=-1).fill_(0)
+    return res
@@ -0,0 +1,117 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+from .kernel import Kernel, _is_same_tensor
+from .rbf_kernel import RBFKernel
+from ..lazy import InterpolatedLazyTensor, LatticeBlurLazyTensor
+from ..utils.lattice import create_permutohedral_lattice, permutohedral_kernel_scale
+
+
+class LatticeInterpolationKernel(Kernel):
+    r"""
+    Approximates an RBF kernel with structured interpolation on a sparse *permutohedral lattice*, as proposed in
+    `Fast High-Dimensional Filtering Using the Permutohedral Lattice`_.
+
+    The (lengthscale-scaled) inputs are embedded in a lattice of simplices. The kernel matrix is approximated by
+
+    .. math::
+
+       \begin{equation*}
+          K_{X_1, X_2} \approx W_{X_1} B W_{X_2}^\top
+       \end{equation*}
+
+    where
+
+    * :math:`W_{X}` *splats* each input onto the `d + 1` vertices of its enclosing simplex (using its barycentric
+      coordinates),
+
+    * :math:`B` *blurs* the values on the lattice vertices with a small Gaussian-like filter, applied along each of
+      the `d + 1` lattice directions.
+
+    Only the lattice vertices that are touched by the data are stored, so there are at most `n (d + 1)` of them.
+    A matrix-vector multiplication costs `O(n d^2)` - linear in `n` and polynomial in `d` (unlike
+    :class:`~gpytorch.kernels.GridInterpolationKernel`, whose cost grows exponentially with `d`).
+    The result is an :class:`~gpytorch.lazy.InterpolatedLazyTensor`, so it works with CG/Lanczos based inference.
+
+    .. note::
+
+        The lattice is only an approximation of the RBF kernel, and it is best suited for moderate to high
+        dimensional problems (roughly `d > 4`) with many data points. The blur filter is slightly wider than the
+        Gaussian it approximates, and some (small) covariance between distant points is lost.
+        Consider decorating this kernel with a :class:`~gpytorch.kernels.ScaleKernel`, to learn the outputscale.
+
+    .. note::
+
+        The lattice is recomputed on every call (it depends on the lengthscale).
+        Batch mode is not supported.
+
+    Args:
+        :attr:`base_kernel` (RBFKernel):
+            The kernel to approximate. It supplies the :attr:`lengthscale` (which may use ARD).
+        :attr:`active_dims` (tuple of ints, optional):
+            Passed down to the `base_kernel`.
+
+    Example:
+        >>> covar_module = gpytorch.kernels.ScaleKernel(
+        >>>     gpytorch.kernels.LatticeInterpolationKernel(gpytorch.kernels.RBFKernel(ard_num_dims=8))
+        >>> )
+        >>> covar = covar_module(torch.randn(100000, 8))  # Output: LazyTensor of size (100000 x 100000)
+
+    .. _Fast High-Dimensional Filtering Using the Permutohedral Lattice:
+        http://graphics.stanford.edu/papers/permutohedral/
+    """
+
+    def __init__(self, base_kernel, active_dims=None):
+        if not isinstance(base_kernel, RBFKernel):
+            raise RuntimeError(
+                "LatticeInterpolationKernel can only approximate an RBFKernel. Got {}.".format(
+                    base_kernel.__class__.__name__
+                )
+            )
+        super(LatticeInterpolationKernel, self).__init__(active_dims=active_dims)
+        self.base_kernel = base_kernel
+
+    def _features(self, inputs):
+        if inputs.ndimension() == 3:
+            if inputs.size(0) > 1:
+                raise RuntimeError("LatticeInterpolationKernel does not support batch mode.")
+            inputs = inputs[0]
+        lengthscale = self.base_kernel.lengthscale
+        return inputs.div(lengthscale.view(-1, lengthscale.size(-1))[0])
+
+    def forward(self, x1, x2, batch_dims=None, diag=False, **params):
+        if batch_dims == (0, 2):
+            raise RuntimeError("LatticeInterpolationKernel does not accept the batch_dims argument.")
+
+        is_batch = x1.ndimension() == 3
+        if diag:
+            # The diagonal of the exact kernel
+            res = torch.ones(x1.size(-2), dtype=x1.dtype, device=x1.device)
+            return res.unsqueeze(0) if is_batch else res
+
+        same_inputs = _is_same_tensor(x1, x2)
+        features = self._features(x1)
+        if not same_inputs:
+            features = torch.cat([features, self._features(x2)])
+        vertices, barycentric, neighbors = create_permutohedral_lattice(features)
+
+        scale = torch.tensor(permutohedral_kernel_scale(features.size(-1)), dtype=x1.dtype, device=x1.device)
+        base_lazy_tsr = LatticeBlurLazyTensor(scale, neighbors)
+
+        num_left = x1.size(-2)
+        left_interp_indices = vertices[:num_left]
+        left_interp_values = barycentric[:num_left]
+        if same_inputs:
+            right_interp_indices = left_interp_indices
+            right_interp_values = left_interp_values
+        else:
+            right_interp_indices = vertices[num_left:]
+            right_interp_values = barycentric[num_left:]
+
+        res = InterpolatedLazyTensor(
+            base_lazy_tsr, left_interp_indices, left_interp_values, right_interp_indices, right_interp_values
+        )
+        return res
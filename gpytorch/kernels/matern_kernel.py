@@ -5,7 +5,7 @@ from __future__ import unicode_literals
 
 import math
 import torch
-from .kernel import Kernel
+from .kernel import Kernel, _is_same_tensor
 
 
 class MaternKernel(Kernel):
@@ -90,14 +90,25 @@ class MaternKernel(Kernel):
         )
         self.nu = nu
 
+    @property
+    def is_stationary(self):
+        return True
+
+    def _can_forward_shared_dist(self):
+        return self.lengthscale.size(-1) == 1
+
+    def _forward_shared_dist(self, dists):
+        return self._forward_dist(dists.dist.div(self.lengthscale))
+
     def forward(self, x1, x2, **params):
         mean = x1.contiguous().view(-1, 1, x1.size(-1)).mean(0, keepdim=True)
 
         x1_ = (x1 - mean).div(self.lengthscale)
-        x2_ = (x2 - mean).div(self.lengthscale)
-        x1_, x2_ = self._create_input_grid(x1_, x2_, **params)
+        x2_ = x1_ if _is_same_tensor(x1, x2) else (x2 - mean).div(self.lengthscale)
+        distance = self._covar_dist(x1_, x2_, **params)
+        return self._forward_dist(distance)
 
-        distance = (x1_ - x2_).norm(2, dim=-1)
+    def _forward_dist(self, distance):
         exp_component = torch.exp(-math.sqrt(self.nu * 2) * distance)
 
         if self.nu == 0.5:
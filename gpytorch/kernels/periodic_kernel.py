@@ -87,6 +87,10 @@ class PeriodicKernel(Kernel):
             prior=log_period_length_prior,
         )
 
+    @property
+    def is_stationary(self):
+        return True
+
     @property
     def period_length(self):
         return self.log_period_length.exp().clamp(self.eps, 1e5)
@@ -3,7 +3,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-from .kernel import Kernel
+from .kernel import Kernel, _is_same_tensor
 
 
 class RBFKernel(Kernel):
@@ -75,10 +75,18 @@ class RBFKernel(Kernel):
             eps=eps,
         )
 
+    @property
+    def is_stationary(self):
+        return True
+
+    def _can_forward_shared_dist(self):
+        return self.lengthscale.size(-1) == 1
+
+    def _forward_shared_dist(self, dists):
+        return dists.sq_dist.div(self.lengthscale.pow(2)).div_(-2).exp_()
+
     def forward(self, x1, x2, **params):
         x1_ = x1.div(self.lengthscale)
-        x2_ = x2.div(self.lengthscale)
-        x1_, x2_ = self._create_input_grid(x1_, x2_, **params)
-
-        diff = (x1_ - x2_).norm(2, dim=-1)
-        return diff.pow(2).div_(-2).exp_()
+        x2_ = x1_ if _is_same_tensor(x1, x2) else x2.div(self.lengthscale)
+        diff = self._covar_dist(x1_, x2_, square_dist=True, **params)
+        return diff.div_(-2).exp_()
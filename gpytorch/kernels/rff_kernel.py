@@ -0,0 +1,205 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import torch
+from .kernel import Kernel, _is_same_tensor
+from .matern_kernel import MaternKernel
+from .rbf_kernel import RBFKernel
+from .spectral_mixture_kernel import SpectralMixtureKernel
+from ..lazy import MatmulLazyTensor, RootLazyTensor
+
+
+class RFFKernel(Kernel):
+    r"""
+    Approximates a stationary kernel with random Fourier features (`Random Features for Large-Scale Kernel
+    Machines`_). By Bochner's theorem, a stationary kernel is the Fourier transform of its spectral density
+    :math:`p(\omega)`. The kernel is approximated with :math:`D` frequencies :math:`\omega_i \sim p(\omega)`:
+
+    .. math::
+
+       \begin{equation*}
+          k(\mathbf{x_1}, \mathbf{x_2}) \approx \mathbf{z}(\mathbf{x_1})^\top \mathbf{z}(\mathbf{x_2}), \qquad
+          \mathbf{z}(\mathbf{x}) = \sqrt{\frac{1}{D}} \left[ \cos(\omega_1^\top \mathbf{x}), \ldots,
+          \cos(\omega_D^\top \mathbf{x}), \sin(\omega_1^\top \mathbf{x}), \ldots, \sin(\omega_D^\top \mathbf{x})
+          \right]
+       \end{equation*}
+
+    The spectral densities of :class:`~gpytorch.kernels.RBFKernel` (a Gaussian),
+    :class:`~gpytorch.kernels.MaternKernel` (a multivariate Student-t with :math:`2 \nu` degrees of freedom), and
+    :class:`~gpytorch.kernels.SpectralMixtureKernel` (a mixture of Gaussians - :attr:`num_samples` frequencies
+    are drawn for each mixture component) are supported.
+
+    The kernel matrix :math:`\mathbf{K}_{XX}` is returned as a :obj:`gpytorch.lazy.RootLazyTensor` of the
+    `n x 2D` feature matrix (`n x 2kD` for a spectral mixture kernel with `k` mixtures). Linear solves and log
+    determinants with this matrix plus a diagonal (e.g. the likelihood noise) use the Woodbury formula, which
+    costs :math:`O(nD^2)` rather than :math:`O(n^2)` per iteration.
+
+    The random draws are standardized (e.g. :math:`\epsilon \sim \mathcal{N}(0, I)`, and
+    :math:`\omega = \epsilon / \ell` for the RBF kernel) so that the hyperparameters of the base kernel receive
+    gradients. They are stored as buffers, and are only redrawn when :meth:`resample` is called.
+
+    .. note::
+
+        This kernel does not have an `outputscale` parameter. To add a scaling parameter,
+        decorate this kernel with a :class:`gpytorch.kernels.ScaleKernel`.
+
+    Args:
+        :attr:`base_kernel` (Kernel):
+            The kernel to approximate. Either a :class:`~gpytorch.kernels.RBFKernel`,
+            :class:`~gpytorch.kernels.MaternKernel`, or :class:`~gpytorch.kernels.SpectralMixtureKernel`.
+        :attr:`num_samples` (int):
+            The number of random frequencies :math:`D` (per mixture component).
+        :attr:`num_dims` (int, optional):
+            The dimension of the input data. If this is not supplied, the frequencies are drawn the first
+            time that the kernel is called. Default: `None`.
+        :attr:`active_dims` (tuple of ints, optional):
+            Set this if you want to compute the covariance of only a few input dimensions. Default: `None`.
+
+    Example:
+        >>> x = torch.randn(1000, 5)
+        >>> covar_module = gpytorch.kernels.ScaleKernel(
+        >>>     gpytorch.kernels.RFFKernel(gpytorch.kernels.RBFKernel(), num_samples=100)
+        >>> )
+        >>> covar = covar_module(x)  # Output: LazyTensor of size (1000 x 1000), with a rank 200 root
+        >>> covar_module.base_kernel.resample()  # Draw new frequencies
+
+    .. _Random Features for Large-Scale Kernel Machines:
+        https://people.eecs.berkeley.edu/~brecht/papers/07.rah.rec.nips.pdf
+    """
+
+    def __init__(self, base_kernel, num_samples, num_dims=None, active_dims=None):
+        if not isinstance(base_kernel, (RBFKernel, MaternKernel, SpectralMixtureKernel)):
+            raise RuntimeError(
+                "RFFKernel expects an RBFKernel, MaternKernel, or SpectralMixtureKernel. "
+                "Got a {}.".format(base_kernel.__class__.__name__)
+            )
+        if base_kernel.active_dims is not None:
+            raise RuntimeError("The active_dims of an RFFKernel should be set on the RFFKernel, not the base_kernel.")
+
+        super(RFFKernel, self).__init__(active_dims=active_dims)
+        self.base_kernel = base_kernel
+        self.num_samples = num_samples
+        self.register_buffer("randn_weights", torch.tensor([]))
+        self.register_buffer("chi2_weights", torch.tensor([]))
+        self.register_buffer("sign_weights", torch.tensor([]))
+        if num_dims is not None:
+            self.resample(num_dims)
+
+    @property
+    def num_mixtures(self):
+        if isinstance(self.base_kernel, SpectralMixtureKernel):
+            return self.base_kernel.num_mixtures
+        return 1
+
+    @property
+    def is_stationary(self):
+        return True
+
+    def _stationary_diag_value(self, x1):
+        # cos^2 + sin^2 = 1, so the diagonal of the approximation is exactly the diagonal of the base kernel
+        return self.base_kernel._stationary_diag_value(x1)
+
+    def resample(self, num_dims=None):
+        """
+        Draws new random frequencies.
+
+        Args:
+            :attr:`num_dims` (int, optional):
+                The dimension of the input data. Defaults to the dimension of the current frequencies.
+
+        Returns:
+            :obj:`gpytorch.kernels.RFFKernel`: self
+        """
+        if num_dims is None:
+            if not self.randn_weights.numel():
+                raise RuntimeError("num_dims must be supplied the first time that the frequencies are drawn.")
+            num_dims = self.randn_weights.size(-2)
+
+        shape = (self.num_mixtures, num_dims, self.num_samples)
+        randn_weights = torch.randn(*shape, dtype=self.randn_weights.dtype, device=self.randn_weights.device)
+        self.randn_weights = randn_weights
+
+        if isinstance(self.base_kernel, MaternKernel):
+            # Chi-squared samples with 2 * nu (an integer) degrees of freedom
+            chi2_weights = torch.randn(int(2 * self.base_kernel.nu), self.num_samples, dtype=randn_weights.dtype)
+            self.chi2_weights = chi2_weights.pow(2).sum(0).to(randn_weights.device)
+
+        elif isinstance(self.base_kernel, SpectralMixtureKernel):
+            # A product of cosines (over dimensions) is an average of cosines with randomly flipped means
+            sign_weights = torch.empty_like(randn_weights).bernoulli_(0.5)
+            self.sign_weights = sign_weights.mul_(2).sub_(1)
+
+        return self
+
+    def _frequencies(self):
+        # Returns the frequencies ((b x) k x d x D) and the weight of each mixture component ((b x) k)
+        if isinstance(self.base_kernel, SpectralMixtureKernel):
+            mixture_means = self.base_kernel.mixture_means.transpose(-1, -2)
+            mixture_scales = self.base_kernel.mixture_scales.transpose(-1, -2)
+            frequencies = (self.sign_weights * mixture_means).add_(mixture_scales * self.randn_weights)
+            return frequencies.mul_(2 * math.pi), self.base_kernel.mixture_weights
+
+        lengthscale = self.base_kernel.lengthscale.transpose(-1, -2).unsqueeze(-3)
+        frequencies = self.randn_weights.div(lengthscale)
+        if isinstance(self.base_kernel, MaternKernel):
+            frequencies = frequencies.mul_(self.chi2_weights.reciprocal().mul(2 * self.base_kernel.nu).sqrt())
+        return frequencies, torch.ones(1, 1, dtype=frequencies.dtype, device=frequencies.device)
+
+    def _featurize(self, x, frequencies, weights):
+        # x (b x n x d) -> features (b x n x 2kD)
+        projections = x.unsqueeze(-3).matmul(frequencies)
+        features = torch.cat([projections.cos(), projections.sin()], -1)
+        features = features.mul_(weights.div(self.num_samples).sqrt().unsqueeze(-1).unsqueeze(-1))
+        features = features.transpose(-3, -2).contiguous()
+        return features.view(*features.shape[:-2], -1)
+
+    def _check_frequencies(self, x):
+        num_dims = x.size(-1)
+        if not self.randn_weights.numel():
+            self.randn_weights = self.randn_weights.to(dtype=x.dtype, device=x.device)
+            self.resample(num_dims)
+        elif self.randn_weights.size(-2) != num_dims:
+            raise RuntimeError(
+                "The RFFKernel frequencies were drawn for {}-dimensional inputs. Got {}-dimensional inputs. "
+                "Call resample(num_dims) to draw new frequencies.".format(self.randn_weights.size(-2), num_dims)
+            )
+
+    def features(self, x):
+        r"""
+        Returns the random Fourier features :math:`\mathbf{z}(\mathbf{x})` of the inputs - so that the kernel
+        matrix is approximated by :math:`\mathbf{Z}_{X_1} \mathbf{Z}_{X_2}^\top`.
+
+        Args:
+            :attr:`x` (Tensor `n x d` or `b x n x d`): the inputs
+
+        Returns:
+            Tensor `n x 2kD` (or `b x n x 2kD`): the features
+        """
+        if self.active_dims is not None:
+            x = x.index_select(-1, self.active_dims)
+        self._check_frequencies(x)
+        frequencies, weights = self._frequencies()
+        if x.dim() == 2:
+            return self._featurize(x.unsqueeze(0), frequencies, weights)[0]
+        return self._featurize(x, frequencies, weights)
+
+    def forward(self, x1, x2, diag=False, batch_dims=None, **params):
+        if batch_dims == (0, 2):
+            raise RuntimeError("RFFKernel does not accept the batch_dims argument.")
+
+        self._check_frequencies(x1)
+        frequencies, weights = self._frequencies()
+        z1 = self._featurize(x1, frequencies, weights)
+        if _is_same_tensor(x1, x2):
+            z2 = z1
+        else:
+            z2 = self._featurize(x2, frequencies, weights)
+
+        if diag:
+            return (z1 * z2).sum(-1)
+        if z1 is z2:
+            return RootLazyTensor(z1)
+        return MatmulLazyTensor(z1, z2.transpose(-1, -2))
@@ -57,6 +57,19 @@ class ScaleKernel(Kernel):
     def outputscale(self):
         return self.log_outputscale.exp()
 
+    @property
+    def is_stationary(self):
+        return self.base_kernel.is_stationary
+
+    def _stationary_diag_value(self, x1):
+        return self.outputscale.view(-1) * self.base_kernel._stationary_diag_value(x1).view(-1)
+
+    def _can_forward_shared_dist(self):
+        return self.base_kernel.active_dims is None and self.base_kernel._can_forward_shared_dist()
+
+    def _forward_shared_dist(self, dists):
+        return self.base_kernel._forward_shared_dist(dists).mul(self.outputscale.view(-1, 1, 1))
+
     def forward(self, x1, x2, batch_dims=None, **params):
         outputscales = self.log_outputscale.exp()
         if batch_dims == (0, 2) and outputscales.numel() > 1:
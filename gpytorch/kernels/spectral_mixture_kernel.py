@@ -7,6 +7,7 @@ import logging
 import math
 import torch
 from .kernel import Kernel
+from ..functions._spectral_mixture import SpectralMixtureCovar
 
 logger = logging.getLogger()
 
@@ -118,6 +119,14 @@ class SpectralMixtureKernel(Kernel):
     def mixture_weights(self):
         return self.log_mixture_weights.exp().clamp(self.eps, 1e5)
 
+    @property
+    def is_stationary(self):
+        return True
+
+    def _stationary_diag_value(self, x1):
+        # Every mixture component is 1 at x1 = x2
+        return self.mixture_weights.sum(-1)
+
     def initialize_from_data(self, train_x, train_y, **kwargs):
         if not torch.is_tensor(train_x) or not torch.is_tensor(train_y):
             raise RuntimeError("train_x and train_y should be tensors")
@@ -133,12 +142,14 @@ class SpectralMixtureKernel(Kernel):
         for ind in range(self.ard_num_dims):
             min_dist[:, ind] = min_dist_sort[(torch.nonzero(min_dist_sort[:, ind]))[0], ind]
 
-        # Inverse of lengthscales should be drawn from truncated Gaussian | N(0, max_dist^2) |
-        self.log_mixture_scales.data.normal_().mul_(max_dist).abs_().pow_(-1).log_()
-        # Draw means from Unif(0, 0.5 / minimum distance between two points)
-        self.log_mixture_means.data.uniform_().mul_(0.5).div_(min_dist).log_()
-        # Mixture weights should be roughly the stdv of the y values divided by the number of mixtures
-        self.log_mixture_weights.data.fill_(train_y.std() / self.num_mixtures).log_()
+        # (The parameters are updated in place, rather than through .data, so that their version counters change)
+        with torch.no_grad():
+            # Inverse of lengthscales should be drawn from truncated Gaussian | N(0, max_dist^2) |
+            self.log_mixture_scales.normal_().mul_(max_dist).abs_().pow_(-1).log_()
+            # Draw means from Unif(0, 0.5 / minimum distance between two points)
+            self.log_mixture_means.uniform_().mul_(0.5).div_(min_dist).log_()
+            # Mixture weights should be roughly the stdv of the y values divided by the number of mixtures
+            self.log_mixture_weights.fill_(train_y.std() / self.num_mixtures).log_()
 
     def forward(self, x1, x2, **params):
         batch_size, n, num_dims = x1.size()
@@ -155,6 +166,13 @@ class SpectralMixtureKernel(Kernel):
                 "(based on the batch_size argument). Got {}.".format(self.batch_size, batch_size)
             )
 
+        # Full kernel matrices are computed one mixture (and one dimension) at a time
+        if not params.get("diag", False) and params.get("batch_dims", None) is None:
+            batch_size = self.mixture_weights.size(0)
+            mixture_means = self.mixture_means.view(batch_size, self.num_mixtures, num_dims)
+            mixture_scales = self.mixture_scales.view(batch_size, self.num_mixtures, num_dims)
+            return SpectralMixtureCovar()(x1, x2, self.mixture_weights, mixture_means, mixture_scales)
+
         # Expand x1 and x2 to account for the number of mixtures
         # Should make x1/x2 (b x k x n x d) for k mixtures
         x1_ = x1.unsqueeze(1)
@@ -0,0 +1,126 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+from .kernel import Kernel
+from ..lazy import SparseLazyTensor
+from ..utils.sparse import radius_neighbors
+
+
+class WendlandKernel(Kernel):
+    r"""
+    Computes a covariance matrix based on the (compactly supported) Wendland kernel
+    between inputs :math:`\mathbf{x_1}` and :math:`\mathbf{x_2}`:
+
+    .. math::
+
+       \begin{equation*}
+          k_{\text{Wendland}}(\mathbf{x_1}, \mathbf{x_2}) = \phi_{l, q}(r), \qquad
+          r = \left\Vert \Theta^{-1} (\mathbf{x_1} - \mathbf{x_2}) \right\Vert
+       \end{equation*}
+
+    where :math:`\phi_{l, q}` is a polynomial on :math:`[0, 1]` that is zero for :math:`r \geq 1`:
+
+    * :math:`q = 0`: :math:`\phi(r) = (1 - r)_+^l`
+    * :math:`q = 1`: :math:`\phi(r) = (1 - r)_+^{l + 1} \left( (l + 1) r + 1 \right)`
+    * :math:`q = 2`: :math:`\phi(r) = (1 - r)_+^{l + 2} \left( (l^2 + 4l + 3) r^2 + (3l + 6) r + 3 \right) / 3`
+
+    and :math:`l = \lfloor d / 2 \rfloor + q + 1` for :math:`d`-dimensional inputs (which makes the kernel positive
+    definite). The kernel is :math:`2q` times differentiable. The :attr:`lengthscale` :math:`\Theta` is the
+    support radius: points that are further apart than one lengthscale are uncorrelated.
+
+    The kernel matrix is returned as a :obj:`gpytorch.lazy.SparseLazyTensor`. The nonzero entries are found with a
+    grid-based neighbor search (see :func:`gpytorch.utils.sparse.radius_neighbors`) - so the memory and time
+    requirements are linear in the number of nonzero entries, rather than quadratic in the number of data points.
+    This is most effective for low-dimensional inputs (e.g. spatial data) and short lengthscales.
+
+    .. note::
+
+        This kernel does not have an `outputscale` parameter. To add a scaling parameter,
+        decorate this kernel with a :class:`gpytorch.kernels.ScaleKernel`.
+
+    Args:
+        :attr:`q` (int):
+            The smoothness parameter: either 0, 1, or 2. Default: `1`.
+        :attr:`ard_num_dims` (int, optional):
+            Set this if you want a separate lengthscale for each
+            input dimension. It should be `d` if :attr:`x1` is a `n x d` matrix. Default: `None`
+        :attr:`batch_size` (int, optional):
+            Set this if you want a separate lengthscale for each
+            batch of input data. It should be `b` if :attr:`x1` is a `b x n x d` tensor. Default: `1`
+        :attr:`active_dims` (tuple of ints, optional):
+            Set this if you want to
+            compute the covariance of only a few input dimensions. The ints
+            corresponds to the indices of the dimensions. Default: `None`.
+        :attr:`log_lengthscale_prior` (Prior, optional):
+            Set this if you want
+            to apply a prior to the lengthscale parameter.  Default: `None`
+        :attr:`eps` (float):
+            The minimum value that the lengthscale can take
+            (prevents divide by zero errors). Default: `1e-6`.
+
+    Attributes:
+        :attr:`lengthscale` (Tensor):
+            The lengthscale parameter. Size/shape of parameter depends on the
+            :attr:`ard_num_dims` and :attr:`batch_size` arguments.
+
+    Example:
+        >>> x = torch.rand(100000, 2)
+        >>> covar_module = gpytorch.kernels.ScaleKernel(gpytorch.kernels.WendlandKernel(q=1))
+        >>> covar_module.base_kernel.initialize(log_lengthscale=math.log(0.01))
+        >>> covar = covar_module(x)  # Output: LazyTensor of size (100000 x 100000), with ~300 nonzeros per row
+    """
+
+    def __init__(self, q=1, ard_num_dims=None, batch_size=1, active_dims=None, log_lengthscale_prior=None, eps=1e-6):
+        if q not in {0, 1, 2}:
+            raise RuntimeError("q expected to be 0, 1, or 2")
+        super(WendlandKernel, self).__init__(
+            has_lengthscale=True,
+            ard_num_dims=ard_num_dims,
+            batch_size=batch_size,
+            active_dims=active_dims,
+            log_lengthscale_prior=log_lengthscale_prior,
+            eps=eps,
+        )
+        self.q = q
+
+    @property
+    def is_stationary(self):
+        return True
+
+    def _forward_dist(self, distance, num_dims):
+        exponent = num_dims // 2 + self.q + 1
+        one_minus_dist = (1 - distance).clamp(min=0)
+        if self.q == 0:
+            return one_minus_dist.pow(exponent)
+        elif self.q == 1:
+            return one_minus_dist.pow(exponent + 1) * distance.mul(exponent + 1).add(1)
+        else:
+            polynomial = distance.pow(2).mul(exponent ** 2 + 4 * exponent + 3).add(distance.mul(3 * exponent + 6))
+            return one_minus_dist.pow(exponent + 2) * polynomial.add(3).div(3)
+
+    def forward(self, x1, x2, diag=False, batch_dims=None, **params):
+        if batch_dims == (0, 2):
+            raise RuntimeError("WendlandKernel does not accept the batch_dims argument.")
+
+        num_dims = x1.size(-1)
+        x1_ = x1.div(self.lengthscale)
+        x2_ = x2.div(self.lengthscale)
+        if diag:
+            distance = (x1_ - x2_).pow(2).sum(-1).clamp(min=1e-30).sqrt()
+            return self._forward_dist(distance, num_dims)
+
+        # Only compute the kernel for pairs of points that are within the support
+        indices = []
+        for i in range(x1_.size(0)):
+            batch_indices = radius_neighbors(x1_[i], x2_[i], radius=1.)
+            batch_indices = torch.cat([torch.full_like(batch_indices[:1], i), batch_indices], 0)
+            indices.append(batch_indices)
+        indices = torch.cat(indices, -1)
+
+        diff = x1_[indices[0], indices[1]] - x2_[indices[0], indices[2]]
+        distance = diff.pow(2).sum(-1).clamp(min=1e-30).sqrt()
+        values = self._forward_dist(distance, num_dims)
+        return SparseLazyTensor(indices, values, sparse_size=torch.Size((x1_.size(0), x1_.size(-2), x2_.size(-2))))
@@ -11,16 +11,20 @@ from .block_diag_lazy_tensor import BlockDiagLazyTensor
 from .chol_lazy_tensor import CholLazyTensor
 from .constant_mul_lazy_tensor import ConstantMulLazyTensor
 from .diag_lazy_tensor import DiagLazyTensor
+from .fast_gauss_transform_lazy_tensor import FastGaussTransformLazyTensor
 from .interpolated_lazy_tensor import InterpolatedLazyTensor
 from .kronecker_product_lazy_tensor import KroneckerProductLazyTensor
+from .lattice_blur_lazy_tensor import LatticeBlurLazyTensor
 from .lazy_evaluated_kernel_tensor import LazyEvaluatedKernelTensor
 from .matmul_lazy_tensor import MatmulLazyTensor
 from .mul_lazy_tensor import MulLazyTensor
 from .non_lazy_tensor import NonLazyTensor
 from .psd_sum_lazy_tensor import PsdSumLazyTensor
 from .root_lazy_tensor import RootLazyTensor
+from .sparse_lazy_tensor import SparseLazyTensor
 from .sum_lazy_tensor import SumLazyTensor
 from .sum_batch_lazy_tensor import SumBatchLazyTensor
+from .tiled_kernel_lazy_tensor import TiledKernelLazyTensor
 from .toeplitz_lazy_tensor import ToeplitzLazyTensor
 from .zero_lazy_tensor import ZeroLazyTensor
 
@@ -35,15 +39,19 @@ __all__ = [
     "CholLazyTensor",
     "ConstantMulLazyTensor",
     "DiagLazyTensor",
+    "FastGaussTransformLazyTensor",
     "InterpolatedLazyTensor",
     "KroneckerProductLazyTensor",
+    "LatticeBlurLazyTensor",
     "MatmulLazyTensor",
     "MulLazyTensor",
     "NonLazyTensor",
     "PsdSumLazyTensor",
     "RootLazyTensor",
+    "SparseLazyTensor",
     "SumLazyTensor",
     "SumBatchLazyTensor",
+    "TiledKernelLazyTensor",
     "ToeplitzLazyTensor",
     "ZeroLazyTensor",
 ]
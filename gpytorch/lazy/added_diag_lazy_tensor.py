@@ -4,11 +4,14 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import torch
+from .constant_mul_lazy_tensor import ConstantMulLazyTensor
+from .lazy_evaluated_kernel_tensor import LazyEvaluatedKernelTensor
 from .non_lazy_tensor import NonLazyTensor
+from .root_lazy_tensor import RootLazyTensor
 from .sum_lazy_tensor import SumLazyTensor
 from .diag_lazy_tensor import DiagLazyTensor
 from ..utils import pivoted_cholesky
-from ..utils.cholesky import batch_potrf
+from ..utils.cholesky import batch_potrf, batch_potrs
 from .. import settings
 
 
@@ -16,6 +19,10 @@ class AddedDiagLazyTensor(SumLazyTensor):
     """
     A SumLazyTensor, but of only two lazy tensors, the second of which must be
     a DiagLazyTensor.
+
+    If the first lazy tensor is a low-rank :obj:`gpytorch.lazy.RootLazyTensor` :math:`VV^\\top` (possibly
+    multiplied by a positive constant) - e.g. the output of :class:`gpytorch.kernels.RFFKernel` - then
+    :meth:`inv_matmul` and :meth:`inv_quad_log_det` are computed exactly with the Woodbury formula.
     """
 
     def __init__(self, *lazy_tensors):
@@ -38,13 +45,100 @@ class AddedDiagLazyTensor(SumLazyTensor):
     def add_diag(self, added_diag):
         return AddedDiagLazyTensor(self._lazy_tensor, self._diag_tensor.add_diag(added_diag))
 
+    def _low_rank_root(self):
+        """
+        Returns the root :math:`V` (`(b x) n x k`, with `k < n`) if the non-diagonal component is
+        :math:`VV^\\top`. Otherwise returns None.
+        """
+        if not hasattr(self, "_low_rank_root_memo"):
+            lazy_tensor = self._lazy_tensor
+            if isinstance(lazy_tensor, LazyEvaluatedKernelTensor):
+                lazy_tensor = lazy_tensor.evaluate_kernel()
+            constant = None
+            if isinstance(lazy_tensor, ConstantMulLazyTensor):
+                constant = lazy_tensor.constant
+                lazy_tensor = lazy_tensor.base_lazy_tensor
+                if isinstance(lazy_tensor, LazyEvaluatedKernelTensor):
+                    lazy_tensor = lazy_tensor.evaluate_kernel()
+
+            root = None
+            if isinstance(lazy_tensor, RootLazyTensor) and lazy_tensor.root_decomposition_size() < self.size(-1):
+                if constant is None:
+                    root = lazy_tensor.root.evaluate()
+                elif torch.all(constant > 0):
+                    root = lazy_tensor.root.evaluate() * constant.sqrt().view(*constant.shape, 1, 1)
+            self._low_rank_root_memo = root
+        return self._low_rank_root_memo
+
+    def _woodbury_factors(self, root):
+        # The Cholesky factor of I + V^T D^{-1} V
+        shift = self._diag_tensor.diag()
+        inner_mat = root.transpose(-1, -2).matmul(root / shift.unsqueeze(-1))
+        inner_mat = inner_mat + torch.eye(inner_mat.size(-1), dtype=inner_mat.dtype, device=inner_mat.device)
+        return batch_potrf(inner_mat)
+
+    def _woodbury_solve(self, tensor, root, inner_chol):
+        # (D + VV^T)^{-1} M = D^{-1} M - D^{-1} V (I + V^T D^{-1} V)^{-1} V^T D^{-1} M
+        # Only k x k systems are solved, so the cost is O(nkt) for t right hand sides.
+        is_vector = tensor.dim() == 1
+        if is_vector:
+            tensor = tensor.unsqueeze(-1)
+        shift = self._diag_tensor.diag().unsqueeze(-1)
+
+        def solve(rhs):
+            rhs = rhs / shift
+            return rhs - root.matmul(batch_potrs(root.transpose(-1, -2).matmul(rhs), inner_chol)) / shift
+
+        # The Woodbury formula subtracts two large terms when the diagonal is small - so the solve is followed by a
+        # step of iterative refinement (which only needs a O(nkt) matrix multiplication with D + VV^T)
+        res = solve(tensor)
+        residual = tensor - root.matmul(root.transpose(-1, -2).matmul(res)) - shift * res
+        res = res + solve(residual)
+        if is_vector:
+            res = res.squeeze(-1)
+        return res
+
+    def inv_matmul(self, tensor):
+        root = self._low_rank_root()
+        if root is None:
+            return super(AddedDiagLazyTensor, self).inv_matmul(tensor)
+
+        return self._woodbury_solve(tensor, root, self._woodbury_factors(root))
+
+    def inv_quad_log_det(self, inv_quad_rhs=None, log_det=False, reduce_inv_quad=True):
+        root = self._low_rank_root()
+        if root is None:
+            return super(AddedDiagLazyTensor, self).inv_quad_log_det(
+                inv_quad_rhs=inv_quad_rhs, log_det=log_det, reduce_inv_quad=reduce_inv_quad
+            )
+
+        shift = self._diag_tensor.diag()
+        inner_chol = self._woodbury_factors(root)
+        inv_quad_term = torch.empty(0, dtype=self.dtype, device=self.device)
+        log_det_term = torch.empty(0, dtype=self.dtype, device=self.device)
+
+        if inv_quad_rhs is not None:
+            if inv_quad_rhs.dim() == 1:
+                inv_quad_rhs = inv_quad_rhs.unsqueeze(-1)
+            solves = self._woodbury_solve(inv_quad_rhs, root, inner_chol)
+            inv_quad_term = (solves * inv_quad_rhs).sum(-2)
+            if reduce_inv_quad:
+                inv_quad_term = inv_quad_term.sum(-1)
+
+        if log_det:
+            # Matrix determinant lemma: log |D + VV^T| = log |I + V^T D^{-1} V| + log |D|
+            inner_diag = torch.diagonal(inner_chol, dim1=-2, dim2=-1)
+            log_det_term = inner_diag.log().sum(-1).mul(2) + shift.log().sum(-1)
+
+        return inv_quad_term, log_det_term
+
     def _preconditioner(self):
         if settings.max_preconditioner_size.value() == 0:
             return None, None
 
         if not hasattr(self, "_woodbury_cache"):
             max_iter = settings.max_preconditioner_size.value()
-            self._piv_chol_self = pivoted_cholesky.pivoted_cholesky(self._lazy_tensor, max_iter)
+            self._piv_chol_self = self._lazy_tensor._preconditioner_root(max_iter)
             self._woodbury_cache = pivoted_cholesky.woodbury_factor(self._piv_chol_self, self._diag_tensor.diag())
 
         # preconditioner
@@ -106,6 +106,14 @@ class ConstantMulLazyTensor(LazyTensor):
         res.append(constant_deriv)
         return res
 
+    def _circulant_eigenvalues(self):
+        res = self.base_lazy_tensor._circulant_eigenvalues()
+        if res is None:
+            return None
+        if self.constant.numel() == 1:
+            return res * self.constant
+        return res * self.constant.view(-1, *([1] * (res.dim() - 1)))
+
     def _constant_as(self, other):
         size = [self.constant.numel()] + [1] * (other.ndimension() - 1)
         constant = self.constant.view(*size)
@@ -115,6 +123,22 @@ class ConstantMulLazyTensor(LazyTensor):
 
         return constant
 
+    def _exact_predictive_covar_inv_quad_form_cache(self, train_train_covar_inv_root, test_train_covar):
+        # The constant is applied to the root (so that the cache keeps the structure of the base lazy tensor)
+        return self.base_lazy_tensor._exact_predictive_covar_inv_quad_form_cache(
+            train_train_covar_inv_root, test_train_covar.base_lazy_tensor
+        )
+
+    def _exact_predictive_covar_inv_quad_form_root(self, precomputed_cache, test_train_covar):
+        res = self.base_lazy_tensor._exact_predictive_covar_inv_quad_form_root(
+            precomputed_cache, test_train_covar.base_lazy_tensor
+        )
+        return res * self._constant_as(res)
+
+    def _preconditioner_root(self, max_rank):
+        res = self.base_lazy_tensor._preconditioner_root(max_rank)
+        return res * self._constant_as(res).sqrt()
+
     def _size(self):
         return self.base_lazy_tensor.size()
 
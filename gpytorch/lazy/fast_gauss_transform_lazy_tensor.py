@@ -0,0 +1,76 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+from .tiled_kernel_lazy_tensor import TiledKernelLazyTensor
+from .. import settings
+from ..utils.fast_gauss_transform import fast_gauss_transform
+
+
+class FastGaussTransformLazyTensor(TiledKernelLazyTensor):
+    """
+    A matrix-free representation of an RBF kernel matrix :math:`K_{X_1, X_2}` for low-dimensional (1-3D) inputs,
+    whose matrix multiplications are approximated (to a given tolerance) in near-linear time with the improved
+    fast Gauss transform (see :func:`gpytorch.utils.fast_gauss_transform.fast_gauss_transform`).
+    Nearby points are computed exactly, and points further away are summarized by Taylor expansions.
+    Unlike :obj:`gpytorch.kernels.GridInterpolationKernel`, this does not require a grid - which makes
+    it well suited to irregularly sampled spatial data.
+
+    The matrix multiplications in CG and Lanczos use the fast Gauss transform. Everything else
+    (the derivative of :math:`u^\\top K v`, the diagonal, and evaluating the matrix) is computed exactly, in tiles,
+    as in :obj:`gpytorch.lazy.TiledKernelLazyTensor`.
+
+    This LazyTensor is created automatically for RBF kernels when the
+    :func:`gpytorch.settings.fast_gauss_transform_tolerance` setting is used. It does not need to be constructed
+    manually.
+
+    Args:
+        :attr:`x1` (Tensor `n x d` or `b x n x d`): the inputs for the rows of the kernel matrix
+        :attr:`x2` (Tensor `m x d` or `b x m x d`): the inputs for the columns of the kernel matrix
+        :attr:`hyperparameters` (Tensors): the parameters of the kernel (i.e. `list(kernel.parameters())`).
+        :attr:`kernel` (RBFKernel): the kernel
+        :attr:`tolerance` (float): the error tolerance of the matrix multiplications. Default: `1e-4`.
+    """
+
+    def __init__(self, x1, x2, *hyperparameters, **kwargs):
+        tolerance = kwargs.pop("tolerance", 1e-4)
+        super(FastGaussTransformLazyTensor, self).__init__(x1, x2, *hyperparameters, tolerance=tolerance, **kwargs)
+        self.params.pop("tolerance")
+        self.tolerance = tolerance
+
+    @staticmethod
+    def supports_kernel(kernel, x1):
+        from ..kernels import RBFKernel
+
+        return type(kernel) is RBFKernel and x1.size(-1) <= 3
+
+    def _tile_size(self):
+        # The kernel matrix is never stored in full - even if max_kernel_tile_size is not set
+        max_tile_size = settings.max_kernel_tile_size.value()
+        if max_tile_size is None:
+            max_tile_size = 2 ** 22
+        return max(1, max_tile_size // max(1, self.x2.size(-2)))
+
+    def _fast_gauss_transform(self, x1, x2, rhs):
+        lengthscale = self.kernel.lengthscale.detach()
+        if x1.ndimension() == 2:
+            return fast_gauss_transform(x1.div(lengthscale[0]), x2.div(lengthscale[0]), rhs, self.tolerance)
+
+        batch_size = max(x1.size(0), rhs.size(0) if rhs.ndimension() == 3 else 1)
+        x1 = x1.div(lengthscale).expand(batch_size, *x1.shape[1:])
+        x2 = x2.div(lengthscale).expand(batch_size, *x2.shape[1:])
+        rhs = rhs.expand(batch_size, *rhs.shape[-2:]) if rhs.ndimension() == 3 else rhs
+        res = [
+            fast_gauss_transform(x1[i], x2[i], rhs[i] if rhs.ndimension() == 3 else rhs, self.tolerance)
+            for i in range(batch_size)
+        ]
+        return torch.stack(res)
+
+    def _matmul(self, rhs):
+        return self._fast_gauss_transform(self.x1, self.x2, rhs)
+
+    def _t_matmul(self, rhs):
+        # The kernel is symmetric
+        return self._fast_gauss_transform(self.x2, self.x1, rhs)
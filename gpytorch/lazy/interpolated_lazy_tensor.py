@@ -11,7 +11,8 @@ from .root_lazy_tensor import RootLazyTensor
 from ..utils import sparse
 from ..utils.interpolation import left_interp, left_t_interp
 from ..utils.sparse import bdsmm
-from .. import beta_features
+from ..utils.toeplitz import circulant_root
+from .. import settings
 
 
 class InterpolatedLazyTensor(LazyTensor):
@@ -90,12 +91,30 @@ class InterpolatedLazyTensor(LazyTensor):
         self.right_interp_values = right_interp_values
 
     def _approx_diag(self):
-        base_diag_root = self.base_lazy_tensor.diag().sqrt()
+        base_diag_root = self.base_lazy_tensor._approx_diag().sqrt()
         left_res = left_interp(self.left_interp_indices, self.left_interp_values, base_diag_root)
         right_res = left_interp(self.right_interp_indices, self.right_interp_values, base_diag_root)
         res = left_res * right_res
         return res
 
+    def _preconditioner_root(self, max_rank):
+        # For KISS-GP, W K_UU W^T ~= (W R)(W R)^T, where R is made of the leading eigenvectors of the
+        # circulant approximation to K_UU (when K_UU is a Kronecker product of Toeplitz matrices)
+        if settings.toeplitz_inference.value() != "circulant":
+            return super(InterpolatedLazyTensor, self)._preconditioner_root(max_rank)
+
+        eigenvalues = self.base_lazy_tensor._circulant_eigenvalues()
+        is_symmetric = torch.equal(self.left_interp_indices, self.right_interp_indices) and torch.equal(
+            self.left_interp_values, self.right_interp_values
+        )
+        if eigenvalues is None or not is_symmetric:
+            return super(InterpolatedLazyTensor, self)._preconditioner_root(max_rank)
+
+        signal_ndim = eigenvalues.dim() - (self.base_lazy_tensor.ndimension() - 2)
+        base_root = circulant_root(eigenvalues, max_rank, signal_ndim=signal_ndim)
+        res = left_interp(self.left_interp_indices, self.left_interp_values, base_root)
+        return res.transpose(-1, -2).contiguous()
+
     def _matmul(self, rhs):
         # Get sparse tensor representations of left/right interp matrices
         left_interp_t = self._sparse_left_interp_t(self.left_interp_indices, self.left_interp_values)
@@ -426,7 +445,7 @@ class InterpolatedLazyTensor(LazyTensor):
     def exact_predictive_covar(self, num_train, likelihood, precomputed_cache=None):
         from ..distributions import MultivariateNormal
 
-        if not beta_features.fast_pred_var.on() and not beta_features.fast_pred_samples.on():
+        if not settings.fast_pred_var.on() and not settings.fast_pred_samples.on():
             return super(InterpolatedLazyTensor, self).exact_predictive_covar(num_train, likelihood, precomputed_cache)
 
         n_test = self.size(-2) - num_train
@@ -440,8 +459,8 @@ class InterpolatedLazyTensor(LazyTensor):
 
         if (
             precomputed_cache is None
-            or (beta_features.fast_pred_samples.on() and precomputed_cache[0] is None)
-            or (not beta_features.fast_pred_samples.on() and precomputed_cache[1] is None)
+            or (settings.fast_pred_samples.on() and precomputed_cache[0] is None)
+            or (not settings.fast_pred_samples.on() and precomputed_cache[1] is None)
         ):
             # Get inverse root
             train_train_covar = self.__class__(
@@ -456,7 +475,7 @@ class InterpolatedLazyTensor(LazyTensor):
             train_train_covar = likelihood(grv).lazy_covariance_matrix
 
             # Get probe vectors for inverse root
-            num_probe_vectors = beta_features.fast_pred_var.num_probe_vectors()
+            num_probe_vectors = settings.fast_pred_var.num_probe_vectors()
             batch_size = train_interp_indices.size(0)
             n_inducing = self.base_lazy_tensor.size(-1)
             vector_indices = torch.randperm(n_inducing).type_as(train_interp_indices)
@@ -494,7 +513,7 @@ class InterpolatedLazyTensor(LazyTensor):
             root = self._exact_predictive_covar_inv_quad_form_cache(train_train_covar_inv_root, test_train_covar)
 
             # Precomputed factor
-            if beta_features.fast_pred_samples.on():
+            if settings.fast_pred_samples.on():
                 inside = self.base_lazy_tensor + RootLazyTensor(root).mul(-1)
                 inside_root = inside.root_decomposition()
                 # Prevent backprop through this variable
@@ -506,7 +525,7 @@ class InterpolatedLazyTensor(LazyTensor):
                 precomputed_cache = None, root
 
         # Compute the exact predictive posterior
-        if beta_features.fast_pred_samples.on():
+        if settings.fast_pred_samples.on():
             res = self._exact_predictive_covar_inv_quad_form_root(precomputed_cache[0], test_train_covar)
             res = RootLazyTensor(res)
         else:
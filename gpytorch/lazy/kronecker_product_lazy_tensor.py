@@ -7,6 +7,8 @@ import torch
 import operator
 from .lazy_tensor import LazyTensor
 from functools import reduce
+from ..utils.toeplitz import circulant_inv_matmul
+from .. import settings
 
 
 def _prod(iterable):
@@ -72,6 +74,25 @@ class KroneckerProductLazyTensor(LazyTensor):
         super(KroneckerProductLazyTensor, self).__init__(*lazy_tensors)
         self.lazy_tensors = lazy_tensors
 
+    def _circulant_eigenvalues(self):
+        # The eigenvalues of a Kronecker product are the products of the eigenvalues of its factors
+        factor_eigenvalues = [lazy_tensor._circulant_eigenvalues() for lazy_tensor in self.lazy_tensors]
+        if any(eigenvalues is None for eigenvalues in factor_eigenvalues):
+            return None
+
+        # The last factor corresponds to the slowest-varying index
+        num_batch_dims = self.ndimension() - 2
+        res = factor_eigenvalues[-1]
+        for eigenvalues in factor_eigenvalues[-2::-1]:
+            res_levels = res.dim() - num_batch_dims
+            eigenvalues_levels = eigenvalues.dim() - num_batch_dims
+            res = res.view(*res.shape, *([1] * eigenvalues_levels))
+            eigenvalues = eigenvalues.view(
+                *eigenvalues.shape[:num_batch_dims], *([1] * res_levels), *eigenvalues.shape[num_batch_dims:]
+            )
+            res = res * eigenvalues
+        return res
+
     def _matmul(self, rhs):
         is_vec = rhs.ndimension() == 1
         if is_vec:
@@ -94,6 +115,22 @@ class KroneckerProductLazyTensor(LazyTensor):
             res = res.squeeze(-1)
         return res
 
+    def _preconditioner(self):
+        # The circulant preconditioner is opt-in (the default "cg" mode keeps unpreconditioned CG/SLQ)
+        if settings.toeplitz_inference.value() == "cg" or settings.max_preconditioner_size.value() == 0:
+            return None, None
+
+        # Multilevel circulant preconditioner, applied with (up to 3 dimensional) FFTs
+        eigenvalues = self._circulant_eigenvalues()
+        signal_ndim = eigenvalues.dim() - (self.ndimension() - 2) if eigenvalues is not None else 0
+        if not 1 <= signal_ndim <= 3:
+            return None, None
+
+        def precondition_closure(tensor):
+            return circulant_inv_matmul(eigenvalues, tensor, signal_ndim=signal_ndim)
+
+        return precondition_closure, eigenvalues.contiguous().view(*self.batch_shape, -1).log().sum(-1)
+
     def _quad_form_derivative(self, left_vecs, right_vecs):
         if left_vecs.ndimension() == 1:
             left_vecs = left_vecs.unsqueeze(1)
@@ -224,3 +261,26 @@ class KroneckerProductLazyTensor(LazyTensor):
             left_indices = left_indices - (left_indices_i * left_size)
             right_indices = right_indices - (right_indices_i * right_size)
         return res
+
+    def inv_quad_log_det(self, inv_quad_rhs=None, log_det=False, reduce_inv_quad=True):
+        # With specialized Toeplitz inference, we use log|A_1 x ... x A_d| = sum_i (n / n_i) log|A_i|
+        # so that the log determinant of each factor is computed with its own structure
+        if (
+            not log_det
+            or settings.toeplitz_inference.value() == "cg"
+            or not all(lazy_tensor.is_square for lazy_tensor in self.lazy_tensors)
+        ):
+            return super(KroneckerProductLazyTensor, self).inv_quad_log_det(
+                inv_quad_rhs=inv_quad_rhs, log_det=log_det, reduce_inv_quad=reduce_inv_quad
+            )
+
+        inv_quad_term = torch.empty(0, dtype=self.dtype, device=self.device)
+        if inv_quad_rhs is not None:
+            inv_quad_term, _ = super(KroneckerProductLazyTensor, self).inv_quad_log_det(
+                inv_quad_rhs=inv_quad_rhs, log_det=False, reduce_inv_quad=reduce_inv_quad
+            )
+
+        log_det_term = 0
+        for lazy_tensor in self.lazy_tensors:
+            log_det_term = log_det_term + lazy_tensor.log_det().mul(self.size(-1) // lazy_tensor.size(-1))
+        return inv_quad_term, log_det_term
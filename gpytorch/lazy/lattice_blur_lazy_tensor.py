@@ -0,0 +1,87 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+from .lazy_tensor import LazyTensor
+from ..utils.lattice import permutohedral_blur, permutohedral_blur_center_weight
+
+
+class LatticeBlurLazyTensor(LazyTensor):
+    """
+    Represents the (scaled) blur operator of a permutohedral lattice: an `m x m` symmetric positive semi-definite
+    matrix over the `m` lattice vertices (see :func:`gpytorch.utils.lattice.permutohedral_blur`).
+
+    Multiplication costs `O(m d)`, and never constructs the matrix. This is the base LazyTensor of the
+    :class:`gpytorch.kernels.LatticeInterpolationKernel`, and is designed to be wrapped by an
+    :class:`gpytorch.lazy.InterpolatedLazyTensor` (which splats and slices the data onto/from the lattice).
+
+    Args:
+        :attr:`scale` (Tensor - 0D or 1 element):
+            A constant that multiplies the blur operator
+        :attr:`neighbors` (Tensor `2 x (d + 1) x m`, long):
+            The lattice neighbors of every vertex (see :func:`gpytorch.utils.lattice.create_permutohedral_lattice`)
+    """
+
+    def __init__(self, scale, neighbors):
+        if neighbors.ndimension() != 3 or neighbors.size(0) != 2:
+            raise RuntimeError(
+                "LatticeBlurLazyTensor expects a 2 x (d + 1) x m tensor of neighbors. "
+                "Got size {}".format(neighbors.size())
+            )
+        super(LatticeBlurLazyTensor, self).__init__(scale, neighbors)
+        self.scale = scale
+        self.neighbors = neighbors
+
+    def _matmul(self, rhs):
+        return permutohedral_blur(self.neighbors, rhs) * self.scale
+
+    def _t_matmul(self, rhs):
+        # Matrix is symmetric
+        return self._matmul(rhs)
+
+    def _quad_form_derivative(self, left_vecs, right_vecs):
+        if left_vecs.ndimension() == 1:
+            left_vecs = left_vecs.unsqueeze(1)
+            right_vecs = right_vecs.unsqueeze(1)
+
+        scale_grad = (left_vecs * permutohedral_blur(self.neighbors, right_vecs)).sum()
+        return scale_grad.view_as(self.scale), torch.zeros_like(self.neighbors)
+
+    def _size(self):
+        num_vertices = self.neighbors.size(-1)
+        return torch.Size((num_vertices, num_vertices))
+
+    def _transpose_nonbatch(self):
+        return self
+
+    def _get_indices(self, left_indices, right_indices):
+        # Entries are computed by blurring the columns that are needed (in chunks)
+        # This costs O(m d) per unique column - so it should only be used on a few entries
+        unique_right_indices, inverse = torch.unique(right_indices, return_inverse=True)
+        num_vertices = self.neighbors.size(-1)
+        chunk_size = max(1, 2 ** 20 // num_vertices)
+
+        res = torch.zeros(left_indices.numel(), dtype=self.dtype, device=self.device)
+        for start in range(0, unique_right_indices.numel(), chunk_size):
+            end = min(start + chunk_size, unique_right_indices.numel())
+            chunk_indices = unique_right_indices[start:end]
+            columns = torch.zeros(num_vertices, end - start, dtype=self.dtype, device=self.device)
+            columns[chunk_indices, torch.arange(0, end - start, dtype=torch.long, device=self.device)] = 1
+            columns = self._matmul(columns)
+
+            in_chunk = (inverse >= start) & (inverse < end)
+            if in_chunk.any():
+                chunk_entries = in_chunk.nonzero().squeeze(-1)
+                res[chunk_entries] = columns[left_indices[chunk_entries], inverse[chunk_entries] - start]
+        return res
+
+    def _approx_diag(self):
+        # On a fully occupied lattice, every diagonal entry is the same
+        center_weight = permutohedral_blur_center_weight(self.neighbors.size(1) - 1)
+        return (self.scale * center_weight).expand(self.neighbors.size(-1)).contiguous()
+
+    def diag(self):
+        vertex_indices = torch.arange(0, self.neighbors.size(-1), dtype=torch.long, device=self.device)
+        return self._get_indices(vertex_indices, vertex_indices)
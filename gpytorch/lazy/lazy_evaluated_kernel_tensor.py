@@ -44,6 +44,12 @@ class LazyEvaluatedKernelTensor(LazyTensor):
     def _quad_form_derivative(self, left_vecs, right_vecs):
         raise RuntimeError(LAZY_KERNEL_TENSOR_WARNING)
 
+    def _circulant_eigenvalues(self):
+        return self.evaluate_kernel()._circulant_eigenvalues()
+
+    def _preconditioner_root(self, max_rank):
+        return self.evaluate_kernel()._preconditioner_root(max_rank)
+
     def _transpose_nonbatch(self):
         return self.__class__(self.kernel, self.x2, self.x1, **self.params)
 
@@ -65,13 +71,16 @@ class LazyEvaluatedKernelTensor(LazyTensor):
         Implementing it this way allows us to compute predictions more efficiently
         in cases where only the variances are required.
         """
-        from ..kernels import Kernel
-
         if hasattr(self, "_cached_kernel_diag"):
             return self._cached_kernel_diag
         elif hasattr(self, "_cached_kernel_eval"):
             return self._cached_kernel_eval.diag()
         else:
+            # Stationary kernels have a constant diagonal - which doesn't depend on the data
+            res = self.kernel._constant_diag(self.x1, self.x2, batch_dims=self.batch_dims)
+            if res is not None:
+                return res.view(self.shape[:-1])
+
             if not self.is_batch:
                 x1 = self.x1.unsqueeze(0)
                 x2 = self.x2.unsqueeze(0)
@@ -85,7 +94,7 @@ class LazyEvaluatedKernelTensor(LazyTensor):
             if x2.dim() == 2:  # We only have a single data point
                 x2 = x2.unsqueeze(1)
 
-            res = super(Kernel, self.kernel).__call__(x1, x2, diag=True, batch_dims=self.batch_dims, **self.params)
+            res = self.kernel._cached_call(x1, x2, diag=True, batch_dims=self.batch_dims, **self.params)
 
             # Did this Kernel eat the diag option?
             # If it does not return a LazyEvaluatedKernelTensor, we can call diag on the output
@@ -129,8 +138,6 @@ class LazyEvaluatedKernelTensor(LazyTensor):
         NB: This is a meta LazyTensor, in the sense that evaluate can return
         a LazyTensor if the kernel being evaluated does so.
         """
-        from ..kernels import Kernel
-
         if hasattr(self, "_cached_kernel_eval"):
             return self._cached_kernel_eval
         else:
@@ -141,13 +148,35 @@ class LazyEvaluatedKernelTensor(LazyTensor):
                 x1 = self.x1
                 x2 = self.x2
 
-            self._cached_kernel_eval = super(Kernel, self.kernel).__call__(
+            if self._use_fast_gauss_transform(x1):
+                from .fast_gauss_transform_lazy_tensor import FastGaussTransformLazyTensor
+
+                self._cached_kernel_eval = FastGaussTransformLazyTensor(
+                    self.x1,
+                    self.x2,
+                    *self.kernel.parameters(),
+                    kernel=self.kernel,
+                    tolerance=settings.fast_gauss_transform_tolerance.value(),
+                    **self.params
+                )
+                return self._cached_kernel_eval
+
+            if self._use_tiled_kernel(x1, x2):
+                from .tiled_kernel_lazy_tensor import TiledKernelLazyTensor
+
+                self._cached_kernel_eval = TiledKernelLazyTensor(
+                    self.x1, self.x2, *self.kernel.parameters(), kernel=self.kernel, **self.params
+                )
+                return self._cached_kernel_eval
+
+            self._cached_kernel_eval = self.kernel._cached_call(
                 x1, x2, diag=False, batch_dims=self.batch_dims, **self.params
             )
+            # (Out of place - the result may be shared through the kernel cache)
             if self.squeeze_row:
-                self._cached_kernel_eval.squeeze_(-2)
+                self._cached_kernel_eval = self._cached_kernel_eval.squeeze(-2)
             if self.squeeze_col:
-                self._cached_kernel_eval.squeeze_(-1)
+                self._cached_kernel_eval = self._cached_kernel_eval.squeeze(-1)
 
             if (
                 not self.is_batch
@@ -159,6 +188,37 @@ class LazyEvaluatedKernelTensor(LazyTensor):
                 self._cached_kernel_eval = NonLazyTensor(self._cached_kernel_eval)
             return self._cached_kernel_eval
 
+    def _use_fast_gauss_transform(self, x1):
+        """
+        Matrix multiplications use the fast Gauss transform for RBF kernels on low-dimensional inputs
+        (see :obj:`gpytorch.settings.fast_gauss_transform_tolerance`).
+        """
+        from .fast_gauss_transform_lazy_tensor import FastGaussTransformLazyTensor
+
+        if settings.fast_gauss_transform_tolerance.value() is None:
+            return False
+        if self.batch_dims is not None or self.squeeze_row or self.squeeze_col:
+            return False
+        return FastGaussTransformLazyTensor.supports_kernel(self.kernel, x1)
+
+    def _use_tiled_kernel(self, x1, x2):
+        """
+        Kernel matrices are computed on the fly (see :obj:`gpytorch.settings.max_kernel_tile_size`) if
+        they are large, and if the kernel returns dense tensors (rather than LazyTensors with structure).
+        """
+        from ..kernels import Kernel
+
+        max_tile_size = settings.max_kernel_tile_size.value()
+        if max_tile_size is None or self.batch_dims is not None or self.squeeze_row or self.squeeze_col:
+            return False
+        if x1.size(-2) * x2.size(-2) <= max_tile_size:
+            return False
+
+        # Check what kind of output the kernel produces on the first row
+        with torch.no_grad(), settings.max_kernel_tile_size(None):
+            res = super(Kernel, self.kernel).__call__(x1.narrow(-2, 0, 1), x2, diag=False, **self.params)
+        return torch.is_tensor(res)
+
     def representation(self):
         return self.evaluate_kernel().representation()
 
@@ -168,6 +228,26 @@ class LazyEvaluatedKernelTensor(LazyTensor):
     def evaluate(self):
         return self.evaluate_kernel().evaluate()
 
+    def _exact_predictive_covar_inv_quad_form_cache(self, train_train_covar_inv_root, test_train_covar):
+        if self.kernel.has_custom_exact_predictions:
+            return self.evaluate_kernel()._exact_predictive_covar_inv_quad_form_cache(
+                train_train_covar_inv_root, test_train_covar.evaluate_kernel()
+            )
+        else:
+            return super(LazyEvaluatedKernelTensor, self)._exact_predictive_covar_inv_quad_form_cache(
+                train_train_covar_inv_root, test_train_covar
+            )
+
+    def _exact_predictive_covar_inv_quad_form_root(self, precomputed_cache, test_train_covar):
+        if self.kernel.has_custom_exact_predictions:
+            return self.evaluate_kernel()._exact_predictive_covar_inv_quad_form_root(
+                precomputed_cache, test_train_covar.evaluate_kernel()
+            )
+        else:
+            return super(LazyEvaluatedKernelTensor, self)._exact_predictive_covar_inv_quad_form_root(
+                precomputed_cache, test_train_covar
+            )
+
     def exact_predictive_mean(self, full_mean, train_labels, num_train, likelihood, precomputed_cache=None):
         if self.kernel.has_custom_exact_predictions:
             return self.evaluate_kernel().exact_predictive_mean(
@@ -186,6 +266,14 @@ class LazyEvaluatedKernelTensor(LazyTensor):
                 num_train, likelihood, precomputed_cache
             )
 
+    def exact_predictive_var(self, num_train, likelihood, precomputed_cache=None):
+        if self.kernel.has_custom_exact_predictions:
+            return self.evaluate_kernel().exact_predictive_var(num_train, likelihood, precomputed_cache)
+        else:
+            return super(LazyEvaluatedKernelTensor, self).exact_predictive_var(
+                num_train, likelihood, precomputed_cache
+            )
+
     def repeat(self, *sizes):
         if self.squeeze_row or self.squeeze_col:
             raise RuntimeError("Can't repeat a row/col of a LazyEvaluatedKernelTensor")
@@ -9,7 +9,9 @@ from ..functions._inv_matmul import InvMatmul
 from ..functions._inv_quad_log_det import InvQuadLogDet
 from ..functions._root_decomposition import RootDecomposition
 from ..functions._matmul import Matmul
-from .. import beta_features, settings
+from .. import settings
+from ..utils import num_chunk_rows, pivoted_cholesky
+from ..utils.toeplitz import circulant_root
 from .lazy_tensor_representation_tree import LazyTensorRepresentationTree
 
 
@@ -158,6 +160,20 @@ class LazyTensor(object):
         """
         return self.diag()
 
+    def _circulant_eigenvalues(self):
+        """
+        (Optional) for matrices with (multilevel) Toeplitz structure, returns the eigenvalues of a
+        (multilevel) circulant approximation to the matrix. The eigenvectors of this approximation are the
+        Fourier basis vectors, so it can be applied or inverted with FFTs.
+
+        The eigenvalues are returned on the grid of Fourier frequencies, i.e. with size (b x) m_1 x ... x m_d
+        for a Kronecker product of d Toeplitz matrices of sizes m_1, ..., m_d.
+
+        Returns:
+            tensor: - the eigenvalues of the approximation, or None if no such approximation exists
+        """
+        return None
+
     def _exact_predictive_covar_inv_quad_form_cache(self, train_train_covar_inv_root, test_train_covar):
         """
         Computes a cache for K_X*X (K_XX + sigma^2 I)^-1 K_X*X if possible. By default, this does no work and returns
@@ -247,6 +263,26 @@ class LazyTensor(object):
         """
         return None, None
 
+    def _preconditioner_root(self, max_rank):
+        """
+        Returns a low-rank root :math:`R` (of rank at most `max_rank`) so that :math:`R^{\\top} R` approximates
+        this (positive semi-definite) matrix. This is used to build preconditioners for this matrix with an added
+        diagonal (see :class:`gpytorch.lazy.AddedDiagLazyTensor`).
+
+        By default, this is a pivoted Cholesky decomposition. With `gpytorch.settings.toeplitz_inference("circulant")`,
+        matrices with a circulant approximation (see :meth:`_circulant_eigenvalues`) instead use the leading
+        eigenvectors of the approximation.
+
+        Returns:
+            tensor: - the root :math:`R` ((b x) max_rank x n)
+        """
+        if settings.toeplitz_inference.value() == "circulant":
+            eigenvalues = self._circulant_eigenvalues()
+            if eigenvalues is not None:
+                signal_ndim = eigenvalues.dim() - len(self.batch_shape)
+                return circulant_root(eigenvalues, max_rank, signal_ndim=signal_ndim).transpose(-1, -2).contiguous()
+        return pivoted_cholesky.pivoted_cholesky(self, max_rank)
+
     def _t_matmul(self, rhs):
         """
         Performs a transpose matrix multiplication :math:`K^{\\top}M` with the matrix :math:`K` that this
@@ -499,7 +535,7 @@ class LazyTensor(object):
             test_test_covar = self[num_train:, num_train:]
 
         train_train_covar = likelihood(MultivariateNormal(torch.zeros(1), train_train_covar)).lazy_covariance_matrix
-        if not beta_features.fast_pred_var.on():
+        if not settings.fast_pred_var.on():
             from .matmul_lazy_tensor import MatmulLazyTensor
 
             test_train_covar = test_train_covar.evaluate()
@@ -520,6 +556,106 @@ class LazyTensor(object):
         res = test_test_covar + RootLazyTensor(covar_inv_quad_form_root).mul(-1)
         return res, precomputed_cache
 
+    def exact_predictive_var(self, num_train, likelihood, precomputed_cache=None):
+        """
+        Computes the posterior predictive variances of a GP - i.e. the diagonal of :meth:`exact_predictive_covar`,
+        without the rest of the predictive covariance matrix.
+        Assumes that self is the block prior covariance matrix of training and testing points
+        [ K_XX, K_XX*; K_X*X, K_X*X* ]
+
+        With :obj:`gpytorch.settings.fast_pred_var`, this is the diagonal of the (low rank) LOVE predictive
+        covariance. Otherwise, the test points are processed in chunks (of :func:`gpytorch.utils.num_chunk_rows`
+        rows), so that only one chunk of :math:`K_{X^{*}X}` and its solves are in memory at a time.
+
+        Args:
+            num_train (int): The number of training points in the full covariance matrix
+            noise (scalar): The observed noise (from the likelihood)
+            precomputed_cache (optional): speeds up subsequent computations (default: None)
+
+        Returns:
+            :obj:`torch.tensor`: The predictive posterior variances of the test points
+        """
+        from ..distributions import MultivariateNormal
+
+        if settings.fast_pred_var.on():
+            res, precomputed_cache = self.exact_predictive_covar(num_train, likelihood, precomputed_cache)
+            return res.diag(), precomputed_cache
+
+        if self.ndimension() == 3:
+            train_train_covar = self[:, :num_train, :num_train]
+            test_test_covar = self[:, num_train:, num_train:]
+        else:
+            train_train_covar = self[:num_train, :num_train]
+            test_test_covar = self[num_train:, num_train:]
+        train_train_covar = likelihood(MultivariateNormal(torch.zeros(1), train_train_covar)).lazy_covariance_matrix
+
+        res = test_test_covar.diag()
+        num_test = res.size(-1)
+        chunk_size = num_chunk_rows(num_train)
+        corrections = []
+        for start in range(0, num_test, chunk_size):
+            end = min(start + chunk_size, num_test)
+            if self.ndimension() == 3:
+                test_train_covar = self[:, num_train + start:num_train + end, :num_train].evaluate()
+            else:
+                test_train_covar = self[num_train + start:num_train + end, :num_train].evaluate()
+            train_test_solve = train_train_covar.inv_matmul(test_train_covar.transpose(-1, -2))
+            corrections.append((test_train_covar * train_test_solve.transpose(-1, -2)).sum(-1))
+        if len(corrections):
+            res = res - torch.cat(corrections, -1)
+        return res, None
+
+    def exact_loo_predictive(self, mean, target):
+        r"""
+        Computes the leave-one-out (LOO) predictive means and variances of the observations of a GP - i.e. the
+        predictive distribution of each :math:`y_i`, conditioned on all of the other observations.
+        Assumes that self is the covariance matrix of the observations :math:`\hat K = K_{XX} + \sigma^2 I`.
+
+        The LOO predictions only require :math:`\boldsymbol \alpha = \hat K^{-1} (\mathbf y - \boldsymbol \mu)`
+        and the diagonal of :math:`\hat K^{-1}`:
+
+        .. math::
+
+            \sigma^2_{-i} = 1 / [\hat K^{-1}]_{ii}, \qquad \mu_{-i} = y_i - \alpha_i \sigma^2_{-i}
+
+        For matrices of size up to :obj:`gpytorch.settings.max_cholesky_size`, the diagonal is computed exactly
+        (with a Cholesky factorization). Larger matrices use a stochastic (Hutchinson) estimate, with
+        :obj:`gpytorch.settings.num_trace_samples` random probe vectors, in the same CG solve as
+        :math:`\boldsymbol \alpha`.
+
+        Args:
+            mean (:obj:`torch.tensor`): the prior means of the observations (`n` or `b x n`)
+            target (:obj:`torch.tensor`): the observations (`n` or `b x n`)
+
+        Returns:
+            (:obj:`torch.tensor`, :obj:`torch.tensor`): the LOO predictive means and variances
+        """
+        from ..utils.cholesky import batch_potrf, batch_potrs, batch_trtri
+
+        labels_offset = (target - mean).unsqueeze(-1)
+        num_data = self.size(-1)
+        if num_data <= settings.max_cholesky_size.value():
+            # K^-1 = U^-1 U^-T, for the Cholesky factor K = U^T U
+            chol = batch_potrf(self.evaluate())
+            inv_diag = batch_trtri(chol).pow(2).sum(-1)
+            solve = batch_potrs(labels_offset, chol).squeeze(-1)
+        else:
+            # diag(K^-1) ~= mean(z * K^-1 z), for random +1/-1 vectors z
+            num_random_probes = settings.num_trace_samples.value()
+            probe_vectors = torch.empty(
+                *labels_offset.shape[:-1], num_random_probes, dtype=labels_offset.dtype, device=labels_offset.device
+            )
+            probe_vectors.bernoulli_().mul_(2).add_(-1)
+            solves = self.inv_matmul(torch.cat([labels_offset, probe_vectors], -1))
+            solve = solves[..., 0]
+            # The estimate is bounded below by 1 / diag(K) (which keeps the variances positive)
+            inv_diag = solves[..., 1:].mul(probe_vectors).mean(-1)
+            inv_diag = torch.max(inv_diag, self.diag().reciprocal())
+
+        loo_var = inv_diag.reciprocal()
+        loo_mean = target - solve * loo_var
+        return loo_mean, loo_var
+
     def inv_matmul(self, tensor):
         """
         Computes a linear solve (w.r.t self = :math:`K`) with several right hand sides :math:`M`.
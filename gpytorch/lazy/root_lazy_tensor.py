@@ -5,7 +5,9 @@ from __future__ import unicode_literals
 
 import torch
 from .lazy_tensor import LazyTensor
+from .matmul_lazy_tensor import MatmulLazyTensor
 from .non_lazy_tensor import NonLazyTensor
+from ..utils.cholesky import batch_potrf, batch_potrs, batch_trtri
 
 
 def _inner_repeat(tensor, amt):
@@ -101,6 +103,8 @@ class RootLazyTensor(LazyTensor):
     def diag(self):
         if isinstance(self.root, NonLazyTensor):
             return (self.root.tensor ** 2).sum(-1)
+        elif isinstance(self.root, MatmulLazyTensor):
+            return (self._evaluated_root ** 2).sum(-1)
         else:
             return super(RootLazyTensor, self).diag()
 
@@ -109,6 +113,89 @@ class RootLazyTensor(LazyTensor):
             self._evaluated_memo = torch.matmul(self._evaluated_root, self._evaluated_root.transpose(-1, -2))
         return self._evaluated_memo
 
+    def _root_rows(self, start, length):
+        if isinstance(self.root, MatmulLazyTensor):
+            # Only the required rows of the left factor are used
+            left = self.root.left_lazy_tensor.evaluate().narrow(-2, start, length)
+            return MatmulLazyTensor(left, self.root.right_lazy_tensor)
+        return NonLazyTensor(self._evaluated_root.narrow(-2, start, length))
+
+    def _woodbury_prediction_factors(self, num_train, likelihood):
+        # The prior covariance of the training data (with the likelihood's noise) is D + V V^T, where V is the
+        # (low rank) root of the training rows. Returns V, D, and the Cholesky factor of I + V^T D^{-1} V.
+        # Returns None if the root is not low rank, or if the noise is not diagonal.
+        from .added_diag_lazy_tensor import AddedDiagLazyTensor
+        from ..distributions import MultivariateNormal
+
+        if self.root_decomposition_size() >= num_train:
+            return None
+        train_root = self._root_rows(0, num_train).evaluate()
+        train_train_covar = likelihood(MultivariateNormal(torch.zeros(1), RootLazyTensor(train_root)))
+        train_train_covar = train_train_covar.lazy_covariance_matrix
+        if not isinstance(train_train_covar, AddedDiagLazyTensor):
+            return None
+
+        shift = train_train_covar._diag_tensor.diag()
+        inner_mat = train_root.transpose(-1, -2).matmul(train_root / shift.unsqueeze(-1))
+        inner_mat = inner_mat + torch.eye(inner_mat.size(-1), dtype=inner_mat.dtype, device=inner_mat.device)
+        return train_root, shift, batch_potrf(inner_mat)
+
+    def exact_predictive_mean(self, full_mean, train_labels, num_train, likelihood, precomputed_cache=None):
+        # With a low rank root, the predictive mean is R_* (I + V^T D^{-1} V)^{-1} V^T D^{-1} (y - mu)
+        # The cache is the k-dimensional vector that is multiplied by the root of the test points
+        if precomputed_cache is None:
+            factors = self._woodbury_prediction_factors(num_train, likelihood)
+            if factors is None:
+                return super(RootLazyTensor, self).exact_predictive_mean(
+                    full_mean, train_labels, num_train, likelihood, precomputed_cache
+                )
+            train_root, shift, inner_chol = factors
+
+            train_mean = full_mean.narrow(-1, 0, num_train)
+            train_labels_offset = ((train_labels - train_mean) / shift).unsqueeze(-1)
+            precomputed_cache = batch_potrs(train_root.transpose(-1, -2).matmul(train_labels_offset), inner_chol)
+        elif precomputed_cache.size(-2) == num_train:
+            # The cache was computed by the default method
+            return super(RootLazyTensor, self).exact_predictive_mean(
+                full_mean, train_labels, num_train, likelihood, precomputed_cache
+            )
+
+        num_test = self.size(-1) - num_train
+        test_mean = full_mean.narrow(-1, num_train, num_test)
+        res = self._root_rows(num_train, num_test).matmul(precomputed_cache).squeeze(-1) + test_mean
+        return res, precomputed_cache.detach()
+
+    def _exact_predictive_covar_root(self, num_train, likelihood, precomputed_cache=None):
+        # With a low rank root, the predictive covariance is R_* (I + V^T D^{-1} V)^{-1} R_*^T
+        # The cache is the inverse of the Cholesky factor of I + V^T D^{-1} V, which is the root of the inverse
+        # Returns None if the default predictive covariance should be used
+        if precomputed_cache is None:
+            factors = self._woodbury_prediction_factors(num_train, likelihood)
+            if factors is None:
+                return None
+            _, _, inner_chol = factors
+            precomputed_cache = batch_trtri(inner_chol).detach()
+        elif precomputed_cache.shape[-2:] != torch.Size((self.root_decomposition_size(),) * 2):
+            # The cache was computed by the default method
+            return None
+
+        test_root = self._root_rows(num_train, self.size(-1) - num_train).matmul(precomputed_cache)
+        return test_root, precomputed_cache
+
+    def exact_predictive_covar(self, num_train, likelihood, precomputed_cache=None):
+        res = self._exact_predictive_covar_root(num_train, likelihood, precomputed_cache)
+        if res is None:
+            return super(RootLazyTensor, self).exact_predictive_covar(num_train, likelihood, precomputed_cache)
+        test_root, precomputed_cache = res
+        return RootLazyTensor(test_root), precomputed_cache
+
+    def exact_predictive_var(self, num_train, likelihood, precomputed_cache=None):
+        res = self._exact_predictive_covar_root(num_train, likelihood, precomputed_cache)
+        if res is None:
+            return super(RootLazyTensor, self).exact_predictive_var(num_train, likelihood, precomputed_cache)
+        test_root, precomputed_cache = res
+        return test_root.pow(2).sum(-1), precomputed_cache
+
     def root_decomposition_size(self):
         return self.root.size(-1)
 
@@ -0,0 +1,213 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+from .lazy_tensor import LazyTensor
+from ..utils.sparse import bdsmm, _searchsorted
+
+
+class SparseLazyTensor(LazyTensor):
+    """
+    A (batch of) sparse matrices, stored in COO format - i.e. as the indices and values of the nonzero entries.
+    This is the output of compactly supported kernels (e.g. :class:`gpytorch.kernels.WendlandKernel`).
+
+    Matrix multiplications are sparse-dense matrix multiplications, and the derivative of :math:`u^\\top K v`
+    is only computed for the nonzero entries. Therefore, the memory requirements are linear in the number of
+    nonzero entries.
+
+    Args:
+        :attr:`indices` (LongTensor `2 x nnz` or `3 x nnz`):
+            The (row, column) or (batch, row, column) indices of the nonzero entries.
+        :attr:`values` (Tensor `nnz`):
+            The values of the nonzero entries.
+        :attr:`sparse_size` (torch.Size):
+            The size of the matrix - `n x m` or `b x n x m`.
+    """
+
+    def __init__(self, indices, values, sparse_size=None):
+        if sparse_size is None:
+            raise RuntimeError("SparseLazyTensor requires a sparse_size.")
+        sparse_size = torch.Size(sparse_size)
+        if indices.size(0) != len(sparse_size):
+            raise RuntimeError(
+                "Expected {} rows of indices for a matrix of size {}. Got {}.".format(
+                    len(sparse_size), sparse_size, indices.size(0)
+                )
+            )
+        super(SparseLazyTensor, self).__init__(indices, values, sparse_size=sparse_size)
+        self.indices = indices
+        self.values = values
+        self.sparse_size = sparse_size
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def device(self):
+        return self.values.device
+
+    def _sparse_tensor(self, transpose=False):
+        indices = self.indices
+        size = self.sparse_size
+        if transpose:
+            indices = torch.cat([indices[:-2], indices[-1:], indices[-2:-1]], 0)
+            size = torch.Size((*size[:-2], size[-1], size[-2]))
+        return torch.sparse_coo_tensor(indices, self.values, size, dtype=self.values.dtype, device=self.values.device)
+
+    def _flat_indices(self, *indices):
+        # Linearizes (batch, row, column) indices
+        res = indices[-2] * self.sparse_size[-1] + indices[-1]
+        if len(indices) == 3:
+            res = res + indices[0] * (self.sparse_size[-2] * self.sparse_size[-1])
+        return res
+
+    def _matmul(self, rhs):
+        is_vector = rhs.ndimension() == 1
+        if is_vector:
+            rhs = rhs.unsqueeze(-1)
+        res = bdsmm(self._sparse_tensor(), rhs)
+        if is_vector:
+            res = res.squeeze(-1)
+        return res
+
+    def _t_matmul(self, rhs):
+        is_vector = rhs.ndimension() == 1
+        if is_vector:
+            rhs = rhs.unsqueeze(-1)
+        res = bdsmm(self._sparse_tensor(transpose=True), rhs)
+        if is_vector:
+            res = res.squeeze(-1)
+        return res
+
+    def _quad_form_derivative(self, left_vecs, right_vecs):
+        if left_vecs.ndimension() == 1:
+            left_vecs = left_vecs.unsqueeze(1)
+            right_vecs = right_vecs.unsqueeze(1)
+
+        # d(u^T K v) / dK_ij = u_i v_j - only for the nonzero entries
+        if self.indices.size(0) == 3:
+            left_vals = left_vecs[self.indices[0], self.indices[1]]
+            right_vals = right_vecs[self.indices[0], self.indices[2]]
+        else:
+            left_vals = left_vecs[self.indices[0]]
+            right_vals = right_vecs[self.indices[1]]
+        values_grad = (left_vals * right_vals).sum(-1)
+
+        # Return zero grad for the indices
+        return torch.zeros_like(self.indices), values_grad
+
+    def _size(self):
+        return self.sparse_size
+
+    def _transpose_nonbatch(self):
+        indices = torch.cat([self.indices[:-2], self.indices[-1:], self.indices[-2:-1]], 0)
+        size = torch.Size((*self.sparse_size[:-2], self.sparse_size[-1], self.sparse_size[-2]))
+        return self.__class__(indices, self.values, sparse_size=size)
+
+    def _lookup(self, flat_indices):
+        # Returns the entries at the (linearized) indices - which are 0 if they are not stored
+        if not hasattr(self, "_sorted_flat_indices_memo"):
+            self._sorted_flat_indices_memo = self._flat_indices(*self.indices).sort()
+        sorted_flat_indices, order = self._sorted_flat_indices_memo
+        if not sorted_flat_indices.numel():
+            return torch.zeros(flat_indices.size(), dtype=self.dtype, device=self.device)
+
+        positions = _searchsorted(sorted_flat_indices, flat_indices).clamp(max=sorted_flat_indices.numel() - 1)
+        found = sorted_flat_indices[positions].eq(flat_indices).type_as(self.values)
+        return self.values[order[positions]] * found
+
+    def _batch_get_indices(self, batch_indices, left_indices, right_indices):
+        return self._lookup(self._flat_indices(batch_indices, left_indices, right_indices))
+
+    def _get_indices(self, left_indices, right_indices):
+        return self._lookup(self._flat_indices(left_indices, right_indices))
+
+    def _getitem_nonbatch(self, row_index, col_index, first_tensor_index_dim=None):
+        row_map = _index_map(row_index, self.size(-2), self.device)
+        col_map = _index_map(col_index, self.size(-1), self.device)
+        if first_tensor_index_dim is not None or row_map is None or col_map is None:
+            return super(SparseLazyTensor, self)._getitem_nonbatch(row_index, col_index, first_tensor_index_dim)
+
+        # Only keep the nonzero entries in the selected rows and columns
+        new_rows = row_map[self.indices[-2]]
+        new_cols = col_map[self.indices[-1]]
+        mask = new_rows.ge(0) & new_cols.ge(0)
+        indices = torch.cat([self.indices[:-2, mask], new_rows[mask].unsqueeze(0), new_cols[mask].unsqueeze(0)], 0)
+        size = torch.Size((*self.sparse_size[:-2], int(row_map.max()) + 1, int(col_map.max()) + 1))
+        return self.__class__(indices, self.values[mask], sparse_size=size)
+
+    def diag(self):
+        if self.size(-1) != self.size(-2):
+            raise RuntimeError("Diag works on square matrices (or batches)")
+
+        mask = self.indices[-2].eq(self.indices[-1])
+        flat_indices = self.indices[-2, mask]
+        if self.indices.size(0) == 3:
+            flat_indices = flat_indices + self.indices[0, mask] * self.size(-1)
+        res = torch.zeros(self.sparse_size[:-1].numel(), dtype=self.dtype, device=self.device)
+        return res.index_add(0, flat_indices, self.values[mask]).view(self.sparse_size[:-1])
+
+    def evaluate(self):
+        res = torch.zeros(self.sparse_size, dtype=self.dtype, device=self.device)
+        return res.index_put(tuple(self.indices), self.values, accumulate=True)
+
+    def __getitem__(self, index):
+        index = list(index) if isinstance(index, tuple) else [index]
+        index += [slice(None, None, None)] * (self.ndimension() - len(index))
+        if self.ndimension() < 3:
+            return super(SparseLazyTensor, self).__getitem__(tuple(index))
+
+        batch_index = index[0]
+        if not torch.is_tensor(batch_index) and batch_index == slice(None, None, None):
+            return super(SparseLazyTensor, self).__getitem__(tuple(index))
+        if torch.is_tensor(batch_index) and (torch.is_tensor(index[1]) or torch.is_tensor(index[2])):
+            # The tensor indices are paired - so each batch index selects a row or a column (or an entry)
+            left_index, right_index = index[1:]
+            if not torch.is_tensor(left_index):
+                left_index = torch.arange(0, self.size(-2), dtype=torch.long, device=self.device)[left_index]
+                left_index = left_index.unsqueeze(0).expand(batch_index.numel(), left_index.numel())
+                batch_index = batch_index.unsqueeze(-1).expand_as(left_index)
+                right_index = right_index.unsqueeze(-1).expand_as(left_index)
+            elif not torch.is_tensor(right_index):
+                right_index = torch.arange(0, self.size(-1), dtype=torch.long, device=self.device)[right_index]
+                right_index = right_index.unsqueeze(0).expand(batch_index.numel(), right_index.numel())
+                batch_index = batch_index.unsqueeze(-1).expand_as(right_index)
+                left_index = left_index.unsqueeze(-1).expand_as(right_index)
+            return self._batch_get_indices(batch_index, left_index, right_index)
+
+        # Select the nonzero entries of the chosen batches
+        if isinstance(batch_index, int):
+            mask = self.indices[0].eq(batch_index)
+            res = self.__class__(self.indices[1:, mask], self.values[mask], sparse_size=self.sparse_size[1:])
+        else:
+            # (Batches can be selected more than once)
+            batches = torch.arange(0, self.size(0), dtype=torch.long, device=self.device)[batch_index].view(-1)
+            indices = []
+            values = []
+            for new_batch, batch in enumerate(batches.tolist()):
+                mask = self.indices[0].eq(batch)
+                batch_indices = self.indices[:, mask].clone()
+                batch_indices[0].fill_(new_batch)
+                indices.append(batch_indices)
+                values.append(self.values[mask])
+            size = torch.Size((batches.numel(), *self.sparse_size[1:]))
+            res = self.__class__(torch.cat(indices, -1), torch.cat(values, -1), sparse_size=size)
+            index[0] = slice(None, None, None)
+            return res[tuple(index)]
+        return res[tuple(index[1:])]
+
+
+def _index_map(index, size, device):
+    """
+    Maps each of the `size` original indices to its position after indexing (or -1 if it is not selected).
+    Returns None if the index selects an entry more than once.
+    """
+    selected = torch.arange(0, size, dtype=torch.long, device=device)[index].view(-1)
+    res = torch.full((size,), -1, dtype=torch.long, device=device)
+    res[selected] = torch.arange(0, selected.numel(), dtype=torch.long, device=device)
+    if res.ge(0).sum().item() != selected.numel():
+        return None
+    return res
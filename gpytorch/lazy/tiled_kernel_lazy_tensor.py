@@ -0,0 +1,192 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+from .lazy_tensor import LazyTensor
+from .. import settings
+
+
+class TiledKernelLazyTensor(LazyTensor):
+    """
+    A matrix-free representation of the kernel matrix :math:`K_{X_1, X_2}`. The kernel matrix is never stored.
+    Instead, it is recomputed (from the inputs and the kernel) in blocks of rows (tiles) whenever it is needed.
+    Each tile has at most :func:`gpytorch.settings.max_kernel_tile_size` entries.
+
+    Matrix multiplications, and the derivative of :math:`u^\\top K v` w.r.t. the inputs and the kernel's
+    hyperparameters, only ever store one tile at a time. This makes it possible to use exact GPs (with CG and
+    Lanczos) on datasets whose kernel matrix does not fit in memory - at the cost of recomputing the kernel for
+    every matrix multiplication.
+
+    This LazyTensor is created automatically for kernels that produce dense kernel matrices, when the
+    :func:`gpytorch.settings.max_kernel_tile_size` setting is used. It does not need to be constructed manually.
+
+    Args:
+        :attr:`x1` (Tensor `n x d` or `b x n x d`): the inputs for the rows of the kernel matrix
+        :attr:`x2` (Tensor `m x d` or `b x m x d`): the inputs for the columns of the kernel matrix
+        :attr:`hyperparameters` (Tensors): the parameters of the kernel (i.e. `list(kernel.parameters())`).
+            These receive gradients through the derivative of :math:`u^\\top K v`.
+        :attr:`kernel` (Kernel): the kernel that computes the tiles
+    """
+
+    def __init__(self, x1, x2, *hyperparameters, **kwargs):
+        kernel = kwargs.pop("kernel", None)
+        if kernel is None:
+            raise RuntimeError("TiledKernelLazyTensor requires a kernel.")
+        super(TiledKernelLazyTensor, self).__init__(x1, x2, *hyperparameters, kernel=kernel, **kwargs)
+        self.x1 = x1
+        self.x2 = x2
+        self.kernel = kernel
+        self.params = kwargs
+
+    @property
+    def dtype(self):
+        return self.x1.dtype
+
+    @property
+    def device(self):
+        return self.x1.device
+
+    def _tile_size(self):
+        max_tile_size = settings.max_kernel_tile_size.value()
+        if max_tile_size is None:
+            return self.x1.size(-2)
+        return max(1, max_tile_size // max(1, self.x2.size(-2)))
+
+    def _kernel_tile(self, x1, x2):
+        from ..kernels import Kernel
+
+        is_batch = x1.ndimension() == 3
+        if not is_batch:
+            x1 = x1.unsqueeze(0)
+            x2 = x2.unsqueeze(0)
+
+        # Tiles are evaluated in full - they should not be tiled themselves
+        with settings.max_kernel_tile_size(None):
+            res = super(Kernel, self.kernel).__call__(x1, x2, diag=False, batch_dims=None, **self.params)
+            if isinstance(res, LazyTensor):
+                res = res.evaluate()
+
+        if not is_batch and res.ndimension() == 3 and res.size(0) == 1:
+            res = res[0]
+        return res
+
+    def _matmul(self, rhs):
+        tile_size = self._tile_size()
+        num_rows = self.x1.size(-2)
+        res = []
+        for start in range(0, num_rows, tile_size):
+            length = min(tile_size, num_rows - start)
+            res.append(self._kernel_tile(self.x1.narrow(-2, start, length), self.x2).matmul(rhs))
+        return torch.cat(res, -2)
+
+    def _t_matmul(self, rhs):
+        tile_size = self._tile_size()
+        num_rows = self.x1.size(-2)
+        res = None
+        for start in range(0, num_rows, tile_size):
+            length = min(tile_size, num_rows - start)
+            tile = self._kernel_tile(self.x1.narrow(-2, start, length), self.x2)
+            tile_res = tile.transpose(-1, -2).matmul(rhs.narrow(-2, start, length))
+            res = tile_res if res is None else res + tile_res
+        return res
+
+    def _quad_form_derivative(self, left_vecs, right_vecs):
+        if left_vecs.ndimension() == 1:
+            left_vecs = left_vecs.unsqueeze(1)
+            right_vecs = right_vecs.unsqueeze(1)
+
+        hyperparameters = list(self.kernel.parameters())
+        x1_grad = torch.zeros_like(self.x1)
+        x2_grad = torch.zeros_like(self.x2)
+        hyperparameter_grads = [torch.zeros_like(param) for param in hyperparameters]
+
+        tile_size = self._tile_size()
+        num_rows = self.x1.size(-2)
+        # This is called from the backward pass of a (legacy) autograd Function, where the saved tensors have no
+        # graph. The tiles are recomputed from fresh leaf copies of the inputs, with grad mode explicitly enabled.
+        with torch.autograd.set_grad_enabled(True):
+            x2 = self.x2.detach().clone().requires_grad_(True)
+            for start in range(0, num_rows, tile_size):
+                length = min(tile_size, num_rows - start)
+                x1 = self.x1.narrow(-2, start, length).detach().clone().requires_grad_(True)
+                tile_res = self._kernel_tile(x1, x2).matmul(right_vecs.detach())
+                loss = (left_vecs.narrow(-2, start, length).detach() * tile_res).sum()
+
+                inputs = [x1, x2] + [param for param in hyperparameters if param.requires_grad]
+                grads = iter(torch.autograd.grad(loss, inputs, allow_unused=True))
+                x1_tile_grad = next(grads)
+                if x1_tile_grad is not None:
+                    x1_grad.narrow(-2, start, length).add_(x1_tile_grad)
+                x2_tile_grad = next(grads)
+                if x2_tile_grad is not None:
+                    x2_grad.add_(x2_tile_grad)
+                for param, param_grad in zip(hyperparameters, hyperparameter_grads):
+                    if param.requires_grad:
+                        tile_grad = next(grads)
+                        if tile_grad is not None:
+                            param_grad.add_(tile_grad)
+
+        return tuple([x1_grad, x2_grad] + hyperparameter_grads)
+
+    def _size(self):
+        return self.kernel.size(self.x1, self.x2)
+
+    def _transpose_nonbatch(self):
+        return self.__class__(self.x2, self.x1, *self._args[2:], **self._kwargs)
+
+    def _get_indices(self, left_indices, right_indices):
+        from .lazy_evaluated_kernel_tensor import LazyEvaluatedKernelTensor
+
+        return LazyEvaluatedKernelTensor(self.kernel, self.x1, self.x2, **self.params)._get_indices(
+            left_indices, right_indices
+        )
+
+    def diag(self):
+        from .lazy_evaluated_kernel_tensor import LazyEvaluatedKernelTensor
+
+        if self.size(-1) != self.size(-2):
+            raise RuntimeError("Diag works on square matrices (or batches)")
+        return LazyEvaluatedKernelTensor(self.kernel, self.x1, self.x2, **self.params).diag()
+
+    def evaluate(self):
+        tile_size = self._tile_size()
+        num_rows = self.x1.size(-2)
+        res = []
+        for start in range(0, num_rows, tile_size):
+            length = min(tile_size, num_rows - start)
+            res.append(self._kernel_tile(self.x1.narrow(-2, start, length), self.x2))
+        return torch.cat(res, -2)
+
+    def __getitem__(self, index):
+        index = list(index) if isinstance(index, tuple) else [index]
+        index += [slice(None, None, None)] * (self.ndimension() - len(index))
+        left_index, right_index = index[-2:]
+
+        # Batch indexing (which would also have to index the hyperparameters) is handled by the default method
+        is_batch = self.ndimension() == 3
+        if is_batch and not (isinstance(index[0], slice) and index[0] == slice(None, None, None)):
+            return super(TiledKernelLazyTensor, self).__getitem__(tuple(index))
+
+        # Special case: if both row and col are tensor indexed, then we use _get_indices
+        if torch.is_tensor(left_index) and torch.is_tensor(right_index) and not is_batch:
+            return self._get_indices(left_index, right_index)
+
+        squeeze_row = isinstance(left_index, int) or torch.is_tensor(left_index)
+        squeeze_col = isinstance(right_index, int) or torch.is_tensor(right_index)
+        if isinstance(left_index, int):
+            left_index = slice(left_index, left_index + 1, None)
+        if isinstance(right_index, int):
+            right_index = slice(right_index, right_index + 1, None)
+
+        x1 = self.x1[..., left_index, :]
+        x2 = self.x2[..., right_index, :]
+        res = self.__class__(x1, x2, *self._args[2:], **self._kwargs)
+        if squeeze_row or squeeze_col:
+            res = res.evaluate()
+            if squeeze_row:
+                res = res.squeeze(-2)
+            if squeeze_col:
+                res = res.squeeze(-1)
+        return res
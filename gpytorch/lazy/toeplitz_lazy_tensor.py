@@ -5,7 +5,16 @@ from __future__ import unicode_literals
 
 import torch
 from .lazy_tensor import LazyTensor
-from ..utils.toeplitz import sym_toeplitz_matmul, sym_toeplitz_derivative_quadratic_form
+from ..functions._toeplitz_inv_matmul import ToeplitzInvMatmul
+from ..functions._toeplitz_inv_quad_log_det import ToeplitzInvQuadLogDet
+from ..utils.toeplitz import (
+    circulant_eigenvalues,
+    circulant_inv_matmul,
+    sym_toeplitz_circulant_column,
+    sym_toeplitz_derivative_quadratic_form,
+    sym_toeplitz_matmul,
+)
+from .. import settings
 
 
 class ToeplitzLazyTensor(LazyTensor):
@@ -20,6 +29,24 @@ class ToeplitzLazyTensor(LazyTensor):
         # Matrix is symmetric
         return self._matmul(rhs)
 
+    def _circulant_eigenvalues(self):
+        # T. Chan's optimal circulant approximation
+        if not hasattr(self, "_circulant_eigenvalues_cache"):
+            self._circulant_eigenvalues_cache = circulant_eigenvalues(sym_toeplitz_circulant_column(self.column))
+        return self._circulant_eigenvalues_cache
+
+    def _preconditioner(self):
+        # The circulant preconditioner is opt-in (the default "cg" mode keeps unpreconditioned CG/SLQ)
+        if settings.toeplitz_inference.value() == "cg" or settings.max_preconditioner_size.value() == 0:
+            return None, None
+
+        eigenvalues = self._circulant_eigenvalues()
+
+        def precondition_closure(tensor):
+            return circulant_inv_matmul(eigenvalues, tensor)
+
+        return precondition_closure, eigenvalues.log().sum(-1)
+
     def _quad_form_derivative(self, left_vecs, right_vecs):
         if left_vecs.ndimension() == 1:
             left_vecs = left_vecs.unsqueeze(1)
@@ -49,11 +76,53 @@ class ToeplitzLazyTensor(LazyTensor):
         toeplitz_indices = (left_indices - right_indices).fmod(n_grid).abs().long()
         return self.column.index_select(0, toeplitz_indices)
 
+    def add_diag(self, added_diag):
+        # Adding a constant diagonal preserves the Toeplitz structure
+        if added_diag.dim() == 0 or (added_diag.size(-1) == 1 and added_diag.dim() <= self.column.dim()):
+            diag_term = self.column.narrow(-1, 0, 1) + added_diag.view(*added_diag.shape[:-1], 1)
+            return ToeplitzLazyTensor(torch.cat([diag_term, self.column.narrow(-1, 1, self.column.size(-1) - 1)], -1))
+        return super(ToeplitzLazyTensor, self).add_diag(added_diag)
+
     def add_jitter(self, jitter_val=1e-3):
         jitter = torch.zeros_like(self.column)
         jitter.narrow(-1, 0, 1).fill_(jitter_val)
         return ToeplitzLazyTensor(self.column.add(jitter))
 
+    def inv_matmul(self, tensor):
+        if settings.toeplitz_inference.value() != "exact":
+            return super(ToeplitzLazyTensor, self).inv_matmul(tensor)
+
+        if self.dim() != tensor.dim() and not (self.dim() == 2 and tensor.dim() == 1):
+            raise RuntimeError(
+                "LazyTensor (size={}) and right-hand-side Tensor (size={}) should have the same number "
+                "of dimensions.".format(self.shape, tensor.shape)
+            )
+        return ToeplitzInvMatmul()(tensor, self.column)
+
+    def inv_quad_log_det(self, inv_quad_rhs=None, log_det=False, reduce_inv_quad=True):
+        method = settings.toeplitz_inference.value()
+        if method == "cg" or not (inv_quad_rhs is not None or log_det):
+            return super(ToeplitzLazyTensor, self).inv_quad_log_det(
+                inv_quad_rhs=inv_quad_rhs, log_det=log_det, reduce_inv_quad=reduce_inv_quad
+            )
+
+        args = [self.column]
+        if inv_quad_rhs is not None:
+            if self.dim() != inv_quad_rhs.dim() and not (self.dim() == 2 and inv_quad_rhs.dim() == 1):
+                raise RuntimeError(
+                    "LazyTensor (size={}) and right-hand-side Tensor (size={}) should have the same number "
+                    "of dimensions.".format(self.shape, inv_quad_rhs.shape)
+                )
+            args = [inv_quad_rhs] + args
+
+        inv_quad_term, log_det_term = ToeplitzInvQuadLogDet(
+            method=method, inv_quad=(inv_quad_rhs is not None), log_det=log_det
+        )(*args)
+
+        if inv_quad_term.numel() and reduce_inv_quad:
+            inv_quad_term = inv_quad_term.sum(-1)
+        return inv_quad_term, log_det_term
+
     def diag(self):
         """
         Gets the diagonal of the Toeplitz matrix wrapped by this object.
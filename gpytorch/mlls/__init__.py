@@ -1,6 +1,12 @@
 from .marginal_log_likelihood import MarginalLogLikelihood
 from .exact_marginal_log_likelihood import ExactMarginalLogLikelihood
+from .leave_one_out_pseudo_likelihood import LeaveOneOutPseudoLikelihood
 from .variational_marginal_log_likelihood import VariationalMarginalLogLikelihood
 
 
-__all__ = ["MarginalLogLikelihood", "ExactMarginalLogLikelihood", "VariationalMarginalLogLikelihood"]
+__all__ = [
+    "MarginalLogLikelihood",
+    "ExactMarginalLogLikelihood",
+    "LeaveOneOutPseudoLikelihood",
+    "VariationalMarginalLogLikelihood",
+]
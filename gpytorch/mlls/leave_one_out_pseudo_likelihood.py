@@ -0,0 +1,65 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+from .marginal_log_likelihood import MarginalLogLikelihood
+from ..likelihoods import GaussianLikelihood
+from ..distributions import MultivariateNormal, MultitaskMultivariateNormal
+from ..functions import exact_loo_predictive
+
+
+class LeaveOneOutPseudoLikelihood(MarginalLogLikelihood):
+    def __init__(self, likelihood, model):
+        r"""
+        The leave-one-out (LOO) pseudo-likelihood of an exact GP - an alternative to the exact marginal log
+        likelihood for training the hyperparameters (Rasmussen and Williams, 2006, section 5.4.2):
+
+        .. math::
+
+            \frac{1}{n} \sum_i \log p(y_i \mid \mathbf y_{-i}) =
+            \frac{1}{n} \sum_i \log \mathcal N(y_i; \mu_{-i}, \sigma^2_{-i})
+
+        The LOO predictive means and variances of all of the observations are computed with a single solve
+        (see :func:`gpytorch.functions.exact_loo_predictive`).
+
+        Args:
+        - likelihood: (Likelihood) - the likelihood for the model
+        - model: (Module) - the exact GP model
+        """
+        if not isinstance(likelihood, GaussianLikelihood):
+            raise RuntimeError("Likelihood must be Gaussian for exact inference")
+        super(LeaveOneOutPseudoLikelihood, self).__init__(likelihood, model)
+
+    def forward(self, output, target):
+        if not isinstance(output, MultivariateNormal):
+            raise RuntimeError("LeaveOneOutPseudoLikelihood can only operate on Gaussian random variables")
+
+        output = self.likelihood(output)
+        mean, covar = output.mean, output.lazy_covariance_matrix
+        n_data = target.size(-1)
+
+        if target.size() != mean.size():
+            raise RuntimeError(
+                "Expected target size to equal mean size, but got {} and {}".format(target.size(), mean.size())
+            )
+
+        if isinstance(output, MultitaskMultivariateNormal):
+            if target.ndimension() == 2:
+                mean = mean.view(-1)
+                target = target.view(-1)
+            elif target.ndimension() == 3:
+                mean = mean.view(mean.size(0), -1)
+                target = target.view(target.size(0), -1)
+
+        loo_mean, loo_var = exact_loo_predictive(covar, mean, target)
+        res = -0.5 * ((target - loo_mean).pow(2).div(loo_var) + loo_var.log() + math.log(2 * math.pi)).sum(-1)
+
+        # Add log probs of priors on the parameters
+        for _, param, prior in self.named_parameter_priors():
+            res.add_(prior.log_prob(param).sum())
+        for _, prior, params, transform in self.named_derived_priors():
+            res.add_(prior.log_prob(transform(*params)).sum())
+
+        return res.div_(n_data)
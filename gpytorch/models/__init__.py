@@ -5,8 +5,20 @@ from __future__ import unicode_literals
 
 from .gp import GP
 from .exact_gp import ExactGP
+from .exact_gp_posterior import ExactGPPosterior
+from .pathwise_samples import PathwiseSamples
+from .prediction_server import PredictionServer
 from .variational_gp import VariationalGP
 from .grid_inducing_variational_gp import GridInducingVariationalGP
 from .additive_grid_inducing_variational_gp import AdditiveGridInducingVariationalGP
 
-__all__ = ["GP", "ExactGP", "VariationalGP", "GridInducingVariationalGP", "AdditiveGridInducingVariationalGP"]
+__all__ = [
+    "GP",
+    "ExactGP",
+    "ExactGPPosterior",
+    "PathwiseSamples",
+    "PredictionServer",
+    "VariationalGP",
+    "GridInducingVariationalGP",
+    "AdditiveGridInducingVariationalGP",
+]
@@ -6,8 +6,9 @@ from __future__ import unicode_literals
 import warnings
 import torch
 from ..module import Module
-from ..functions import exact_predictive_mean, exact_predictive_covar
+from ..functions import exact_loo_predictive, exact_predictive_mean, exact_predictive_covar, exact_predictive_var
 from ..distributions import MultivariateNormal, MultitaskMultivariateNormal
+from ..lazy import DiagLazyTensor
 from ..likelihoods import GaussianLikelihood
 from .. import settings
 
@@ -32,11 +33,13 @@ class ExactGP(Module):
 
         self.mean_cache = None
         self.covar_cache = None
+        self._cache_state = None
 
     def _apply(self, fn):
         if self.train_inputs is not None:
             self.train_inputs = tuple(fn(train_input) for train_input in self.train_inputs)
             self.train_targets = fn(self.train_targets)
+        self.clear_caches()
         return super(ExactGP, self)._apply(fn)
 
     def set_train_data(self, inputs=None, targets=None, strict=True):
@@ -55,14 +58,104 @@ class ExactGP(Module):
                 if strict and getattr(targets, attr) != getattr(self.train_targets, attr):
                     raise RuntimeError("Cannot modify {attr} of targets".format(attr=attr))
             self.train_targets = targets
+        self.clear_caches()
+
+    def _state(self):
+        # The version counters of the parameters (and of the training data) change with every in-place update -
+        # including the updates made by the optimizers and by Module.initialize. (Only writes through .data are
+        # not tracked.) This is cheap: no parameter values are copied or compared.
+        tensors = list(self.parameters())
+        if self.train_inputs is not None:
+            tensors.extend(self.train_inputs)
+            tensors.append(self.train_targets)
+        return [(id(tensor), tensor._version) for tensor in tensors]
+
+    def clear_caches(self):
+        """
+        Discards the prediction caches (see :meth:`precompute_caches`). They are recomputed by the next prediction.
+        """
         self.mean_cache = None
         self.covar_cache = None
+        self._cache_state = None
+
+    def precompute_caches(self):
+        """
+        Computes the prediction caches - the mean cache :math:`\\hat K_{XX}^{-1} (\\mathbf y - \\boldsymbol \\mu_X)`,
+        and (with :obj:`gpytorch.settings.fast_pred_var`) the LOVE covariance cache - so that the first prediction
+        is as fast as the following ones. Otherwise, the caches are computed by the first prediction.
+
+        The caches are kept when the model is switched between train and eval mode. They are recomputed
+        automatically (by the next prediction) if the hyperparameters or the training data change - through an
+        optimizer step, :meth:`~gpytorch.Module.initialize`, :meth:`set_train_data`, or any other in-place
+        operation. Call :meth:`clear_caches` after writing to a parameter's `.data` directly.
+
+        Returns:
+            :obj:`gpytorch.models.ExactGP`: the model (in eval mode)
+
+        Example:
+            >>> model.eval()
+            >>> with gpytorch.settings.fast_pred_var():
+            >>>     model.precompute_caches()
+            >>>     pred = likelihood(model(test_x))  # No solves with the training covariance
+        """
+        if self.train_inputs is None:
+            raise RuntimeError("precompute_caches requires training data. Call .set_train_data() first.")
+        self.eval()
+        with torch.no_grad(), settings.debug(False):
+            self(*(train_input[..., :1, :] for train_input in self.train_inputs))
+        return self
+
+    def posterior(self, cholesky=False, rank=None):
+        """
+        Returns the posterior of the (trained) model, with the training covariance factorized once, for making many
+        fast predictions. See :obj:`gpytorch.models.ExactGPPosterior`.
+
+        The model must be in eval mode. The posterior has to be recreated if the model changes.
+
+        Args:
+            :attr:`cholesky` (bool): compute the caches exactly, with a Cholesky factorization (required for
+                sliding windows of training data). Default: False.
+            :attr:`rank` (int, optional): the maximum rank of the (LOVE) covariance cache.
+                Default: :obj:`gpytorch.settings.max_root_decomposition_size`.
+
+        Returns:
+            :obj:`gpytorch.models.ExactGPPosterior`
+        """
+        from .exact_gp_posterior import ExactGPPosterior
+
+        return ExactGPPosterior(self, cholesky=cholesky, rank=rank)
+
+    def loo_predictions(self):
+        """
+        Returns the leave-one-out (LOO) predictive distributions of the training observations - the distribution
+        of each observation, conditioned on all of the other training observations (with the current
+        hyperparameters). All of them are computed with a single solve, rather than by refitting the model
+        :math:`n` times (see :func:`gpytorch.functions.exact_loo_predictive`).
 
-    def train(self, mode=True):
-        if mode:
-            self.mean_cache = None
-            self.covar_cache = None
-        return super(ExactGP, self).train(mode)
+        This works in train and in eval mode, and is differentiable with respect to the hyperparameters.
+        See :obj:`gpytorch.mlls.LeaveOneOutPseudoLikelihood` for the LOO training objective.
+
+        Returns:
+            :obj:`gpytorch.distributions.MultivariateNormal`: the LOO predictive means and variances (the
+            covariance is diagonal - only the marginals are meaningful)
+
+        Example:
+            >>> loo = model.loo_predictions()
+            >>> loo_mse = (loo.mean - model.train_targets).pow(2).mean()
+        """
+        if self.train_inputs is None:
+            raise RuntimeError("loo_predictions requires training data. Call .set_train_data() first.")
+        output = self.likelihood(super(ExactGP, self).__call__(*self.train_inputs))
+        mean, covar = output.mean, output.lazy_covariance_matrix
+
+        if isinstance(output, MultitaskMultivariateNormal):
+            flat_mean = mean.contiguous().view(*mean.shape[:-2], -1)
+            flat_targets = self.train_targets.contiguous().view(*self.train_targets.shape[:-2], -1)
+            loo_mean, loo_var = exact_loo_predictive(covar, flat_mean, flat_targets)
+            return MultitaskMultivariateNormal(loo_mean.view_as(mean), DiagLazyTensor(loo_var))
+
+        loo_mean, loo_var = exact_loo_predictive(covar, mean, self.train_targets)
+        return MultivariateNormal(loo_mean, DiagLazyTensor(loo_var))
 
     def __call__(self, *args, **kwargs):
         train_inputs = list(self.train_inputs) if self.train_inputs is not None else []
@@ -108,6 +201,12 @@ class ExactGP(Module):
                     raise RuntimeError("ExactGP.forward must return a MultivariateNormal")
             full_mean, full_covar = full_output.mean, full_output.lazy_covariance_matrix
 
+            # The caches are stale if the hyperparameters or the training data have changed since they were computed
+            state = self._state()
+            if self._cache_state != state:
+                self.mean_cache = None
+                self.covar_cache = None
+
             num_tasks = 1
             if isinstance(full_output, MultitaskMultivariateNormal):
                 num_tasks = full_output.num_tasks
@@ -153,15 +252,28 @@ class ExactGP(Module):
                 likelihood=self.likelihood,
                 precomputed_cache=self.mean_cache,
             )
-            predictive_covar, covar_cache = exact_predictive_covar(
-                full_covar=full_covar,
-                num_train=num_train,
-                likelihood=self.likelihood,
-                precomputed_cache=self.covar_cache,
-            )
+            if settings.diag_pred_covar.on() and num_tasks == 1:
+                predictive_var, covar_cache = exact_predictive_var(
+                    full_covar=full_covar,
+                    num_train=num_train,
+                    likelihood=self.likelihood,
+                    precomputed_cache=self.covar_cache,
+                )
+                predictive_covar = DiagLazyTensor(predictive_var)
+            else:
+                predictive_covar, covar_cache = exact_predictive_covar(
+                    full_covar=full_covar,
+                    num_train=num_train,
+                    likelihood=self.likelihood,
+                    precomputed_cache=self.covar_cache,
+                )
+                if settings.diag_pred_covar.on():
+                    # Multitask covariances are indexed by data points - so they are not computed in chunks
+                    predictive_covar = DiagLazyTensor(predictive_covar.diag())
 
             self.mean_cache = mean_cache
             self.covar_cache = covar_cache
+            self._cache_state = state
             if num_tasks > 1:
                 if train_targets.ndimension() == 2:
                     # Batch multitask
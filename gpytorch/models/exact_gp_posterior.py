@@ -0,0 +1,590 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+from ..module import Module
+from ..distributions import MultivariateNormal, MultitaskMultivariateNormal
+from ..functions import exact_predictive_var
+from ..lazy import DiagLazyTensor, LazyEvaluatedKernelTensor, LazyTensor, NonLazyTensor, RootLazyTensor
+from ..utils import num_chunk_rows
+from ..utils.cholesky import batch_potrf, batch_potrs
+from ..utils.eig import batch_symeig
+from ..utils.serialization import load_tensors, save_tensors
+from .pathwise_samples import PathwiseSamples
+from .. import settings
+
+
+def _householder_rotate(root, num_rows):
+    """
+    Rotates the columns of :attr:`root` (`n x r`, or `b x n x r`) with :attr:`num_rows` Householder reflections
+    :math:`Q`, so that the first :attr:`num_rows` rows of :math:`R Q` are zero outside of the first
+    :attr:`num_rows` columns. Returns :math:`R Q`.
+    """
+    root = root.clone()
+    for i in range(num_rows):
+        row = root[..., i, i:]
+        sign = torch.ones_like(row[..., :1]).masked_fill_(row[..., :1].lt(0), -1)
+        reflection = torch.cat([row[..., :1] + sign * row.norm(dim=-1, keepdim=True), row[..., 1:]], -1)
+        reflection = reflection.div(reflection.norm(dim=-1, keepdim=True).clamp(min=1e-30)).unsqueeze(-1)
+        columns = root[..., :, i:]
+        root[..., :, i:] = columns - columns.matmul(reflection).mul(2).matmul(reflection.transpose(-1, -2))
+    return root
+
+
+class ExactGPPosterior(object):
+    """
+    The posterior of a trained :obj:`gpytorch.models.ExactGP`, for making many predictions with a fixed model.
+    This is usually created with :meth:`gpytorch.models.ExactGP.posterior`.
+
+    All of the work that involves the training covariance matrix :math:`\\hat K_{XX} = K_{XX} + \\sigma^2 I` is done
+    once, when the posterior is created:
+
+    * the mean cache :math:`\\hat K_{XX}^{-1} (\\mathbf y - \\boldsymbol \\mu_X)` (with preconditioned CG), and
+    * the covariance cache :math:`R`, a low-rank root so that :math:`R R^\\top \\approx \\hat K_{XX}^{-1}`
+      (with Lanczos - see :obj:`gpytorch.settings.fast_pred_var`).
+
+    Each prediction then only evaluates the test/train cross-covariance :math:`K_{X^*X}` (once - for both the
+    predictive mean and the predictive covariance), and returns a lazy predictive covariance
+    :math:`K_{X^*X^*} - (K_{X^*X} R)(K_{X^*X} R)^\\top`. Computing the predictive variances only evaluates the
+    diagonal of :math:`K_{X^*X^*}`.
+
+    The predictive covariances are the same as the ones computed with :obj:`gpytorch.settings.fast_pred_var`
+    (LOVE). Their accuracy is controlled by the :attr:`rank` of the covariance cache, and can be checked against
+    the exact predictive variances with :meth:`variance_error`.
+
+    For kernels with structured kernel matrices, the caches are also projected onto the structure the first time
+    that the posterior is called (see :meth:`gpytorch.lazy.LazyTensor._exact_predictive_covar_inv_quad_form_cache`).
+    For example, for KISS-GP (:obj:`gpytorch.lazy.InterpolatedLazyTensor` kernel matrices), the caches become
+    :math:`K_{UU} W_X^\\top [\\boldsymbol \\alpha, R]`, so that the cost of a prediction does not depend on the
+    number of training points.
+
+    .. note::
+        The posterior is a snapshot of the model: it has to be recreated if the hyperparameters or the training
+        data change. The caches do not backpropagate to the hyperparameters (gradients with respect to the test
+        inputs are still computed).
+
+    Args:
+        :attr:`model` (:obj:`gpytorch.models.ExactGP`): a model (in eval mode) with training data
+        :attr:`cholesky` (bool): if True, the caches are computed exactly from a Cholesky factorization of
+            :math:`\\hat K_{XX}` instead (:math:`\\mathcal O(n^3)` time and :math:`\\mathcal O(n^2)` memory). This is
+            required for :meth:`remove_observations` and :meth:`update_window`. Default: False.
+        :attr:`rank` (int, optional): the maximum rank of the (Lanczos) covariance cache. Larger ranks give more
+            accurate predictive covariances. Default: :obj:`gpytorch.settings.max_root_decomposition_size`.
+
+    Very large test sets can be streamed through the posterior in chunks of bounded size with
+    :meth:`predict_chunks`.
+
+    The posterior can be saved with :meth:`save`, and loaded (e.g. memory-mapped by many worker processes) with
+    :meth:`load` - without recomputing the caches.
+
+    Example:
+        >>> model.eval()
+        >>> posterior = model.posterior()
+        >>> for test_x in queries:
+        >>>     pred = likelihood(posterior(test_x))  # Same as likelihood(model(test_x)), but faster
+        >>>     mean, var = pred.mean, pred.variance
+    """
+
+    def __init__(
+        self,
+        model,
+        train_inputs=None,
+        train_targets=None,
+        mean_cache=None,
+        covar_cache=None,
+        num_tasks=1,
+        num_updates=0,
+        cholesky=False,
+        rank=None,
+    ):
+        if model.training:
+            raise RuntimeError("ExactGPPosterior requires a model in eval mode. Call .eval() first.")
+        if train_inputs is None:
+            if model.train_inputs is None:
+                raise RuntimeError("ExactGPPosterior requires training data. Call .set_train_data() first.")
+            train_inputs = model.train_inputs
+            train_targets = model.train_targets
+
+        self.model = model
+        self.train_inputs = tuple(train_inputs)
+        self.train_targets = train_targets
+        self.num_tasks = num_tasks
+        # The number of low rank updates since the caches were last computed from scratch
+        self.num_updates = num_updates
+        self.cholesky = cholesky
+        self.rank = rank
+        # The caches, projected onto the structure of the test/train covariance (computed on the first call)
+        self._prediction_cache = None
+        if mean_cache is not None and covar_cache is not None:
+            self.mean_cache = mean_cache
+            self.covar_cache = covar_cache
+            return
+
+        train_output = model.likelihood(Module.__call__(model, *self.train_inputs))
+        self.num_tasks = train_output.num_tasks if isinstance(train_output, MultitaskMultivariateNormal) else 1
+        train_mean = self._flatten(train_output.mean)
+        train_train_covar = train_output.lazy_covariance_matrix
+
+        train_labels_offset = (self._flatten(self.train_targets) - train_mean).unsqueeze(-1)
+        if cholesky:
+            # K_XX^-1 = U^-1 U^-T, for the Cholesky factor K_XX = U^T U
+            with torch.no_grad():
+                train_train_chol = batch_potrf(train_train_covar.evaluate())
+                self.mean_cache = batch_potrs(train_labels_offset, train_train_chol)
+                self.covar_cache = batch_potrs(train_train_chol.transpose(-1, -2), train_train_chol)
+        else:
+            self.mean_cache = train_train_covar.inv_matmul(train_labels_offset).detach()
+            if rank is None:
+                rank = settings.max_root_decomposition_size.value()
+            with settings.max_root_decomposition_size(rank):
+                self.covar_cache = train_train_covar.root_inv_decomposition().detach()
+
+    def _flatten(self, tensor):
+        # Multitask means and targets are interleaved (n x t -> nt), like the multitask covariances
+        if self.num_tasks > 1:
+            tensor = tensor.contiguous().view(*tensor.shape[:-2], -1)
+        return tensor
+
+    @property
+    def num_train(self):
+        return self.mean_cache.size(-2)
+
+    def save(self, f):
+        """
+        Saves the posterior - the hyperparameters of the model (its `state_dict`), the training data, and the
+        caches - so that the posterior can be loaded (with :meth:`load`) without recomputing the caches.
+
+        Args:
+            :attr:`f` (str or file object): where to save the posterior
+        """
+        tensors = {"train_input_{}".format(i): train_input for i, train_input in enumerate(self.train_inputs)}
+        tensors.update(train_targets=self.train_targets, mean_cache=self.mean_cache, covar_cache=self.covar_cache)
+        metadata = {
+            "state_dict": self.model.state_dict(),
+            "num_train_inputs": len(self.train_inputs),
+            "num_tasks": self.num_tasks,
+            "num_updates": self.num_updates,
+            "cholesky": self.cholesky,
+            "rank": self.rank,
+        }
+        save_tensors(f, tensors, metadata)
+
+    @staticmethod
+    def load(model, f, mmap=False):
+        """
+        Loads a posterior that was saved with :meth:`save`. The saved hyperparameters are loaded into the
+        :attr:`model`.
+
+        With :attr:`mmap`, the training data and the caches are memory-mapped rather than read into memory: they
+        are only read from disk when they are used, and all of the processes that load the same file share the
+        same memory.
+
+        Args:
+            :attr:`model` (:obj:`gpytorch.models.ExactGP`): a model (in eval mode), of the same type as the model of
+                the saved posterior
+            :attr:`f` (str or file object): the saved posterior. Memory-mapping requires a file name.
+            :attr:`mmap` (bool): memory-map the training data and the caches. Default: False.
+
+        Returns:
+            :obj:`gpytorch.models.ExactGPPosterior`
+
+        Example:
+            >>> # Once, after training
+            >>> model.eval()
+            >>> model.posterior().save("posterior.pt")
+            >>> # In each worker process
+            >>> model = GPModel(None, None, gpytorch.likelihoods.GaussianLikelihood()).eval()
+            >>> posterior = gpytorch.models.ExactGPPosterior.load(model, "posterior.pt", mmap=True)
+        """
+        if model.training:
+            raise RuntimeError("ExactGPPosterior requires a model in eval mode. Call .eval() first.")
+        tensors, metadata = load_tensors(f, mmap=mmap)
+        model.load_state_dict(metadata["state_dict"])
+        return ExactGPPosterior(
+            model,
+            tuple(tensors["train_input_{}".format(i)] for i in range(metadata["num_train_inputs"])),
+            tensors["train_targets"],
+            mean_cache=tensors["mean_cache"],
+            covar_cache=tensors["covar_cache"],
+            num_tasks=metadata["num_tasks"],
+            num_updates=metadata["num_updates"],
+            cholesky=metadata["cholesky"],
+            rank=metadata["rank"],
+        )
+
+    def _to_tensor(self, input):
+        return torch.as_tensor(input, dtype=self.train_inputs[0].dtype, device=self.train_inputs[0].device)
+
+    def predict_chunks(self, *inputs, **kwargs):
+        """
+        Streams the predictive means and variances of a (possibly very large) set of test points, in chunks.
+        Only one chunk of the test/train cross-covariance is in memory at a time, and all chunks use the caches of
+        this posterior. No gradients are computed.
+
+        Args:
+            :attr:`inputs`: the test inputs. Either Tensors (`t x d` or `b x t x d`), arrays that can be sliced and
+                converted with `torch.as_tensor` (e.g. a `numpy.memmap`), or a single iterator over chunks
+                (Tensors/arrays, or tuples of them for models with several inputs).
+            :attr:`chunk_size` (int, optional): the (maximum) number of test points per chunk. Default: the number
+                of points whose cross-covariance has :obj:`gpytorch.settings.max_kernel_tile_size` entries
+                (or :math:`2^{24}` entries, if that setting is not used).
+
+        Yields:
+            (Tensor, Tensor): the predictive mean and the predictive variance of the next chunk of test points
+            (of the latent function - the observation noise is not added).
+
+        Example:
+            >>> test_x = numpy.memmap("grid.dat", dtype="float32", mode="r", shape=(50000000, 2))
+            >>> for i, (mean, var) in enumerate(model.posterior().predict_chunks(test_x, chunk_size=10000)):
+            >>>     save(i, mean, var)
+        """
+        chunk_size = kwargs.pop("chunk_size", None)
+        if chunk_size is None:
+            chunk_size = num_chunk_rows(self.num_train)
+        if kwargs:
+            raise RuntimeError("Unexpected keyword arguments: {}".format(", ".join(kwargs)))
+
+        if len(inputs) == 1 and not torch.is_tensor(inputs[0]) and not hasattr(inputs[0], "shape"):
+            # An iterator over chunks (which might be too large themselves)
+            input_chunks = (chunk if isinstance(chunk, (tuple, list)) else (chunk,) for chunk in inputs[0])
+        else:
+            input_chunks = (inputs,)
+
+        with torch.no_grad():
+            for input_chunk in input_chunks:
+                # The data dimension is the first dimension of vectors, and the second-to-last dimension otherwise
+                data_dim = 0 if len(input_chunk[0].shape) == 1 else len(input_chunk[0].shape) - 2
+                num_data = input_chunk[0].shape[data_dim]
+                for start in range(0, num_data, chunk_size):
+                    index = (slice(None),) * data_dim + (slice(start, start + chunk_size),)
+                    output = self(*[self._to_tensor(input[index]) for input in input_chunk])
+                    yield output.mean, output.variance
+
+    def _joint_prior(self, train_inputs, inputs, **kwargs):
+        """
+        The (lazy) joint prior of the training points and the given inputs.
+        Returns the prior, its (flattened) mean, and the input/train and input/input blocks of its covariance.
+        """
+        inputs = tuple(i.unsqueeze(-1) if i.ndimension() == 1 else i for i in inputs)
+
+        # If the inputs and the training data have different batch modes, expand the one that is not batch
+        full_inputs = []
+        for train_input, input in zip(train_inputs, inputs):
+            if train_input.dim() < input.dim():
+                train_input = train_input.unsqueeze(0).expand(input.size(0), *train_input.size())
+            elif input.dim() < train_input.dim():
+                input = input.unsqueeze(0).expand(train_input.size(0), *input.size())
+            full_inputs.append(torch.cat([train_input, input], dim=-2))
+
+        # The joint prior is lazy - only the blocks that involve the inputs are evaluated
+        full_output = Module.__call__(self.model, *full_inputs, **kwargs)
+        if not isinstance(full_output, MultivariateNormal):
+            raise RuntimeError("ExactGP.forward must return a MultivariateNormal")
+        full_mean, full_covar = self._flatten(full_output.mean), full_output.lazy_covariance_matrix
+
+        # (Multitask kernel matrices are indexed by data points, rather than by rows)
+        num_train = train_inputs[0].size(-2)
+        if full_covar.ndimension() == 3:
+            input_train_covar = full_covar[:, num_train:, :num_train]
+            input_covar = full_covar[:, num_train:, num_train:]
+        else:
+            input_train_covar = full_covar[num_train:, :num_train]
+            input_covar = full_covar[num_train:, num_train:]
+        return full_output, full_mean, input_train_covar, input_covar
+
+    def _expand_caches(self, batch_size):
+        mean_cache, covar_cache = self.mean_cache, self.covar_cache
+        if mean_cache.ndimension() == 2:
+            mean_cache = mean_cache.unsqueeze(0).expand(batch_size, *mean_cache.shape)
+            covar_cache = covar_cache.unsqueeze(0).expand(batch_size, *covar_cache.shape)
+        return mean_cache, covar_cache
+
+    def add_observations(self, inputs, targets):
+        r"""
+        Returns a new posterior, that is also conditioned on some additional observations (e.g. fantasies).
+        The caches are updated with a rank-:math:`k` update (for :math:`k` new observations) - the training
+        covariance is not factorized again:
+
+        .. math::
+
+            \begin{pmatrix} \hat K_{XX} & K_{XZ} \\ K_{ZX} & \hat K_{ZZ} \end{pmatrix}^{-1} =
+            \begin{pmatrix} \hat K_{XX}^{-1} + B S^{-1} B^\top & -B S^{-1} \\ -S^{-1} B^\top & S^{-1}
+            \end{pmatrix}
+
+        where :math:`B = \hat K_{XX}^{-1} K_{XZ}` and the Schur complement :math:`S = \hat K_{ZZ} - K_{ZX} B`
+        are computed with the covariance cache :math:`R` (:math:`\hat K_{XX}^{-1} \approx R R^\top`).
+        The cost is :math:`\mathcal O(nk(r + k))` for a rank-:math:`r` covariance cache, plus the evaluation of
+        :math:`K_{ZX}`. The updated caches are as accurate as the covariance cache (which can be improved with
+        :obj:`gpytorch.settings.max_root_decomposition_size`).
+
+        The hyperparameters of the model are not changed. Multitask models are not supported.
+
+        Args:
+            :attr:`inputs` (Tensor `k x d` or `f x k x d`, or a tuple of them): the inputs of the new observations
+            :attr:`targets` (Tensor `k` or `f x k`): the new observations. If the targets (or the inputs) have a
+                batch dimension `f`, this returns a batch of `f` posteriors - one for each fantasy.
+
+        Returns:
+            :obj:`gpytorch.models.ExactGPPosterior`: the updated posterior
+
+        Example:
+            >>> posterior = model.posterior()
+            >>> # Lookahead: 16 fantasized observations at a candidate point
+            >>> fantasies = likelihood(posterior(candidate_x)).sample(torch.Size((16,)))
+            >>> fantasy_posterior = posterior.add_observations(candidate_x, fantasies)
+            >>> fantasy_posterior(test_x).variance  # 16 x t
+        """
+        if self.num_tasks > 1:
+            raise RuntimeError("add_observations does not support multitask models.")
+        if torch.is_tensor(inputs):
+            inputs = (inputs,)
+        inputs = tuple(i.unsqueeze(-1) if i.ndimension() == 1 else i for i in inputs)
+
+        # Fantasies: add a batch dimension to the training data, and to the caches
+        train_inputs, train_targets = list(self.train_inputs), self.train_targets
+        is_batch = targets.dim() > 1 or any(input.dim() > 2 for input in inputs) or train_targets.dim() > 1
+        if is_batch:
+            batch_size = targets.size(0) if targets.dim() > 1 else inputs[0].size(0)
+            if targets.dim() == 1:
+                targets = targets.unsqueeze(0).expand(batch_size, targets.size(-1))
+            if train_targets.dim() == 1:
+                train_targets = train_targets.unsqueeze(0).expand(batch_size, train_targets.size(-1))
+                train_inputs = [
+                    train_input.unsqueeze(0).expand(batch_size, *train_input.shape) for train_input in train_inputs
+                ]
+            inputs = [
+                input.unsqueeze(0).expand(batch_size, *input.shape) if input.dim() == 2 else input for input in inputs
+            ]
+            mean_cache, covar_cache = self._expand_caches(batch_size)
+        else:
+            mean_cache, covar_cache = self.mean_cache, self.covar_cache
+
+        with torch.no_grad():
+            _, full_mean, new_train_covar, new_covar = self._joint_prior(train_inputs, inputs)
+            new_mean = full_mean[..., self.num_train:]
+
+            # B = K_XX^-1 K_XZ ~= R R^T K_XZ, and the Schur complement S = K_ZZ + sigma^2 I - K_ZX B
+            # S is the noise plus the posterior covariance of the new points - which is made PSD (as the
+            # low rank approximation can make it slightly indefinite)
+            new_train_root = new_train_covar.matmul(covar_cache)
+            train_new_solve = covar_cache.matmul(new_train_root.transpose(-1, -2))
+            new_posterior_covar = new_covar.evaluate() - new_train_root.matmul(new_train_root.transpose(-1, -2))
+            evals, evecs = batch_symeig(new_posterior_covar)
+            new_posterior_covar = (evecs * evals.unsqueeze(-2)).matmul(evecs.transpose(-1, -2))
+            new_output = self.model.likelihood(MultivariateNormal(new_mean, NonLazyTensor(new_posterior_covar)))
+            new_mean, schur_complement = new_output.mean, new_output.lazy_covariance_matrix.evaluate()
+            schur_chol = batch_potrf(schur_complement)
+            schur_inv_root = batch_potrs(schur_chol.transpose(-1, -2), schur_chol)
+
+            # The new root of the inverse: [[R, -B S^-1/2], [0, S^-1/2]]
+            zeros = torch.zeros(
+                *schur_inv_root.shape[:-1], covar_cache.size(-1), dtype=covar_cache.dtype, device=covar_cache.device
+            )
+            new_covar_cache = torch.cat([
+                torch.cat([covar_cache, train_new_solve.matmul(schur_inv_root).mul(-1)], -1),
+                torch.cat([zeros, schur_inv_root], -1),
+            ], -2)
+
+            # The new mean cache: [alpha - B S^-1 d, S^-1 d] with d = (y_Z - mu_Z) - K_ZX alpha
+            residual = (targets - new_mean).unsqueeze(-1) - new_train_covar.matmul(mean_cache)
+            residual_solve = schur_inv_root.matmul(schur_inv_root.transpose(-1, -2).matmul(residual))
+            new_mean_cache = torch.cat([mean_cache - train_new_solve.matmul(residual_solve), residual_solve], -2)
+
+        new_train_inputs = tuple(
+            torch.cat([train_input, input], dim=-2) for train_input, input in zip(train_inputs, inputs)
+        )
+        new_train_targets = torch.cat([train_targets, targets], dim=-1)
+        return ExactGPPosterior(
+            self.model,
+            new_train_inputs,
+            new_train_targets,
+            mean_cache=new_mean_cache,
+            covar_cache=new_covar_cache,
+            num_updates=self.num_updates + 1,
+            cholesky=self.cholesky,
+            rank=self.rank,
+        )
+
+    def _check_downdate(self, method_name):
+        # The Lanczos root only approximates the inverse training covariance on the subspace that matters for
+        # predictions - so downdating it silently gives wrong predictions
+        if not self.cholesky:
+            raise RuntimeError(
+                "{} requires an exact covariance cache. Create the posterior with cholesky=True.".format(method_name)
+            )
+
+    def remove_observations(self, num_observations):
+        r"""
+        Returns a new posterior, without the oldest (i.e. the first) :attr:`num_observations` training points.
+        The caches are downdated - the remaining training covariance is not factorized again.
+
+        With :math:`P = \hat K_{XX}^{-1} = R R^\top`, the inverse of the training covariance of the remaining
+        points (2) is :math:`P_{22} - P_{21} P_{11}^{-1} P_{12}`. The columns of the root are rotated (with
+        :math:`k` Householder reflections :math:`Q`) so that the rows of the removed points (1) are zero outside
+        of the first :math:`k` columns: :math:`R_1 Q = (T, 0)`. The downdated root is then :math:`R_2 Q` without
+        its first :math:`k` columns, and the mean cache becomes
+        :math:`\boldsymbol \alpha_2 - (R_2 Q)_{:, :k} T^{-1} \boldsymbol \alpha_1`.
+        The cost is :math:`\mathcal O(nrk)` for a rank-:math:`r` covariance cache.
+
+        .. note::
+            This requires a covariance cache that is an accurate inverse of the training covariance in all
+            directions - i.e. a posterior created with `cholesky=True`. (The Lanczos root only approximates
+            :math:`\hat K_{XX}^{-1}` on the subspace that matters for predictions.)
+
+        Args:
+            :attr:`num_observations` (int): the number of (oldest) training points to remove
+
+        Returns:
+            :obj:`gpytorch.models.ExactGPPosterior`: the downdated posterior
+        """
+        if self.num_tasks > 1:
+            raise RuntimeError("remove_observations does not support multitask models.")
+        if num_observations <= 0:
+            return self
+        if num_observations >= self.num_train:
+            raise RuntimeError(
+                "Cannot remove {} of the {} training points.".format(num_observations, self.num_train)
+            )
+        self._check_downdate("remove_observations")
+
+        with torch.no_grad():
+            root = _householder_rotate(self.covar_cache, num_observations)
+            removed_root = root[..., :num_observations, :num_observations]
+            cross_root = root[..., num_observations:, :num_observations]
+
+            # P_21 P_11^-1 alpha_1 = (R_2 Q)_{:, :k} T^-1 alpha_1, with T^-1 = T^T (T T^T)^-1
+            removed_mean_cache = self.mean_cache[..., :num_observations, :]
+            removed_solve = removed_root.transpose(-1, -2).matmul(
+                batch_potrs(removed_mean_cache, removed_root.transpose(-1, -2))
+            )
+            new_mean_cache = self.mean_cache[..., num_observations:, :] - cross_root.matmul(removed_solve)
+            new_covar_cache = root[..., num_observations:, num_observations:].contiguous()
+
+        return ExactGPPosterior(
+            self.model,
+            tuple(train_input[..., num_observations:, :] for train_input in self.train_inputs),
+            self.train_targets[..., num_observations:],
+            mean_cache=new_mean_cache,
+            covar_cache=new_covar_cache,
+            num_updates=self.num_updates + 1,
+            cholesky=self.cholesky,
+            rank=self.rank,
+        )
+
+    def update_window(self, inputs, targets, window_size, refresh_every=None):
+        r"""
+        A sliding window of training data: returns a new posterior, with the new observations appended, and the
+        oldest training points removed - so that there are (at most) :attr:`window_size` training points.
+        The caches are updated and downdated with low rank updates (see :meth:`add_observations` and
+        :meth:`remove_observations`), which take :math:`\mathcal O(nk(r + k))` time for :math:`k` new
+        observations - rather than refactorizing the training covariance. Removing observations requires a posterior
+        that was created with `cholesky=True` (so :math:`r = n`, and the cost is :math:`\mathcal O(n^2 k)` rather
+        than :math:`\mathcal O(n^3)`).
+
+        As the roundoff errors of the updates accumulate, the caches are recomputed from scratch every
+        :attr:`refresh_every` updates.
+
+        Args:
+            :attr:`inputs` (Tensor `k x d`, or a tuple of them): the inputs of the new observations
+            :attr:`targets` (Tensor `k`): the new observations
+            :attr:`window_size` (int): the maximum number of training points
+            :attr:`refresh_every` (int, optional): the number of low rank updates after which the caches are
+                recomputed from scratch. Default: never.
+
+        Returns:
+            :obj:`gpytorch.models.ExactGPPosterior`: the updated posterior
+
+        Example:
+            >>> posterior = model.posterior(cholesky=True)
+            >>> for x, y in sensor_stream:
+            >>>     posterior = posterior.update_window(x, y, window_size=5000, refresh_every=1000)
+            >>>     pred = posterior(forecast_x)
+        """
+        self._check_downdate("update_window")
+        res = self.add_observations(inputs, targets)
+        res = res.remove_observations(res.num_train - window_size)
+        if refresh_every is not None and res.num_updates >= refresh_every:
+            res = ExactGPPosterior(
+                self.model, res.train_inputs, res.train_targets, cholesky=self.cholesky, rank=self.rank
+            )
+        return res
+
+    def sample_paths(self, num_samples, num_features=1024):
+        """
+        Draws sample functions from the posterior, with pathwise conditioning. The sample functions can be evaluated
+        at any number of test points, in time that is linear in the number of test points.
+        See :obj:`gpytorch.models.PathwiseSamples`.
+
+        Args:
+            :attr:`num_samples` (int): the number of sample functions
+            :attr:`num_features` (int): the number of random Fourier frequencies for the prior samples. Default: 1024.
+
+        Returns:
+            :obj:`gpytorch.models.PathwiseSamples`
+        """
+        return PathwiseSamples(self, num_samples, num_features=num_features)
+
+    def _predictive_root(self, test_train_covar):
+        # Computes K_X*X [alpha, R] - with the caches projected onto the structure of K_X*X (e.g. for KISS-GP)
+        caches = torch.cat([self.mean_cache, self.covar_cache], -1)
+        if caches.ndimension() < test_train_covar.ndimension():
+            caches = caches.unsqueeze(0).expand(test_train_covar.size(0), *caches.shape)
+        if isinstance(test_train_covar, LazyEvaluatedKernelTensor):
+            test_train_covar = test_train_covar.evaluate_kernel()
+        if not isinstance(test_train_covar, LazyTensor):
+            return test_train_covar.matmul(caches)
+
+        cache_key = (test_train_covar.__class__, caches.shape)
+        if self._prediction_cache is None or self._prediction_cache[0] != cache_key:
+            with torch.no_grad():
+                cache = test_train_covar._exact_predictive_covar_inv_quad_form_cache(caches, test_train_covar)
+            self._prediction_cache = cache_key, cache
+        return test_train_covar._exact_predictive_covar_inv_quad_form_root(self._prediction_cache[1], test_train_covar)
+
+    def variance_error(self, inputs):
+        """
+        Compares the predictive variances of the posterior (e.g. with a low rank LOVE covariance cache) with the
+        exact predictive variances (computed with CG, in chunks - see
+        :func:`gpytorch.functions.exact_predictive_var`), at some (held out) inputs.
+
+        Args:
+            :attr:`inputs` (Tensor `t x d`, or a tuple of them): the inputs
+
+        Returns:
+            dict: the `max_abs_error`, `mean_abs_error` and `max_rel_error` of the predictive variances
+        """
+        if torch.is_tensor(inputs):
+            inputs = (inputs,)
+        with torch.no_grad(), settings.fast_pred_var(False):
+            res = self(*inputs).variance
+            full_output, _, _, _ = self._joint_prior(self.train_inputs, inputs)
+            # (Multitask kernel matrices are indexed by data points, rather than by rows)
+            num_train = self.train_inputs[0].size(-2)
+            actual, _ = exact_predictive_var(full_output.lazy_covariance_matrix, num_train, self.model.likelihood)
+            actual = actual.view_as(res)
+        errors = (res - actual).abs()
+        return {
+            "max_abs_error": errors.max().item(),
+            "mean_abs_error": errors.mean().item(),
+            "max_rel_error": errors.div(actual.abs().clamp(min=1e-10)).max().item(),
+        }
+
+    def __call__(self, *args, **kwargs):
+        full_output, full_mean, test_train_covar, test_test_covar = self._joint_prior(
+            self.train_inputs, args, **kwargs
+        )
+        test_mean = full_mean[..., self.num_train:]
+
+        # One pass over K_X*X for both the mean and the covariance root
+        res = self._predictive_root(test_train_covar)
+
+        predictive_mean = res[..., 0] + test_mean
+        if settings.diag_pred_covar.on():
+            predictive_covar = DiagLazyTensor(test_test_covar.diag() - res[..., 1:].pow(2).sum(-1))
+        else:
+            predictive_covar = test_test_covar + RootLazyTensor(res[..., 1:]).mul(-1)
+        if self.num_tasks > 1:
+            predictive_mean = predictive_mean.view(*predictive_mean.shape[:-1], -1, self.num_tasks).contiguous()
+        return full_output.__class__(predictive_mean, predictive_covar)
@@ -9,8 +9,9 @@ from ..lazy import DiagLazyTensor, InterpolatedLazyTensor
 from ..variational import MVNVariationalStrategy
 from ..kernels.kernel import Kernel
 from ..kernels.grid_kernel import GridKernel
+from ..utils.grid import create_grid, create_data_from_grid, is_uniform_grid
 from ..utils.interpolation import Interpolation, left_interp
-from .. import beta_features
+from .. import beta_features, settings
 from .abstract_variational_gp import AbstractVariationalGP
 
 
@@ -19,28 +20,20 @@ class GridInducingVariationalGP(AbstractVariationalGP):
         self._grid_mode = True
         self._kernels = set()
 
-        grid = torch.zeros(grid_size, len(grid_bounds))
-        for i in range(len(grid_bounds)):
-            grid_diff = float(grid_bounds[i][1] - grid_bounds[i][0]) / (grid_size - 2)
-            grid[:, i] = torch.linspace(grid_bounds[i][0] - grid_diff, grid_bounds[i][1] + grid_diff, grid_size)
-
-        inducing_points = torch.zeros(int(pow(grid_size, len(grid_bounds))), len(grid_bounds))
-        prev_points = None
-        for i in range(len(grid_bounds)):
-            for j in range(grid_size):
-                inducing_points[j * grid_size ** i : (j + 1) * grid_size ** i, i].fill_(grid[j, i])
-                if prev_points is not None:
-                    inducing_points[j * grid_size ** i : (j + 1) * grid_size ** i, :i].copy_(prev_points)
-            prev_points = inducing_points[: grid_size ** (i + 1), : (i + 1)]
+        grid = torch.stack(create_grid(grid_size, grid_bounds), -1)
+        inducing_points = create_data_from_grid(grid)
 
         super(GridInducingVariationalGP, self).__init__(inducing_points)
         self.register_buffer("grid", grid)
+        self._uniform_grid_dims = [is_uniform_grid(dim_grid) for dim_grid in grid.unbind(-1)]
 
     def _compute_grid(self, inputs):
         if inputs.ndimension() == 1:
             inputs = inputs.unsqueeze(1)
 
-        interp_indices, interp_values = Interpolation().interpolate(self.grid, inputs)
+        interp_indices, interp_values = Interpolation().interpolate(
+            self.grid, inputs, uniform_grid_dims=self._uniform_grid_dims
+        )
         return interp_indices, interp_values
 
     def _initalize_variational_parameters(self, prior_output):
@@ -92,6 +85,10 @@ class GridInducingVariationalGP(AbstractVariationalGP):
             variational_output.lazy_covariance_matrix, interp_indices, interp_values, interp_indices, interp_values
         )
 
+        # Only the variances
+        if settings.diag_pred_covar.on() and not self.training:
+            test_covar = DiagLazyTensor(test_covar.diag())
+
         # Diagonal correction
         if beta_features.diagonal_correction.on():
             from ..lazy import AddedDiagLazyTensor
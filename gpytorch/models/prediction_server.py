@@ -0,0 +1,211 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+import collections
+import time
+import torch
+from .exact_gp import ExactGP
+from .exact_gp_posterior import ExactGPPosterior
+from .. import settings
+
+
+class PredictionServer(object):
+    """
+    Serves the predictions of a (trained) model to many concurrent callers, with an asyncio request queue.
+    Concurrent prediction requests are coalesced into a single batched call of the model: the server waits at
+    most :attr:`max_latency` seconds for more requests after the first request of a batch arrives (or until there
+    are :attr:`max_batch_size` test points). This amortizes the (Python) overhead of each call of the model - the
+    kernel calls, the lazy tensors, etc. - over all of the requests in the batch.
+
+    For :obj:`gpytorch.models.ExactGP` models, the predictions are made with the model's
+    :obj:`gpytorch.models.ExactGPPosterior`, which is created once (when the server is created). The predictive
+    variances are computed with :obj:`gpytorch.settings.diag_pred_covar`.
+
+    The predictions are computed in the event loop (i.e. the event loop is blocked while a batch is predicted -
+    the requests that arrive in the meantime make up the next batch).
+
+    Args:
+        :attr:`model` (:obj:`gpytorch.models.ExactGP`, :obj:`gpytorch.models.ExactGPPosterior`, or a variational
+            model): the model, in eval mode
+        :attr:`likelihood` (:obj:`gpytorch.likelihoods.Likelihood`, optional): if given, the predictions are the
+            predictive distributions of the observations (rather than of the latent function)
+        :attr:`max_batch_size` (int): the maximum number of test points in a batch. Default: 128.
+        :attr:`max_latency` (float): the maximum time (in seconds) that a request waits for other requests to
+            arrive. Default: 0.002.
+        :attr:`max_latency_samples` (int): the number of (most recent) request latencies that are kept for the
+            latency metrics. Default: 10000.
+
+    Example:
+        >>> model.eval()
+        >>> server = gpytorch.models.PredictionServer(model, likelihood, max_latency=0.005)
+        >>> async def handle(x):
+        >>>     mean, variance = await server.predict(x)  # x is a single point (Tensor d)
+        >>>     ...
+        >>> async def main():
+        >>>     async with server:
+        >>>         await asyncio.gather(*[handle(x) for x in requests])
+        >>>     print(server.metrics())
+        >>> asyncio.get_event_loop().run_until_complete(main())
+    """
+
+    def __init__(self, model, likelihood=None, max_batch_size=128, max_latency=0.002, max_latency_samples=10000):
+        if isinstance(model, ExactGP):
+            predictor = model.posterior()
+        elif isinstance(model, ExactGPPosterior):
+            predictor = model
+        elif model.training:
+            raise RuntimeError("PredictionServer requires a model in eval mode. Call .eval() first.")
+        else:
+            predictor = model
+
+        self.model = model
+        self.likelihood = likelihood
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._predictor = predictor
+        self._queue = None
+        self._worker = None
+        # The requests that have been taken off the queue, but have not been predicted yet
+        self._batch = []
+
+        self.num_requests = 0
+        self.num_batches = 0
+        self._latencies = collections.deque(maxlen=max_latency_samples)
+        self._busy_time = 0.
+        self._start_time = None
+
+    def start(self):
+        """
+        Starts serving requests (in the running event loop).
+        """
+        if self._worker is not None:
+            raise RuntimeError("The PredictionServer has already been started.")
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.ensure_future(self._serve())
+        self._start_time = time.perf_counter()
+
+    async def stop(self):
+        """
+        Stops serving requests. Requests that have not been predicted yet (including the requests of a batch that
+        is still waiting for more requests) are cancelled.
+        """
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        for _, future, _ in self._batch:
+            future.cancel()
+        self._batch = []
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            future.cancel()
+        self._worker = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    async def predict(self, x):
+        """
+        Predicts the mean and the variance at the test point(s) :attr:`x`.
+
+        Args:
+            :attr:`x` (Tensor `d` or `k x d`): a single test point, or `k` test points
+
+        Returns:
+            (Tensor, Tensor): the predictive mean and variance - of size `1` (for a single test point) or `k`
+            (for multitask models: `t` or `k x t`)
+        """
+        if self._worker is None:
+            raise RuntimeError("The PredictionServer is not running. Call .start() first.")
+        is_single_point = x.dim() <= 1
+        if is_single_point:
+            x = x.view(1, -1)
+        future = asyncio.get_event_loop().create_future()
+        self._queue.put_nowait((x, future, time.perf_counter()))
+        mean, variance = await future
+        if is_single_point:
+            mean, variance = mean[0], variance[0]
+        return mean, variance
+
+    async def _serve(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            self._batch = [await self._queue.get()]
+            num_points = self._batch[0][0].size(0)
+            deadline = loop.time() + self.max_latency
+            while num_points < self.max_batch_size:
+                timeout = deadline - loop.time()
+                try:
+                    if timeout > 0:
+                        request = await asyncio.wait_for(self._queue.get(), timeout)
+                    else:
+                        request = self._queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                self._batch.append(request)
+                num_points += request[0].size(0)
+            requests, self._batch = self._batch, []
+            self._predict_batch(requests)
+
+    def _predict_batch(self, requests):
+        start_time = time.perf_counter()
+        try:
+            with torch.no_grad(), settings.diag_pred_covar():
+                output = self._predictor(torch.cat([x for x, _, _ in requests], 0))
+                if self.likelihood is not None:
+                    output = self.likelihood(output)
+                mean, variance = output.mean, output.variance
+        except Exception as e:
+            for _, future, _ in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        end_time = time.perf_counter()
+        self.num_batches += 1
+        self._busy_time += end_time - start_time
+        offset = 0
+        for x, future, request_time in requests:
+            if not future.done():
+                future.set_result((mean[offset:offset + x.size(0)], variance[offset:offset + x.size(0)]))
+            offset += x.size(0)
+            self.num_requests += 1
+            self._latencies.append(end_time - request_time)
+
+    def metrics(self):
+        """
+        Returns the latency (from the arrival of a request until its prediction, in seconds) and throughput
+        metrics of the server, as a dict:
+
+        * `num_requests`, `num_batches` and `mean_batch_size` (the mean number of requests per batch)
+        * `throughput` (requests per second, since the server was started)
+        * `utilization` (the fraction of the time spent predicting)
+        * `latency_mean`, `latency_p50`, `latency_p99` and `latency_max` (of the most recent requests)
+        """
+        elapsed_time = time.perf_counter() - self._start_time if self._start_time is not None else 0.
+        latencies = sorted(self._latencies)
+        res = {
+            "num_requests": self.num_requests,
+            "num_batches": self.num_batches,
+            "mean_batch_size": self.num_requests / max(self.num_batches, 1),
+            "throughput": self.num_requests / elapsed_time if elapsed_time > 0 else 0.,
+            "utilization": self._busy_time / elapsed_time if elapsed_time > 0 else 0.,
+        }
+        if latencies:
+            res.update(
+                latency_mean=sum(latencies) / len(latencies),
+                latency_p50=latencies[(len(latencies) - 1) // 2],
+                latency_p99=latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)],
+                latency_max=latencies[-1],
+            )
+        return res
@@ -4,10 +4,11 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import torch
-from .. import beta_features
+from .. import settings
 from ..functions import inv_matmul
 from ..distributions import MultivariateNormal
-from ..lazy import RootLazyTensor, MatmulLazyTensor
+from ..lazy import DiagLazyTensor, RootLazyTensor, MatmulLazyTensor
+from ..utils import num_chunk_rows
 from ..variational import MVNVariationalStrategy
 from .abstract_variational_gp import AbstractVariationalGP
 
@@ -27,6 +28,29 @@ class VariationalGP(AbstractVariationalGP):
             self.has_computed_root = False
         return super(VariationalGP, self).train(mode)
 
+    def _predictive_var(self, variational_output, induc_induc_covar, induc_test_covar, test_test_covar):
+        # The diagonal of the predictive covariance
+        res = test_test_covar.diag()
+        if settings.fast_pred_var.on():
+            test_induc_covar = induc_test_covar.transpose(-1, -2)
+            res = res - test_induc_covar.matmul(self.prior_root_inv).pow(2).sum(-1)
+            return res + test_induc_covar.matmul(self.variational_root).pow(2).sum(-1)
+
+        # Otherwise, the test points are processed in chunks
+        variational_root = variational_output.lazy_covariance_matrix.root_decomposition()
+        num_induc = induc_induc_covar.size(-1)
+        num_test = res.size(-1)
+        chunk_size = num_chunk_rows(num_induc)
+        corrections = []
+        for start in range(0, num_test, chunk_size):
+            induc_test_chunk = induc_test_covar[:, start:start + chunk_size].evaluate()
+            inv_product = inv_matmul(induc_induc_covar, induc_test_chunk)
+            factor = variational_root.matmul(inv_product)
+            corrections.append(((factor - induc_test_chunk) * (factor - inv_product)).sum(-2))
+        if len(corrections):
+            res = res + torch.cat(corrections, -1)
+        return res
+
     def __call__(self, inputs, **kwargs):
         prior_output = None
         variational_output = self.variational_output()
@@ -72,7 +96,7 @@ class VariationalGP(AbstractVariationalGP):
                 self.has_computed_alpha = True
 
             # Compute chol cache, if necessary
-            if not self.has_computed_root and beta_features.fast_pred_var.on():
+            if not self.has_computed_root and settings.fast_pred_var.on():
                 self.prior_root_inv = induc_induc_covar.root_inv_decomposition()
 
                 chol_variational_output = variational_output.lazy_covariance_matrix.root.evaluate()
@@ -84,7 +108,11 @@ class VariationalGP(AbstractVariationalGP):
 
             # Test covariance
             predictive_covar = test_test_covar
-            if beta_features.fast_pred_var.on():
+            if settings.diag_pred_covar.on():
+                predictive_covar = DiagLazyTensor(
+                    self._predictive_var(variational_output, induc_induc_covar, induc_test_covar, test_test_covar)
+                )
+            elif settings.fast_pred_var.on():
                 correction = RootLazyTensor(test_induc_covar.matmul(self.prior_root_inv)).mul(-1)
                 correction = correction + RootLazyTensor(test_induc_covar.matmul(self.variational_root))
                 predictive_covar = predictive_covar + correction
@@ -44,12 +44,15 @@ class Module(nn.Module):
         for name, val in kwargs.items():
             if name not in self._parameters:
                 raise AttributeError("Unknown parameter {p} for {c}".format(p=name, c=self.__class__.__name__))
-            if torch.is_tensor(val):
-                self.__getattr__(name).data.copy_(val)
-            elif isinstance(val, float) or isinstance(val, int):
-                self.__getattr__(name).data.fill_(val)
-            else:
-                raise AttributeError("Type {t} not valid to initialize parameter {p}".format(t=type(val), p=name))
+            # The parameters are updated in place (rather than through .data), so that their version counters
+            # change - this is how cached results (e.g. the ExactGP prediction caches) detect the new values
+            with torch.no_grad():
+                if torch.is_tensor(val):
+                    self.__getattr__(name).copy_(val)
+                elif isinstance(val, float) or isinstance(val, int):
+                    self.__getattr__(name).fill_(val)
+                else:
+                    raise AttributeError("Type {t} not valid to initialize parameter {p}".format(t=type(val), p=name))
 
             # Ensure value is contained in support of prior (if present)
             prior = self._priors.get(name)
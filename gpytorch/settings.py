@@ -61,6 +61,82 @@ class debug(_feature_flag):
     _state = True
 
 
+class diag_pred_covar(_feature_flag):
+    """
+    Only compute the diagonal of predictive covariances (i.e. the predictive variances).
+    In eval mode, :obj:`gpytorch.models.ExactGP`, :obj:`gpytorch.models.VariationalGP` and
+    :obj:`gpytorch.models.GridInducingVariationalGP` then return predictive distributions with a
+    :obj:`gpytorch.lazy.DiagLazyTensor` covariance. The variances are computed in chunks of test points
+    (see :obj:`gpytorch.settings.max_kernel_tile_size`) - or from the LOVE cache,
+    if :obj:`gpytorch.settings.fast_pred_var` is used.
+    Pros: the memory requirements are linear (rather than quadratic) in the number of test points
+    Cons: the predictive distribution ignores the correlations between the test points (e.g. for sampling)
+    Default: False
+    """
+
+    _state = False
+
+
+class fast_gauss_transform_tolerance(_value_context):
+    """
+    If set, matrix multiplications with RBF kernel matrices of low-dimensional (1-3D) inputs are approximated
+    with the improved fast Gauss transform (see :obj:`gpytorch.lazy.FastGaussTransformLazyTensor`).
+    The absolute error of each entry is (roughly) at most this value, times the sum of the absolute values
+    of the vector that is multiplied.
+    Pros: matrix multiplications take near-linear time, and memory usage is linear in the number of data points
+    Cons: matrix multiplications (and therefore solves and log determinants) are approximate
+    Default: None (matrix multiplications are exact)
+    """
+
+    _global_value = None
+
+
+class fast_pred_samples(_feature_flag):
+    """
+    Fast predictive samples of exact GPs - with the LOVE cache (see :obj:`gpytorch.settings.fast_pred_var`).
+    The samples are drawn with a low rank root of the predictive covariance (for KISS-GP models).
+    """
+
+    pass
+
+
+class fast_pred_var(_feature_flag):
+    """
+    Fast predictive variances of exact GPs - with LOVE (Lanczos variance estimates).
+    A low rank root :math:`R` of :math:`(K_{XX} + \\sigma^2 I)^{-1}` is computed once (with Lanczos), and cached with
+    the model. The predictive covariance is then :math:`K_{X^*X^*} - (K_{X^*X} R)(K_{X^*X} R)^\\top`.
+    The rank of the root is :obj:`gpytorch.settings.max_root_decomposition_size`.
+
+    For KISS-GP models, :attr:`num_probe_vectors` sets the number of probe vectors that start the Lanczos
+    iterations.
+
+    (:obj:`gpytorch.models.ExactGPPosterior` always uses LOVE for its predictive covariances.)
+    """
+
+    _num_probe_vectors = 1
+
+    @classmethod
+    def num_probe_vectors(cls):
+        return cls._num_probe_vectors
+
+    @classmethod
+    def _set_num_probe_vectors(cls, value):
+        cls._num_probe_vectors = value
+
+    def __init__(self, state=True, num_probe_vectors=1):
+        self.orig_value = self.__class__.num_probe_vectors()
+        self.value = num_probe_vectors
+        super(fast_pred_var, self).__init__(state)
+
+    def __enter__(self):
+        self.__class__._set_num_probe_vectors(self.value)
+        super(fast_pred_var, self).__enter__()
+
+    def __exit__(self, *args):
+        self.__class__._set_num_probe_vectors(self.orig_value)
+        return super(fast_pred_var, self).__exit__()
+
+
 class max_cg_iterations(_value_context):
     """
     The maximum number of conjugate gradient iterations to perform (when computing
@@ -71,6 +147,18 @@ class max_cg_iterations(_value_context):
     _global_value = 20
 
 
+class max_cholesky_size(_value_context):
+    """
+    The maximum size of a matrix whose (inverse) diagonal is computed exactly, with a Cholesky factorization.
+    This is used when computing leave-one-out predictions
+    (see :obj:`gpytorch.mlls.LeaveOneOutPseudoLikelihood`). Larger matrices use a stochastic estimate
+    (with :obj:`gpytorch.settings.num_trace_samples` probe vectors and CG).
+    Default: 800
+    """
+
+    _global_value = 800
+
+
 class max_root_decomposition_size(_value_context):
     """
     The maximum number of Lanczos iterations to perform
@@ -93,6 +181,20 @@ class max_preconditioner_size(_value_context):
     _global_value = 5
 
 
+class max_kernel_tile_size(_value_context):
+    """
+    If set, kernel matrices are not stored in memory (if the kernel would otherwise produce a dense matrix
+    with more entries than this value). Instead, they are represented by a
+    :obj:`gpytorch.lazy.TiledKernelLazyTensor`, which recomputes (at most) this many entries at a time,
+    every time that the kernel matrix is multiplied with.
+    Pros: memory usage is linear in the number of data points
+    Cons: every matrix multiplication (and derivative) has to recompute the kernel
+    Default: None (kernel matrices are stored)
+    """
+
+    _global_value = None
+
+
 class max_lanczos_quadrature_iterations(_value_context):
     """
     The maximum number of Lanczos iterations to perform when doing stochastic
@@ -142,6 +244,22 @@ class terminate_cg_by_size(_feature_flag):
     _state = True
 
 
+class toeplitz_inference(_value_context):
+    """
+    How to compute solves and log determinants of (symmetric PD) ToeplitzLazyTensors
+    - "cg": preconditioned CG and stochastic Lanczos quadrature, as with any other LazyTensor
+    - "exact": exact log determinants and solves. The Levinson-Durbin recursion (O(n^2)) computes the first
+      column of the inverse, after which solves use the Gohberg-Semencul formula (O(n log n) each)
+    - "circulant": log determinants from T. Chan's optimal circulant approximation (O(n log n), a Whittle-type
+      approximation). Solves use CG, preconditioned with the same circulant matrix.
+      Kronecker products of Toeplitz matrices (e.g. from GridKernel) use the Kronecker product of the circulant
+      approximations, and KISS-GP matrices W K_UU W^T + sigma^2 I are preconditioned with its leading eigenvectors
+    Default: "cg"
+    """
+
+    _global_value = "cg"
+
+
 class use_toeplitz(_feature_flag):
     """
     Whether or not to use Toeplitz math with gridded data, grid inducing point modules
@@ -7,14 +7,30 @@ from .linear_cg import linear_cg
 from .stochastic_lq import StochasticLQ
 from . import cholesky
 from . import eig
+from . import fast_gauss_transform
 from . import fft
 from . import grid
 from . import interpolation
 from . import lanczos
+from . import lattice
 from . import pivoted_cholesky
+from . import serialization
 from . import sparse
 
 
+def num_chunk_rows(num_columns):
+    """
+    The number of rows of a chunk of a (kernel) matrix with `num_columns` columns - so that the chunk has at most
+    :obj:`gpytorch.settings.max_kernel_tile_size` (default: :math:`2^{24}`) entries.
+    """
+    from .. import settings
+
+    max_entries = settings.max_kernel_tile_size.value()
+    if max_entries is None:
+        max_entries = 2 ** 24
+    return max(1, max_entries // max(1, num_columns))
+
+
 def prod(items):
     """
     """
@@ -32,10 +48,13 @@ __all__ = [
     "StochasticLQ",
     "cholesky",
     "eig",
+    "fast_gauss_transform",
     "fft",
     "grid",
     "interpolation",
     "lanczos",
+    "lattice",
     "pivoted_cholesky",
+    "serialization",
     "sparse",
 ]
@@ -9,8 +9,12 @@ import torch
 
 def batch_potrf(mat):
     """
-    TODO: Replace with torch batch potrf once it is implemented.
+    Computes the (upper triangular) Cholesky factors of a batch of matrices.
+    If the installed version of PyTorch supports batched Cholesky decompositions, all of the matrices are
+    factorized in a single call. Otherwise, the matrices are factorized one at a time.
     """
+    if hasattr(torch, "linalg") and hasattr(torch.linalg, "cholesky"):
+        return torch.linalg.cholesky(mat).transpose(-1, -2)
     potrf_list = [sub_mat.potrf() for sub_mat in mat.view(-1, *mat.shape[-2:])]
     res = torch.cat(potrf_list, 0)
     return res.view_as(mat)
@@ -18,17 +22,37 @@ def batch_potrf(mat):
 
 def batch_potrs(mat, chol):
     """
-    TODO: Replace with torch batch potrs once it is implemented.
+    Solves :math:`U^\\top U X = M` for a batch of (upper triangular) Cholesky factors :math:`U`.
+    The system is solved with two triangular solves (rather than with potrs), so that the result can be
+    differentiated with respect to both :math:`M` and :math:`U`.
+    If the installed version of PyTorch supports batched triangular solves, all of the systems are solved in a
+    single call. Otherwise, the systems are solved one at a time.
     """
-    potrs_list = []
-    potrs_list = [
-        torch.potrs(sub_mat, sub_chol)
-        for sub_mat, sub_chol in zip(mat.view(-1, *mat.shape[-2:]), chol.view(-1, *chol.shape[-2:]))
-    ]
-    res = torch.cat(potrs_list, 0)
+    if hasattr(torch, "triangular_solve"):
+        half_solve = torch.triangular_solve(mat, chol, upper=True, transpose=True)[0]
+        return torch.triangular_solve(half_solve, chol, upper=True)[0]
+    trtrs_list = []
+    for sub_mat, sub_chol in zip(mat.view(-1, *mat.shape[-2:]), chol.view(-1, *chol.shape[-2:])):
+        half_solve = torch.trtrs(sub_mat, sub_chol, upper=True, transpose=True)[0]
+        trtrs_list.append(torch.trtrs(half_solve, sub_chol, upper=True)[0])
+    res = torch.cat(trtrs_list, 0)
     return res.view_as(mat)
 
 
+def batch_trtri(chol):
+    """
+    Inverts a batch of upper triangular (Cholesky) factors :math:`U`, so that :math:`U^{-1} U^{-\\top}` is the
+    inverse of :math:`U^\\top U`. This takes a single (differentiable) triangular solve, rather than the two that
+    :func:`batch_potrs` would need.
+    """
+    eye = torch.eye(chol.size(-1), dtype=chol.dtype, device=chol.device)
+    if hasattr(torch, "triangular_solve"):
+        return torch.triangular_solve(eye.expand_as(chol), chol, upper=True)[0]
+    trtri_list = [torch.trtrs(eye, sub_chol, upper=True)[0] for sub_chol in chol.view(-1, *chol.shape[-2:])]
+    res = torch.cat(trtri_list, 0)
+    return res.view_as(chol)
+
+
 def tridiag_batch_potrf(trid, upper=False):
     """
     """
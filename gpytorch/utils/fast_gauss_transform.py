@@ -0,0 +1,190 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import itertools
+import math
+import torch
+from .sparse import _expand_cells, _grid_cells, _searchsorted
+
+
+def _expansion_order(cell_radius, cutoff, tolerance, max_order):
+    """
+    The smallest expansion order p for which the Taylor remainder of a source in a cell of radius
+    :attr:`cell_radius` is below the tolerance - for all targets within the cutoff.
+    The remainder is bounded by :math:`(2 r_x r_y)^p / p! \\exp(-(r_x - r_y)^2)`.
+    """
+    target_radii = [(cutoff + 2 * cell_radius) * i / 100 for i in range(101)]
+    for order in range(1, max_order + 1):
+        log_bound = max(
+            order * math.log(2 * r_x * cell_radius + 1e-30) - math.lgamma(order + 1) - (r_x - cell_radius) ** 2
+            for r_x in target_radii
+        )
+        if log_bound < math.log(tolerance):
+            return order
+    return max_order
+
+
+def _monomials(diff, multi_indices):
+    """
+    Computes :math:`\\mathbf{d}^\\alpha = \\prod_k d_k^{\\alpha_k}` for each multi-index :math:`\\alpha`.
+
+    Args:
+        diff - Tensor n x d
+        multi_indices - LongTensor t x d
+
+    Returns:
+        Tensor n x t
+    """
+    exponents = torch.arange(0, int(multi_indices.max()) + 1, dtype=diff.dtype, device=diff.device)
+    powers = diff.unsqueeze(-1).pow(exponents)
+    res = powers[:, 0, multi_indices[:, 0]]
+    for i in range(1, diff.size(-1)):
+        res = res * powers[:, i, multi_indices[:, i]]
+    return res
+
+
+def _direct_sum(x1, x1_keys, x2, sorted_x2_keys, x2_order, offset_keys, rhs, res, max_block_size):
+    """
+    Adds the exact contributions of the sources (x2) in the cells at the given offsets from the targets (x1) to res.
+    """
+    if not sorted_x2_keys.numel():
+        return res
+    block_size = max(1, max_block_size // max(1, offset_keys.numel() * rhs.size(-1)))
+    for start in range(0, x1.size(0), block_size):
+        length = min(block_size, x1.size(0) - start)
+        query_keys = (x1_keys[start:start + length].unsqueeze(-1) + offset_keys).view(-1)
+        query_index, position = _expand_cells(query_keys, sorted_x2_keys)
+        rows = query_index // offset_keys.numel() + start
+        cols = x2_order[position]
+        values = (x1[rows] - x2[cols]).pow(2).sum(-1).neg().exp()
+        res.index_add_(0, rows, values.unsqueeze(-1) * rhs[cols])
+    return res
+
+
+def fast_gauss_transform(x1, x2, rhs, tolerance=1e-4, cell_width=1.0, max_order=16, max_block_size=2 ** 22):
+    r"""
+    Computes the Gauss transform :math:`\sum_j \exp(-\Vert \mathbf{x_1}_i - \mathbf{x_2}_j \Vert^2 / 2) \mathbf{v}_j`
+    (i.e. an RBF kernel matrix with unit lengthscale times :attr:`rhs`) in near-linear time, with an
+    improved fast Gauss transform (Yang et al., 2003).
+
+    The points are sorted into grid cells of width :attr:`cell_width`:
+
+    * Sources (x2) in the same or adjacent cells as the target (x1) are computed exactly (the near field).
+    * Sources in cells further away are summarized by a truncated Taylor expansion around the center of their
+      cell (the far field).
+    * Sources further away than the cutoff radius :math:`\sqrt{2 \log(1 / \text{tolerance})}` are ignored.
+
+    The expansion order and the cutoff are chosen so that the absolute error of each entry is at most
+    (roughly) :math:`2 \cdot \text{tolerance} \cdot \sum_j \vert \mathbf{v}_j \vert`.
+    This is intended for low-dimensional inputs (d <= 3) - the cost grows exponentially with the dimension.
+
+    Args:
+        x1 - Tensor n x d - the targets (divided by the lengthscale)
+        x2 - Tensor m x d - the sources (divided by the lengthscale)
+        rhs - Tensor m or m x k
+        tolerance - the (absolute) error tolerance, relative to :math:`\sum_j \vert \mathbf{v}_j \vert`
+        cell_width - the width of the grid cells (in lengthscales)
+        max_order - the maximum order of the Taylor expansions
+        max_block_size - the maximum number of entries of the intermediate tensors
+
+    Returns:
+        Tensor n or n x k
+    """
+    if x1.ndimension() != 2 or x2.ndimension() != 2:
+        raise RuntimeError("fast_gauss_transform expects n x d and m x d inputs")
+    is_vector = rhs.ndimension() == 1
+    if is_vector:
+        rhs = rhs.unsqueeze(-1)
+    num_dims = x1.size(-1)
+    num_cols = rhs.size(-1)
+    device = x1.device
+    res = torch.zeros(x1.size(0), num_cols, dtype=rhs.dtype, device=device)
+    if not x1.size(0) or not x2.size(0):
+        return res.squeeze(-1) if is_vector else res
+
+    # Work in units of h = sqrt(2), so that the kernel is exp(-|x1 - x2|^2)
+    x1 = x1.detach().div(math.sqrt(2))
+    x2 = x2.detach().div(math.sqrt(2))
+    width = cell_width / math.sqrt(2)
+    cutoff = math.sqrt(math.log(1. / tolerance))
+    num_rings = int(math.ceil(cutoff / width)) + 1
+    _, _, x1_keys, x2_keys, strides = _grid_cells(x1, x2, width, padding=num_rings)
+    x1_corners = x1.div(width).floor().mul(width)
+
+    # The near field (adjacent cells) and the far field (cells within the cutoff)
+    near_offsets = []
+    far_offsets = []
+    for offset in itertools.product(range(-num_rings, num_rings + 1), repeat=num_dims):
+        if max(abs(i) for i in offset) <= 1:
+            near_offsets.append(offset)
+        elif math.sqrt(sum((max(abs(i) - 1, 0) * width) ** 2 for i in offset)) < cutoff:
+            far_offsets.append(offset)
+    near_offset_keys = (torch.tensor(near_offsets, dtype=torch.long, device=device) * strides).sum(-1)
+    x2_keys, x2_order = x2_keys.sort()
+    _direct_sum(x1, x1_keys, x2, x2_keys, x2_order, near_offset_keys, rhs, res, max_block_size)
+    if not len(far_offsets):
+        return res.squeeze(-1) if is_vector else res
+
+    # Taylor expansions of the sources around the centers of their cells:
+    # exp(-|x - y|^2) = exp(-|x - c|^2) exp(-|y - c|^2) sum_alpha 2^|alpha| / alpha! (x - c)^alpha (y - c)^alpha
+    cell_radius = width * math.sqrt(num_dims) / 2
+    order = _expansion_order(cell_radius, cutoff, tolerance, max_order)
+    multi_indices = torch.tensor(
+        [index for index in itertools.product(range(order), repeat=num_dims) if sum(index) < order],
+        dtype=torch.long,
+        device=device,
+    )
+    log_factors = [sum(i * math.log(2) - math.lgamma(i + 1) for i in index) for index in multi_indices.tolist()]
+    factors = torch.tensor(log_factors, dtype=x1.dtype, device=device).exp()
+    num_terms = multi_indices.size(0)
+
+    # Expansions only pay off for cells that contain more points than there are terms in the expansion.
+    # The far field of the other cells is computed exactly.
+    # (torch.unique does not return the counts in all supported versions of PyTorch)
+    cell_keys, source_cells = torch.unique(x2_keys, sorted=True, return_inverse=True)
+    cell_counts = torch.bincount(source_cells, minlength=cell_keys.numel())
+    is_expanded = cell_counts.ge(num_terms)[source_cells]
+    far_offset_keys = (torch.tensor(far_offsets, dtype=torch.long, device=device) * strides).sum(-1)
+    direct_mask = is_expanded.eq(0)
+    if direct_mask.any():
+        _direct_sum(
+            x1, x1_keys, x2, x2_keys[direct_mask], x2_order[direct_mask], far_offset_keys, rhs, res, max_block_size
+        )
+    if not is_expanded.any():
+        return res.squeeze(-1) if is_vector else res
+
+    cell_keys, source_cells = torch.unique(x2_keys[is_expanded], sorted=True, return_inverse=True)
+    sorted_x2 = x2[x2_order[is_expanded]]
+    sorted_rhs = rhs[x2_order[is_expanded]]
+    coefficients = torch.zeros(cell_keys.numel(), num_terms, num_cols, dtype=rhs.dtype, device=device)
+    block_size = max(1, max_block_size // (num_terms * num_cols))
+    for start in range(0, sorted_x2.size(0), block_size):
+        length = min(block_size, sorted_x2.size(0) - start)
+        x2_block = sorted_x2[start:start + length]
+        diff = x2_block - x2_block.div(width).floor().add(0.5).mul(width)
+        source_terms = _monomials(diff, multi_indices) * factors * diff.pow(2).sum(-1, keepdim=True).neg().exp()
+        coefficients.index_add_(
+            0,
+            source_cells[start:start + length],
+            source_terms.unsqueeze(-1) * sorted_rhs[start:start + length].unsqueeze(-2),
+        )
+
+    # Evaluate the expansions of the far field cells at the targets
+    for offset, offset_key in zip(far_offsets, far_offset_keys.tolist()):
+        keys = x1_keys + offset_key
+        positions = _searchsorted(cell_keys, keys).clamp(max=cell_keys.numel() - 1)
+        targets = cell_keys[positions].eq(keys).nonzero().view(-1)
+        if not targets.numel():
+            continue
+        positions = positions[targets]
+        centers = x1_corners[targets] + torch.tensor(offset, dtype=x1.dtype, device=device).add(0.5).mul(width)
+        for start in range(0, targets.numel(), block_size):
+            length = min(block_size, targets.numel() - start)
+            diff = x1[targets[start:start + length]] - centers[start:start + length]
+            target_terms = _monomials(diff, multi_indices) * diff.pow(2).sum(-1, keepdim=True).neg().exp()
+            block_res = (target_terms.unsqueeze(-1) * coefficients[positions[start:start + length]]).sum(-2)
+            res.index_add_(0, targets[start:start + length], block_res)
+
+    return res.squeeze(-1) if is_vector else res
@@ -3,8 +3,8 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
-
 import math
+import torch
 
 
 def scale_to_bounds(x, lower_bound, upper_bound):
@@ -45,3 +45,115 @@ def choose_grid_size(train_inputs, ratio=1.):
     num_data = train_inputs.numel() if train_inputs.dim() == 1 else train_inputs.size(-2)
     num_dim = 1 if train_inputs.dim() == 1 else train_inputs.size(-1)
     return int(ratio * math.pow(num_data, 1. / num_dim))
+
+
+def create_grid(grid_sizes, grid_bounds, dtype=None, device=None):
+    """
+    Creates a regularly spaced grid for KISS-GP. Each dimension of the grid is padded by one
+    grid spacing beyond the supplied bounds, so that cubic interpolation remains valid at the edges.
+
+    Args:
+        :attr:`grid_sizes` (int or list(int)):
+            number of grid points - either for all dimensions, or for each dimension
+        :attr:`grid_bounds` (tuple(tuple(float, float))):
+            the lower/upper bound of each dimension
+
+    Returns:
+        list(:obj:`torch.Tensor`) - the grid points of each dimension
+    """
+    if isinstance(grid_sizes, int):
+        grid_sizes = [grid_sizes] * len(grid_bounds)
+    if len(grid_sizes) != len(grid_bounds):
+        raise RuntimeError(
+            "Got {} grid sizes for {} grid bounds - they should match.".format(len(grid_sizes), len(grid_bounds))
+        )
+
+    grid = []
+    for grid_size, bound in zip(grid_sizes, grid_bounds):
+        grid_diff = float(bound[1] - bound[0]) / (grid_size - 2)
+        grid.append(torch.linspace(bound[0] - grid_diff, bound[1] + grid_diff, grid_size, dtype=dtype, device=device))
+    return grid
+
+
+def create_adaptive_grid(inputs, grid_sizes, uniform_weight=0.2):
+    """
+    Creates a non-uniform (tensor-product) grid for KISS-GP that puts more grid points where there is more data.
+
+    The interior grid points of each dimension are placed at the empirical quantiles of the data,
+    blended with a regularly spaced grid (so that sparse regions still receive some grid points).
+    Like :func:`create_grid`, each dimension is padded by an extra grid point on either side.
+
+    Args:
+        :attr:`inputs` (Tensor `n x d`):
+            the (training) data
+        :attr:`grid_sizes` (int or list(int)):
+            number of grid points - either for all dimensions, or for each dimension
+        :attr:`uniform_weight` (float, optional):
+            how much weight the regularly spaced grid receives. Must be in `(0, 1]` (default: 0.2)
+
+    Returns:
+        list(:obj:`torch.Tensor`) - the grid points of each dimension
+    """
+    if inputs.ndimension() == 1:
+        inputs = inputs.unsqueeze(-1)
+    num_data, num_dims = inputs.size()
+    if isinstance(grid_sizes, int):
+        grid_sizes = [grid_sizes] * num_dims
+    if not 0 < uniform_weight <= 1:
+        raise RuntimeError("uniform_weight must be in (0, 1]. Got {}.".format(uniform_weight))
+
+    sorted_inputs = inputs.detach().sort(0)[0]
+    grid = []
+    for i, grid_size in enumerate(grid_sizes):
+        if grid_size < 4:
+            raise RuntimeError("Each dimension needs at least 4 grid points. Got {}.".format(grid_size))
+        steps = torch.linspace(0, 1, grid_size - 2, dtype=inputs.dtype, device=inputs.device)
+        quantiles = sorted_inputs[(steps * (num_data - 1)).round().long(), i]
+        uniform = quantiles[0] + steps * (quantiles[-1] - quantiles[0])
+        interior = quantiles.mul(1 - uniform_weight).add_(uniform.mul(uniform_weight))
+        lower = interior[:1] * 2 - interior[1:2]
+        upper = interior[-1:] * 2 - interior[-2:-1]
+        grid.append(torch.cat([lower, interior, upper]))
+    return grid
+
+
+def create_data_from_grid(grid):
+    """
+    Expands a grid into the full set of points that lie on it. The last dimension varies
+    fastest, which matches the ordering of the (Kronecker structured) kernel matrices and the
+    interpolation indices used by KISS-GP.
+
+    Args:
+        :attr:`grid` (list(Tensor) or Tensor `k x d`):
+            the grid points of each dimension
+
+    Returns:
+        :obj:`torch.Tensor` (`k_1 * ... * k_d x d`)
+    """
+    if torch.is_tensor(grid):
+        grid = [grid[:, i] for i in range(grid.size(-1))]
+    grid_sizes = [len(dim_grid) for dim_grid in grid]
+
+    columns = []
+    for i, dim_grid in enumerate(grid):
+        view_sizes = [1] * len(grid)
+        view_sizes[i] = grid_sizes[i]
+        columns.append(dim_grid.view(*view_sizes).expand(*grid_sizes).contiguous().view(-1))
+    return torch.stack(columns, -1)
+
+
+def is_uniform_grid(dim_grid, rtol=1e-4):
+    """
+    Determines whether the points of a (one dimensional) grid are regularly spaced.
+
+    Args:
+        :attr:`dim_grid` (Tensor `k`):
+            the grid points of a single dimension
+
+    Returns:
+        bool
+    """
+    if len(dim_grid) < 3:
+        return True
+    spacings = dim_grid[1:] - dim_grid[:-1]
+    return bool(((spacings - spacings[0]).abs().max() <= rtol * spacings[0].abs()).item())
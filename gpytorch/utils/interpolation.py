@@ -6,6 +6,7 @@ from __future__ import unicode_literals
 from copy import deepcopy
 
 import torch
+from .grid import is_uniform_grid
 
 
 class Interpolation(object):
@@ -40,10 +41,72 @@ class Interpolation(object):
         res = res + (((-0.5 * U + 2.5).mul(U) - 4).mul(U) + 2) * U_ge_1_le_2
         return res
 
-    def interpolate(self, x_grid, x_target, interp_points=range(-2, 2)):
+    def _cubic_hermite_interpolation(self, dim_grid, x_target, interp_points):
+        """
+        Local cubic interpolation for a single dimension with irregularly spaced grid points.
+        This is a cubic Hermite spline, where the derivatives are estimated with finite differences
+        (Catmull-Rom). On a regularly spaced grid, it is identical to the cubic convolution interpolation above.
+
+        Returns the index of the first grid point of each (4 point) stencil, and the interpolation values.
+        """
+        if len(interp_points) != 4:
+            raise RuntimeError("Irregularly spaced grids only support 4 interpolation points")
+        num_grid_points = len(dim_grid)
+
+        # Index of the closest grid point that is less than (or equal to) each target
+        lower_grid_pt_idxs = x_target.detach().unsqueeze(-1).ge(dim_grid.unsqueeze(-2)).long().sum(-1) - 1
+        lower_grid_pt_idxs = lower_grid_pt_idxs.clamp(1, num_grid_points - 3) - 1
+
+        offset = torch.arange(0, 4, dtype=torch.long, device=dim_grid.device)
+        stencil = dim_grid[lower_grid_pt_idxs.unsqueeze(-1) + offset]
+        spacing = stencil[:, 2] - stencil[:, 1]
+        left_ratio = spacing / (stencil[:, 2] - stencil[:, 0])
+        right_ratio = spacing / (stencil[:, 3] - stencil[:, 1])
+
+        s = (x_target - stencil[:, 1]) / spacing
+        s2 = s * s
+        s3 = s2 * s
+        h00 = 2 * s3 - 3 * s2 + 1
+        h10 = s3 - 2 * s2 + s
+        h01 = 3 * s2 - 2 * s3
+        h11 = s3 - s2
+
+        interp_values = torch.stack(
+            [-h10 * left_ratio, h00 - h11 * right_ratio, h01 + h10 * left_ratio, h11 * right_ratio], -1
+        )
+        return lower_grid_pt_idxs, interp_values
+
+    def interpolate(self, x_grid, x_target, interp_points=range(-2, 2), uniform_grid_dims=None):
+        """
+        Computes the (sparse) interpolation weights of the targets onto a (tensor-product) grid.
+
+        Args:
+            :attr:`x_grid` (list(Tensor) or Tensor `k x d`):
+                the grid points of each dimension. Dimensions with regularly spaced points
+                use cubic convolution interpolation, all others use local cubic (Hermite spline) interpolation.
+            :attr:`x_target` (Tensor `n x d`):
+                the points to interpolate
+            :attr:`uniform_grid_dims` (list(bool), optional):
+                whether the points of each dimension of the grid are regularly spaced. Checking this requires a
+                device synchronization per dimension - so callers that interpolate onto the same grid repeatedly
+                should compute it once (see :func:`gpytorch.utils.grid.is_uniform_grid`).
+                Default: computed from the grid.
+
+        Returns:
+            (:obj:`torch.Tensor`, :obj:`torch.Tensor`) - the interpolation indices and values (`n x c^d`).
+            The last dimension of the grid varies fastest in the indices.
+        """
+        num_dim = x_target.size(-1)
+        if torch.is_tensor(x_grid):
+            x_grid = [x_grid[:, i] for i in range(x_grid.size(-1))]
+        x_grid = x_grid[:num_dim]
+        if uniform_grid_dims is None:
+            uniform_grid_dims = [is_uniform_grid(dim_grid) for dim_grid in x_grid]
+        uniform_grid_dims = uniform_grid_dims[:num_dim]
+
         # Do some boundary checking
-        grid_mins = x_grid.min(0)[0]
-        grid_maxs = x_grid.max(0)[0]
+        grid_mins = torch.stack([dim_grid.min() for dim_grid in x_grid])
+        grid_maxs = torch.stack([dim_grid.max() for dim_grid in x_grid])
         x_target_min = x_target.min(0)[0]
         x_target_max = x_target.min(0)[0]
         lt_min_mask = (x_target_min - grid_mins).lt(-1e-7)
@@ -78,25 +141,38 @@ class Interpolation(object):
             )
 
         # Now do interpolation
-        interp_points = torch.tensor(interp_points, dtype=x_grid.dtype, device=x_grid.device)
+        dtype = x_grid[0].dtype
+        device = x_grid[0].device
+        grid_sizes = [len(dim_grid) for dim_grid in x_grid]
+        interp_point_list = list(interp_points)
+        interp_points = torch.tensor(interp_point_list, dtype=dtype, device=device)
         interp_points_flip = interp_points.flip(0)
 
-        num_grid_points = x_grid.size(0)
         num_target_points = x_target.size(0)
-        num_dim = x_target.size(-1)
         num_coefficients = len(interp_points)
 
-        interp_values = torch.ones(
-            num_target_points, num_coefficients ** num_dim, dtype=x_grid.dtype, device=x_grid.device
-        )
-        interp_indices = torch.zeros(
-            num_target_points, num_coefficients ** num_dim, dtype=torch.long, device=x_grid.device
-        )
+        interp_values = torch.ones(num_target_points, num_coefficients ** num_dim, dtype=dtype, device=device)
+        interp_indices = torch.zeros(num_target_points, num_coefficients ** num_dim, dtype=torch.long, device=device)
 
         for i in range(num_dim):
-            grid_delta = x_grid[1, i] - x_grid[0, i]
-            lower_grid_pt_idxs = torch.floor((x_target[:, i] - x_grid[0, i]) / grid_delta).squeeze()
-            lower_pt_rel_dists = (x_target[:, i] - x_grid[0, i]) / grid_delta - lower_grid_pt_idxs
+            dim_grid = x_grid[i]
+            num_grid_points = grid_sizes[i]
+
+            if not uniform_grid_dims[i]:
+                lower_grid_pt_idxs, dim_interp_values = self._cubic_hermite_interpolation(
+                    dim_grid, x_target[:, i], interp_point_list
+                )
+                dim_interp_indices = lower_grid_pt_idxs.unsqueeze(-1) + torch.arange(
+                    0, num_coefficients, dtype=torch.long, device=device
+                )
+                interp_indices, interp_values = self._add_dim_interp(
+                    interp_indices, interp_values, dim_interp_indices, dim_interp_values, i, grid_sizes
+                )
+                continue
+
+            grid_delta = dim_grid[1] - dim_grid[0]
+            lower_grid_pt_idxs = torch.floor((x_target[:, i] - dim_grid[0]) / grid_delta).squeeze()
+            lower_pt_rel_dists = (x_target[:, i] - dim_grid[0]) / grid_delta - lower_grid_pt_idxs
             lower_grid_pt_idxs = lower_grid_pt_idxs - interp_points.max()
             lower_grid_pt_idxs.detach_()
 
@@ -110,7 +186,7 @@ class Interpolation(object):
 
             if num_left > 0:
                 left_boundary_pts.squeeze_(1)
-                x_grid_first = x_grid[:num_coefficients, i].unsqueeze(1).t().expand(num_left, num_coefficients)
+                x_grid_first = dim_grid[:num_coefficients].unsqueeze(1).t().expand(num_left, num_coefficients)
 
                 grid_targets = x_target.select(1, i)[left_boundary_pts].unsqueeze(1).expand(num_left, num_coefficients)
                 dists = torch.abs(x_grid_first - grid_targets)
@@ -126,7 +202,7 @@ class Interpolation(object):
 
             if num_right > 0:
                 right_boundary_pts.squeeze_(1)
-                x_grid_last = x_grid[-num_coefficients:, i].unsqueeze(1).t().expand(num_right, num_coefficients)
+                x_grid_last = dim_grid[-num_coefficients:].unsqueeze(1).t().expand(num_right, num_coefficients)
 
                 grid_targets = x_target.select(1, i)[right_boundary_pts].unsqueeze(1)
                 grid_targets = grid_targets.expand(num_right, num_coefficients)
@@ -140,15 +216,27 @@ class Interpolation(object):
 
             offset = (interp_points - interp_points.min()).long().unsqueeze(-2)
             dim_interp_indices = lower_grid_pt_idxs.long().unsqueeze(-1) + offset
+            interp_indices, interp_values = self._add_dim_interp(
+                interp_indices, interp_values, dim_interp_indices, dim_interp_values, i, grid_sizes
+            )
 
-            n_inner_repeat = num_coefficients ** i
-            n_outer_repeat = num_coefficients ** (num_dim - i - 1)
-            index_coeff = num_grid_points ** (num_dim - i - 1)
-            dim_interp_indices = dim_interp_indices.unsqueeze(-1).repeat(1, n_inner_repeat, n_outer_repeat)
-            dim_interp_values = dim_interp_values.unsqueeze(-1).repeat(1, n_inner_repeat, n_outer_repeat)
-            interp_indices = interp_indices.add(dim_interp_indices.view(num_target_points, -1).mul(index_coeff))
-            interp_values = interp_values.mul(dim_interp_values.view(num_target_points, -1))
+        return interp_indices, interp_values
 
+    def _add_dim_interp(self, interp_indices, interp_values, dim_interp_indices, dim_interp_values, dim, grid_sizes):
+        """
+        Combines the interpolation of one dimension with that of the (tensor-product) grid.
+        """
+        num_target_points, num_coefficients = dim_interp_values.size()
+        num_dim = len(grid_sizes)
+        n_inner_repeat = num_coefficients ** dim
+        n_outer_repeat = num_coefficients ** (num_dim - dim - 1)
+        index_coeff = 1
+        for grid_size in grid_sizes[dim + 1 :]:
+            index_coeff *= grid_size
+        dim_interp_indices = dim_interp_indices.unsqueeze(-1).repeat(1, n_inner_repeat, n_outer_repeat)
+        dim_interp_values = dim_interp_values.unsqueeze(-1).repeat(1, n_inner_repeat, n_outer_repeat)
+        interp_indices = interp_indices.add(dim_interp_indices.view(num_target_points, -1).mul(index_coeff))
+        interp_values = interp_values.mul(dim_interp_values.view(num_target_points, -1))
         return interp_indices, interp_values
 
 
@@ -0,0 +1,180 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import torch
+
+
+# The blur along each lattice direction - a 3-tap filter with variance 1/4.
+# Every direction is blurred twice (forward, then in reverse order) so that the resulting operator is
+# symmetric positive semi-definite. Each direction therefore receives a total variance of 1/2.
+_blur_weights = (0.125, 0.75, 0.125)
+
+
+def create_permutohedral_lattice(features):
+    """
+    Embeds the (scaled) features into a permutohedral lattice, as described in
+    `Fast High-Dimensional Filtering Using the Permutohedral Lattice`_.
+
+    Each feature vector lies inside a simplex of the lattice. It is represented by the
+    `d + 1` vertices of that simplex, and its barycentric coordinates.
+    Only the vertices that are used by at least one feature vector are stored.
+
+    Args:
+        :attr:`features` (Tensor `n x d`):
+            the feature vectors. The lattice approximates a Gaussian filter with unit standard deviation
+            (so the features should be divided by the lengthscale).
+
+    Returns:
+        (:obj:`torch.Tensor`, :obj:`torch.Tensor`, :obj:`torch.Tensor`):
+
+        - the lattice vertices of each feature vector (`n x (d + 1)`, long)
+        - the barycentric weights of each vertex (`n x (d + 1)`) - this is differentiable w.r.t. the features
+        - the lattice neighbors of each lattice vertex along each of the `d + 1` directions (`2 x (d + 1) x m`, long).
+          Missing neighbors are given the index `m`.
+
+    .. _Fast High-Dimensional Filtering Using the Permutohedral Lattice:
+        http://graphics.stanford.edu/papers/permutohedral/
+    """
+    num_data, num_dims = features.size()
+    device = features.device
+    dim_plus_one = num_dims + 1
+
+    # Elevate the features onto the hyperplane H_d (whose coordinates sum to 0)
+    index = torch.arange(1, dim_plus_one, dtype=features.dtype, device=device)
+    scale_factor = math.sqrt(2. / 3.) * dim_plus_one / (index * (index + 1)).sqrt()
+    scaled_features = features * scale_factor
+    rev_cumsum = scaled_features.flip(-1).cumsum(-1).flip(-1)
+    elevated = torch.cat([rev_cumsum, torch.zeros_like(rev_cumsum[:, :1])], -1)
+    elevated = torch.cat([elevated[:, :1], elevated[:, 1:] - index * scaled_features], -1)
+
+    # Find the closest remainder-0 lattice point
+    elevated_data = elevated.detach()
+    lower = elevated_data.div(dim_plus_one).floor().mul(dim_plus_one)
+    upper = elevated_data.div(dim_plus_one).ceil().mul(dim_plus_one)
+    rem0 = torch.where(upper - elevated_data < elevated_data - lower, upper, lower)
+    coord_sum = rem0.sum(-1, keepdim=True).div(dim_plus_one).round().long()
+
+    # Rank the differential between the elevated point and its remainder-0 point
+    # (ties are broken in favor of the later coordinate)
+    diff = elevated_data - rem0
+    coord_index = torch.arange(0, dim_plus_one, dtype=torch.long, device=device)
+    later = coord_index.unsqueeze(-1).lt(coord_index.unsqueeze(-2)).long()
+    earlier = coord_index.unsqueeze(-1).gt(coord_index.unsqueeze(-2)).long()
+    diff_i = diff.unsqueeze(-1)
+    diff_j = diff.unsqueeze(-2)
+    rank = (diff_j.gt(diff_i).long() * later + diff_j.ge(diff_i).long() * earlier).sum(-1)
+
+    # Move the remainder-0 point onto the hyperplane (if necessary)
+    pos_mask = (coord_sum > 0) & (rank >= dim_plus_one - coord_sum)
+    neg_mask = (coord_sum < 0) & (rank < -coord_sum)
+    rank = rank + coord_sum + dim_plus_one * (neg_mask.long() - pos_mask.long())
+    rem0 = rem0 + dim_plus_one * (neg_mask.type_as(rem0) - pos_mask.type_as(rem0))
+
+    # Barycentric coordinates (these carry the gradients w.r.t. the features)
+    delta = (elevated - rem0) / dim_plus_one
+    barycentric = torch.zeros(num_data, dim_plus_one + 1, dtype=features.dtype, device=device)
+    barycentric = barycentric.scatter_add(-1, num_dims - rank, delta)
+    barycentric = barycentric.scatter_add(-1, dim_plus_one - rank, -delta)
+    barycentric = torch.cat([barycentric[:, :1] + 1 + barycentric[:, -1:], barycentric[:, 1:-1]], -1)
+
+    # The keys of the simplex vertices (remainder k = 0, ..., d)
+    # The last coordinate of a key is redundant, since the coordinates sum to 0
+    remainder = coord_index.unsqueeze(-1)
+    canonical = torch.where(
+        rank.unsqueeze(-2) <= num_dims - remainder,
+        remainder.expand(dim_plus_one, dim_plus_one).unsqueeze(0),
+        (remainder - dim_plus_one).expand(dim_plus_one, dim_plus_one).unsqueeze(0),
+    )
+    keys = (rem0.long().unsqueeze(-2) + canonical)[..., :num_dims]
+    lattice_keys, vertices = torch.unique(keys.contiguous().view(-1, num_dims), dim=0, return_inverse=True)
+    vertices = vertices.view(num_data, dim_plus_one)
+    num_vertices = lattice_keys.size(0)
+
+    # Find the neighbors of each vertex along each lattice direction
+    offsets = torch.ones(dim_plus_one, num_dims, dtype=torch.long, device=device)
+    offsets[:num_dims].sub_(torch.eye(num_dims, dtype=torch.long, device=device).mul(dim_plus_one))
+    neighbor_keys = torch.stack(
+        [lattice_keys.unsqueeze(0) + offsets.unsqueeze(1), lattice_keys.unsqueeze(0) - offsets.unsqueeze(1)]
+    )
+    all_keys = torch.cat([lattice_keys, neighbor_keys.view(-1, num_dims)])
+    _, all_ids = torch.unique(all_keys, dim=0, return_inverse=True)
+    id_to_vertex = torch.full((all_keys.size(0),), num_vertices, dtype=torch.long, device=device)
+    id_to_vertex[all_ids[:num_vertices]] = torch.arange(0, num_vertices, dtype=torch.long, device=device)
+    neighbors = id_to_vertex[all_ids[num_vertices:]].view(2, dim_plus_one, num_vertices)
+
+    return vertices, barycentric, neighbors
+
+
+def permutohedral_blur(neighbors, rhs):
+    """
+    Blurs values on a permutohedral lattice along all of its directions.
+    This is a symmetric (positive semi-definite) linear operator, with cost linear in the number of lattice vertices.
+
+    Args:
+        :attr:`neighbors` (Tensor `2 x (d + 1) x m`):
+            the lattice neighbors (see :func:`create_permutohedral_lattice`)
+        :attr:`rhs` (Tensor `m` or `m x t`):
+            the values on the lattice vertices
+
+    Returns:
+        :obj:`torch.Tensor` - the blurred values (same size as `rhs`)
+    """
+    is_vector = rhs.ndimension() == 1
+    if is_vector:
+        rhs = rhs.unsqueeze(-1)
+
+    side_weight, center_weight, _ = _blur_weights
+    num_directions = neighbors.size(1)
+    padding = torch.zeros(1, rhs.size(-1), dtype=rhs.dtype, device=rhs.device)
+    for direction in list(range(num_directions)) + list(range(num_directions - 1, -1, -1)):
+        padded_rhs = torch.cat([rhs, padding])
+        neighbor_sum = padded_rhs.index_select(0, neighbors[0, direction]) + padded_rhs.index_select(
+            0, neighbors[1, direction]
+        )
+        rhs = rhs * center_weight + neighbor_sum * side_weight
+
+    if is_vector:
+        rhs = rhs.squeeze(-1)
+    return rhs
+
+
+def permutohedral_kernel_scale(num_dims):
+    r"""
+    The constant that turns the splat-blur-slice operator of the lattice into an approximation of the
+    (unit lengthscale) RBF kernel :math:`\exp(-\|x - x'\|^2 / 2)`.
+
+    The blur is (approximately) a Gaussian with unit variance, and it preserves mass. The kernel is therefore
+    scaled by the Gaussian normalizing constant :math:`(2 \pi)^{d/2}`, times the density of the lattice
+    vertices in feature space :math:`(2 / 3)^{d/2} \sqrt{d + 1}`.
+
+    Args:
+        :attr:`num_dims` (int): the dimensionality of the features
+
+    Returns:
+        float
+    """
+    return (4. * math.pi / 3.) ** (num_dims / 2.) * math.sqrt(num_dims + 1)
+
+
+def permutohedral_blur_center_weight(num_dims):
+    """
+    The diagonal entry of the blur operator (:func:`permutohedral_blur`) on a fully occupied lattice.
+
+    Args:
+        :attr:`num_dims` (int): the dimensionality of the features
+
+    Returns:
+        float
+    """
+    # Two random walks (of one blur step along each direction) meet iff their step differences
+    # are identical in every direction (the d + 1 lattice directions sum to zero)
+    side_weight, center_weight, _ = _blur_weights
+    diff_probs = [
+        center_weight ** 2 + 2 * side_weight ** 2,
+        2 * center_weight * side_weight,
+        side_weight ** 2,
+    ]
+    return diff_probs[0] ** (num_dims + 1) + 2 * sum(prob ** (num_dims + 1) for prob in diff_probs[1:])
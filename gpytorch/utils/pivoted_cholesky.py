@@ -12,7 +12,8 @@ def pivoted_cholesky(matrix, max_iter, error_tol=1e-3):
     # LazyTensor.diag() operates in batch mode.
     if isinstance(matrix, LazyTensor):
         matrix = matrix.evaluate_kernel()
-        matrix_diag = matrix._approx_diag()
+        # The diagonal is updated in place - so don't modify the LazyTensor's (possibly cached or expanded) diagonal
+        matrix_diag = matrix._approx_diag().clone()
     elif torch.is_tensor(matrix):
         matrix_diag = NonLazyTensor(matrix).diag()
 
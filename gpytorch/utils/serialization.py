@@ -0,0 +1,105 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import struct
+import torch
+
+# The raw tensor data is aligned to this many bytes
+_ALIGNMENT = 64
+
+
+def _aligned(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def save_tensors(f, tensors, metadata=None):
+    """
+    Saves a dictionary of (CPU) tensors to a file, in a format that can be memory-mapped by :func:`load_tensors`.
+
+    The file starts with a (small) header - the :attr:`metadata` and the names, dtypes and shapes of the tensors,
+    saved with :func:`torch.save`. The raw data of each tensor follows (aligned to 64 bytes).
+
+    Args:
+        f - a file name, or a (binary) file object
+        tensors - dict of name -> Tensor
+        metadata - anything that can be saved with :func:`torch.save` (e.g. a `state_dict`)
+    """
+    if isinstance(f, str):
+        with open(f, "wb") as file:
+            return save_tensors(file, tensors, metadata)
+
+    arrays = [(name, tensor.detach().cpu().contiguous().numpy()) for name, tensor in tensors.items()]
+    entries = []
+    offset = 0
+    for name, array in arrays:
+        entries.append((name, array.dtype.str, tuple(array.shape), offset, array.nbytes))
+        offset = _aligned(offset + array.nbytes)
+
+    header = io.BytesIO()
+    torch.save({"metadata": metadata, "tensors": entries}, header)
+    header = header.getvalue()
+    data_start = _aligned(8 + len(header))
+
+    f.write(struct.pack("<Q", len(header)))
+    f.write(header)
+    f.write(b"\0" * (data_start - 8 - len(header)))
+    position = data_start
+    for (name, array), (_, _, _, offset, nbytes) in zip(arrays, entries):
+        f.write(b"\0" * (data_start + offset - position))
+        f.write(array.tobytes())
+        position = data_start + offset + nbytes
+
+
+def load_tensors(f, mmap=False):
+    """
+    Loads the tensors (and the metadata) saved with :func:`save_tensors`.
+
+    With :attr:`mmap`, the tensors are memory-mapped (copy-on-write) instead of being read into memory. The data is
+    only read from disk when it is used, and the pages are shared between all of the processes that map the
+    same file (until a process modifies a tensor).
+
+    Args:
+        f - a file name, or a (binary) file object. Memory-mapping requires a file name.
+        mmap - memory-map the tensors. Default: False.
+
+    Returns:
+        (dict of name -> Tensor, metadata)
+    """
+    import numpy
+
+    if isinstance(f, str) and not mmap:
+        with open(f, "rb") as file:
+            return load_tensors(file)
+    elif isinstance(f, str):
+        with open(f, "rb") as file:
+            (data_start, entries), metadata = _load_header(file)
+        tensors = {}
+        for name, dtype, shape, offset, nbytes in entries:
+            if nbytes:
+                num_elements = nbytes // numpy.dtype(dtype).itemsize
+                array = numpy.memmap(f, dtype=dtype, mode="c", offset=data_start + offset, shape=(num_elements,))
+                array = array.reshape(shape)
+            else:
+                array = numpy.empty(shape, dtype=dtype)
+            tensors[name] = torch.from_numpy(array)
+        return tensors, metadata
+
+    if mmap:
+        raise RuntimeError("Memory-mapping requires a file name (not a file object).")
+    base = f.tell()
+    (data_start, entries), metadata = _load_header(f)
+    tensors = {}
+    for name, dtype, shape, offset, nbytes in entries:
+        f.seek(base + data_start + offset)
+        array = numpy.frombuffer(bytearray(f.read(nbytes)), dtype=dtype).reshape(shape)
+        tensors[name] = torch.from_numpy(array)
+    return tensors, metadata
+
+
+def _load_header(f):
+    header_size, = struct.unpack("<Q", f.read(8))
+    header = torch.load(io.BytesIO(f.read(header_size)))
+    return (_aligned(8 + header_size), header["tensors"]), header["metadata"]
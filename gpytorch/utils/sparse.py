@@ -3,6 +3,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import itertools
 from operator import mul
 
 import torch
@@ -242,3 +243,132 @@ def to_sparse(dense):
     if dense.is_cuda:
         res = res.cuda()
     return res
+
+
+def _searchsorted(sorted_tensor, values, right=False):
+    """
+    For each value, returns the index at which it would be inserted into the (1D) sorted tensor.
+    If right=True, the index is past any entries that are equal to the value.
+    """
+    if hasattr(torch, "searchsorted"):
+        return torch.searchsorted(sorted_tensor, values, right=right)
+    return _binary_search(sorted_tensor, values, right=right)
+
+
+def _binary_search(sorted_tensor, values, right=False):
+    # (For versions of PyTorch that do not have torch.searchsorted)
+    lower = torch.zeros(values.size(), dtype=torch.long, device=values.device)
+    upper = torch.full(values.size(), sorted_tensor.numel(), dtype=torch.long, device=values.device)
+    if not sorted_tensor.numel():
+        return lower
+
+    # (Vectorized over the values)
+    for _ in range(sorted_tensor.numel().bit_length() + 1):
+        middle = (lower + upper) // 2
+        middle_values = sorted_tensor[middle.clamp(max=sorted_tensor.numel() - 1)]
+        go_right = middle_values.le(values) if right else middle_values.lt(values)
+        go_right = go_right & lower.lt(upper)
+        lower = torch.where(go_right, middle + 1, lower)
+        upper = torch.where(go_right, upper, torch.where(lower.lt(upper), middle, upper))
+    return lower
+
+
+def _grid_cells(x1, x2, cell_width, padding=1):
+    """
+    Sorts the points of x1 and x2 into grid cells of width :attr:`cell_width`.
+    The grid is padded with :attr:`padding` empty cells on each side, so that the cells within :attr:`padding`
+    of any occupied cell have a unique (row-major) key.
+
+    Returns:
+        - LongTensor n x d, LongTensor m x d - the (integer) grid cells of the points
+        - LongTensor n, LongTensor m - the keys of the cells
+        - LongTensor d - the strides of the keys
+    """
+    num_dims = x1.size(-1)
+    x1_cells = x1.detach().div(cell_width).floor().long()
+    x2_cells = x2.detach().div(cell_width).floor().long()
+    min_cells = torch.min(x1_cells.min(0)[0], x2_cells.min(0)[0]) - padding
+    x1_cells = x1_cells - min_cells
+    x2_cells = x2_cells - min_cells
+    extents = (torch.max(x1_cells.max(0)[0], x2_cells.max(0)[0]) + padding + 1).tolist()
+
+    # The cells are numbered in row-major order
+    strides = [1] * num_dims
+    for i in range(num_dims - 2, -1, -1):
+        strides[i] = strides[i + 1] * extents[i + 1]
+    if strides[0] * extents[0] >= 2 ** 62:
+        raise RuntimeError("Too many grid cells - grid cells are intended for low dimensional inputs.")
+    strides = torch.tensor(strides, dtype=torch.long, device=x1.device)
+    return x1_cells, x2_cells, (x1_cells * strides).sum(-1), (x2_cells * strides).sum(-1), strides
+
+
+def _expand_cells(query_keys, sorted_keys):
+    """
+    Expands each query (cell key) into all of the points in that cell.
+
+    Args:
+        query_keys - LongTensor q - the cell keys that are queried
+        sorted_keys - LongTensor m - the (sorted) cell keys of the points
+
+    Returns:
+        LongTensor k, LongTensor k - for each (query, point) candidate: the index of the query, and the
+        position of the point in :attr:`sorted_keys`
+    """
+    device = query_keys.device
+    query_starts = _searchsorted(sorted_keys, query_keys)
+    query_counts = _searchsorted(sorted_keys, query_keys, right=True) - query_starts
+
+    count_ends = query_counts.cumsum(0)
+    num_candidates = count_ends[-1].item() if count_ends.numel() else 0
+    candidates = torch.arange(0, num_candidates, dtype=torch.long, device=device)
+    query_index = _searchsorted(count_ends, candidates, right=True)
+    position = candidates - (count_ends - query_counts)[query_index] + query_starts[query_index]
+    return query_index, position
+
+
+def radius_neighbors(x1, x2, radius=1.0, max_block_size=2 ** 16):
+    """
+    Finds all pairs of points (x1_i, x2_j) that are closer than the radius, without computing all of the
+    pairwise distances. The points are sorted into grid cells of width :attr:`radius`, and each point is only
+    compared to the points in its own cell and the adjacent cells.
+
+    Args:
+        x1 - Tensor n x d
+        x2 - Tensor m x d
+        radius - the (Euclidean) radius
+        max_block_size - the number of rows of x1 that are processed at a time
+
+    Returns:
+        LongTensor 2 x nnz - the (row, column) indices of the pairs, sorted by row
+    """
+    if x1.ndimension() != 2 or x2.ndimension() != 2:
+        raise RuntimeError("radius_neighbors expects n x d and m x d inputs")
+    num_dims = x1.size(-1)
+    device = x1.device
+
+    _, _, x1_keys, x2_keys, strides = _grid_cells(x1, x2, radius)
+    x2_keys, x2_order = x2_keys.sort()
+
+    # The keys of the adjacent cells
+    offsets = torch.tensor(list(itertools.product([-1, 0, 1], repeat=num_dims)), dtype=torch.long, device=device)
+    offset_keys = (offsets * strides).sum(-1)
+
+    res = []
+    sq_radius = radius ** 2
+    for start in range(0, x1.size(0), max_block_size):
+        length = min(max_block_size, x1.size(0) - start)
+        query_keys = (x1_keys[start:start + length].unsqueeze(-1) + offset_keys).view(-1)
+        query_index, position = _expand_cells(query_keys, x2_keys)
+        if not query_index.numel():
+            continue
+        rows = query_index // offset_keys.numel() + start
+        cols = x2_order[position]
+
+        # Keep the pairs that are within the radius
+        sq_dists = (x1.detach()[rows] - x2.detach()[cols]).pow(2).sum(-1)
+        mask = sq_dists.lt(sq_radius)
+        res.append(torch.stack([rows[mask], cols[mask]], 0))
+
+    if not len(res):
+        return torch.zeros(2, 0, dtype=torch.long, device=device)
+    return torch.cat(res, -1)
@@ -3,6 +3,7 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import math
 import torch
 from ..utils import fft
 
@@ -249,3 +250,237 @@ def sym_toeplitz_derivative_quadratic_form(left_vectors, right_vectors):
         res[:, 0] -= (left_vectors * right_vectors).view(batch_size, -1).sum(1)
 
     return res
+
+
+def sym_toeplitz_circulant_column(toeplitz_column):
+    """
+    Computes the first column of T. Chan's optimal circulant approximation C to a symmetric Toeplitz matrix T,
+    i.e. the circulant matrix minimizing ||C - T||_F. The entries are given by:
+                                c_k = ((n - k) * t_k + k * t_{n-k}) / n
+    If T is positive definite, so is C.
+
+    Args:
+        - toeplitz_column (vector n or b x n) - First column of the symmetric Toeplitz matrix T.
+    Returns:
+        - vector n or b x n - First column of the circulant matrix C.
+    """
+    n = toeplitz_column.size(-1)
+    if n == 1:
+        return toeplitz_column
+
+    weights = torch.arange(n, dtype=toeplitz_column.dtype, device=toeplitz_column.device)
+    reversed_column = torch.cat([toeplitz_column.narrow(-1, 0, 1), toeplitz_column.narrow(-1, 1, n - 1).flip(-1)], -1)
+    res = toeplitz_column.mul(n - weights).add_(reversed_column.mul(weights))
+    return res.div_(n)
+
+
+def circulant_eigenvalues(circulant_column):
+    """
+    Computes the eigenvalues of a symmetric circulant matrix C from its first column.
+    These are given by the (real) discrete Fourier transform of the column.
+
+    Args:
+        - circulant_column (vector n or b x n) - First column of the symmetric circulant matrix C.
+    Returns:
+        - vector n or b x n - The eigenvalues of C (in the order of the Fourier frequencies).
+    """
+    return fft.fft1(circulant_column).select(-1, 0)
+
+
+def circulant_inv_matmul(circulant_eigenvalues, tensor, signal_ndim=1):
+    """
+    Performs the solve C^{-1} M where the matrix C is a symmetric circulant matrix, using the FFT.
+
+    If signal_ndim > 1, C is a multilevel circulant matrix (e.g. a Kronecker product of circulant matrices)
+    on a m_1 x ... x m_d grid, and is diagonalized by the d-dimensional FFT (supported for d <= 3).
+
+    Args:
+        - circulant_eigenvalues (vector n, b x n, or (b x) m_1 x ... x m_d) - Eigenvalues of C
+          (see :func:`circulant_eigenvalues`).
+        - tensor (vector n, matrix n x p, or b x n x p) - Matrix or vector to solve against.
+        - signal_ndim (int) - The number of levels d of C (default 1).
+    Returns:
+        - tensor (n, n x p or b x n x p) - The result of the solve C^{-1} M.
+    """
+    is_vector = tensor.ndimension() == 1
+    if is_vector:
+        tensor = tensor.unsqueeze(-1)
+
+    grid_sizes = circulant_eigenvalues.shape[-signal_ndim:]
+    tensor_shape = tensor.shape
+    tensor = tensor.transpose(-1, -2).contiguous()
+    tensor = tensor.view(*tensor.shape[:-1], *grid_sizes)
+
+    fft_tensor = torch.stack((tensor, torch.zeros_like(tensor)), dim=-1).fft(signal_ndim)
+    fft_tensor = fft_tensor.div(circulant_eigenvalues.unsqueeze(-signal_ndim - 1).unsqueeze(-1))
+    res = fft_tensor.ifft(signal_ndim).select(-1, 0)
+    res = res.contiguous().view(*tensor_shape[:-2], tensor_shape[-1], tensor_shape[-2]).transpose(-1, -2)
+
+    if is_vector:
+        res = res.squeeze(-1)
+    return res
+
+
+def circulant_root(circulant_eigenvalues, rank, signal_ndim=1):
+    """
+    Computes a low-rank root R (so that RR^T ~= C) of a symmetric (multilevel) circulant matrix C,
+    from the eigenvectors corresponding to its largest eigenvalues. The eigenvectors are the (real) Fourier
+    basis vectors on the m_1 x ... x m_d grid, scaled by the square roots of the eigenvalues.
+
+    Args:
+        - circulant_eigenvalues (vector n, b x n, or (b x) m_1 x ... x m_d) - Eigenvalues of C
+          (see :func:`circulant_eigenvalues`).
+        - rank (int) - The number of eigenvectors to use.
+        - signal_ndim (int) - The number of levels d of C (default 1).
+    Returns:
+        - tensor (n x rank or b x n x rank) - The root R.
+    """
+    grid_sizes = circulant_eigenvalues.shape[-signal_ndim:]
+    batch_shape = circulant_eigenvalues.shape[:-signal_ndim]
+    num_points = 1
+    for grid_size in grid_sizes:
+        num_points = num_points * grid_size
+    rank = min(rank, num_points)
+
+    flattened_eigenvalues = circulant_eigenvalues.contiguous().view(*batch_shape, num_points)
+    eigenvalues, frequencies = flattened_eigenvalues.topk(rank, dim=-1)
+
+    # phase = 2 pi * sum_j (frequency_j * position_j mod m_j) / m_j, for each level j of the grid
+    phases = torch.zeros(*batch_shape, num_points, rank, dtype=eigenvalues.dtype, device=eigenvalues.device)
+    negated_frequencies = torch.zeros_like(frequencies)
+    positions = torch.arange(num_points, dtype=torch.long, device=eigenvalues.device)
+    remaining_frequencies = frequencies
+    stride = 1
+    for grid_size in reversed(grid_sizes):
+        frequency = remaining_frequencies.fmod(grid_size)
+        position = positions.fmod(grid_size)
+        phase = (position.unsqueeze(-1) * frequency.unsqueeze(-2)).fmod(grid_size)
+        phases = phases + phase.type_as(phases).div(grid_size)
+
+        negated_frequencies = negated_frequencies + (grid_size - frequency).fmod(grid_size).mul(stride)
+        remaining_frequencies = remaining_frequencies.div(grid_size)
+        positions = positions.div(grid_size)
+        stride = stride * grid_size
+    phases = phases.mul(2 * math.pi)
+
+    # The frequencies f and -f share an eigenvalue, spanned by the real vectors cos(phase) and sin(phase)
+    # We use cos for the first of each pair (and for self-conjugate frequencies), and sin for the second
+    use_cos = (frequencies <= negated_frequencies).unsqueeze(-2).expand_as(phases)
+    res = torch.where(use_cos, phases.cos(), phases.sin())
+    norms = torch.where(
+        frequencies == negated_frequencies,
+        torch.full_like(eigenvalues, num_points),
+        torch.full_like(eigenvalues, num_points / 2.),
+    )
+    res = res.mul(eigenvalues.clamp(min=0).div(norms).sqrt().unsqueeze(-2))
+    return res
+
+
+def sym_toeplitz_levinson(toeplitz_column):
+    """
+    Runs the Levinson-Durbin recursion on a symmetric positive definite Toeplitz matrix T.
+    This computes the first column of T^{-1} (which, by the Gohberg-Semencul formula, fully determines T^{-1})
+    and the exact log determinant of T in O(n^2) time and O(n) memory.
+
+    Args:
+        - toeplitz_column (vector n or b x n) - First column of the symmetric Toeplitz matrix T.
+    Returns:
+        - vector n or b x n - The first column of T^{-1}
+        - scalar or vector b - The log determinant of T
+    """
+    is_batch = toeplitz_column.ndimension() == 2
+    if not is_batch:
+        toeplitz_column = toeplitz_column.unsqueeze(0)
+
+    batch_size, n = toeplitz_column.size()
+    t_0 = toeplitz_column[:, 0]
+    log_det = t_0.log().mul(n)
+
+    # Durbin's algorithm (Golub & Van Loan, Alg. 4.7.1) on the normalized matrix T / t_0
+    # beta tracks the prediction error of the k-th order predictor y
+    normalized_column = toeplitz_column[:, 1:].div(t_0.unsqueeze(-1))
+    predictor = torch.zeros_like(normalized_column)
+    beta = torch.ones_like(t_0)
+    for k in range(n - 1):
+        alpha = normalized_column[:, k] + (normalized_column[:, :k].flip(-1) * predictor[:, :k]).sum(-1)
+        alpha = alpha.div(beta).neg()
+        predictor[:, :k] = predictor[:, :k] + alpha.unsqueeze(-1) * predictor[:, :k].flip(-1)
+        predictor[:, k] = alpha
+        beta = beta.mul(1 - alpha.pow(2))
+        log_det = log_det + beta.log()
+
+    inv_column = torch.cat([torch.ones_like(t_0).unsqueeze(-1), predictor], -1)
+    inv_column = inv_column.div(t_0.mul(beta).unsqueeze(-1))
+
+    if not is_batch:
+        inv_column = inv_column.squeeze(0)
+        log_det = log_det.squeeze(0)
+    return inv_column, log_det
+
+
+def _lower_triangular_toeplitz_matmul(toeplitz_column, tensor, transpose=False):
+    zeros = torch.zeros_like(toeplitz_column)
+    zeros.narrow(-1, 0, 1).copy_(toeplitz_column.narrow(-1, 0, 1))
+    if transpose:
+        return toeplitz_matmul(zeros, toeplitz_column, tensor)
+    return toeplitz_matmul(toeplitz_column, zeros, tensor)
+
+
+def _gohberg_semencul_columns(inv_column):
+    # T^{-1} = (L(u) L(u)^T - L(v) L(v)^T) / u_0,
+    # where L(.) is the lower triangular Toeplitz matrix with the given first column,
+    # u is the first column of T^{-1}, and v = [0, u_{n-1}, ..., u_1]
+    n = inv_column.size(-1)
+    v = torch.cat([torch.zeros_like(inv_column.narrow(-1, 0, 1)), inv_column.narrow(-1, 1, n - 1).flip(-1)], -1)
+    scale = inv_column.narrow(-1, 0, 1).rsqrt()
+    return inv_column.mul(scale), v.mul(scale)
+
+
+def sym_toeplitz_inv_matmul(inv_column, tensor):
+    """
+    Performs the exact solve T^{-1} M where T is a symmetric positive definite Toeplitz matrix, using the
+    Gohberg-Semencul formula. Each solve requires four FFT-based triangular Toeplitz matmuls, so this
+    costs O(n log n) per right hand side once the first column of T^{-1} is known.
+
+    Args:
+        - inv_column (vector n or b x n) - First column of T^{-1} (see :func:`sym_toeplitz_levinson`).
+        - tensor (vector n, matrix n x p, or b x n x p) - Matrix or vector to solve against.
+    Returns:
+        - tensor (n, n x p or b x n x p) - The result of the solve T^{-1} M.
+    """
+    u, v = _gohberg_semencul_columns(inv_column)
+    if v.size(-1) == 1:
+        return tensor.mul(u.pow(2))
+
+    res = _lower_triangular_toeplitz_matmul(u, _lower_triangular_toeplitz_matmul(u, tensor, transpose=True))
+    res = res - _lower_triangular_toeplitz_matmul(v, _lower_triangular_toeplitz_matmul(v, tensor, transpose=True))
+    return res
+
+
+def sym_toeplitz_log_det_derivative(inv_column):
+    """
+    Computes the derivative of log|T| with respect to each element of the first column of a symmetric positive
+    definite Toeplitz matrix T, i.e. tr(T^{-1} dT/dc_i). These are (twice) the sums of the diagonals of T^{-1},
+    which are computed in O(n log n) time using the Gohberg-Semencul formula.
+
+    Args:
+        - inv_column (vector n or b x n) - First column of T^{-1} (see :func:`sym_toeplitz_levinson`).
+    Returns:
+        - vector n or b x n - The derivative of the log determinant with respect to the column of T.
+    """
+    n = inv_column.size(-1)
+    if n == 1:
+        return inv_column
+
+    # The sum of the kth subdiagonal of L(u) L(u)^T is \sum_j (n - k - j) u_j u_{j+k}
+    weights = torch.arange(n, dtype=inv_column.dtype, device=inv_column.device)
+    res = torch.zeros_like(inv_column)
+    for vec, sign in zip(_gohberg_semencul_columns(inv_column), (1, -1)):
+        correlation = _lower_triangular_toeplitz_matmul(vec, vec.unsqueeze(-1), transpose=True).squeeze(-1)
+        weighted_correlation = _lower_triangular_toeplitz_matmul(
+            vec.mul(weights), vec.unsqueeze(-1), transpose=True
+        ).squeeze(-1)
+        res = res + correlation.mul(n - weights).sub(weighted_correlation).mul(sign)
+
+    res.narrow(-1, 1, n - 1).mul_(2)
+    return res
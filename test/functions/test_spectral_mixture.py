@@ -0,0 +1,55 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import torch
+import unittest
+from gpytorch.functions._spectral_mixture import SpectralMixtureCovar
+
+
+def _naive_spectral_mixture(x1, x2, weights, means, scales):
+    diff = x1.unsqueeze(-2).unsqueeze(1) - x2.unsqueeze(-3).unsqueeze(1)
+    exp_term = (diff * scales.unsqueeze(-2).unsqueeze(-2)).pow(2).mul(-2 * math.pi ** 2).exp()
+    cos_term = (diff * means.unsqueeze(-2).unsqueeze(-2)).mul(2 * math.pi).cos()
+    res = (exp_term * cos_term).prod(-1)
+    return (res * weights.unsqueeze(-1).unsqueeze(-1)).sum(1)
+
+
+class TestSpectralMixtureCovar(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.x1 = torch.randn(2, 7, 3, dtype=torch.double)
+        self.x2 = torch.randn(2, 5, 3, dtype=torch.double)
+        self.weights = torch.rand(2, 4, dtype=torch.double)
+        self.means = torch.rand(2, 4, 3, dtype=torch.double)
+        self.scales = torch.rand(2, 4, 3, dtype=torch.double)
+
+    def _test_spectral_mixture(self, x1, x2, max_block_size):
+        inputs = [x1, x2, self.weights, self.means, self.scales]
+        inputs = [tensor.clone().requires_grad_(True) for tensor in inputs]
+        actual_inputs = [tensor.clone().detach().requires_grad_(True) for tensor in inputs]
+
+        res = SpectralMixtureCovar(max_block_size=max_block_size)(*inputs)
+        actual = _naive_spectral_mixture(*actual_inputs)
+        self.assertLess(torch.norm(res - actual), 1e-6)
+
+        grad_output = torch.randn_like(res)
+        res.backward(grad_output)
+        actual.backward(grad_output)
+        for tensor, actual_tensor in zip(inputs, actual_inputs):
+            self.assertLess(torch.norm(tensor.grad - actual_tensor.grad), 1e-6)
+
+    def test_spectral_mixture(self):
+        self._test_spectral_mixture(self.x1, self.x2, max_block_size=2 ** 22)
+
+    def test_spectral_mixture_blocks(self):
+        self._test_spectral_mixture(self.x1, self.x2, max_block_size=50)
+
+    def test_spectral_mixture_symmetric(self):
+        self._test_spectral_mixture(self.x1, self.x1, max_block_size=50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,9 @@ from __future__ import unicode_literals
 import math
 import torch
 import unittest
-from gpytorch.kernels import RBFKernel, AdditiveKernel, ProductKernel
+import gpytorch
+from gpytorch.kernels import RBFKernel, AdditiveKernel, ProductKernel, MaternKernel, ScaleKernel, PeriodicKernel
+from gpytorch.lazy import FastGaussTransformLazyTensor, SumLazyTensor, TiledKernelLazyTensor
 
 
 class TestAdditiveKernel(unittest.TestCase):
@@ -126,6 +128,85 @@ class TestAdditiveKernel(unittest.TestCase):
         )
         self.assertLess(torch.norm(res - actual_param_grad), 2e-5)
 
+    def create_fused_kernels(self):
+        kernels = [
+            RBFKernel().initialize(log_lengthscale=-0.5),
+            MaternKernel(nu=1.5).initialize(log_lengthscale=0.3),
+            ScaleKernel(RBFKernel(batch_size=2), batch_size=2).initialize(log_outputscale=torch.tensor([0.5, 1.])),
+            RBFKernel(active_dims=[0]),
+            MaternKernel(nu=2.5, active_dims=[0]),
+            # Not fused (ARD lengthscale, or not a distance-based kernel)
+            RBFKernel(ard_num_dims=2),
+            PeriodicKernel(),
+        ]
+        for kern in kernels:
+            kern.eval()
+        return kernels
+
+    def test_fused_sum(self):
+        a = torch.randn(2, 5, 2)
+        b = torch.randn(2, 4, 2)
+        kernels = self.create_fused_kernels()
+        kernel = AdditiveKernel(*kernels)
+        kernel.eval()
+
+        for x1, x2 in ((a, b), (a, a)):
+            actual = sum(kern(x1, x2).evaluate() for kern in kernels)
+            res = kernel(x1, x2).evaluate()
+            self.assertLess(torch.norm(res - actual), 1e-5)
+            with torch.no_grad():
+                res = kernel(x1, x2).evaluate()
+            self.assertLess(torch.norm(res - actual), 1e-5)
+
+        # Gradients
+        kernel(a, b).evaluate().sum().backward()
+        for kern in kernels:
+            for param in kern.parameters():
+                actual_grad = torch.autograd.grad(kern(a, b).evaluate().sum(), param)[0]
+                self.assertLess(torch.norm(param.grad - actual_grad), 1e-4)
+
+    def test_no_fusion_for_tiled_or_fast_gauss_transform_kernels(self):
+        x = torch.randn(300, 2)
+        kernel = AdditiveKernel(RBFKernel(), MaternKernel(nu=2.5))
+        kernel.eval()
+        actual = kernel(x).evaluate()
+        with gpytorch.settings.max_kernel_tile_size(1000):
+            res = kernel(x).evaluate_kernel()
+            self.assertIsInstance(res, SumLazyTensor)
+            self.assertTrue(all(isinstance(term, TiledKernelLazyTensor) for term in res.lazy_tensors))
+            self.assertLess(torch.norm(res.evaluate() - actual), 1e-4)
+
+        x = torch.randn(300, 1)
+        kernel = AdditiveKernel(RBFKernel(), RBFKernel().initialize(log_lengthscale=0.5))
+        kernel.eval()
+        with gpytorch.settings.fast_gauss_transform_tolerance(1e-4):
+            res = kernel(x).evaluate_kernel()
+            self.assertIsInstance(res, SumLazyTensor)
+            self.assertTrue(all(isinstance(term, FastGaussTransformLazyTensor) for term in res.lazy_tensors))
+
+    def test_fused_product(self):
+        a = torch.randn(2, 5, 2)
+        b = torch.randn(2, 4, 2)
+        kernels = self.create_fused_kernels()[:5]
+        kernel = ProductKernel(*kernels)
+        kernel.eval()
+
+        actual = kernels[0](a, b).evaluate()
+        for kern in kernels[1:]:
+            actual = actual * kern(a, b).evaluate()
+        res = kernel(a, b).evaluate()
+        self.assertLess(torch.norm(res - actual), 1e-5)
+
+        # The components are not evaluated separately
+        def forward(*args, **kwargs):
+            raise RuntimeError("forward should not be called")
+
+        for kern in kernels:
+            kern.forward = forward
+        with torch.no_grad():
+            res = kernel(a, b).evaluate()
+        self.assertLess(torch.norm(res - actual), 1e-5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,119 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+from gpytorch.kernels import RBFKernel, GridInterpolationKernel
+from gpytorch.lazy import InterpolatedLazyTensor, KroneckerProductLazyTensor, NonLazyTensor, ToeplitzLazyTensor
+from gpytorch.utils.grid import create_data_from_grid
+
+
+class TestGridInterpolationKernel(unittest.TestCase):
+    def test_standard(self):
+        base_kernel = RBFKernel()
+        kernel = GridInterpolationKernel(base_kernel, num_dims=2, grid_size=128, grid_bounds=[(-1.2, 1.2)] * 2)
+
+        xs = torch.randn(5, 2).clamp(-1, 1)
+        interp_covar = kernel(xs, xs).evaluate_kernel()
+        self.assertIsInstance(interp_covar, InterpolatedLazyTensor)
+
+        xs = torch.randn(5, 2).clamp(-1, 1)
+        grid_eval = kernel(xs, xs).evaluate()
+        actual_eval = base_kernel(xs, xs).evaluate()
+        self.assertLess(torch.norm(grid_eval - actual_eval), 2e-5)
+
+    def test_inducing_points_are_not_stored(self):
+        kernel = GridInterpolationKernel(RBFKernel(), grid_size=10, grid_bounds=[(0, 1)] * 2)
+        self.assertNotIn("inducing_points", kernel._buffers)
+        self.assertNotIn("inducing_points", kernel.state_dict())
+
+        # They are still available on demand
+        inducing_points = kernel.inducing_points
+        self.assertEqual(inducing_points.size(), torch.Size((1, 100, 2)))
+        self.assertTrue(torch.equal(inducing_points[0], create_data_from_grid(kernel.grid)))
+
+        # Old state dicts (which saved the inducing points, and the grid as a single tensor) can still be loaded
+        state_dict = kernel.state_dict()
+        state_dict["inducing_points"] = inducing_points
+        state_dict["grid"] = torch.stack([state_dict.pop("grid_0"), state_dict.pop("grid_1")], -1).mul(2)
+        kernel.load_state_dict(state_dict)
+        self.assertTrue(torch.equal(kernel.grid[1], state_dict["grid"][:, 1]))
+
+    def test_different_grid_sizes(self):
+        base_kernel = RBFKernel(ard_num_dims=2)
+        base_kernel.initialize(log_lengthscale=torch.tensor([[[-1., 0.5]]]))
+        kernel = GridInterpolationKernel(base_kernel, grid_size=[40, 25], grid_bounds=[(0, 1), (0, 3)])
+        self.assertEqual(kernel.grid_sizes, [40, 25])
+
+        xs = torch.rand(10, 2).mul(0.8).add(0.1).mul(torch.tensor([1., 3.]))
+        interp_covar = kernel(xs).evaluate_kernel()
+        self.assertEqual(interp_covar.base_lazy_tensor.size(), torch.Size((1000, 1000)))
+        actual = base_kernel(xs).evaluate()
+        self.assertLess((interp_covar.evaluate() - actual).abs().max().item(), 1e-2)
+
+        # Points on (and close to) the grid bounds are interpolated with the padding grid points, which is less
+        # accurate than in the interior of the grid
+        edge_xs = torch.tensor([[0., 0.], [1., 3.], [0., 3.], [1., 0.], [0.01, 0.03], [0.99, 2.91], [0.003, 1.5]])
+        edge_covar = kernel(edge_xs).evaluate()
+        actual = base_kernel(edge_xs).evaluate()
+        self.assertLess((edge_covar - actual).abs().max().item(), 5e-2)
+
+    def test_irregular_grid(self):
+        base_kernel = RBFKernel()
+        base_kernel.initialize(log_lengthscale=-1)
+        grid = [torch.linspace(0, 1, 30).pow(1.5).mul(2.4).sub(1.2), torch.linspace(-1.2, 1.2, 40)]
+        kernel = GridInterpolationKernel(base_kernel, grid=grid)
+        self.assertFalse(kernel.grid_is_dynamic)
+
+        xs = torch.rand(10, 2).mul(2).sub(1)
+        interp_covar = kernel(xs).evaluate_kernel()
+        # Kronecker structure is kept - but only the regularly spaced dimension is Toeplitz
+        base_lazy_tensor = interp_covar.base_lazy_tensor
+        self.assertIsInstance(base_lazy_tensor, KroneckerProductLazyTensor)
+        self.assertEqual(
+            [type(lazy_tensor) for lazy_tensor in base_lazy_tensor.lazy_tensors], [ToeplitzLazyTensor, NonLazyTensor]
+        )
+        actual = base_kernel(xs).evaluate()
+        self.assertLess((interp_covar.evaluate() - actual).abs().max().item(), 1e-2)
+
+    def test_dynamic_grid_is_only_updated_when_out_of_bounds(self):
+        kernel = GridInterpolationKernel(RBFKernel(), grid_size=20, num_dims=1)
+        xs = torch.linspace(0, 1, 10).unsqueeze(-1)
+        kernel(xs).evaluate_kernel()
+        grid = kernel.grid[0].clone()
+        self.assertTrue(kernel.has_initialized_grid.item())
+
+        kernel(xs * 0.5).evaluate_kernel()
+        self.assertTrue(torch.equal(grid, kernel.grid[0]))
+
+        kernel(xs * 2).evaluate_kernel()
+        self.assertGreater(kernel.grid[0].max().item(), grid.max().item())
+
+    def test_frozen_grid_reuses_train_interpolation(self):
+        kernel = GridInterpolationKernel(RBFKernel(), grid_size=20, num_dims=1)
+        xs = torch.linspace(0, 1, 10).unsqueeze(-1)
+        kernel(xs).evaluate_kernel()
+        kernel.freeze_grid()
+        grid = kernel.grid[0].clone()
+
+        res1 = kernel(xs).evaluate_kernel()
+        res2 = kernel(xs).evaluate_kernel()
+        self.assertEqual(res1.left_interp_values.data_ptr(), res2.left_interp_values.data_ptr())
+        self.assertTrue(torch.equal(res1.evaluate(), res2.evaluate()))
+
+        # The grid no longer adapts to the data
+        kernel(xs * 2).evaluate_kernel()
+        self.assertTrue(torch.equal(grid, kernel.grid[0]))
+
+        # Modifying the inputs invalidates the cache
+        xs.mul_(0.5)
+        res3 = kernel(xs).evaluate_kernel()
+        self.assertNotEqual(res1.left_interp_values.data_ptr(), res3.left_interp_values.data_ptr())
+        actual = RBFKernel()(xs).evaluate()
+        self.assertLess(torch.norm(res3.evaluate() - actual), 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
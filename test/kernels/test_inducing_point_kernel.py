@@ -0,0 +1,148 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import torch
+import unittest
+import gpytorch
+from gpytorch.kernels import InducingPointKernel, RBFKernel, ScaleKernel
+from gpytorch.lazy import RootLazyTensor
+
+
+class SGPRModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood, inducing_points):
+        super(SGPRModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = gpytorch.means.ConstantMean()
+        self.covar_module = InducingPointKernel(ScaleKernel(RBFKernel()), inducing_points=inducing_points)
+
+    def forward(self, x):
+        return gpytorch.distributions.MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class TestInducingPointKernel(unittest.TestCase):
+    def setUp(self):
+        self.rng_state = torch.get_rng_state()
+        torch.manual_seed(0)
+
+    def tearDown(self):
+        torch.set_rng_state(self.rng_state)
+
+    def _create_model(self):
+        train_x = torch.rand(50, 2)
+        train_y = torch.sin(train_x.sum(-1) * 3) + torch.randn(50).mul(0.1)
+        likelihood = gpytorch.likelihoods.GaussianLikelihood()
+        likelihood.initialize(log_noise=math.log(0.05))
+        model = SGPRModel(train_x, train_y, likelihood, inducing_points=torch.rand(10, 2))
+        model.mean_module.initialize(constant=0.2)
+        return model, likelihood
+
+    def _dense_covars(self, model, x1, x2):
+        kernel = model.covar_module
+        inducing_points = kernel.inducing_points[0]
+        k_uu = kernel.base_kernel(inducing_points, inducing_points).evaluate() + torch.eye(10).mul(1e-3)
+        k_1u = kernel.base_kernel(x1, inducing_points).evaluate()
+        k_2u = kernel.base_kernel(x2, inducing_points).evaluate()
+        return k_1u.matmul(torch.gesv(k_2u.t(), k_uu)[0])
+
+    def test_inducing_inv_root_batch(self):
+        base_kernel = RBFKernel(batch_size=2)
+        base_kernel.initialize(log_lengthscale=torch.tensor([[[-1.]], [[0.]]]))
+        kernel = InducingPointKernel(base_kernel, inducing_points=torch.rand(10, 2))
+        inv_root = kernel._inducing_inv_root
+        self.assertEqual(inv_root.size(), torch.Size((2, 10, 10)))
+
+        k_uu = base_kernel(kernel.inducing_points, kernel.inducing_points).evaluate() + torch.eye(10).mul(1e-3)
+        res = k_uu.matmul(inv_root.matmul(inv_root.transpose(-1, -2)))
+        self.assertLess((res - torch.eye(10)).abs().max().item(), 1e-3)
+
+    def test_inducing_inv_root_cache(self):
+        kernel = InducingPointKernel(ScaleKernel(RBFKernel()), inducing_points=torch.rand(10, 2))
+
+        # Results that are part of an autograd graph are not cached
+        self.assertIsNot(kernel._inducing_inv_root, kernel._inducing_inv_root)
+
+        with torch.no_grad():
+            res = kernel._inducing_inv_root
+            self.assertIs(kernel._inducing_inv_root, res)
+            # The cache is kept across train/eval
+            kernel.eval()
+            self.assertIs(kernel._inducing_inv_root, res)
+            kernel.train()
+            self.assertIs(kernel._inducing_inv_root, res)
+
+            # The cache is invalidated when the inducing points or the hyperparameters change
+            kernel.inducing_points.add_(0.1)
+            new_res = kernel._inducing_inv_root
+            self.assertIsNot(new_res, res)
+            kernel.base_kernel.initialize(log_outputscale=1.)
+            self.assertIsNot(kernel._inducing_inv_root, new_res)
+
+        # In train mode, the (detached) cache is not used when gradients are needed
+        self.assertTrue(kernel._inducing_inv_root.requires_grad)
+
+        # In eval mode, the factor is cached even with autograd enabled
+        kernel.eval()
+        res = kernel._inducing_inv_root
+        self.assertFalse(res.requires_grad)
+        self.assertIs(kernel._inducing_inv_root, res)
+        kernel.base_kernel.initialize(log_outputscale=0.)
+        self.assertIsNot(kernel._inducing_inv_root, res)
+
+    def test_predictions_reuse_inducing_inv_root(self):
+        model, likelihood = self._create_model()
+        model.eval()
+        likelihood.eval()
+        test_x = torch.rand(20, 2)
+        model(test_x)
+        res = model.covar_module._inducing_inv_root_cache[1]
+        model(test_x)
+        self.assertIs(model.covar_module._inducing_inv_root_cache[1], res)
+
+    def test_marginal_log_likelihood(self):
+        model, likelihood = self._create_model()
+        train_x, train_y = model.train_inputs[0], model.train_targets
+        mll = gpytorch.mlls.ExactMarginalLogLikelihood(likelihood, model)
+        res = mll(model(train_x), train_y)
+
+        # The Titsias bound
+        noise = likelihood.log_noise.exp()
+        q_ff = self._dense_covars(model, train_x, train_x)
+        covar = q_ff + torch.eye(50) * noise
+        diff = (train_y - 0.2).unsqueeze(-1)
+        inv_quad = diff.t().matmul(torch.gesv(diff, covar)[0]).squeeze()
+        log_det = torch.logdet(covar)
+        trace_diff = (model.covar_module.base_kernel(train_x, diag=True) - q_ff.diag()).sum() / noise
+        actual = -0.5 * (inv_quad + log_det + 50 * math.log(2 * math.pi) + trace_diff) / 50
+        self.assertLess(abs(res.item() - actual.item()), 1e-4)
+
+    def test_predictions(self):
+        model, likelihood = self._create_model()
+        train_x, train_y = model.train_inputs[0], model.train_targets
+        test_x = torch.rand(7, 2)
+        model.eval()
+
+        with torch.no_grad():
+            for _ in range(2):
+                # (The second time around, the predictions use the caches)
+                preds = model(test_x)
+                self.assertIsInstance(preds.lazy_covariance_matrix, RootLazyTensor)
+                self.assertEqual(preds.lazy_covariance_matrix.root_decomposition_size(), 10)
+                self.assertEqual(model.mean_cache.size(), torch.Size((10, 1)))
+                self.assertEqual(model.covar_cache.size(), torch.Size((10, 10)))
+
+                noise = likelihood.log_noise.exp()
+                covar = self._dense_covars(model, train_x, train_x) + torch.eye(50) * noise
+                test_train_covar = self._dense_covars(model, test_x, train_x)
+                actual_mean = test_train_covar.matmul(torch.gesv((train_y - 0.2).unsqueeze(-1), covar)[0])
+                actual_mean = actual_mean.squeeze(-1) + 0.2
+                actual_covar = self._dense_covars(model, test_x, test_x)
+                actual_covar = actual_covar - test_train_covar.matmul(torch.gesv(test_train_covar.t(), covar)[0])
+
+                self.assertLess((preds.mean - actual_mean).abs().max().item(), 1e-4)
+                self.assertLess((preds.covariance_matrix - actual_covar).abs().max().item(), 1e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
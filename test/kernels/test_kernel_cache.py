@@ -0,0 +1,130 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+from gpytorch.kernels import RBFKernel, ScaleKernel
+
+
+class TestKernelCache(unittest.TestCase):
+    def assertSameMemory(self, tensor1, tensor2):
+        self.assertEqual(tensor1.data_ptr(), tensor2.data_ptr())
+
+    def assertNotSameMemory(self, tensor1, tensor2):
+        self.assertNotEqual(tensor1.data_ptr(), tensor2.data_ptr())
+
+    def create_kernel(self):
+        kernel = RBFKernel().enable_kernel_cache(max_size=2)
+        kernel.eval()
+        return kernel
+
+    def test_cache_hit(self):
+        kernel = self.create_kernel()
+        x = torch.randn(1, 10, 2)
+        x2 = torch.randn(1, 10, 2)
+        with torch.no_grad():
+            res1 = kernel(x).evaluate()
+            res2 = kernel(x).evaluate()
+            # (The diagonal of K_xx is constant, and is not cached)
+            diag1 = kernel(x, x2, diag=True)
+            diag2 = kernel(x, x2, diag=True)
+        self.assertSameMemory(res1, res2)
+        self.assertIs(diag1, diag2)
+
+        # Views of the same memory also hit the cache
+        with torch.no_grad():
+            res3 = kernel(x[:, :5]).evaluate()
+            res4 = kernel(x[:, :10][:, :5]).evaluate()
+        self.assertSameMemory(res3, res4)
+
+    def test_cache_invalidated_by_hyperparameters(self):
+        kernel = self.create_kernel()
+        x = torch.randn(10, 2)
+        with torch.no_grad():
+            res1 = kernel(x).evaluate()
+
+            # Through initialize (which does not change the version counter)
+            kernel.initialize(log_lengthscale=torch.tensor([[1.]]))
+            res2 = kernel(x).evaluate()
+            actual = RBFKernel().initialize(log_lengthscale=torch.tensor([[1.]]))(x).evaluate()
+            self.assertLess(torch.norm(res2 - actual), 1e-5)
+            self.assertGreater(torch.norm(res1 - res2), 1e-2)
+
+            # Through an in-place update
+            kernel.log_lengthscale.add_(1.)
+            res3 = kernel(x).evaluate()
+            actual = RBFKernel().initialize(log_lengthscale=torch.tensor([[2.]]))(x).evaluate()
+            self.assertLess(torch.norm(res3 - actual), 1e-5)
+
+            # Train and eval mode are cached separately
+            kernel.train()
+            res4 = kernel(x).evaluate()
+            kernel.eval()
+            self.assertNotSameMemory(kernel(x).evaluate(), res4)
+
+    def test_cache_invalidated_by_inputs(self):
+        kernel = self.create_kernel()
+        x = torch.randn(10, 2)
+        with torch.no_grad():
+            res1 = kernel(x).evaluate()
+            x.add_(1.)
+            res2 = kernel(x).evaluate()
+            actual = RBFKernel()(x).evaluate()
+        self.assertLess(torch.norm(res2 - actual), 1e-5)
+
+        # The symmetric matrix is not returned for x1 != x2
+        with torch.no_grad():
+            res3 = kernel(x, x.clone()).evaluate()
+        self.assertLess(torch.norm(res3 - actual), 1e-5)
+        self.assertFalse(torch.equal(res1, res2))
+
+    def test_lru_eviction(self):
+        kernel = self.create_kernel()
+        xs = [torch.randn(10, 2) for _ in range(3)]
+        with torch.no_grad():
+            res0 = kernel(xs[0]).evaluate()
+            res1 = kernel(xs[1]).evaluate()
+            # Use xs[0] again, so that xs[1] is the least recently used entry
+            self.assertSameMemory(kernel(xs[0]).evaluate(), res0)
+            kernel(xs[2]).evaluate()
+            self.assertEqual(len(kernel._kernel_cache), 2)
+            self.assertSameMemory(kernel(xs[0]).evaluate(), res0)
+            self.assertNotSameMemory(kernel(xs[1]).evaluate(), res1)
+
+        kernel.clear_kernel_cache()
+        self.assertEqual(len(kernel._kernel_cache), 0)
+        kernel.disable_kernel_cache()
+        with torch.no_grad():
+            res2 = kernel(xs[0]).evaluate()
+            self.assertNotSameMemory(kernel(xs[0]).evaluate(), res2)
+
+    def test_squeezed_results_do_not_modify_the_cache(self):
+        from gpytorch.lazy import LazyEvaluatedKernelTensor
+
+        kernel = self.create_kernel()
+        x = torch.randn(6, 2)
+        with torch.no_grad():
+            actual = LazyEvaluatedKernelTensor(RBFKernel(), x[:1], x, squeeze_row=True).evaluate()
+            for _ in range(3):
+                res = LazyEvaluatedKernelTensor(kernel, x[:1], x, squeeze_row=True).evaluate()
+                self.assertEqual(res.shape, actual.shape)
+                self.assertLess((res - actual).abs().max().item(), 1e-6)
+
+    def test_no_cache_with_grad(self):
+        kernel = ScaleKernel(RBFKernel()).enable_kernel_cache()
+        x = torch.randn(10, 2)
+        res1 = kernel(x).evaluate()
+        res2 = kernel(x).evaluate()
+        self.assertIsNot(res1, res2)
+        self.assertEqual(len(kernel._kernel_cache), 0)
+
+        # Gradients are still correct
+        res1.sum().backward()
+        res2.sum().backward()
+        self.assertIsNotNone(kernel.log_outputscale.grad)
+
+
+if __name__ == "__main__":
+    unittest.main()
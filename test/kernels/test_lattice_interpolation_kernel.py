@@ -0,0 +1,68 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+from gpytorch.kernels import LatticeInterpolationKernel, MaternKernel, RBFKernel
+from gpytorch.lazy import InterpolatedLazyTensor, LatticeBlurLazyTensor
+
+
+class TestLatticeInterpolationKernel(unittest.TestCase):
+    def setUp(self):
+        self.rng_state = torch.get_rng_state()
+        torch.manual_seed(0)
+
+    def tearDown(self):
+        torch.set_rng_state(self.rng_state)
+
+    def test_approximates_rbf(self):
+        base_kernel = RBFKernel(ard_num_dims=3)
+        base_kernel.initialize(log_lengthscale=torch.tensor([[[0., 0.5, -0.5]]]))
+        kernel = LatticeInterpolationKernel(base_kernel)
+
+        xs = torch.rand(400, 3).mul(2)
+        lazy_covar = kernel(xs).evaluate_kernel()
+        self.assertIsInstance(lazy_covar, InterpolatedLazyTensor)
+        self.assertIsInstance(lazy_covar.base_lazy_tensor, LatticeBlurLazyTensor)
+        self.assertEqual(lazy_covar.size(), torch.Size((400, 400)))
+
+        res = lazy_covar.evaluate()
+        actual = base_kernel(xs).evaluate()
+        self.assertLess((res - actual).abs().mean().item(), 0.05)
+        self.assertLess((res - actual).norm().item() / actual.norm().item(), 0.2)
+
+    def test_cross_covariance(self):
+        kernel = LatticeInterpolationKernel(RBFKernel())
+        x1 = torch.rand(50, 4)
+        x2 = torch.rand(20, 4)
+        res = kernel(x1, x2).evaluate()
+        self.assertEqual(res.size(), torch.Size((50, 20)))
+
+        # Cross covariances match the joint covariance matrix
+        full_res = kernel(torch.cat([x1, x2])).evaluate()
+        self.assertLess((res - full_res[:50, 50:]).abs().max().item(), 1e-5)
+
+        self.assertTrue(torch.equal(kernel(x1, diag=True), torch.ones(50)))
+
+    def test_lengthscale_gradient(self):
+        base_kernel = RBFKernel()
+        kernel = LatticeInterpolationKernel(base_kernel)
+        xs = torch.rand(100, 5)
+        vec = torch.randn(100)
+        kernel(xs).matmul(vec).dot(vec).backward()
+        self.assertIsNotNone(base_kernel.log_lengthscale.grad)
+        self.assertGreater(base_kernel.log_lengthscale.grad.abs().item(), 0)
+
+    def test_errors(self):
+        with self.assertRaises(RuntimeError):
+            LatticeInterpolationKernel(MaternKernel())
+
+        kernel = LatticeInterpolationKernel(RBFKernel())
+        with self.assertRaises(RuntimeError):
+            kernel(torch.rand(2, 10, 3)).evaluate()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -175,6 +175,67 @@ class TestRBFKernel(unittest.TestCase):
 
         self.assertLess(torch.norm(res - actual_param_grad), 1e-5)
 
+    def test_stationary_diag(self):
+        a = torch.randn(2, 5, 3)
+        kernel = RBFKernel(batch_size=2).initialize(log_lengthscale=torch.randn(2, 1, 1))
+        kernel.eval()
+        actual = torch.cat([mat.diag().unsqueeze(0) for mat in kernel(a, a.clone()).evaluate()])
+
+        # The diagonal is computed without calling forward
+        def forward(*args, **kwargs):
+            raise RuntimeError("forward should not be called")
+
+        kernel.forward = forward
+        self.assertTrue(torch.equal(kernel(a).diag(), actual))
+        self.assertTrue(torch.equal(kernel(a, diag=True), actual))
+        self.assertTrue(torch.equal(kernel(a[0], diag=True), actual[0]))
+        self.assertEqual(kernel(a, diag=True, batch_dims=(0, 2)).shape, torch.Size((6, 5)))
+        self.assertEqual(kernel(a[0], diag=True, batch_dims=(0, 2)).shape, torch.Size((3, 5)))
+
+    def test_covar_dist(self):
+        kernel = RBFKernel()
+        a = torch.randn(2, 5, 3) * 10
+        b = torch.randn(2, 4, 3) * 10
+        actual = (a.unsqueeze(-2) - b.unsqueeze(-3)).norm(2, dim=-1)
+        self.assertLess((kernel._covar_dist(a, b) - actual).abs().max().item(), 1e-3)
+        self.assertLess((kernel._covar_dist(a, b, square_dist=True) - actual.pow(2)).abs().max().item(), 1e-2)
+
+        # Symmetric inputs have an exactly zero diagonal
+        res = kernel._covar_dist(a, a, square_dist=True)
+        self.assertTrue(torch.equal(res[0].diag(), torch.zeros(5)))
+        self.assertTrue(torch.equal(kernel._covar_dist(a, a, diag=True), torch.zeros(2, 5)))
+        self.assertGreaterEqual(res.min().item(), 0)
+
+        # batch_dims
+        res = kernel._covar_dist(a, b, batch_dims=(0, 2))
+        actual = (a.unsqueeze(-2) - b.unsqueeze(-3)).abs().permute(0, 3, 1, 2).contiguous().view(6, 5, 4)
+        self.assertLess((res - actual).abs().max().item(), 1e-3)
+
+    def test_covar_dist_gradient(self):
+        kernel = RBFKernel()
+        a = torch.randn(5, 3, requires_grad=True)
+        a_copy = a.detach().clone().requires_grad_(True)
+
+        # The diagonal (zero distance) should not produce NaN gradients
+        kernel._covar_dist(a, a).sum().backward()
+        actual = (a_copy.unsqueeze(-2) - a_copy.unsqueeze(-3)).pow(2).sum(-1).add(1e-30).sqrt()
+        actual.sum().backward()
+        self.assertFalse(torch.isnan(a.grad).any())
+        self.assertLess((a.grad - a_copy.grad).abs().max().item(), 1e-4)
+
+    def test_covar_dist_gradient_equal_inputs(self):
+        # A distinct x2 that merely has the same values as x1 still receives its gradient
+        kernel = RBFKernel()
+        a = torch.randn(5, 3)
+        b = a.clone().requires_grad_(True)
+        b_copy = a.clone().requires_grad_(True)
+        weights = torch.randn(5, 5)
+
+        kernel._covar_dist(a, b, square_dist=True).mul(weights).sum().backward()
+        (a.unsqueeze(-2) - b_copy.unsqueeze(-3)).pow(2).sum(-1).mul(weights).sum().backward()
+        self.assertIsNotNone(b.grad)
+        self.assertLess((b.grad - b_copy.grad).abs().max().item(), 1e-4)
+
 
 if __name__ == "__main__":
     unittest.main()
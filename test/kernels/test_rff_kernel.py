@@ -0,0 +1,102 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+from gpytorch.kernels import MaternKernel, RBFKernel, RFFKernel, ScaleKernel, SpectralMixtureKernel
+from gpytorch.lazy import RootLazyTensor
+
+
+class TestRFFKernel(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+
+    def _test_approximation(self, base_kernel, x):
+        kernel = RFFKernel(base_kernel, num_samples=20000)
+        with torch.no_grad():
+            res = kernel(x).evaluate()
+            actual = base_kernel(x).evaluate()
+            self.assertLess((res - actual).abs().max(), 0.1)
+
+            res = kernel(x, x[..., :4, :]).evaluate()
+            actual = base_kernel(x, x[..., :4, :]).evaluate()
+            self.assertLess((res - actual).abs().max(), 0.1)
+
+            # The diagonal is exact
+            res = kernel(x).diag()
+            actual = base_kernel(x).diag()
+            self.assertLess(torch.norm(res - actual), 1e-5)
+
+    def test_rbf(self):
+        self._test_approximation(RBFKernel().initialize(log_lengthscale=-0.5), torch.randn(10, 3))
+
+    def test_rbf_ard_batch(self):
+        base_kernel = RBFKernel(ard_num_dims=3, batch_size=2)
+        base_kernel.initialize(log_lengthscale=torch.randn(2, 1, 3).mul(0.2))
+        self._test_approximation(base_kernel, torch.randn(2, 10, 3))
+
+    def test_matern(self):
+        for nu in [0.5, 1.5, 2.5]:
+            self._test_approximation(MaternKernel(nu=nu), torch.randn(10, 2))
+
+    def test_spectral_mixture(self):
+        base_kernel = SpectralMixtureKernel(num_mixtures=2, ard_num_dims=2)
+        base_kernel.initialize(
+            log_mixture_weights=torch.tensor([[1, 0.5]]).log(),
+            log_mixture_means=torch.tensor([[[[0.1, 0.2]], [[0.2, 0.1]]]]).log(),
+            log_mixture_scales=torch.tensor([[[[0.5, 0.25]], [[0.25, 0.5]]]]).log(),
+        )
+        self._test_approximation(base_kernel, torch.randn(10, 2))
+
+    def test_low_rank_output(self):
+        kernel = ScaleKernel(RFFKernel(RBFKernel(), num_samples=8))
+        x = torch.randn(50, 3)
+        res = kernel(x).evaluate_kernel().base_lazy_tensor.evaluate_kernel()
+        self.assertIsInstance(res, RootLazyTensor)
+        self.assertEqual(res.root_decomposition_size(), 16)
+
+        # Solves with the added noise use the Woodbury formula
+        lazy_tensor = kernel(x).add_diag(torch.tensor(0.1))
+        self.assertIsNotNone(lazy_tensor._low_rank_root())
+        rhs = torch.randn(50, 2)
+        actual = torch.gesv(rhs, lazy_tensor.evaluate())[0]
+        self.assertLess(torch.norm(lazy_tensor.inv_matmul(rhs) - actual) / torch.norm(actual), 1e-3)
+
+    def test_resample(self):
+        kernel = RFFKernel(RBFKernel(), num_samples=8)
+        x = torch.randn(5, 3)
+        with torch.no_grad():
+            res1 = kernel(x).evaluate()
+            res2 = kernel(x).evaluate()
+            self.assertTrue(torch.equal(res1, res2))
+            kernel.resample()
+            res3 = kernel(x).evaluate()
+            self.assertFalse(torch.equal(res1, res3))
+
+        with self.assertRaises(RuntimeError):
+            kernel(torch.randn(5, 2)).evaluate()
+        with self.assertRaises(RuntimeError):
+            RFFKernel(ScaleKernel(RBFKernel()), num_samples=8)
+
+    def test_features(self):
+        kernel = RFFKernel(RBFKernel(), num_samples=8, active_dims=[0, 2])
+        x = torch.randn(5, 3)
+        with torch.no_grad():
+            features = kernel.features(x)
+            self.assertEqual(features.shape, torch.Size((5, 16)))
+            res = features.matmul(features.transpose(-1, -2))
+            self.assertLess(torch.norm(res - kernel(x).evaluate()), 1e-5)
+
+    def test_gradients(self):
+        base_kernel = MaternKernel(nu=1.5)
+        kernel = RFFKernel(base_kernel, num_samples=8, num_dims=3)
+        x = torch.randn(5, 3)
+        kernel(x, x.clone()).evaluate().sum().backward()
+        self.assertIsNotNone(base_kernel.log_lengthscale.grad)
+        self.assertGreater(base_kernel.log_lengthscale.grad.abs().sum(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -79,6 +79,29 @@ class TestScaleKernel(unittest.TestCase):
         actual = torch.cat([actual[i].diag().unsqueeze(0) for i in range(actual.size(0))])
         self.assertLess(torch.norm(res - actual), 1e-5)
 
+    def test_stationary_diag(self):
+        a = torch.randn(2, 4, 3)
+        kernel = ScaleKernel(RBFKernel(), batch_size=2)
+        kernel.initialize(log_outputscale=torch.tensor([2., 3.]).log())
+        kernel.eval()
+        self.assertTrue(kernel.is_stationary)
+
+        actual = torch.cat([mat.diag().unsqueeze(0) for mat in kernel(a, a.clone()).evaluate()])
+        res = kernel(a).diag()
+        self.assertLess(torch.norm(res - actual), 1e-5)
+        res = kernel(a, diag=True)
+        self.assertLess(torch.norm(res - actual), 1e-5)
+
+        # batch_dims
+        actual = kernel(a, a.clone(), batch_dims=(0, 2)).evaluate()
+        actual = torch.cat([mat.diag().unsqueeze(0) for mat in actual])
+        res = kernel(a, diag=True, batch_dims=(0, 2))
+        self.assertLess(torch.norm(res - actual), 1e-5)
+
+        # The outputscale gets a gradient
+        kernel(a).diag().sum().backward()
+        self.assertLess(torch.norm(kernel.log_outputscale.grad - torch.tensor([8., 12.])), 1e-5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -93,6 +93,29 @@ class TestSpectralMixtureKernel(unittest.TestCase):
         actual = torch.cat([actual[i].diag().unsqueeze(0) for i in range(actual.size(0))])
         self.assertLess(torch.norm(res - actual), 1e-5)
 
+    def test_offset_inputs(self):
+        # Inputs far from the origin should not suffer from cancellation errors
+        kernel = SpectralMixtureKernel(num_mixtures=2, ard_num_dims=2)
+        kernel.initialize(log_mixture_weights=torch.tensor([[1., 1.]]).log())
+        kernel.eval()
+        a = torch.randn(50, 2)
+        actual = kernel(a, a.clone()).evaluate()
+        res = kernel(a + 1e4, a + 1e4).evaluate()
+        self.assertLess((res.diag() - 2).abs().max().item(), 1e-3)
+        self.assertLess((res - actual).abs().max().item(), 1e-2)
+
+    def test_stationary_diag(self):
+        a = torch.tensor([[4, 2, 8], [1, 2, 3]], dtype=torch.float).view(2, 3, 1)
+        weights = torch.tensor([[4, 2], [1, 2]], dtype=torch.float).view(2, 2)
+        kernel = SpectralMixtureKernel(batch_size=2, num_mixtures=2)
+        kernel.initialize(log_mixture_weights=weights.log())
+        kernel.eval()
+
+        actual = torch.cat([mat.diag().unsqueeze(0) for mat in kernel(a, a.clone()).evaluate()])
+        res = kernel(a).diag()
+        self.assertLess(torch.norm(res - actual), 1e-5)
+        self.assertLess(torch.norm(res - torch.tensor([[6.], [3.]])), 1e-5)
+
 
 if __name__ == "__main__":
     unittest.main()
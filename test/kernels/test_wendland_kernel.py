@@ -0,0 +1,72 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+import gpytorch
+from gpytorch.kernels import WendlandKernel
+from gpytorch.lazy import SparseLazyTensor
+
+
+def _dense_wendland(x1, x2, lengthscale, q):
+    distance = (x1.unsqueeze(-2) - x2.unsqueeze(-3)).div(lengthscale).pow(2).sum(-1).clamp(min=1e-30).sqrt()
+    exponent = x1.size(-1) // 2 + q + 1
+    one_minus_dist = (1 - distance).clamp(min=0)
+    if q == 0:
+        return one_minus_dist ** exponent
+    elif q == 1:
+        return one_minus_dist ** (exponent + 1) * ((exponent + 1) * distance + 1)
+    polynomial = (exponent ** 2 + 4 * exponent + 3) * distance ** 2 + (3 * exponent + 6) * distance + 3
+    return one_minus_dist ** (exponent + 2) * polynomial / 3
+
+
+class TestWendlandKernel(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+
+    def test_computes_kernel(self):
+        x1 = torch.rand(30, 2) * 3
+        x2 = torch.rand(20, 2) * 3
+        for q in [0, 1, 2]:
+            kernel = WendlandKernel(q=q).initialize(log_lengthscale=torch.tensor(0.5).log())
+            kernel.eval()
+
+            res = kernel(x1, x2).evaluate_kernel()
+            self.assertIsInstance(res, SparseLazyTensor)
+            actual = _dense_wendland(x1, x2, 0.5, q)
+            self.assertLess(torch.norm(res.evaluate() - actual), 1e-5)
+            self.assertLess(res.values.numel(), actual.numel() // 2)
+
+            res = kernel(x1, x1).diag()
+            self.assertLess(torch.norm(res - torch.ones(30)), 1e-5)
+
+    def test_computes_kernel_batch(self):
+        x1 = torch.rand(2, 30, 3) * 3
+        kernel = WendlandKernel(ard_num_dims=3, batch_size=2)
+        kernel.initialize(log_lengthscale=torch.rand(2, 1, 3).add(0.5).log())
+        res = kernel(x1).evaluate()
+        actual = torch.cat([_dense_wendland(x1[i], x1[i], kernel.lengthscale[i], 1).unsqueeze(0) for i in range(2)])
+        self.assertLess(torch.norm(res - actual), 1e-5)
+
+    def test_gradients(self):
+        x = torch.rand(30, 2) * 3
+        y = torch.randn(30)
+        kernel = WendlandKernel(q=2).initialize(log_lengthscale=torch.tensor(0.8).log())
+        covar = kernel(x).add_diag(torch.tensor(0.1))
+        with gpytorch.settings.max_cg_iterations(100):
+            inv_quad, log_det = covar.inv_quad_log_det(y, log_det=True)
+        inv_quad.backward()
+        res = kernel.log_lengthscale.grad.clone()
+
+        kernel.log_lengthscale.grad = None
+        actual = _dense_wendland(x, x, kernel.lengthscale, 2) + torch.eye(30).mul(0.1)
+        actual_inv_quad = y.dot(torch.gesv(y.unsqueeze(-1), actual)[0].squeeze(-1))
+        actual_inv_quad.backward()
+        self.assertLess(abs(inv_quad.item() - actual_inv_quad.item()) / actual_inv_quad.item(), 1e-3)
+        self.assertLess(torch.norm(res - kernel.log_lengthscale.grad) / torch.norm(res), 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,7 @@ from __future__ import unicode_literals
 
 import torch
 import unittest
-from gpytorch.lazy import NonLazyTensor, DiagLazyTensor, AddedDiagLazyTensor
+from gpytorch.lazy import NonLazyTensor, DiagLazyTensor, AddedDiagLazyTensor, RootLazyTensor
 from test.lazy._lazy_tensor_test_case import LazyTensorTestCase, BatchLazyTensorTestCase
 
 
@@ -43,5 +43,41 @@ class TestAddedDiagLazyTensorBatch(BatchLazyTensorTestCase, unittest.TestCase):
         return tensor + torch.cat([diag[i].diag().unsqueeze(0) for i in range(3)])
 
 
+class TestAddedDiagLazyTensorLowRank(LazyTensorTestCase, unittest.TestCase):
+    seed = 0
+    should_test_sample = True
+
+    def create_lazy_tensor(self):
+        root = torch.randn(5, 2, requires_grad=True)
+        diag = torch.tensor([1., 2., 4., 2., 3.], requires_grad=True)
+        return AddedDiagLazyTensor(RootLazyTensor(root), DiagLazyTensor(diag))
+
+    def evaluate_lazy_tensor(self, lazy_tensor):
+        diag = lazy_tensor._diag_tensor._diag
+        root = lazy_tensor._lazy_tensor.root.tensor
+        return root.matmul(root.transpose(-1, -2)) + diag.diag()
+
+    def test_low_rank_root(self):
+        lazy_tensor = self.create_lazy_tensor()
+        self.assertIsNotNone(lazy_tensor._low_rank_root())
+        self.assertIsNotNone(lazy_tensor._lazy_tensor.mul(2.).add_diag(torch.tensor(1.))._low_rank_root())
+        self.assertIsNone(lazy_tensor._lazy_tensor.mul(-2.).add_diag(torch.tensor(1.))._low_rank_root())
+
+
+class TestAddedDiagLazyTensorLowRankBatch(BatchLazyTensorTestCase, unittest.TestCase):
+    seed = 4
+    should_test_sample = True
+
+    def create_lazy_tensor(self):
+        root = torch.randn(3, 5, 2, requires_grad=True)
+        diag = torch.tensor([[1., 2., 4., 2., 3.], [2., 1., 2., 1., 4.], [1., 2., 2., 3., 4.]], requires_grad=True)
+        return AddedDiagLazyTensor(RootLazyTensor(root), DiagLazyTensor(diag))
+
+    def evaluate_lazy_tensor(self, lazy_tensor):
+        diag = lazy_tensor._diag_tensor._diag
+        root = lazy_tensor._lazy_tensor.root.tensor
+        return root.matmul(root.transpose(-1, -2)) + torch.cat([diag[i].diag().unsqueeze(0) for i in range(3)])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,124 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+import gpytorch
+from gpytorch.kernels import MaternKernel, RBFKernel, ScaleKernel
+from gpytorch.lazy import FastGaussTransformLazyTensor
+
+
+class ExactGPModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood):
+        super(ExactGPModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = gpytorch.means.ConstantMean()
+        self.covar_module = ScaleKernel(RBFKernel(ard_num_dims=2))
+
+    def forward(self, x):
+        return gpytorch.distributions.MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class TestFastGaussTransformLazyTensor(unittest.TestCase):
+    def setUp(self):
+        self.rng_state = torch.get_rng_state()
+        torch.manual_seed(0)
+
+    def tearDown(self):
+        torch.set_rng_state(self.rng_state)
+
+    def create_lazy_tensor(self, kernel, x1, x2):
+        return FastGaussTransformLazyTensor(x1, x2, *kernel.parameters(), kernel=kernel, tolerance=1e-6)
+
+    def test_matmul_and_derivatives(self):
+        kernel = RBFKernel(ard_num_dims=2)
+        kernel.initialize(log_lengthscale=torch.tensor([[[-1., -0.5]]]))
+        x1 = torch.rand(500, 2).mul(3).requires_grad_(True)
+        x2 = torch.rand(400, 2).mul(3).requires_grad_(True)
+        rhs = torch.randn(400, 4)
+        lhs = torch.randn(500, 4)
+
+        actual = kernel(x1, x2).evaluate()
+        (lhs * actual.matmul(rhs)).sum().backward()
+        actual_grads = [x1.grad.clone(), x2.grad.clone(), kernel.log_lengthscale.grad.clone()]
+        for tensor in [x1, x2, kernel.log_lengthscale]:
+            tensor.grad = None
+
+        lazy_tensor = self.create_lazy_tensor(kernel, x1, x2)
+        self.assertEqual(lazy_tensor.size(), torch.Size((500, 400)))
+        self.assertLess((lazy_tensor.evaluate() - actual).abs().max().item(), 1e-5)
+
+        res = lazy_tensor.matmul(rhs)
+        self.assertLess((res - actual.matmul(rhs)).abs().max().item(), 1e-3)
+        res_t = lazy_tensor._t_matmul(lhs)
+        self.assertLess((res_t - actual.t().matmul(lhs)).abs().max().item(), 1e-3)
+
+        # The derivatives are exact
+        (lhs * res).sum().backward()
+        res_grads = [x1.grad, x2.grad, kernel.log_lengthscale.grad]
+        for res_grad, actual_grad in zip(res_grads, actual_grads):
+            self.assertLess(((res_grad - actual_grad).abs() / actual_grad.abs().clamp(1, 1e5)).max().item(), 1e-4)
+
+    def test_matmul_batch(self):
+        kernel = RBFKernel(batch_size=2)
+        kernel.initialize(log_lengthscale=torch.tensor([[[-1.]], [[0.]]]))
+        x = torch.rand(2, 300, 1).mul(5)
+        rhs = torch.randn(2, 300, 3)
+
+        actual = kernel(x).evaluate()
+        res = self.create_lazy_tensor(kernel, x, x).matmul(rhs)
+        self.assertLess((res - actual.matmul(rhs)).abs().max().item(), 1e-3)
+
+    def test_kernel_matrix_uses_fast_gauss_transform(self):
+        kernel = ScaleKernel(RBFKernel())
+        x = torch.randn(30, 2)
+        with gpytorch.settings.fast_gauss_transform_tolerance(1e-4):
+            lazy_tensor = kernel(x).evaluate_kernel().base_lazy_tensor.evaluate_kernel()
+            self.assertIsInstance(lazy_tensor, FastGaussTransformLazyTensor)
+            self.assertEqual(lazy_tensor.tolerance, 1e-4)
+            self.assertLess((lazy_tensor.diag() - torch.ones(30)).abs().max().item(), 1e-5)
+
+            # Other kernels and higher-dimensional inputs are not supported
+            lazy_tensor = MaternKernel()(x).evaluate_kernel()
+            self.assertNotIsInstance(lazy_tensor, FastGaussTransformLazyTensor)
+            lazy_tensor = RBFKernel()(torch.randn(30, 4)).evaluate_kernel()
+            self.assertNotIsInstance(lazy_tensor, FastGaussTransformLazyTensor)
+
+        lazy_tensor = kernel(x).evaluate_kernel().base_lazy_tensor.evaluate_kernel()
+        self.assertNotIsInstance(lazy_tensor, FastGaussTransformLazyTensor)
+
+    def test_exact_gp_matches_dense(self):
+        train_x = torch.rand(200, 2)
+        train_y = torch.sin(train_x.sum(-1) * 4)
+        test_x = torch.rand(10, 2)
+
+        results = []
+        for tolerance in [None, 1e-6]:
+            # The log determinant uses random probe vectors
+            torch.manual_seed(1)
+            likelihood = gpytorch.likelihoods.GaussianLikelihood()
+            model = ExactGPModel(train_x, train_y, likelihood)
+            model.covar_module.base_kernel.initialize(log_lengthscale=-2.)
+            mll = gpytorch.mlls.ExactMarginalLogLikelihood(likelihood, model)
+            with gpytorch.settings.fast_gauss_transform_tolerance(tolerance), gpytorch.settings.max_cg_iterations(100):
+                loss = -mll(model(train_x), train_y)
+                loss.backward()
+                model.eval()
+                likelihood.eval()
+                with torch.no_grad():
+                    preds = model(test_x)
+                    mean, var = preds.mean, preds.variance
+            grads = [param.grad.clone() for param in model.parameters()]
+            results.append((loss.item(), grads, mean, var))
+
+        (loss, grads, mean, var), (fgt_loss, fgt_grads, fgt_mean, fgt_var) = results
+        self.assertAlmostEqual(loss, fgt_loss, places=3)
+        for grad, fgt_grad in zip(grads, fgt_grads):
+            self.assertLess((grad - fgt_grad).abs().max().item(), 1e-2)
+        self.assertLess((mean - fgt_mean).abs().max().item(), 1e-3)
+        self.assertLess((var - fgt_var).abs().max().item(), 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,9 @@ from __future__ import unicode_literals
 
 import unittest
 import torch
-from gpytorch.lazy import NonLazyTensor, InterpolatedLazyTensor
+import gpytorch
+from gpytorch.lazy import NonLazyTensor, InterpolatedLazyTensor, ToeplitzLazyTensor
+from gpytorch.utils.toeplitz import sym_toeplitz
 from test.lazy._lazy_tensor_test_case import LazyTensorTestCase, BatchLazyTensorTestCase
 
 
@@ -40,6 +42,25 @@ class TestInterpolatedLazyTensor(LazyTensorTestCase, unittest.TestCase):
         actual = left_matrix.matmul(base_tensor).matmul(right_matrix.t())
         return actual
 
+    def test_circulant_preconditioner_root(self):
+        left_interp_indices = torch.LongTensor([[0, 1], [2, 3], [3, 4], [4, 5]])
+        left_interp_values = torch.tensor([[0.1, 0.9], [1, 2], [0.5, 1], [1, 3]], dtype=torch.float)
+        # A circulant base matrix, so that its circulant approximation is exact
+        base_column = torch.tensor([4, 1, 0.5, 0.25, 0.5, 1], dtype=torch.float)
+        lazy_tensor = InterpolatedLazyTensor(
+            ToeplitzLazyTensor(base_column), left_interp_indices, left_interp_values, left_interp_indices,
+            left_interp_values
+        )
+
+        left_matrix = torch.zeros(4, 6)
+        left_matrix.scatter_(1, left_interp_indices, left_interp_values)
+        actual = left_matrix.matmul(sym_toeplitz(base_column)).matmul(left_matrix.t())
+
+        with gpytorch.settings.toeplitz_inference("circulant"):
+            root = lazy_tensor._preconditioner_root(6)
+        self.assertEqual(root.shape, torch.Size((6, 4)))
+        self.assertLess((root.t().matmul(root) - actual).abs().max().item(), 1e-4)
+
 
 class TestInterpolatedLazyTensorBatch(BatchLazyTensorTestCase, unittest.TestCase):
     seed = 0
@@ -5,7 +5,9 @@ from __future__ import unicode_literals
 
 import torch
 import unittest
-from gpytorch.lazy import KroneckerProductLazyTensor, NonLazyTensor
+import gpytorch
+from gpytorch.lazy import KroneckerProductLazyTensor, NonLazyTensor, ToeplitzLazyTensor
+from gpytorch.utils.toeplitz import sym_toeplitz
 from test.lazy._lazy_tensor_test_case import LazyTensorTestCase, BatchLazyTensorTestCase
 from test.lazy._lazy_tensor_test_case import RectangularLazyTensorTestCase, RectangularBatchLazyTensorTestCase
 
@@ -62,6 +64,55 @@ class TestKroneckerProductLazyTensorBatch(BatchLazyTensorTestCase, unittest.Test
         return res
 
 
+class TestKroneckerProductToeplitzLazyTensor(LazyTensorTestCase, unittest.TestCase):
+    seed = 0
+
+    def create_lazy_tensor(self):
+        # Columns that are symmetric about their midpoints are also circulant
+        a = torch.tensor([4, 1, 0.5, 1], dtype=torch.float, requires_grad=True)
+        b = torch.tensor([3, 0.5, 0.5], dtype=torch.float, requires_grad=True)
+        c = torch.tensor([5, 1, 0.2, 0.2, 1], dtype=torch.float, requires_grad=True)
+        return KroneckerProductLazyTensor(ToeplitzLazyTensor(a), ToeplitzLazyTensor(b), ToeplitzLazyTensor(c))
+
+    def evaluate_lazy_tensor(self, lazy_tensor):
+        res = kron(sym_toeplitz(lazy_tensor.lazy_tensors[0].column), sym_toeplitz(lazy_tensor.lazy_tensors[1].column))
+        res = kron(res, sym_toeplitz(lazy_tensor.lazy_tensors[2].column))
+        return res
+
+    def test_circulant_preconditioner(self):
+        lazy_tensor = self.create_lazy_tensor()
+        evaluated = self.evaluate_lazy_tensor(lazy_tensor).detach()
+        self.assertEqual(lazy_tensor._circulant_eigenvalues().shape, torch.Size((5, 3, 4)))
+
+        # The circulant preconditioner is opt-in
+        self.assertIsNone(lazy_tensor._preconditioner()[0])
+
+        # The circulant approximation of a circulant matrix is exact
+        with gpytorch.settings.toeplitz_inference("circulant"):
+            precondition_closure, log_det_correction = lazy_tensor._preconditioner()
+        rhs = torch.randn(lazy_tensor.size(-1), 2)
+        self.assertLess((precondition_closure(rhs) - evaluated.inverse().matmul(rhs)).abs().max().item(), 1e-4)
+        self.assertLess(abs(log_det_correction.item() - torch.logdet(evaluated).item()), 1e-3)
+
+        with gpytorch.settings.toeplitz_inference("circulant"):
+            root = lazy_tensor._preconditioner_root(lazy_tensor.size(-1))
+        self.assertLess((root.t().matmul(root) - evaluated).abs().max().item(), 1e-4)
+
+    def test_factored_log_det(self):
+        lazy_tensor = self.create_lazy_tensor()
+        evaluated = self.evaluate_lazy_tensor(lazy_tensor)
+
+        with gpytorch.settings.toeplitz_inference("exact"):
+            res = lazy_tensor.log_det()
+        actual = torch.logdet(evaluated)
+        self.assertLess(abs(res.item() - actual.item()), 1e-3)
+
+        res.backward()
+        actual_grads = torch.autograd.grad(actual, [factor.column for factor in lazy_tensor.lazy_tensors])
+        for factor, actual_grad in zip(lazy_tensor.lazy_tensors, actual_grads):
+            self.assertLess((factor.column.grad - actual_grad).abs().max().item(), 1e-3)
+
+
 class TestKroneckerProductLazyTensorRectangular(RectangularLazyTensorTestCase, unittest.TestCase):
     def create_lazy_tensor(self):
         a = torch.randn(2, 3, requires_grad=True)
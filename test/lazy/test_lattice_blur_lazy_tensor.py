@@ -0,0 +1,32 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+from gpytorch.lazy import LatticeBlurLazyTensor
+from gpytorch.utils.lattice import create_permutohedral_lattice, permutohedral_blur
+from test.lazy._lazy_tensor_test_case import LazyTensorTestCase
+
+
+class TestLatticeBlurLazyTensor(LazyTensorTestCase, unittest.TestCase):
+    seed = 0
+
+    def create_lazy_tensor(self):
+        _, _, neighbors = create_permutohedral_lattice(torch.randn(4, 2))
+        scale = torch.tensor(2.5, requires_grad=True)
+        return LatticeBlurLazyTensor(scale, neighbors)
+
+    def evaluate_lazy_tensor(self, lazy_tensor):
+        eye = torch.eye(lazy_tensor.size(-1))
+        return permutohedral_blur(lazy_tensor.neighbors, eye) * lazy_tensor.scale
+
+    def test_diag_matches_evaluate(self):
+        lazy_tensor = self.create_lazy_tensor()
+        evaluated = self.evaluate_lazy_tensor(lazy_tensor)
+        self.assertLess((lazy_tensor.diag() - evaluated.diag()).abs().max().item(), 1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+from gpytorch.lazy import SparseLazyTensor
+from test.lazy._lazy_tensor_test_case import LazyTensorTestCase, BatchLazyTensorTestCase
+
+
+def _tridiagonal_indices(size):
+    rows = torch.arange(0, size, dtype=torch.long)
+    indices = [
+        torch.stack([rows, rows]),
+        torch.stack([rows[:-1], rows[1:]]),
+        torch.stack([rows[1:], rows[:-1]]),
+    ]
+    return torch.cat(indices, -1)
+
+
+class TestSparseLazyTensor(LazyTensorTestCase, unittest.TestCase):
+    seed = 0
+    should_test_sample = True
+
+    def create_lazy_tensor(self):
+        # A diagonally dominant (positive definite) tridiagonal matrix
+        indices = _tridiagonal_indices(5)
+        values = torch.tensor([4., 5., 4., 6., 5., 1., -1., 2., 1., 1., -1., 2., 1.], requires_grad=True)
+        return SparseLazyTensor(indices, values, sparse_size=torch.Size((5, 5)))
+
+    def evaluate_lazy_tensor(self, lazy_tensor):
+        res = torch.zeros(5, 5)
+        return res.index_put(tuple(lazy_tensor.indices), lazy_tensor.values)
+
+    def test_getitem_sparse(self):
+        lazy_tensor = self.create_lazy_tensor()
+        evaluated = self.evaluate_lazy_tensor(lazy_tensor)
+        res = lazy_tensor[1:4, 2:5]
+        self.assertIsInstance(res, SparseLazyTensor)
+        self.assertTrue(torch.equal(res.evaluate(), evaluated[1:4, 2:5]))
+
+
+class TestSparseLazyTensorBatch(BatchLazyTensorTestCase, unittest.TestCase):
+    seed = 0
+    should_test_sample = True
+
+    def create_lazy_tensor(self):
+        indices = _tridiagonal_indices(5)
+        indices = torch.cat(
+            [torch.cat([torch.full((1, indices.size(-1)), i, dtype=torch.long), indices]) for i in range(3)], -1
+        )
+        values = torch.tensor([4., 5., 4., 6., 5., 1., -1., 2., 1., 1., -1., 2., 1.])
+        values = torch.cat([values, values.mul(2), values.add(1)]).requires_grad_(True)
+        return SparseLazyTensor(indices, values, sparse_size=torch.Size((3, 5, 5)))
+
+    def evaluate_lazy_tensor(self, lazy_tensor):
+        res = torch.zeros(3, 5, 5)
+        return res.index_put(tuple(lazy_tensor.indices), lazy_tensor.values)
+
+    def test_getitem_batch(self):
+        lazy_tensor = self.create_lazy_tensor()
+        evaluated = self.evaluate_lazy_tensor(lazy_tensor)
+        self.assertTrue(torch.equal(lazy_tensor[1].evaluate(), evaluated[1]))
+        self.assertTrue(torch.equal(lazy_tensor[torch.tensor([2, 0]), :3].evaluate(), evaluated[[2, 0], :3]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+import gpytorch
+from gpytorch.kernels import MaternKernel, RBFKernel, ScaleKernel
+from gpytorch.lazy import TiledKernelLazyTensor
+
+
+class ExactGPModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood):
+        super(ExactGPModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = gpytorch.means.ConstantMean()
+        self.covar_module = ScaleKernel(MaternKernel(nu=2.5, ard_num_dims=2))
+
+    def forward(self, x):
+        return gpytorch.distributions.MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class TestTiledKernelLazyTensor(unittest.TestCase):
+    def setUp(self):
+        self.rng_state = torch.get_rng_state()
+        torch.manual_seed(0)
+
+    def tearDown(self):
+        torch.set_rng_state(self.rng_state)
+
+    def create_lazy_tensor(self, kernel, x1, x2):
+        return TiledKernelLazyTensor(x1, x2, *kernel.parameters(), kernel=kernel)
+
+    def test_matmul_and_derivatives(self):
+        kernel = RBFKernel(ard_num_dims=3)
+        kernel.initialize(log_lengthscale=torch.tensor([[[-0.5, 0., 0.5]]]))
+        x1 = torch.randn(23, 3, requires_grad=True)
+        x2 = torch.randn(17, 3, requires_grad=True)
+        rhs = torch.randn(17, 4)
+        lhs = torch.randn(23, 4)
+
+        actual = kernel(x1, x2).evaluate()
+        (lhs * actual.matmul(rhs)).sum().backward()
+        actual_grads = [x1.grad.clone(), x2.grad.clone(), kernel.log_lengthscale.grad.clone()]
+        for tensor in [x1, x2, kernel.log_lengthscale]:
+            tensor.grad = None
+
+        with gpytorch.settings.max_kernel_tile_size(50):
+            lazy_tensor = self.create_lazy_tensor(kernel, x1, x2)
+            self.assertEqual(lazy_tensor.size(), torch.Size((23, 17)))
+            self.assertLess((lazy_tensor.evaluate() - actual).abs().max().item(), 1e-5)
+
+            res = lazy_tensor.matmul(rhs)
+            self.assertLess((res - actual.matmul(rhs)).abs().max().item(), 1e-5)
+            res_t = lazy_tensor._t_matmul(lhs)
+            self.assertLess((res_t - actual.t().matmul(lhs)).abs().max().item(), 1e-5)
+
+            (lhs * res).sum().backward()
+            res_grads = [x1.grad, x2.grad, kernel.log_lengthscale.grad]
+            for res_grad, actual_grad in zip(res_grads, actual_grads):
+                self.assertLess((res_grad - actual_grad).abs().max().item(), 1e-4)
+
+    def test_getitem_and_diag(self):
+        kernel = MaternKernel(nu=1.5)
+        x = torch.randn(20, 2)
+        actual = kernel(x).evaluate()
+
+        with gpytorch.settings.max_kernel_tile_size(30):
+            lazy_tensor = self.create_lazy_tensor(kernel, x, x)
+            self.assertLess((lazy_tensor.diag() - actual.diag()).abs().max().item(), 1e-5)
+
+            res = lazy_tensor[5:15, 2:4]
+            self.assertIsInstance(res, TiledKernelLazyTensor)
+            self.assertLess((res.evaluate() - actual[5:15, 2:4]).abs().max().item(), 1e-5)
+            self.assertLess((lazy_tensor[3] - actual[3]).abs().max().item(), 1e-5)
+
+            indices = torch.tensor([1, 4, 7])
+            self.assertLess((lazy_tensor[indices, indices] - actual[indices, indices]).abs().max().item(), 1e-5)
+
+    def test_kernel_matrix_is_tiled(self):
+        kernel = ScaleKernel(RBFKernel())
+        x = torch.randn(30, 2)
+        with gpytorch.settings.max_kernel_tile_size(100):
+            lazy_tensor = kernel(x).evaluate_kernel()
+            self.assertIsInstance(lazy_tensor.base_lazy_tensor.evaluate_kernel(), TiledKernelLazyTensor)
+
+            # Small kernel matrices are stored as usual
+            small_lazy_tensor = kernel(x[:5]).evaluate_kernel()
+            self.assertNotIsInstance(small_lazy_tensor.base_lazy_tensor.evaluate_kernel(), TiledKernelLazyTensor)
+
+        lazy_tensor = kernel(x).evaluate_kernel()
+        self.assertNotIsInstance(lazy_tensor.base_lazy_tensor.evaluate_kernel(), TiledKernelLazyTensor)
+
+    def test_exact_gp_matches_dense(self):
+        train_x = torch.rand(60, 2)
+        train_y = torch.sin(train_x.sum(-1) * 4)
+        test_x = torch.rand(10, 2)
+
+        results = []
+        for max_tile_size in [None, 200]:
+            # The log determinant uses random probe vectors
+            torch.manual_seed(1)
+            likelihood = gpytorch.likelihoods.GaussianLikelihood()
+            model = ExactGPModel(train_x, train_y, likelihood)
+            mll = gpytorch.mlls.ExactMarginalLogLikelihood(likelihood, model)
+            with gpytorch.settings.max_kernel_tile_size(max_tile_size), gpytorch.settings.max_cg_iterations(100):
+                loss = -mll(model(train_x), train_y)
+                loss.backward()
+                model.eval()
+                likelihood.eval()
+                with torch.no_grad():
+                    preds = model(test_x)
+                    mean, var = preds.mean, preds.variance
+            grads = [param.grad.clone() for param in model.parameters()]
+            results.append((loss.item(), grads, mean, var))
+
+        (loss, grads, mean, var), (tiled_loss, tiled_grads, tiled_mean, tiled_var) = results
+        self.assertAlmostEqual(loss, tiled_loss, places=4)
+        for grad, tiled_grad in zip(grads, tiled_grads):
+            self.assertLess((grad - tiled_grad).abs().max().item(), 1e-3)
+        self.assertLess((mean - tiled_mean).abs().max().item(), 1e-3)
+        self.assertLess((var - tiled_var).abs().max().item(), 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ from __future__ import unicode_literals
 
 import torch
 import unittest
+import gpytorch
 import gpytorch.utils.toeplitz as toeplitz
 from gpytorch.lazy import ToeplitzLazyTensor
 from test.lazy._lazy_tensor_test_case import LazyTensorTestCase, BatchLazyTensorTestCase
@@ -20,6 +21,56 @@ class TestToeplitzLazyTensor(LazyTensorTestCase, unittest.TestCase):
     def evaluate_lazy_tensor(self, lazy_tensor):
         return toeplitz.sym_toeplitz(lazy_tensor.column)
 
+    def test_add_diag_preserves_toeplitz(self):
+        lazy_tensor = self.create_lazy_tensor().add_diag(torch.tensor(1.5))
+        self.assertIsInstance(lazy_tensor, ToeplitzLazyTensor)
+
+    def test_circulant_preconditioner_is_opt_in(self):
+        lazy_tensor = self.create_lazy_tensor()
+        self.assertIsNone(lazy_tensor._preconditioner()[0])
+        with gpytorch.settings.toeplitz_inference("circulant"):
+            self.assertIsNotNone(lazy_tensor._preconditioner()[0])
+
+    def test_exact_inv_quad_log_det(self):
+        for method in ("exact", "circulant"):
+            lazy_tensor = self.create_lazy_tensor()
+            column_copy = lazy_tensor.column.detach().clone().requires_grad_(True)
+            vecs = torch.randn(lazy_tensor.size(1), 3, requires_grad=True)
+            vecs_copy = vecs.detach().clone().requires_grad_(True)
+
+            with gpytorch.settings.toeplitz_inference(method):
+                res_inv_quad, res_log_det = lazy_tensor.inv_quad_log_det(inv_quad_rhs=vecs, log_det=True)
+            (res_inv_quad + res_log_det).backward()
+
+            evaluated = toeplitz.sym_toeplitz(column_copy)
+            actual_inv_quad = evaluated.inverse().matmul(vecs_copy).mul(vecs_copy).sum()
+            actual_log_det = torch.logdet(evaluated)
+            if method == "circulant":
+                circulant_column = toeplitz.sym_toeplitz_circulant_column(column_copy)
+                actual_log_det = torch.logdet(toeplitz.sym_toeplitz(circulant_column))
+            (actual_inv_quad + actual_log_det).backward()
+
+            self.assertLess(abs(res_inv_quad.item() - actual_inv_quad.item()), 1e-3)
+            self.assertLess(abs(res_log_det.item() - actual_log_det.item()), 1e-4)
+            self.assertLess((lazy_tensor.column.grad - column_copy.grad).abs().max().item(), 1e-3)
+            self.assertLess((vecs.grad - vecs_copy.grad).abs().max().item(), 1e-3)
+
+    def test_exact_inv_matmul(self):
+        lazy_tensor = self.create_lazy_tensor()
+        column_copy = lazy_tensor.column.detach().clone().requires_grad_(True)
+        rhs = torch.randn(lazy_tensor.size(1), 3, requires_grad=True)
+        rhs_copy = rhs.detach().clone().requires_grad_(True)
+
+        with gpytorch.settings.toeplitz_inference("exact"):
+            res = lazy_tensor.inv_matmul(rhs)
+        res.sum().backward()
+        actual = toeplitz.sym_toeplitz(column_copy).inverse().matmul(rhs_copy)
+        actual.sum().backward()
+
+        self.assertLess((res - actual).abs().max().item(), 1e-4)
+        self.assertLess((lazy_tensor.column.grad - column_copy.grad).abs().max().item(), 1e-4)
+        self.assertLess((rhs.grad - rhs_copy.grad).abs().max().item(), 1e-4)
+
 
 class TestToeplitzLazyTensorBatch(BatchLazyTensorTestCase, unittest.TestCase):
     seed = 0
@@ -36,6 +87,21 @@ class TestToeplitzLazyTensorBatch(BatchLazyTensorTestCase, unittest.TestCase):
             ]
         )
 
+    def test_exact_inv_quad_log_det(self):
+        lazy_tensor = self.create_lazy_tensor()
+        evaluated = self.evaluate_lazy_tensor(lazy_tensor)
+        vecs = torch.randn(2, lazy_tensor.size(1), 3)
+
+        with gpytorch.settings.toeplitz_inference("exact"):
+            res_inv_quad, res_log_det = lazy_tensor.inv_quad_log_det(inv_quad_rhs=vecs, log_det=True)
+
+        actual_inv_quad = torch.cat(
+            [evaluated[i].inverse().matmul(vecs[i]).mul(vecs[i]).sum().view(1) for i in range(2)]
+        )
+        actual_log_det = torch.cat([torch.logdet(evaluated[i]).view(1) for i in range(2)])
+        self.assertLess((res_inv_quad - actual_inv_quad).abs().max().item(), 1e-3)
+        self.assertLess((res_log_det - actual_log_det).abs().max().item(), 1e-4)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,131 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import torch
+import unittest
+import gpytorch
+from gpytorch.distributions import MultivariateNormal
+from gpytorch.kernels import RBFKernel, ScaleKernel
+from gpytorch.lazy import DiagLazyTensor
+from gpytorch.likelihoods import GaussianLikelihood
+from gpytorch.means import ConstantMean
+
+
+class ExactGPModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood, batch_size=1):
+        super(ExactGPModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = ConstantMean(batch_size=batch_size)
+        self.covar_module = ScaleKernel(RBFKernel(batch_size=batch_size), batch_size=batch_size)
+
+    def forward(self, x):
+        return MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class VariationalGPModel(gpytorch.models.VariationalGP):
+    def __init__(self, train_x):
+        super(VariationalGPModel, self).__init__(train_x)
+        self.mean_module = ConstantMean()
+        self.covar_module = ScaleKernel(RBFKernel())
+
+    def forward(self, x):
+        return MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class GridInducingVariationalGPModel(gpytorch.models.GridInducingVariationalGP):
+    def __init__(self):
+        super(GridInducingVariationalGPModel, self).__init__(grid_size=16, grid_bounds=[(0, 1)])
+        self.mean_module = ConstantMean()
+        self.covar_module = ScaleKernel(RBFKernel())
+
+    def forward(self, x):
+        return MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class TestDiagPredCovar(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+
+    def _initialize_variational_gp(self, model, num_inducing):
+        model.variational_mean.data.copy_(torch.randn(num_inducing))
+        model.chol_variational_covar.data.copy_(torch.eye(num_inducing).mul(0.5).add(torch.randn(num_inducing).ger(
+            torch.randn(num_inducing)).mul(0.05).tril()))
+        model.variational_params_initialized.fill_(1)
+        model.eval()
+
+    def test_exact_gp(self):
+        train_x = torch.rand(40)
+        train_y = torch.sin(train_x * (2 * math.pi))
+        test_x = torch.rand(30)
+        likelihood = GaussianLikelihood().initialize(log_noise=math.log(0.01))
+        model = ExactGPModel(train_x, train_y, likelihood)
+        model.covar_module.base_kernel.initialize(log_lengthscale=math.log(0.2))
+        model.eval()
+
+        for fast_pred_var in [False, True]:
+            with gpytorch.beta_features.fast_pred_var(fast_pred_var):
+                model.train()
+                model.eval()
+                actual = model(test_x)
+                # (Chunks of 10 test points)
+                with gpytorch.settings.diag_pred_covar(), gpytorch.settings.max_kernel_tile_size(400):
+                    res = model(test_x)
+            self.assertIsInstance(res.lazy_covariance_matrix, DiagLazyTensor)
+            self.assertLess(torch.norm(res.mean - actual.mean), 1e-4)
+            self.assertLess(torch.norm(res.variance - actual.variance), 1e-3)
+
+        # The posterior object
+        with gpytorch.settings.diag_pred_covar():
+            res = model.posterior()(test_x)
+        self.assertIsInstance(res.lazy_covariance_matrix, DiagLazyTensor)
+        self.assertLess(torch.norm(res.variance - actual.variance), 1e-3)
+
+    def test_exact_gp_batch(self):
+        train_x = torch.rand(2, 30, 1)
+        train_y = torch.sin(train_x.squeeze(-1) * (2 * math.pi))
+        test_x = torch.rand(2, 15, 1)
+        model = ExactGPModel(train_x, train_y, GaussianLikelihood(), batch_size=2)
+        model.eval()
+
+        actual = model(test_x)
+        with gpytorch.settings.diag_pred_covar(), gpytorch.settings.max_kernel_tile_size(200):
+            res = model(test_x)
+        self.assertIsInstance(res.lazy_covariance_matrix, DiagLazyTensor)
+        self.assertEqual(res.variance.shape, torch.Size((2, 15)))
+        self.assertLess(torch.norm(res.variance - actual.variance), 1e-3)
+
+    def test_variational_gp(self):
+        test_x = torch.rand(30)
+        model = VariationalGPModel(torch.linspace(0, 1, 10))
+        # (A shorter lengthscale keeps K_uu well conditioned - otherwise the large entries of K_uu^{-1} m make the
+        # predictive means sensitive to round-off in how K_xu is multiplied)
+        model.covar_module.base_kernel.initialize(log_lengthscale=math.log(0.1))
+        self._initialize_variational_gp(model, 10)
+
+        for fast_pred_var in [False, True]:
+            with gpytorch.beta_features.fast_pred_var(fast_pred_var):
+                model.train()
+                model.eval()
+                actual = model(test_x)
+                with gpytorch.settings.diag_pred_covar(), gpytorch.settings.max_kernel_tile_size(200):
+                    res = model(test_x)
+            self.assertIsInstance(res.lazy_covariance_matrix, DiagLazyTensor)
+            self.assertLess(torch.norm(res.mean - actual.mean) / torch.norm(actual.mean), 1e-4)
+            self.assertLess(torch.norm(res.variance - actual.variance) / torch.norm(actual.variance), 1e-4)
+
+    def test_grid_inducing_variational_gp(self):
+        test_x = torch.rand(30)
+        model = GridInducingVariationalGPModel()
+        self._initialize_variational_gp(model, 16)
+
+        actual = model(test_x)
+        with gpytorch.settings.diag_pred_covar():
+            res = model(test_x)
+        self.assertIsInstance(res.lazy_covariance_matrix, DiagLazyTensor)
+        self.assertLess(torch.norm(res.variance - actual.variance), 1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,286 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import os
+import shutil
+import tempfile
+import torch
+import unittest
+import gpytorch
+from gpytorch.distributions import MultivariateNormal, MultitaskMultivariateNormal
+from gpytorch.kernels import MultitaskKernel, RBFKernel, ScaleKernel
+from gpytorch.likelihoods import GaussianLikelihood, MultitaskGaussianLikelihood
+from gpytorch.means import ConstantMean, MultitaskMean
+from gpytorch.models import ExactGPPosterior
+
+
+class ExactGPModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood, batch_size=1):
+        super(ExactGPModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = ConstantMean(batch_size=batch_size)
+        self.covar_module = ScaleKernel(RBFKernel(batch_size=batch_size), batch_size=batch_size)
+
+    def forward(self, x):
+        return MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class MultitaskGPModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood):
+        super(MultitaskGPModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = MultitaskMean(ConstantMean(), num_tasks=2)
+        self.covar_module = MultitaskKernel(RBFKernel(), num_tasks=2, rank=1)
+
+    def forward(self, x):
+        return MultitaskMultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+def _dense_posterior(model, train_x, train_y, test_x, noise):
+    covar_module, mean_module = model.covar_module, model.mean_module
+    train_covar = covar_module(train_x).evaluate() + torch.eye(train_x.size(-2)).mul(noise)
+    test_train_covar = covar_module(test_x, train_x).evaluate()
+    test_test_covar = covar_module(test_x).evaluate()
+    solve = torch.gesv(
+        torch.cat([(train_y - mean_module(train_x)).unsqueeze(-1), test_train_covar.transpose(-1, -2)], -1),
+        train_covar,
+    )[0]
+    mean = test_train_covar.matmul(solve[..., :1]).squeeze(-1) + mean_module(test_x)
+    covar = test_test_covar - test_train_covar.matmul(solve[..., 1:])
+    return mean, covar
+
+
+class TestExactGPPosterior(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+
+    def test_posterior(self):
+        train_x = torch.rand(50)
+        train_y = torch.sin(train_x * (2 * math.pi)) + torch.randn(50).mul(0.1)
+        test_x = torch.rand(20)
+        likelihood = GaussianLikelihood().initialize(log_noise=math.log(0.01))
+        model = ExactGPModel(train_x, train_y, likelihood)
+        model.covar_module.base_kernel.initialize(log_lengthscale=math.log(0.2))
+        model.eval()
+
+        posterior = model.posterior()
+        self.assertIsInstance(posterior, ExactGPPosterior)
+        self.assertEqual(posterior.mean_cache.shape, torch.Size((50, 1)))
+        self.assertEqual(posterior.covar_cache.size(-2), 50)
+
+        actual_mean, actual_covar = _dense_posterior(model, train_x.unsqueeze(-1), train_y, test_x.unsqueeze(-1), 0.01)
+        for _ in range(2):
+            res = posterior(test_x)
+            self.assertIsInstance(res, MultivariateNormal)
+            self.assertLess(torch.norm(res.mean - actual_mean) / torch.norm(actual_mean), 1e-3)
+            self.assertLess(torch.norm(res.variance - actual_covar.diag()), 1e-3)
+            self.assertLess(torch.norm(res.covariance_matrix - actual_covar), 1e-3)
+
+        # The same as the model's predictions
+        with gpytorch.beta_features.fast_pred_var():
+            model_res = model(test_x)
+        self.assertLess(torch.norm(res.mean - model_res.mean), 1e-4)
+        self.assertLess(torch.norm(res.variance - model_res.variance), 1e-3)
+
+    def test_posterior_does_not_evaluate_train_covar(self):
+        train_x = torch.rand(50, 1)
+        train_y = torch.randn(50)
+        model = ExactGPModel(train_x, train_y, GaussianLikelihood())
+        model.eval()
+        posterior = model.posterior()
+
+        num_evals = []
+        forward = model.covar_module.forward
+
+        def counting_forward(x1, x2, **kwargs):
+            num_evals.append((x1.size(-2), x2.size(-2), kwargs.get("diag", False)))
+            return forward(x1, x2, **kwargs)
+
+        model.covar_module.forward = counting_forward
+        res = posterior(torch.rand(5, 1))
+        res.variance
+        # (The diagonal of a stationary kernel is constant - so only the cross-covariance is computed)
+        self.assertEqual(num_evals, [(5, 50, False)])
+
+    def test_posterior_batch(self):
+        train_x = torch.rand(2, 30, 1)
+        train_y = torch.sin(train_x.squeeze(-1) * (2 * math.pi))
+        test_x = torch.rand(2, 10, 1)
+        likelihood = GaussianLikelihood().initialize(log_noise=math.log(0.01))
+        model = ExactGPModel(train_x, train_y, likelihood, batch_size=2)
+        model.covar_module.base_kernel.initialize(log_lengthscale=torch.tensor([0.2, 0.5]).log().view(2, 1, 1))
+        model.eval()
+
+        res = model.posterior()(test_x)
+        actual_mean, actual_covar = _dense_posterior(model, train_x, train_y, test_x, 0.01)
+        self.assertEqual(res.mean.shape, torch.Size((2, 10)))
+        self.assertLess(torch.norm(res.mean - actual_mean) / torch.norm(actual_mean), 1e-3)
+        self.assertLess(torch.norm(res.covariance_matrix - actual_covar), 1e-3)
+
+    def test_posterior_multitask(self):
+        train_x = torch.linspace(0, 1, 30)
+        train_y = torch.stack([torch.sin(train_x * (2 * math.pi)), torch.cos(train_x * (2 * math.pi))], -1)
+        test_x = torch.rand(10)
+        likelihood = MultitaskGaussianLikelihood(num_tasks=2)
+        model = MultitaskGPModel(train_x, train_y, likelihood)
+        model.eval()
+
+        res = model.posterior()(test_x)
+        self.assertIsInstance(res, MultitaskMultivariateNormal)
+        self.assertEqual(res.mean.shape, torch.Size((10, 2)))
+        with gpytorch.beta_features.fast_pred_var():
+            model_res = model(test_x)
+        self.assertLess(torch.norm(res.mean - model_res.mean) / torch.norm(model_res.mean), 1e-3)
+
+    def test_predict_chunks(self):
+        train_x = torch.rand(40, 2)
+        train_y = torch.randn(40)
+        model = ExactGPModel(train_x, train_y, GaussianLikelihood())
+        model.eval()
+        posterior = model.posterior()
+        test_x = torch.rand(25, 2)
+        actual = posterior(test_x)
+
+        # Tensors, arrays, and iterators over chunks
+        inputs = [test_x, test_x.numpy(), (test_x[i:i + 10].numpy() for i in range(0, 25, 10))]
+        for input in inputs:
+            chunks = list(posterior.predict_chunks(input, chunk_size=4))
+            self.assertEqual(len(chunks), 7 if torch.is_tensor(input) or hasattr(input, "shape") else 8)
+            self.assertTrue(all(mean.numel() <= 4 for mean, _ in chunks))
+            means, variances = zip(*chunks)
+            self.assertLess(torch.norm(torch.cat(means) - actual.mean), 1e-5)
+            self.assertLess(torch.norm(torch.cat(variances) - actual.variance), 1e-5)
+
+        # The default chunk size is based on the number of training points
+        with gpytorch.settings.max_kernel_tile_size(400):
+            chunks = list(posterior.predict_chunks(test_x))
+        self.assertEqual([mean.numel() for mean, _ in chunks], [10, 10, 5])
+
+    def test_predict_chunks_batch(self):
+        train_x = torch.rand(2, 30, 1)
+        model = ExactGPModel(train_x, torch.randn(2, 30), GaussianLikelihood(), batch_size=2)
+        model.eval()
+        posterior = model.posterior()
+        test_x = torch.rand(2, 15, 1)
+        means, variances = zip(*posterior.predict_chunks(test_x, chunk_size=6))
+        actual = posterior(test_x)
+        self.assertLess(torch.norm(torch.cat(means, -1) - actual.mean), 1e-5)
+        self.assertLess(torch.norm(torch.cat(variances, -1) - actual.variance), 1e-5)
+
+    def _model(self, train_x, train_y):
+        likelihood = GaussianLikelihood().initialize(log_noise=math.log(0.01))
+        model = ExactGPModel(train_x, train_y, likelihood)
+        model.covar_module.base_kernel.initialize(log_lengthscale=math.log(0.2))
+        return model.eval()
+
+    def test_add_observations(self):
+        train_x = torch.rand(50)
+        train_y = torch.sin(train_x * (2 * math.pi))
+        new_x = torch.rand(3)
+        new_y = torch.cos(new_x * (2 * math.pi))
+        test_x = torch.rand(20)
+
+        posterior = self._model(train_x, train_y).posterior().add_observations(new_x, new_y)
+        self.assertEqual(posterior.mean_cache.shape, torch.Size((53, 1)))
+        self.assertEqual(posterior.train_targets.shape, torch.Size((53,)))
+        res = posterior(test_x)
+
+        actual = self._model(torch.cat([train_x, new_x]), torch.cat([train_y, new_y])).posterior()(test_x)
+        self.assertLess(torch.norm(res.mean - actual.mean) / torch.norm(actual.mean), 1e-3)
+        self.assertLess(torch.norm(res.variance - actual.variance), 1e-3)
+
+        # Observations can be added more than once
+        res = posterior.add_observations(test_x[:2], torch.zeros(2))(test_x)
+        self.assertLess(res.variance[:2].max().item(), 0.02)
+
+    def test_add_observations_batch(self):
+        train_x = torch.rand(50)
+        train_y = torch.sin(train_x * (2 * math.pi))
+        new_x = torch.rand(2)
+        fantasy_y = torch.randn(4, 2)
+        test_x = torch.rand(20)
+
+        posterior = self._model(train_x, train_y).posterior().add_observations(new_x, fantasy_y)
+        res = posterior(test_x)
+        self.assertEqual(res.mean.shape, torch.Size((4, 20)))
+        for i in range(4):
+            actual = self._model(torch.cat([train_x, new_x]), torch.cat([train_y, fantasy_y[i]])).posterior()(test_x)
+            self.assertLess(torch.norm(res.mean[i] - actual.mean) / torch.norm(actual.mean), 1e-3)
+            self.assertLess(torch.norm(res.variance[i] - actual.variance), 1e-3)
+
+    def test_remove_observations(self):
+        train_x = torch.rand(50)
+        train_y = torch.sin(train_x * (2 * math.pi))
+        test_x = torch.rand(20)
+
+        posterior = self._model(train_x, train_y).posterior(cholesky=True).remove_observations(5)
+        self.assertEqual(posterior.mean_cache.shape, torch.Size((45, 1)))
+        self.assertTrue(torch.equal(posterior.train_inputs[0], train_x[5:].unsqueeze(-1)))
+        res = posterior(test_x)
+
+        actual = self._model(train_x[5:], train_y[5:]).posterior(cholesky=True)(test_x)
+        self.assertLess(torch.norm(res.mean - actual.mean) / torch.norm(actual.mean), 1e-3)
+        self.assertLess(torch.norm(res.variance - actual.variance), 1e-3)
+
+    def test_update_window(self):
+        data_x = torch.rand(60)
+        data_y = torch.sin(data_x * (2 * math.pi))
+        test_x = torch.rand(20)
+
+        posterior = self._model(data_x[:30], data_y[:30]).posterior(cholesky=True)
+        for start in range(30, 60, 3):
+            posterior = posterior.update_window(data_x[start:start + 3], data_y[start:start + 3], window_size=30)
+        self.assertEqual(posterior.num_updates, 20)
+        self.assertEqual(posterior.covar_cache.shape, torch.Size((30, 30)))
+        self.assertTrue(torch.equal(posterior.train_targets, data_y[30:]))
+        res = posterior(test_x)
+
+        actual = self._model(data_x[30:], data_y[30:]).posterior(cholesky=True)(test_x)
+        self.assertLess(torch.norm(res.mean - actual.mean) / torch.norm(actual.mean), 1e-3)
+        self.assertLess(torch.norm(res.variance - actual.variance), 1e-3)
+
+        # The caches are recomputed periodically
+        posterior = posterior.update_window(test_x[:3], torch.zeros(3), window_size=30, refresh_every=20)
+        self.assertEqual(posterior.num_updates, 0)
+
+    def test_downdates_require_cholesky(self):
+        train_x = torch.rand(50)
+        train_y = torch.sin(train_x * (2 * math.pi))
+        posterior = self._model(train_x, train_y).posterior(rank=20)
+        with self.assertRaises(RuntimeError):
+            posterior.remove_observations(10)
+        with self.assertRaises(RuntimeError):
+            posterior.update_window(torch.rand(3), torch.zeros(3), window_size=50)
+
+    def test_save_and_load(self):
+        train_x = torch.rand(50)
+        train_y = torch.sin(train_x * (2 * math.pi))
+        test_x = torch.rand(20)
+        posterior = self._model(train_x, train_y).posterior()
+        actual = posterior(test_x)
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tmpdir, "posterior.pt")
+            posterior.save(filename)
+            for mmap in [False, True]:
+                model = ExactGPModel(None, None, GaussianLikelihood()).eval()
+                res = ExactGPPosterior.load(model, filename, mmap=mmap)
+                self.assertTrue(torch.equal(res.covar_cache, posterior.covar_cache))
+                self.assertTrue(torch.equal(res.train_targets, train_y))
+                self.assertAlmostEqual(model.likelihood.log_noise.item(), math.log(0.01), places=5)
+                res = res(test_x)
+                self.assertLess(torch.norm(res.mean - actual.mean), 1e-5)
+                self.assertLess(torch.norm(res.variance - actual.variance), 1e-5)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_posterior_requires_eval_mode(self):
+        model = ExactGPModel(torch.rand(10, 1), torch.randn(10), GaussianLikelihood())
+        with self.assertRaises(RuntimeError):
+            model.posterior()
+
+
+if __name__ == "__main__":
+    unittest.main()
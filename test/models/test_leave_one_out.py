@@ -0,0 +1,101 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import torch
+import unittest
+import gpytorch
+from gpytorch.distributions import MultivariateNormal
+from gpytorch.kernels import RBFKernel, ScaleKernel
+from gpytorch.likelihoods import GaussianLikelihood
+from gpytorch.means import ConstantMean
+from gpytorch.mlls import LeaveOneOutPseudoLikelihood
+
+
+class ExactGPModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood):
+        super(ExactGPModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = ConstantMean()
+        self.covar_module = ScaleKernel(RBFKernel())
+
+    def forward(self, x):
+        return MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class TestLeaveOneOut(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.train_x = torch.rand(30)
+        self.train_y = torch.sin(self.train_x * (2 * math.pi)) + torch.randn(30).mul(0.1)
+        likelihood = GaussianLikelihood().initialize(log_noise=math.log(0.05))
+        self.model = ExactGPModel(self.train_x, self.train_y, likelihood)
+        self.model.covar_module.base_kernel.initialize(log_lengthscale=math.log(0.3))
+        self.model.mean_module.initialize(constant=0.5)
+
+    def _brute_force_loo(self):
+        means = []
+        variances = []
+        with torch.no_grad():
+            for i in range(30):
+                mask = torch.arange(0, 30).ne(i)
+                self.model.set_train_data(self.train_x[mask], self.train_y[mask], strict=False)
+                self.model.eval()
+                output = self.model.likelihood(self.model(self.train_x[i:i + 1]))
+                means.append(output.mean)
+                variances.append(output.variance)
+        self.model.set_train_data(self.train_x, self.train_y, strict=False)
+        self.model.train()
+        return torch.cat(means), torch.cat(variances)
+
+    def test_loo_predictions(self):
+        actual_mean, actual_var = self._brute_force_loo()
+        res = self.model.loo_predictions()
+        self.assertLess(torch.norm(res.mean - actual_mean) / torch.norm(actual_mean), 1e-3)
+        self.assertLess(torch.norm(res.variance - actual_var) / torch.norm(actual_var), 1e-3)
+
+    def test_loo_predictions_stochastic(self):
+        actual_mean, actual_var = self._brute_force_loo()
+        with gpytorch.settings.max_cholesky_size(0), gpytorch.settings.num_trace_samples(2000):
+            with gpytorch.settings.max_cg_iterations(100):
+                res = self.model.loo_predictions()
+        self.assertLess(torch.norm(res.variance - actual_var) / torch.norm(actual_var), 0.05)
+        self.assertLess(torch.norm(res.mean - actual_mean) / torch.norm(actual_mean), 0.05)
+
+    def test_leave_one_out_pseudo_likelihood(self):
+        actual_mean, actual_var = self._brute_force_loo()
+        actual = torch.distributions.Normal(actual_mean, actual_var.sqrt()).log_prob(self.train_y).mean()
+
+        mll = LeaveOneOutPseudoLikelihood(self.model.likelihood, self.model)
+        res = mll(self.model(self.train_x), self.train_y)
+        self.assertLess(abs(res.item() - actual.item()), 1e-3)
+
+        # Training with the LOO objective
+        optimizer = torch.optim.Adam(self.model.parameters(), lr=0.1)
+        for _ in range(30):
+            optimizer.zero_grad()
+            loss = -mll(self.model(self.train_x), self.train_y)
+            loss.backward()
+            optimizer.step()
+        self.assertLess(loss.item(), -res.item())
+
+    def test_leave_one_out_pseudo_likelihood_gradients(self):
+        mll = LeaveOneOutPseudoLikelihood(self.model.likelihood, self.model)
+        (-mll(self.model(self.train_x), self.train_y)).backward()
+        grads = [param.grad.clone() for param in self.model.parameters()]
+        self.model.zero_grad()
+
+        # The same objective, computed with an explicit inverse
+        output = self.model.likelihood(self.model(self.train_x))
+        inv_covar = output.covariance_matrix.inverse()
+        inv_diag = inv_covar.diag()
+        loo_mean = self.train_y - inv_covar.matmul(self.train_y - output.mean) / inv_diag
+        actual = -torch.distributions.Normal(loo_mean, inv_diag.reciprocal().sqrt()).log_prob(self.train_y).mean()
+        actual.backward()
+        for grad, param in zip(grads, self.model.parameters()):
+            self.assertLess(torch.norm(grad - param.grad) / torch.norm(param.grad).clamp(min=1e-6), 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import torch
+import unittest
+import gpytorch
+from gpytorch.distributions import MultitaskMultivariateNormal, MultivariateNormal
+from gpytorch.kernels import AdditiveStructureKernel, GridInterpolationKernel, MultitaskKernel, RBFKernel, ScaleKernel
+from gpytorch.lazy import SumBatchLazyTensor
+from gpytorch.likelihoods import GaussianLikelihood, MultitaskGaussianLikelihood
+from gpytorch.means import ConstantMean, MultitaskMean
+
+
+class ExactGPModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood):
+        super(ExactGPModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = ConstantMean()
+        self.covar_module = ScaleKernel(RBFKernel())
+
+    def forward(self, x):
+        return MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class KissGPModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood):
+        super(KissGPModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = ConstantMean()
+        self.covar_module = ScaleKernel(GridInterpolationKernel(RBFKernel(), grid_size=64, grid_bounds=[(0, 1)]))
+
+    def forward(self, x):
+        return MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class AdditiveStructureModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood):
+        super(AdditiveStructureModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = ConstantMean()
+        self.covar_module = ScaleKernel(AdditiveStructureKernel(RBFKernel(), num_dims=2))
+
+    def forward(self, x):
+        return MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class MultitaskModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood):
+        super(MultitaskModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = MultitaskMean(ConstantMean(), num_tasks=2)
+        self.covar_module = MultitaskKernel(RBFKernel(), num_tasks=2, rank=1)
+
+    def forward(self, x):
+        return MultitaskMultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+def _make_model(model_cls, n=100):
+    train_x = torch.linspace(0, 1, n)
+    train_y = torch.sin(train_x * (2 * math.pi)) + torch.randn(n).mul(0.1)
+    likelihood = GaussianLikelihood().initialize(log_noise=math.log(0.01))
+    model = model_cls(train_x, train_y, likelihood)
+    model.covar_module.initialize(log_outputscale=0.)
+    for module in model.modules():
+        if isinstance(module, RBFKernel):
+            module.initialize(log_lengthscale=math.log(0.2))
+    return model
+
+
+class TestLove(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+
+    def test_settings(self):
+        self.assertIs(gpytorch.beta_features.fast_pred_var, gpytorch.settings.fast_pred_var)
+        self.assertIs(gpytorch.beta_features.fast_pred_samples, gpytorch.settings.fast_pred_samples)
+        self.assertIs(gpytorch.fast_pred_var, gpytorch.settings.fast_pred_var)
+
+        self.assertFalse(gpytorch.settings.fast_pred_var.on())
+        with gpytorch.settings.fast_pred_var(num_probe_vectors=3):
+            self.assertTrue(gpytorch.beta_features.fast_pred_var.on())
+            self.assertEqual(gpytorch.settings.fast_pred_var.num_probe_vectors(), 3)
+        self.assertFalse(gpytorch.settings.fast_pred_var.on())
+        self.assertEqual(gpytorch.settings.fast_pred_var.num_probe_vectors(), 1)
+
+    def test_kissgp_posterior(self):
+        model = _make_model(KissGPModel)
+        model.eval()
+        test_x = torch.rand(30)
+
+        with torch.no_grad(), gpytorch.settings.fast_pred_var(), gpytorch.settings.max_root_decomposition_size(50):
+            expected = model(test_x)
+            posterior = model.posterior()
+            for _ in range(2):
+                res = posterior(test_x)
+                self.assertLess(torch.norm(res.mean - expected.mean), 1e-3)
+                self.assertLess(torch.norm(res.variance - expected.variance), 1e-3)
+
+        # The caches are projected onto the inducing points - they do not depend on the number of training points
+        cache = posterior._prediction_cache[1]
+        self.assertEqual(cache.shape, torch.Size((64, posterior.covar_cache.size(-1) + 1)))
+
+    def test_rank(self):
+        model = _make_model(ExactGPModel)
+        model.eval()
+        test_x = torch.rand(30)
+
+        low_rank = model.posterior(rank=3)
+        high_rank = model.posterior(rank=80)
+        self.assertEqual(low_rank.rank, 3)
+        self.assertLessEqual(low_rank.covar_cache.size(-1), 3)
+
+        low_rank_error = low_rank.variance_error(test_x)
+        high_rank_error = high_rank.variance_error(test_x)
+        self.assertEqual(set(high_rank_error.keys()), {"max_abs_error", "mean_abs_error", "max_rel_error"})
+        self.assertLess(high_rank_error["max_abs_error"], 1e-3)
+        self.assertLess(high_rank_error["max_abs_error"], low_rank_error["max_abs_error"])
+        self.assertLessEqual(high_rank_error["mean_abs_error"], high_rank_error["max_abs_error"])
+
+    def test_sum_batch_lazy_tensor(self):
+        train_x = torch.rand(100, 2)
+        train_y = torch.sin(train_x.sum(-1) * math.pi) + torch.randn(100).mul(0.1)
+        likelihood = GaussianLikelihood().initialize(log_noise=math.log(0.01))
+        model = AdditiveStructureModel(train_x, train_y, likelihood)
+        self.assertIsInstance(model.covar_module.base_kernel(train_x).evaluate_kernel(), SumBatchLazyTensor)
+        model.eval()
+        test_x = torch.rand(30, 2)
+
+        with torch.no_grad():
+            actual = model(test_x)
+            actual_mean, actual_var = actual.mean, actual.variance
+            with gpytorch.settings.fast_pred_var():
+                for _ in range(2):
+                    res = model(test_x)
+                    self.assertIsNotNone(model.covar_cache)
+                    self.assertLess(torch.norm(res.mean - actual_mean), 1e-3)
+                    self.assertLess(torch.norm(res.variance - actual_var), 1e-3)
+
+                res = model.posterior()(test_x)
+                self.assertLess(torch.norm(res.mean - actual_mean), 1e-3)
+                self.assertLess(torch.norm(res.variance - actual_var), 1e-3)
+
+    def test_multitask(self):
+        train_x = torch.linspace(0, 1, 100)
+        train_y = torch.stack([torch.sin(train_x * (2 * math.pi)), torch.cos(train_x * (2 * math.pi))], -1)
+        train_y = train_y + torch.randn(100, 2).mul(0.1)
+        model = MultitaskModel(train_x, train_y, MultitaskGaussianLikelihood(num_tasks=2))
+        model.covar_module.data_covar_module.initialize(log_lengthscale=math.log(0.2))
+        model.eval()
+        test_x = torch.rand(30)
+
+        with torch.no_grad():
+            actual = model(test_x)
+            actual_mean, actual_var = actual.mean, actual.variance
+            with gpytorch.settings.fast_pred_var():
+                for _ in range(2):
+                    res = model(test_x)
+                    self.assertIsInstance(res, MultitaskMultivariateNormal)
+                    self.assertIsNotNone(model.covar_cache)
+                    self.assertEqual(res.variance.shape, torch.Size((30, 2)))
+                    self.assertLess(torch.norm(res.mean - actual_mean), 1e-3)
+                    self.assertLess(torch.norm(res.variance - actual_var), 1e-3)
+
+    def test_precompute_caches(self):
+        model = _make_model(ExactGPModel)
+        test_x = torch.rand(30)
+
+        with gpytorch.settings.fast_pred_var():
+            self.assertIs(model.precompute_caches(), model)
+            self.assertFalse(model.training)
+            mean_cache, covar_cache = model.mean_cache, model.covar_cache
+            self.assertIsNotNone(mean_cache)
+            self.assertIsNotNone(covar_cache)
+            expected = model(test_x)
+            self.assertEqual(model.mean_cache.data_ptr(), mean_cache.data_ptr())
+
+            # The caches survive a train/eval cycle, if nothing changed
+            model.train()
+            model.eval()
+            model(test_x)
+            self.assertEqual(model.mean_cache.data_ptr(), mean_cache.data_ptr())
+
+            # ... and are recomputed after the hyperparameters change
+            model.train()
+            with torch.no_grad():
+                model.covar_module.base_kernel.log_lengthscale.add_(1.)
+            model.eval()
+            res = model(test_x)
+            self.assertNotEqual(model.mean_cache.data_ptr(), mean_cache.data_ptr())
+            self.assertGreater(torch.norm(res.mean - expected.mean), 1e-3)
+
+            # ... including changes through .data (as made by initialize), which do not bump the version counters
+            mean_cache = model.mean_cache
+            model.train()
+            model.covar_module.base_kernel.initialize(log_lengthscale=-3.)
+            model.eval()
+            new_res = model(test_x)
+            self.assertNotEqual(model.mean_cache.data_ptr(), mean_cache.data_ptr())
+            self.assertGreater(torch.norm(new_res.mean - res.mean), 1e-3)
+
+            model.clear_caches()
+            self.assertIsNone(model.mean_cache)
+            self.assertIsNone(model.covar_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import math
+import torch
+import unittest
+import gpytorch
+from gpytorch.distributions import MultivariateNormal
+from gpytorch.kernels import RBFKernel, ScaleKernel
+from gpytorch.likelihoods import GaussianLikelihood
+from gpytorch.means import ConstantMean
+from gpytorch.models import PathwiseSamples
+
+
+class ExactGPModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood):
+        super(ExactGPModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = ConstantMean()
+        self.covar_module = ScaleKernel(RBFKernel())
+
+    def forward(self, x):
+        return MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+class TestPathwiseSamples(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        train_x = torch.rand(20)
+        train_y = torch.sin(train_x * (2 * math.pi))
+        likelihood = GaussianLikelihood().initialize(log_noise=math.log(0.01))
+        self.model = ExactGPModel(train_x, train_y, likelihood)
+        self.model.covar_module.initialize(log_outputscale=math.log(2.))
+        self.model.covar_module.base_kernel.initialize(log_lengthscale=math.log(0.2))
+        self.model.mean_module.initialize(constant=0.5)
+        self.model.eval()
+        self.test_x = torch.linspace(-0.2, 1.2, 10)
+
+    def _test_moments(self, posterior):
+        with torch.no_grad():
+            samples = posterior.sample_paths(10000, num_features=4096)
+            values = samples(self.test_x)
+            actual = posterior(self.test_x)
+        self.assertEqual(values.shape, torch.Size((10000, 10)))
+
+        mean = values.mean(0)
+        covar = (values - mean).transpose(-1, -2).matmul(values - mean).div(10000)
+        actual_covar = actual.covariance_matrix
+        self.assertLess(torch.norm(mean - actual.mean) / torch.norm(actual.mean), 0.05)
+        self.assertLess(torch.norm(covar - actual_covar) / torch.norm(actual_covar), 0.15)
+
+    def test_sample_paths(self):
+        self._test_moments(self.model.posterior())
+
+    def test_sample_paths_cholesky(self):
+        self._test_moments(self.model.posterior(cholesky=True))
+
+    def test_sample_functions_are_fixed(self):
+        samples = self.model.posterior().sample_paths(3)
+        self.assertIsInstance(samples, PathwiseSamples)
+        with torch.no_grad():
+            res = samples(self.test_x)
+            # Evaluating a sample function point by point, or in chunks, gives the same function
+            with gpytorch.settings.max_kernel_tile_size(60):
+                chunked_res = samples(self.test_x)
+            single_res = torch.cat([samples(self.test_x[i:i + 1]) for i in range(10)], -1)
+        self.assertLess(torch.norm(res - chunked_res), 1e-4)
+        self.assertLess(torch.norm(res - single_res), 1e-4)
+
+        # Gradients with respect to the test points (e.g. for optimizing a Thompson sample)
+        x = self.test_x.clone().requires_grad_(True)
+        samples(x).sum().backward()
+        self.assertGreater(x.grad.abs().sum(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+import math
+import torch
+import unittest
+import gpytorch
+from gpytorch.distributions import MultivariateNormal
+from gpytorch.kernels import RBFKernel, ScaleKernel
+from gpytorch.likelihoods import GaussianLikelihood
+from gpytorch.means import ConstantMean
+from gpytorch.models import PredictionServer
+
+
+class ExactGPModel(gpytorch.models.ExactGP):
+    def __init__(self, train_x, train_y, likelihood):
+        super(ExactGPModel, self).__init__(train_x, train_y, likelihood)
+        self.mean_module = ConstantMean()
+        self.covar_module = ScaleKernel(RBFKernel())
+
+    def forward(self, x):
+        return MultivariateNormal(self.mean_module(x), self.covar_module(x))
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestPredictionServer(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        train_x = torch.rand(50, 2)
+        train_y = torch.sin(train_x.sum(-1) * (2 * math.pi))
+        likelihood = GaussianLikelihood().initialize(log_noise=math.log(0.01))
+        self.model = ExactGPModel(train_x, train_y, likelihood).eval()
+        self.test_x = torch.rand(40, 2)
+
+    def _predict(self, server, inputs):
+        async def main():
+            async with server:
+                return await asyncio.gather(*[server.predict(x) for x in inputs])
+
+        return _run(main())
+
+    def test_batches_concurrent_requests(self):
+        server = PredictionServer(self.model, self.model.likelihood, max_latency=1.)
+        res = self._predict(server, self.test_x)
+        self.assertEqual(server.num_batches, 1)
+
+        with torch.no_grad():
+            actual = self.model.likelihood(self.model.posterior()(self.test_x))
+        self.assertLess(torch.norm(torch.stack([mean for mean, _ in res]) - actual.mean), 1e-5)
+        self.assertLess(torch.norm(torch.stack([variance for _, variance in res]) - actual.variance), 1e-5)
+
+        metrics = server.metrics()
+        self.assertEqual(metrics["num_requests"], 40)
+        self.assertEqual(metrics["mean_batch_size"], 40)
+        self.assertGreater(metrics["throughput"], 0)
+        self.assertLessEqual(metrics["latency_p50"], metrics["latency_p99"])
+
+    def test_max_batch_size(self):
+        posterior = self.model.posterior()
+        server = PredictionServer(posterior, max_batch_size=10, max_latency=1.)
+        inputs = [self.test_x[i:i + 2] for i in range(0, 40, 2)]
+        res = self._predict(server, inputs)
+        self.assertEqual(server.num_batches, 4)
+
+        with torch.no_grad():
+            actual = posterior(self.test_x)
+        self.assertEqual(res[0][0].shape, torch.Size((2,)))
+        self.assertLess(torch.norm(torch.cat([mean for mean, _ in res]) - actual.mean) / torch.norm(actual.mean), 1e-4)
+
+    def test_stop_cancels_waiting_batch(self):
+        server = PredictionServer(self.model, max_latency=1.)
+
+        async def main():
+            server.start()
+            request = asyncio.ensure_future(server.predict(self.test_x[0]))
+            # The request is taken off the queue, and waits for more requests to join its batch
+            await asyncio.sleep(0.05)
+            await server.stop()
+            with self.assertRaises(asyncio.CancelledError):
+                await asyncio.wait_for(request, 1.)
+
+        _run(main())
+        self.assertEqual(server.num_batches, 0)
+
+    def test_errors(self):
+        server = PredictionServer(self.model)
+        with self.assertRaises(RuntimeError):
+            self._predict(server, [torch.rand(3)])
+
+        with self.assertRaises(RuntimeError):
+            _run(server.predict(self.test_x[0]))
+
+        self.model.train()
+        with self.assertRaises(RuntimeError):
+            PredictionServer(self.model)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,47 @@ from __future__ import unicode_literals
 import torch
 import unittest
 from test._utils import approx_equal
-from gpytorch.utils.cholesky import tridiag_batch_potrf, tridiag_batch_potrs
+from gpytorch.utils.cholesky import batch_potrf, batch_potrs, batch_trtri, tridiag_batch_potrf, tridiag_batch_potrs
+
+
+class TestBatchPotrf(unittest.TestCase):
+    def test_potrf_and_potrs(self):
+        root = torch.randn(3, 5, 5)
+        mat = root.matmul(root.transpose(-1, -2)) + torch.eye(5).mul(0.1)
+        chol = batch_potrf(mat)
+        self.assertTrue(approx_equal(chol, torch.cat([mat[i].potrf().unsqueeze(0) for i in range(3)])))
+        self.assertTrue(approx_equal(chol.transpose(-1, -2).matmul(chol), mat))
+
+        rhs = torch.randn(3, 5, 2)
+        res = batch_potrs(rhs, chol)
+        self.assertTrue(approx_equal(mat.matmul(res), rhs))
+
+    def test_potrs_backward(self):
+        root = torch.randn(3, 5, 5)
+        mat = root.matmul(root.transpose(-1, -2)) + torch.eye(5).mul(0.1)
+        chol = batch_potrf(mat).detach().requires_grad_(True)
+        rhs = torch.randn(3, 5, 2, requires_grad=True)
+        batch_potrs(rhs, chol).sum().backward()
+
+        chol_copy = chol.detach().clone().requires_grad_(True)
+        rhs_copy = rhs.detach().clone().requires_grad_(True)
+        actual_mat = chol_copy.transpose(-1, -2).matmul(chol_copy)
+        torch.cat([actual_mat[i].inverse().matmul(rhs_copy[i]).unsqueeze(0) for i in range(3)]).sum().backward()
+        self.assertTrue(approx_equal(rhs.grad, rhs_copy.grad))
+        self.assertTrue(approx_equal(chol.grad.triu(), chol_copy.grad.triu()))
+
+    def test_trtri(self):
+        root = torch.randn(3, 5, 5)
+        mat = root.matmul(root.transpose(-1, -2)) + torch.eye(5).mul(0.1)
+        chol = batch_potrf(mat).detach().requires_grad_(True)
+        inv_chol = batch_trtri(chol)
+        self.assertTrue(approx_equal(chol.matmul(inv_chol), torch.eye(5).expand(3, 5, 5)))
+        self.assertTrue(approx_equal(inv_chol, batch_potrs(chol.transpose(-1, -2), chol)))
+
+        inv_chol.sum().backward()
+        chol_copy = chol.detach().clone().requires_grad_(True)
+        torch.cat([chol_copy[i].inverse().unsqueeze(0) for i in range(3)]).sum().backward()
+        self.assertTrue(approx_equal(chol.grad.triu(), chol_copy.grad.triu()))
 
 
 class TestTriDiag(unittest.TestCase):
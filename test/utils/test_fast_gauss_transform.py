@@ -0,0 +1,47 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+from gpytorch.utils.fast_gauss_transform import fast_gauss_transform
+
+
+class TestFastGaussTransform(unittest.TestCase):
+    def setUp(self):
+        self.rng_state = torch.get_rng_state()
+        torch.manual_seed(0)
+
+    def tearDown(self):
+        torch.set_rng_state(self.rng_state)
+
+    def _test_fast_gauss_transform(self, x1, x2, tolerance):
+        rhs = torch.randn(x2.size(0), 3, dtype=torch.float64)
+        actual = (x1.unsqueeze(-2) - x2.unsqueeze(-3)).pow(2).sum(-1).div(-2).exp().matmul(rhs)
+        res = fast_gauss_transform(x1, x2, rhs, tolerance=tolerance)
+        self.assertLess(((res - actual).abs() / rhs.abs().sum(0)).max().item(), 2 * tolerance)
+
+        res = fast_gauss_transform(x1, x2, rhs[:, 0], tolerance=tolerance)
+        self.assertEqual(res.size(), torch.Size((x1.size(0),)))
+        self.assertLess(((res - actual[:, 0]).abs() / rhs[:, 0].abs().sum()).max().item(), 2 * tolerance)
+
+    def test_sparse_points(self):
+        # Only few points per grid cell - far field is computed directly
+        for num_dims in [1, 2, 3]:
+            x1 = torch.rand(300, num_dims, dtype=torch.float64).mul(8)
+            x2 = torch.rand(200, num_dims, dtype=torch.float64).mul(8)
+            for tolerance in [1e-2, 1e-6]:
+                self._test_fast_gauss_transform(x1, x2, tolerance)
+
+    def test_dense_points(self):
+        # Many points per grid cell - far field uses Taylor expansions
+        for num_dims in [1, 2]:
+            x1 = torch.rand(1000, num_dims, dtype=torch.float64).mul(6)
+            x2 = torch.rand(2000, num_dims, dtype=torch.float64).mul(6)
+            for tolerance in [1e-2, 1e-6]:
+                self._test_fast_gauss_transform(x1, x2, tolerance)
+
+
+if __name__ == "__main__":
+    unittest.main()
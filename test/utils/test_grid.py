@@ -35,3 +35,39 @@ class TestGrid(unittest.TestCase):
         x = torch.randn(16, 10000, 4)
         grid_size = gpytorch.utils.grid.choose_grid_size(x, ratio=2.)
         self.assertEqual(grid_size, 20)
+
+    def test_create_grid(self):
+        grid = gpytorch.utils.grid.create_grid(6, ((0, 1), (-2, 2)))
+        self.assertEqual(len(grid), 2)
+        self.assertEqual(grid[0].size(), torch.Size((6,)))
+        # The grid is padded beyond the bounds
+        self.assertLess(torch.norm(torch.stack([grid[0][0], grid[1][0]]) - torch.tensor([-0.25, -3.])), 1e-5)
+        self.assertLess(torch.norm(torch.stack([grid[0][-1], grid[1][-1]]) - torch.tensor([1.25, 3.])), 1e-5)
+        self.assertTrue(gpytorch.utils.grid.is_uniform_grid(grid[0]))
+
+        grid = gpytorch.utils.grid.create_grid([6, 10], ((0, 1), (-2, 2)))
+        self.assertEqual([len(dim_grid) for dim_grid in grid], [6, 10])
+
+    def test_create_data_from_grid(self):
+        grid = [torch.tensor([0., 1., 2.]), torch.tensor([3., 4.])]
+        res = gpytorch.utils.grid.create_data_from_grid(grid)
+        # The last dimension varies fastest
+        actual = torch.tensor([[0., 3.], [0., 4.], [1., 3.], [1., 4.], [2., 3.], [2., 4.]])
+        self.assertTrue(torch.equal(res, actual))
+
+        grid = torch.tensor([[0., 3., 6.], [1., 4., 7.], [2., 5., 8.]])
+        res = gpytorch.utils.grid.create_data_from_grid(grid)
+        self.assertEqual(res.size(), torch.Size((27, 3)))
+        self.assertTrue(torch.equal(res[:4], torch.tensor([[0., 3., 6.], [0., 3., 7.], [0., 3., 8.], [0., 4., 6.]])))
+
+    def test_create_adaptive_grid(self):
+        x = torch.cat([torch.randn(200, 2).mul(0.01), torch.rand(20, 2).mul(2).sub(1)])
+        grid = gpytorch.utils.grid.create_adaptive_grid(x, [20, 30])
+        self.assertEqual([len(dim_grid) for dim_grid in grid], [20, 30])
+        for i, dim_grid in enumerate(grid):
+            # Sorted, covers the data, and has more points in the center
+            self.assertTrue((dim_grid[1:] > dim_grid[:-1]).all())
+            self.assertLessEqual(dim_grid[1].item(), x[:, i].min().item())
+            self.assertGreaterEqual(dim_grid[-2].item(), x[:, i].max().item())
+            self.assertGreater(dim_grid.abs().lt(0.1).sum().item(), len(dim_grid) // 4)
+            self.assertFalse(gpytorch.utils.grid.is_uniform_grid(dim_grid))
@@ -6,6 +6,7 @@ from __future__ import unicode_literals
 import torch
 import unittest
 
+import gpytorch.utils.grid
 import gpytorch.utils.interpolation
 import test._utils
 from gpytorch.utils.interpolation import Interpolation, left_interp, left_t_interp
@@ -146,6 +147,44 @@ class TestCubicInterpolation(unittest.TestCase):
         )
         self.assertTrue(test._utils.approx_equal(values, actual_values))
 
+    def test_irregular_grid_interpolation(self):
+        x = torch.linspace(0.01, 1, 100).unsqueeze(1)
+        grid = torch.linspace(-0.5, 1.1, 50).pow(3).add(0.1)
+        indices, values = Interpolation().interpolate([grid], x)
+        self.assertEqual(indices.size(), torch.Size((100, 4)))
+        self.assertTrue(test._utils.approx_equal(values.sum(-1), torch.ones(100)))
+
+        test_func_x = x.pow(2).squeeze(-1)
+        interp_func_x = left_interp(indices, values, grid.pow(2).unsqueeze(1)).squeeze()
+        self.assertTrue(test._utils.approx_equal(interp_func_x, test_func_x))
+
+    def test_multidim_interpolation_with_different_grid_sizes(self):
+        x = torch.rand(20, 2).mul(0.6).add(0.2)
+        grid = [torch.linspace(-0.2, 1.2, 15), torch.linspace(-0.2, 1.2, 9)]
+        indices, values = Interpolation().interpolate(grid, x)
+        self.assertLess(indices.max().item(), 15 * 9)
+
+        # Interpolate a linear function of the data
+        grid_data = gpytorch.utils.grid.create_data_from_grid(grid)
+        test_func_grid = grid_data[:, 0] - 2 * grid_data[:, 1]
+        interp_func_x = left_interp(indices, values, test_func_grid.unsqueeze(1)).squeeze()
+        self.assertTrue(test._utils.approx_equal(interp_func_x, x[:, 0] - 2 * x[:, 1]))
+
+    def test_precomputed_uniform_grid_dims(self):
+        x = torch.rand(20, 2).mul(0.6).add(0.2)
+        grid = [torch.linspace(-0.2, 1.2, 15), torch.linspace(-0.5, 1.1, 20).pow(3).add(0.2)]
+        actual_indices, actual_values = Interpolation().interpolate(grid, x)
+
+        # The grid structure is not recomputed when it is passed in
+        is_uniform_grid = gpytorch.utils.interpolation.is_uniform_grid
+        gpytorch.utils.interpolation.is_uniform_grid = None
+        try:
+            indices, values = Interpolation().interpolate(grid, x, uniform_grid_dims=[True, False])
+        finally:
+            gpytorch.utils.interpolation.is_uniform_grid = is_uniform_grid
+        self.assertTrue(torch.equal(indices, actual_indices))
+        self.assertTrue(torch.equal(values, actual_values))
+
 
 class TestInterp(unittest.TestCase):
     def setUp(self):
@@ -0,0 +1,92 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import torch
+import unittest
+from gpytorch.utils.lattice import (
+    create_permutohedral_lattice,
+    permutohedral_blur,
+    permutohedral_blur_center_weight,
+    permutohedral_kernel_scale,
+)
+
+
+class TestLattice(unittest.TestCase):
+    def setUp(self):
+        self.rng_state = torch.get_rng_state()
+        torch.manual_seed(0)
+
+    def tearDown(self):
+        torch.set_rng_state(self.rng_state)
+
+    def test_barycentric_coordinates(self):
+        features = torch.randn(50, 4, dtype=torch.double) * 2
+        vertices, barycentric, neighbors = create_permutohedral_lattice(features)
+        self.assertEqual(vertices.size(), torch.Size((50, 5)))
+        self.assertEqual(barycentric.size(), torch.Size((50, 5)))
+        self.assertEqual(neighbors.size(0), 2)
+        self.assertEqual(neighbors.size(1), 5)
+
+        # Barycentric coordinates are convex weights
+        self.assertLess((barycentric.sum(-1) - 1).abs().max().item(), 1e-8)
+        self.assertGreaterEqual(barycentric.min().item(), -1e-8)
+
+        # Each point is embedded in d + 1 distinct vertices
+        for row in vertices:
+            self.assertEqual(len(set(row.tolist())), 5)
+
+    def test_identical_points_share_vertices(self):
+        features = torch.randn(10, 3)
+        vertices, barycentric, _ = create_permutohedral_lattice(torch.cat([features, features]))
+        self.assertTrue(torch.equal(vertices[:10], vertices[10:]))
+        self.assertTrue(torch.equal(barycentric[:10], barycentric[10:]))
+
+    def test_neighbors_are_symmetric(self):
+        features = torch.randn(100, 3)
+        _, _, neighbors = create_permutohedral_lattice(features)
+        num_vertices = neighbors.size(-1)
+        for direction in range(4):
+            plus, minus = neighbors[0, direction], neighbors[1, direction]
+            has_plus = plus.lt(num_vertices).nonzero().squeeze(-1)
+            self.assertTrue(torch.equal(minus[plus[has_plus]], has_plus))
+
+    def test_blur_is_symmetric(self):
+        features = torch.randn(30, 2)
+        _, _, neighbors = create_permutohedral_lattice(features)
+        num_vertices = neighbors.size(-1)
+        blur = permutohedral_blur(neighbors, torch.eye(num_vertices))
+        self.assertLess((blur - blur.t()).abs().max().item(), 1e-6)
+        self.assertGreater(torch.symeig(blur)[0].min().item(), 0)
+
+        # Vector input
+        vec = torch.randn(num_vertices)
+        self.assertLess((permutohedral_blur(neighbors, vec) - blur.matmul(vec)).abs().max().item(), 1e-5)
+
+    def test_blur_center_weight(self):
+        # On a large (fully occupied) lattice, the diagonal of the blur is the center weight
+        features = torch.cat([torch.rand(4000, 1) * 20, torch.tensor([[10.]])])
+        vertices, _, neighbors = create_permutohedral_lattice(features)
+        num_vertices = neighbors.size(-1)
+        rhs = torch.zeros(num_vertices, 1)
+        center = vertices[-1, 0]
+        rhs[center] = 1
+        res = permutohedral_blur(neighbors, rhs)[center].item()
+        self.assertAlmostEqual(res, permutohedral_blur_center_weight(1), places=5)
+
+    def test_lattice_approximates_rbf(self):
+        features = torch.rand(500, 2, dtype=torch.double) * 3
+        vertices, barycentric, neighbors = create_permutohedral_lattice(features)
+        num_vertices = neighbors.size(-1)
+        interp = torch.zeros(500, num_vertices, dtype=torch.double)
+        interp.scatter_(-1, vertices, barycentric)
+        res = interp.matmul(permutohedral_blur(neighbors, interp.t())) * permutohedral_kernel_scale(2)
+
+        actual = (features.unsqueeze(1) - features.unsqueeze(0)).pow(2).sum(-1).div(-2).exp()
+        self.assertLess((res - actual).abs().mean().item(), 0.05)
+        self.assertLess((res - actual).norm().item() / actual.norm().item(), 0.15)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import os
+import shutil
+import tempfile
+import torch
+import unittest
+from gpytorch.utils.serialization import load_tensors, save_tensors
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        self.tensors = {
+            "a": torch.randn(5, 3),
+            "b": torch.arange(0, 7, dtype=torch.long),
+            "c": torch.tensor(2.5, dtype=torch.double),
+            "d": torch.zeros(0, 4),
+        }
+        self.metadata = {"state_dict": {"x": torch.ones(2)}, "num": 3}
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, "tensors.pt")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _assert_loaded(self, tensors, metadata):
+        self.assertEqual(set(tensors.keys()), set(self.tensors.keys()))
+        for name, tensor in self.tensors.items():
+            self.assertEqual(tensors[name].dtype, tensor.dtype)
+            self.assertTrue(torch.equal(tensors[name], tensor))
+        self.assertEqual(metadata["num"], 3)
+        self.assertTrue(torch.equal(metadata["state_dict"]["x"], torch.ones(2)))
+
+    def test_save_and_load(self):
+        save_tensors(self.filename, self.tensors, self.metadata)
+        self._assert_loaded(*load_tensors(self.filename))
+
+    def test_save_and_load_mmap(self):
+        save_tensors(self.filename, self.tensors, self.metadata)
+        tensors, metadata = load_tensors(self.filename, mmap=True)
+        self._assert_loaded(tensors, metadata)
+
+        # Copy-on-write: modifying the tensors does not modify the file
+        tensors["a"].zero_()
+        self._assert_loaded(*load_tensors(self.filename, mmap=True))
+
+    def test_save_and_load_file_object(self):
+        f = io.BytesIO()
+        f.write(b"prefix")
+        save_tensors(f, self.tensors, self.metadata)
+        f.seek(len(b"prefix"))
+        self._assert_loaded(*load_tensors(f))
+        with self.assertRaises(RuntimeError):
+            load_tensors(f, mmap=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
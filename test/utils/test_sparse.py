@@ -6,6 +6,7 @@ from __future__ import unicode_literals
 import torch
 import unittest
 from gpytorch.utils.sparse import sparse_eye, sparse_getitem, sparse_repeat, to_sparse
+from gpytorch.utils.sparse import radius_neighbors, _binary_search, _searchsorted
 
 
 class TestSparse(unittest.TestCase):
@@ -77,6 +78,23 @@ class TestSparse(unittest.TestCase):
         res = to_sparse(self.sparse.to_dense())
         self.assertTrue(torch.equal(actual.to_dense(), res.to_dense()))
 
+    def test_binary_search(self):
+        sorted_tensor = torch.tensor([1, 2, 2, 2, 5, 7])
+        values = torch.tensor([0, 1, 2, 3, 5, 6, 7, 8])
+        self.assertEqual(_binary_search(sorted_tensor, values).tolist(), [0, 0, 1, 4, 4, 5, 5, 6])
+        self.assertEqual(_binary_search(sorted_tensor, values, right=True).tolist(), [0, 1, 4, 4, 5, 5, 6, 6])
+        self.assertTrue(torch.equal(_searchsorted(sorted_tensor, values), _binary_search(sorted_tensor, values)))
+        self.assertEqual(_binary_search(torch.tensor([], dtype=torch.long), values).tolist(), [0] * 8)
+
+    def test_radius_neighbors(self):
+        for num_dims in [1, 2, 3]:
+            x1 = torch.rand(100, num_dims) * 3
+            x2 = torch.rand(80, num_dims) * 3
+            res = radius_neighbors(x1, x2, radius=0.5, max_block_size=30)
+            actual = (x1.unsqueeze(-2) - x2.unsqueeze(-3)).pow(2).sum(-1).lt(0.25)
+            self.assertEqual(res.size(-1), actual.sum().item())
+            self.assertTrue(actual[res[0], res[1]].all())
+
 
 if __name__ == "__main__":
     unittest.main()
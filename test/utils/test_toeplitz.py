@@ -61,6 +61,66 @@ class TestTeoplitz(unittest.TestCase):
         res = utils.toeplitz.toeplitz_matmul(col.unsqueeze(0), row.unsqueeze(0), rhs_mat)
         self.assertTrue(test._utils.approx_equal(res, actual))
 
+    def test_sym_toeplitz_levinson(self):
+        cols = torch.tensor([[4, 1, 0.5, 0.25], [2, -1, 0.5, 0.25]], dtype=torch.float)
+        inv_cols, log_dets = utils.toeplitz.sym_toeplitz_levinson(cols)
+        for col, inv_col, log_det in zip(cols, inv_cols, log_dets):
+            mat = utils.toeplitz.sym_toeplitz(col)
+            self.assertTrue(test._utils.approx_equal(inv_col, mat.inverse()[:, 0]))
+            self.assertTrue(test._utils.approx_equal(log_det, torch.logdet(mat)))
+
+    def test_sym_toeplitz_inv_matmul(self):
+        col = torch.tensor([4, 1, 0.5, 0.25], dtype=torch.float)
+        rhs_mat = torch.randn(4, 2)
+        inv_col, _ = utils.toeplitz.sym_toeplitz_levinson(col)
+
+        res = utils.toeplitz.sym_toeplitz_inv_matmul(inv_col, rhs_mat)
+        actual = utils.toeplitz.sym_toeplitz(col).inverse().matmul(rhs_mat)
+        self.assertTrue(test._utils.approx_equal(res, actual))
+
+    def test_sym_toeplitz_log_det_derivative(self):
+        col = torch.tensor([4, 1, 0.5, 0.25], dtype=torch.float, requires_grad=True)
+        torch.logdet(utils.toeplitz.sym_toeplitz(col)).backward()
+
+        inv_col, _ = utils.toeplitz.sym_toeplitz_levinson(col.detach())
+        res = utils.toeplitz.sym_toeplitz_log_det_derivative(inv_col)
+        self.assertTrue(test._utils.approx_equal(res, col.grad))
+
+    def test_circulant_inv_matmul(self):
+        col = torch.tensor([4, 1, 0.5, 0.25, 0.1], dtype=torch.float)
+        circulant_col = utils.toeplitz.sym_toeplitz_circulant_column(col)
+        circulant_mat = utils.toeplitz.sym_toeplitz(circulant_col)
+        self.assertTrue(test._utils.approx_equal(circulant_col, torch.tensor([4, 0.82, 0.4, 0.4, 0.82])))
+
+        eigenvalues = utils.toeplitz.circulant_eigenvalues(circulant_col)
+        self.assertTrue(test._utils.approx_equal(eigenvalues.log().sum(), torch.logdet(circulant_mat)))
+
+        rhs_mat = torch.randn(5, 2)
+        res = utils.toeplitz.circulant_inv_matmul(eigenvalues, rhs_mat)
+        actual = circulant_mat.inverse().matmul(rhs_mat)
+        self.assertTrue(test._utils.approx_equal(res, actual))
+
+    def test_multilevel_circulant(self):
+        col_1 = torch.tensor([4, 1, 0.5, 1], dtype=torch.float)
+        col_2 = torch.tensor([3, 0.5, 0.5], dtype=torch.float)
+        eigenvalues = utils.toeplitz.circulant_eigenvalues(col_1).unsqueeze(-1)
+        eigenvalues = eigenvalues * utils.toeplitz.circulant_eigenvalues(col_2).unsqueeze(-2)
+
+        # Kronecker product, with the first matrix corresponding to the slowest-varying index
+        mat_1 = utils.toeplitz.sym_toeplitz(col_1)
+        mat_2 = utils.toeplitz.sym_toeplitz(col_2)
+        mat = (mat_1.unsqueeze(1).unsqueeze(3) * mat_2.unsqueeze(0).unsqueeze(2)).view(12, 12)
+
+        rhs_mat = torch.randn(12, 2)
+        res = utils.toeplitz.circulant_inv_matmul(eigenvalues, rhs_mat, signal_ndim=2)
+        self.assertTrue(test._utils.approx_equal(res, mat.inverse().matmul(rhs_mat)))
+
+        root = utils.toeplitz.circulant_root(eigenvalues, 12, signal_ndim=2)
+        self.assertTrue(test._utils.approx_equal(root.matmul(root.t()), mat))
+        root = utils.toeplitz.circulant_root(eigenvalues, 3, signal_ndim=2)
+        top_eigenvalues = eigenvalues.view(-1).topk(3)[0]
+        self.assertTrue(test._utils.approx_equal(root.t().matmul(root), top_eigenvalues.diag()))
+
 
 if __name__ == "__main__":
     unittest.main()